@@ -1,7 +1,17 @@
 import streamlit as st
 
-from src.config import supabase_client
+from src.books import BookCatalog
+from src.config import (
+    BACKEND_LOCAL,
+    configure_metrics,
+    configure_shared_cache,
+    get_backend_settings,
+    get_database_client,
+    get_profiling_settings,
+)
+from src.metrics import track_rerun
 from src.models import Usuario
+from src.profiling import profile_rerun
 from src.repository import DatabaseRepository
 from src.ui import (
     apply_styles,
@@ -29,43 +39,57 @@ def main():
         unsafe_allow_html=True,
     )
 
-    repo = DatabaseRepository(supabase_client)
+    # Cache compartilhado entre as réplicas do host (opcional, ver README).
+    configure_shared_cache()
+    # Exportação das métricas do repositório (opcional, ver README).
+    configure_metrics()
 
-    if "logged_in_user" not in st.session_state:
-        # --- PÁGINA DE LOGIN ---
-        all_users = repo.get_all_users()
-        user_to_login = render_login_page(all_users)
-        if user_to_login:
-            st.session_state["logged_in_user"] = user_to_login
-            # Limpa estados antigos para garantir uma sessão limpa
-            for key in ["data_selecionada", "plano_anterior", "user_check_plano"]:
-                if key in st.session_state:
-                    del st.session_state[key]
-            st.rerun()
-    else:
-        # --- APLICAÇÃO PRINCIPAL (APÓS LOGIN) ---
-        current_user: Usuario = st.session_state["logged_in_user"]
+    # O banco local é populado com o catálogo embutido: dispensa a consulta a 'tb_livros'.
+    local_backend = get_backend_settings()["backend"] == BACKEND_LOCAL
+    repo = DatabaseRepository(
+        get_database_client(), book_catalog=BookCatalog.bundled() if local_backend else None
+    )
 
-        page, logout_clicked = render_sidebar(current_user)
-        if logout_clicked:
-            # Limpa toda a sessão para um logout completo
-            for key in list(st.session_state.keys()):
-                del st.session_state[key]
-            st.rerun()
+    # Consultas, caches e tempo do repositório neste rerun (ver src/metrics.py) e,
+    # quando ativado por um administrador, o profiling do rerun (ver src/profiling.py).
+    with profile_rerun(get_profiling_settings()), track_rerun() as rerun:
+        if "logged_in_user" not in st.session_state:
+            # --- PÁGINA DE LOGIN ---
+            rerun.page = "Login"
+            all_users = repo.get_all_users()
+            user_to_login = render_login_page(all_users)
+            if user_to_login:
+                st.session_state["logged_in_user"] = user_to_login
+                # Limpa estados antigos para garantir uma sessão limpa
+                for key in ["data_selecionada", "plano_anterior", "user_check_plano"]:
+                    if key in st.session_state:
+                        del st.session_state[key]
+                st.rerun()
+        else:
+            # --- APLICAÇÃO PRINCIPAL (APÓS LOGIN) ---
+            current_user: Usuario = st.session_state["logged_in_user"]
+
+            page, logout_clicked = render_sidebar(current_user)
+            rerun.page = page
+            if logout_clicked:
+                # Limpa toda a sessão para um logout completo
+                for key in list(st.session_state.keys()):
+                    del st.session_state[key]
+                st.rerun()
 
-        # Carrega nomes dos planos para o menu de seleção
-        plan_names = repo.get_all_plan_names()
+            # Carrega nomes dos planos para o menu de seleção
+            plan_names = repo.get_all_plan_names()
 
-        if page == "Minha Leitura":
-            render_reading_page(current_user, repo, plan_names)
-        elif page == "Meu Perfil":
-            render_profile_page(current_user, repo)
-        elif page == "Progresso Geral":
-            render_dashboard_page(repo)
-        elif page == "Awards":
-            render_awards_page(current_user, repo)
-        elif page == "Dúvidas da Comunidade":
-            render_qa_page(current_user, repo)
+            if page == "Minha Leitura":
+                render_reading_page(current_user, repo, plan_names)
+            elif page == "Meu Perfil":
+                render_profile_page(current_user, repo)
+            elif page == "Progresso Geral":
+                render_dashboard_page(repo)
+            elif page == "Awards":
+                render_awards_page(current_user, repo)
+            elif page == "Dúvidas da Comunidade":
+                render_qa_page(current_user, repo)
 
 
 if __name__ == "__main__":
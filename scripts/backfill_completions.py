@@ -1,26 +1,44 @@
+import argparse
+import json
 import os
 import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Optional
 
 from dotenv import load_dotenv
-from supabase import Client, create_client
 
 # Adiciona o diretório raiz ao path para encontrar o módulo 'src'
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
+from src.config import (
+    BACKEND_LOCAL,
+    BACKEND_SUPABASE,
+    DatabaseClient,
+    create_database_client,
+)
 from src.repository import DatabaseRepository
 
+MODO_SERVIDOR = "servidor"
+MODO_CLIENTE = "cliente"
 
-def run_backfill():
-    """
-    Executa um script para preencher retroativamente a tabela tb_livros_concluidos.
+# Um grupo é um par (usuário, plano) com os livros a verificar em uma única RPC.
+Grupo = tuple[int, int, list[int]]
 
-    Este script busca todas as combinações únicas de usuário, plano e livro
-    da tabela de leituras e dispara a lógica de verificação de conclusão para cada uma.
-    """
+
+def conectar() -> Optional[DatabaseClient]:
+    """Cria o cliente de banco a partir das variáveis de ambiente (ou do arquivo .env)."""
     # Carrega as variáveis de ambiente de um arquivo .env na raiz do projeto
     # Crie um arquivo .env com SUPABASE_URL e SUPABASE_SERVICE_KEY
     load_dotenv()
 
+    # BIBLE_TRACKER_BACKEND=local usa o banco SQLite em BIBLE_TRACKER_LOCAL_DB (sem rede).
+    backend = os.getenv("BIBLE_TRACKER_BACKEND", BACKEND_SUPABASE)
+    if backend == BACKEND_LOCAL:
+        print("Abrindo o banco local...")
+        return create_database_client(BACKEND_LOCAL, local_path=os.getenv("BIBLE_TRACKER_LOCAL_DB"))
+
     supabase_url = os.getenv("SUPABASE_URL")
     # IMPORTANTE: Use a chave de 'service_role' para ter permissões de escrita/leitura totais
     supabase_key = os.getenv("SUPABASE_SERVICE_KEY")
@@ -28,31 +46,239 @@ def run_backfill():
     if not supabase_url or not supabase_key:
         print("Erro: As variáveis de ambiente SUPABASE_URL e SUPABASE_SERVICE_KEY não foram definidas.")
         print("Crie um arquivo .env na raiz do projeto com essas credenciais.")
-        return
+        return None
 
     print("Conectando ao Supabase...")
-    client: Client = create_client(supabase_url, supabase_key)
-    repo = DatabaseRepository(client)
-    print("Conexão estabelecida.")
+    return create_database_client(BACKEND_SUPABASE, url=supabase_url, key=supabase_key)
+
+
+def backfill_servidor(client: DatabaseClient, repo: DatabaseRepository, dry_run: bool) -> None:
+    """Calcula e insere as conclusões pendentes em um único comando no banco.
+
+    Usa a view 'vw_livros_concluidos_pendentes' e a função 'backfill_livros_concluidos'
+    (scripts/ddl.sql). No dry-run, apenas lista as conclusões que seriam inseridas.
+    """
+    if dry_run:
+        pendentes = list(
+            repo.paginate(
+                lambda: client.from_("vw_livros_concluidos_pendentes")
+                .select("usuario_id, plano_id, id_livro")
+                .order("usuario_id")
+                .order("plano_id")
+                .order("id_livro"),
+                key=None,
+            )
+        )
+        for p in pendentes:
+            print(f"  + Usuário={p['usuario_id']}, Plano={p['plano_id']}, Livro={p['id_livro']}")
+        print(f"\n[dry-run] {len(pendentes)} conclusões seriam inseridas.")
+        return
+
+    print("Executando o backfill no servidor (um único comando)...")
+    response = client.rpc("backfill_livros_concluidos", {"p_dry_run": False}).execute()
+    print(
+        f"\nVerificação concluída! {response.data or 0} conclusões inseridas em 'tb_livros_concluidos'."
+    )
+
+
+class Checkpoint:
+    """Arquivo JSON com os grupos (usuário, plano) já processados, para retomar o backfill."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self.feitos: set[str] = set()
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                self.feitos = set(json.load(f).get("feitos", []))
+
+    @staticmethod
+    def chave(usuario_id: int, plano_id: int) -> str:
+        return f"{usuario_id}:{plano_id}"
+
+    def marcar(self, chaves: list[str]) -> None:
+        """Registra os grupos concluídos e grava o arquivo de forma atômica."""
+        with self._lock:
+            self.feitos.update(chaves)
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"feitos": sorted(self.feitos)}, f)
+            os.replace(tmp_path, self.path)
+
+    def remover(self) -> None:
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+
+def carregar_candidatos(
+    client: DatabaseClient, repo: DatabaseRepository
+) -> tuple[dict[tuple[int, int, int], set[int]], set[tuple[int, int, int]]]:
+    """Lê as leituras (paginadas) e as conclusões existentes.
+
+    Returns:
+        Os capítulos distintos lidos por (usuário, plano, livro) e o conjunto de
+        (usuário, plano, livro) já presentes em 'tb_livros_concluidos'.
+    """
+    print("Buscando as leituras existentes para análise...")
+    lidos: dict[tuple[int, int, int], set[int]] = {}
+    for r in repo.paginate(
+        lambda: client.table("tb_leituras").select("id, usuario_id, plano_id, id_livro, capitulo")
+    ):
+        lidos.setdefault((r["usuario_id"], r["plano_id"], r["id_livro"]), set()).add(r["capitulo"])
+
+    existentes = {
+        (r["usuario_id"], r["plano_id"], r["id_livro"])
+        for r in repo.paginate(
+            lambda: client.table("tb_livros_concluidos").select("id, usuario_id, plano_id, id_livro")
+        )
+    }
+    return lidos, existentes
 
-    try:
-        print("Buscando todas as leituras existentes para análise...")
-        response = client.table("tb_leituras").select("usuario_id, plano_id, id_livro").execute()
-        if not response.data:
-            print("Nenhum registro de leitura encontrado. Nada a fazer.")
-            return
 
-        unique_checks = {(r["usuario_id"], r["plano_id"], r["id_livro"]) for r in response.data}
-        total_checks = len(unique_checks)
-        print(f"Encontradas {total_checks} combinações únicas para verificar.")
+def calcular_delta(
+    client: DatabaseClient,
+    repo: DatabaseRepository,
+    lidos: dict[tuple[int, int, int], set[int]],
+    existentes: set[tuple[int, int, int]],
+) -> list[tuple[int, int, int]]:
+    """Aplica localmente a regra de conclusão e retorna as conclusões que faltam."""
+    alvo: dict[tuple[int, int], set[int]] = {}
+    for slot in repo.paginate(
+        lambda: client.table("tb_plano_slots")
+        .select("plano_id, id_livro, capitulo")
+        .order("plano_id")
+        .order("ordem"),
+        key=None,
+    ):
+        alvo.setdefault((slot["plano_id"], slot["id_livro"]), set()).add(slot["capitulo"])
 
-        for i, (user_id, plan_id, book_id) in enumerate(unique_checks):
+    delta = []
+    for (usuario_id, plano_id, livro_id), capitulos in lidos.items():
+        capitulos_alvo = alvo.get((plano_id, livro_id))
+        if capitulos_alvo and (usuario_id, plano_id, livro_id) not in existentes:
+            if len(capitulos) >= len(capitulos_alvo):
+                delta.append((usuario_id, plano_id, livro_id))
+    return sorted(delta)
+
+
+def backfill_cliente(
+    client: DatabaseClient,
+    repo: DatabaseRepository,
+    dry_run: bool,
+    workers: int,
+    lote: int,
+    checkpoint_path: str,
+) -> None:
+    """Verifica as conclusões pelo cliente, em paralelo, com lotes e checkpoint.
+
+    Cada grupo (usuário, plano) usa uma chamada a 'handle_books_completion_check'.
+    Os grupos são divididos em lotes de `lote` grupos, processados por até `workers`
+    threads; cada lote concluído é registrado no checkpoint, e uma nova execução pula
+    os grupos já processados.
+    """
+    lidos, existentes = carregar_candidatos(client, repo)
+    if not lidos:
+        print("Nenhum registro de leitura encontrado. Nada a fazer.")
+        return
+
+    if dry_run:
+        delta = calcular_delta(client, repo, lidos, existentes)
+        for usuario_id, plano_id, livro_id in delta:
+            print(f"  + Usuário={usuario_id}, Plano={plano_id}, Livro={livro_id}")
+        print(f"\n[dry-run] {len(delta)} conclusões seriam inseridas ({len(existentes)} já existem).")
+        return
+
+    checkpoint = Checkpoint(checkpoint_path)
+    livros_por_grupo: dict[tuple[int, int], list[int]] = {}
+    for usuario_id, plano_id, livro_id in sorted(lidos):
+        if (usuario_id, plano_id, livro_id) not in existentes:
+            livros_por_grupo.setdefault((usuario_id, plano_id), []).append(livro_id)
+    grupos: list[Grupo] = [
+        (usuario_id, plano_id, livros)
+        for (usuario_id, plano_id), livros in livros_por_grupo.items()
+        if Checkpoint.chave(usuario_id, plano_id) not in checkpoint.feitos
+    ]
+    if checkpoint.feitos:
+        print(
+            f"Retomando do checkpoint '{checkpoint_path}': {len(checkpoint.feitos)} grupos já processados."
+        )
+    if not grupos:
+        print("Nenhum grupo pendente. Nada a fazer.")
+        checkpoint.remover()
+        return
+
+    lotes = [grupos[i : i + lote] for i in range(0, len(grupos), lote)]
+    print(f"{len(grupos)} grupos (usuário, plano) em {len(lotes)} lotes, com {workers} workers.")
+
+    def processar(lote_grupos: list[Grupo]) -> int:
+        novas = 0
+        for usuario_id, plano_id, livros in lote_grupos:
+            response = client.rpc(
+                "handle_books_completion_check",
+                {"p_usuario_id": usuario_id, "p_plano_id": plano_id, "p_livro_ids": livros},
+            ).execute()
+            novas += len(response.data or [])
+        checkpoint.marcar([Checkpoint.chave(u, p) for u, p, _ in lote_grupos])
+        return novas
+
+    inicio = time.monotonic()
+    feitos = novas = erros = 0
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(processar, lote_grupos) for lote_grupos in lotes]
+        for future in as_completed(futures):
+            feitos += 1
+            try:
+                novas += future.result()
+            except Exception as e:
+                erros += 1
+                print(f"  Erro em um lote (será refeito na próxima execução): {e}")
+            decorrido = time.monotonic() - inicio
             print(
-                f"[{i+1}/{total_checks}] Verificando: Usuário={user_id}, Plano={plan_id}, Livro={book_id}"
+                f"[{feitos}/{len(lotes)}] lotes · {novas} conclusões novas · {erros} erros · "
+                f"{feitos / decorrido if decorrido else 0:.1f} lotes/s"
             )
-            repo._check_and_save_book_completion(user_id, plan_id, book_id)
 
-        print("\nVerificação concluída! A tabela 'tb_livros_concluidos' foi atualizada.")
+    if erros:
+        print(f"\n{erros} lotes falharam. Execute novamente para retomar a partir do checkpoint.")
+        return
+    checkpoint.remover()
+    print(f"\nVerificação concluída! {novas} conclusões inseridas em 'tb_livros_concluidos'.")
+
+
+def run_backfill():
+    """
+    Executa um script para preencher retroativamente a tabela tb_livros_concluidos.
+
+    No modo 'servidor' (padrão), as conclusões são calculadas e inseridas em um único
+    comando no banco. No modo 'cliente', as combinações de usuário, plano e livro são
+    verificadas em paralelo via RPC, com checkpoint para retomar após interrupções.
+    Em ambos, --dry-run apenas informa as conclusões que seriam inseridas.
+    """
+    parser = argparse.ArgumentParser(
+        description="Preenche retroativamente a tabela tb_livros_concluidos."
+    )
+    parser.add_argument("--modo", choices=[MODO_SERVIDOR, MODO_CLIENTE], default=MODO_SERVIDOR)
+    parser.add_argument("--dry-run", action="store_true", help="Apenas informa o que seria inserido.")
+    parser.add_argument("--workers", type=int, default=4, help="Threads no modo cliente.")
+    parser.add_argument("--lote", type=int, default=50, help="Grupos (usuário, plano) por lote.")
+    parser.add_argument(
+        "--checkpoint", default="backfill_checkpoint.json", help="Arquivo de checkpoint do modo cliente."
+    )
+    args = parser.parse_args()
+
+    client = conectar()
+    if client is None:
+        return
+    repo = DatabaseRepository(client)
+    print("Conexão estabelecida.")
+
+    try:
+        if args.modo == MODO_SERVIDOR:
+            backfill_servidor(client, repo, args.dry_run)
+        else:
+            backfill_cliente(
+                client, repo, args.dry_run, max(1, args.workers), max(1, args.lote), args.checkpoint
+            )
     except Exception as e:
         print(f"\nOcorreu um erro durante o processo de backfill: {e}")
 
@@ -0,0 +1,354 @@
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import time
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Callable, Optional
+
+import pandas as pd
+
+# Adiciona o diretório raiz ao path para encontrar o módulo 'src'
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.books import BUNDLED_BOOKS
+from src.cache import get_cache
+from src.config import BACKEND_LOCAL, DatabaseClient, create_database_client
+from src.models import Leitura, Livro, Usuario
+from src.plan_index import PlanIndex
+from src.progress import PlanProgress
+from src.repository import DatabaseRepository
+from src.ui import _add_dashboard_percentages, _dashboard_metrics
+from src.utils import expandir_capitulos
+
+# Primeiro dia dos planos sintéticos.
+INICIO_PLANO = date(2024, 1, 1)
+
+# Tempo mínimo de cada repetição, em segundos (o número de execuções é calibrado).
+TEMPO_MINIMO = 0.2
+
+
+def gerar_plano(dias: int, capitulos_por_dia: int) -> list[dict[str, Any]]:
+    """Gera as entradas de um plano que percorre a Bíblia em ordem, repetindo-a se preciso.
+
+    Returns:
+        Entradas no formato de `PlanIndex.from_rows`, com os capítulos já expandidos
+        (como chegam de 'tb_plano_slots').
+    """
+    livros = [(ordem, nome, capitulos) for nome, ordem, capitulos, _ in BUNDLED_BOOKS]
+    posicao, capitulo = 0, 1
+    entradas = []
+    for dia in range(dias):
+        data = INICIO_PLANO + timedelta(days=dia)
+        restantes = capitulos_por_dia
+        while restantes:
+            livro_id, nome, total = livros[posicao]
+            fim = min(total, capitulo + restantes - 1)
+            entradas.append(
+                {
+                    "data_leitura": data,
+                    "livro_id": livro_id,
+                    "livro": nome,
+                    "capitulos": f"{capitulo}-{fim}" if fim > capitulo else str(capitulo),
+                    "capitulos_expandidos": list(range(capitulo, fim + 1)),
+                }
+            )
+            restantes -= fim - capitulo + 1
+            capitulo = fim + 1
+            if capitulo > total:
+                posicao, capitulo = (posicao + 1) % len(livros), 1
+    return entradas
+
+
+def gerar_leituras(plan_index: PlanIndex, total: int, rng: random.Random) -> list[Leitura]:
+    """Gera um histórico de `total` leituras em ordem, com lacunas (~5% dos capítulos pulados)."""
+    leituras = []
+    livros = {livro_id: nome for nome, livro_id, _, _ in BUNDLED_BOOKS}
+    criado_em = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    for slot in range(plan_index.total_slots):
+        if len(leituras) >= total:
+            break
+        if rng.random() < 0.05:
+            continue
+        livro_id, capitulo, data = plan_index.slot_key(slot)
+        leituras.append(
+            Leitura(
+                capitulo=capitulo,
+                created_at=criado_em,
+                data_leitura_plano=data,
+                livro=Livro(id=livro_id, nome=livros[livro_id]),
+            )
+        )
+    return leituras
+
+
+def gerar_dashboard(usuarios: int, planos: int, total_plano: int, rng: random.Random) -> pd.DataFrame:
+    """Gera o DataFrame da view 'vw_dashboard_progresso' para `usuarios` x `planos` pares."""
+    linhas = []
+    for plano in range(planos):
+        meta = rng.randint(total_plano // 4, total_plano)
+        for usuario in range(usuarios):
+            lidos = rng.randint(0, total_plano)
+            linhas.append(
+                {
+                    "Usuario": f"Membro {usuario}",
+                    "Plano": f"Plano {plano}",
+                    "Lidos": lidos,
+                    "Meta_Hoje": meta,
+                    "Total_Plano": total_plano,
+                    "Status": "Em dia" if lidos >= meta else "Atrasado",
+                }
+            )
+    return pd.DataFrame(linhas)
+
+
+def montar_banco_local(
+    entradas: list[dict[str, Any]], leituras: list[Leitura]
+) -> tuple[DatabaseClient, DatabaseRepository]:
+    """Cria um banco local em memória com um usuário, o plano e o histórico de leituras."""
+    client = create_database_client(BACKEND_LOCAL)
+    client.table("tb_usuarios").insert({"nome": "Leitor"}).execute()
+    client.table("tb_planos").insert({"nome": "Plano Sintético"}).execute()
+    client.table("tb_plano_entradas").insert(
+        [
+            {
+                "plano_id": 1,
+                "data_leitura": str(e["data_leitura"]),
+                "id_livro": e["livro_id"],
+                "capitulos": e["capitulos"],
+            }
+            for e in entradas
+        ]
+    ).execute()
+    client.table("tb_leituras").insert(
+        [
+            {
+                "usuario_id": 1,
+                "plano_id": 1,
+                "id_livro": leitura.livro.id,
+                "capitulo": leitura.capitulo,
+                "data_leitura_plano": str(leitura.data_leitura_plano),
+            }
+            for leitura in leituras
+        ]
+    ).execute()
+    return client, DatabaseRepository(client)
+
+
+def medir(nome: str, funcao: Callable[[], Any], repeticoes: int) -> dict[str, Any]:
+    """Mede o tempo por execução de `funcao`.
+
+    O número de execuções por repetição é calibrado para durar ao menos TEMPO_MINIMO;
+    as estatísticas são do tempo por execução, em microssegundos.
+    """
+    execucoes = 1
+    while True:
+        inicio = time.perf_counter()
+        for _ in range(execucoes):
+            funcao()
+        decorrido = time.perf_counter() - inicio
+        if decorrido >= TEMPO_MINIMO:
+            break
+        execucoes *= 2 if decorrido < TEMPO_MINIMO / 10 else 1 + int(TEMPO_MINIMO / max(decorrido, 1e-9))
+
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        for _ in range(execucoes):
+            funcao()
+        tempos.append((time.perf_counter() - inicio) / execucoes * 1e6)
+    resultado = {
+        "nome": nome,
+        "execucoes": execucoes,
+        "repeticoes": repeticoes,
+        "min_us": min(tempos),
+        "mediana_us": statistics.median(tempos),
+        "media_us": statistics.fmean(tempos),
+        "desvio_us": statistics.stdev(tempos) if len(tempos) > 1 else 0.0,
+    }
+    print(f"  {nome:<32} {resultado['mediana_us']:>12.1f} µs  (min {resultado['min_us']:.1f} µs)")
+    return resultado
+
+
+def comparar(
+    resultados: list[dict[str, Any]], referencia: dict[str, Any], tolerancia: float
+) -> list[str]:
+    """Compara as medianas com as de uma execução de referência.
+
+    Returns:
+        Uma descrição de cada benchmark mais lento que a referência além da tolerância.
+    """
+    anteriores = {r["nome"]: r["mediana_us"] for r in referencia.get("resultados", [])}
+    regressoes = []
+    for r in resultados:
+        anterior = anteriores.get(r["nome"])
+        if anterior and r["mediana_us"] > anterior * (1 + tolerancia):
+            regressoes.append(
+                f"{r['nome']}: {r['mediana_us']:.1f} µs (referência {anterior:.1f} µs, "
+                f"+{r['mediana_us'] / anterior - 1:.0%})"
+            )
+    return regressoes
+
+
+def commit_atual() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_benchmarks():
+    """
+    Executa os benchmarks dos caminhos críticos em Python e grava os resultados em JSON.
+
+    Usa dados sintéticos e determinísticos (pela semente): um plano de --dias dias, um
+    histórico de --leituras capítulos lidos e um dashboard de --usuarios x --planos
+    pares. Os benchmarks de estatísticas e gravação usam o backend local em memória.
+    Com --referencia, compara as medianas com uma execução anterior e termina com
+    erro se alguma ficar mais lenta que a tolerância.
+    """
+    parser = argparse.ArgumentParser(description="Benchmarks dos caminhos críticos da aplicação.")
+    parser.add_argument("--dias", type=int, default=1095, help="Dias do plano sintético.")
+    parser.add_argument("--capitulos-por-dia", type=int, default=10, help="Capítulos por dia do plano.")
+    parser.add_argument("--leituras", type=int, default=10000, help="Capítulos lidos no histórico.")
+    parser.add_argument("--usuarios", type=int, default=2000, help="Membros no dashboard.")
+    parser.add_argument("--planos", type=int, default=10, help="Planos no dashboard.")
+    parser.add_argument("--repeticoes", type=int, default=7, help="Repetições de cada benchmark.")
+    parser.add_argument("--semente", type=int, default=42, help="Semente dos dados sintéticos.")
+    parser.add_argument(
+        "--filtro", default="", help="Executa apenas os benchmarks com este texto no nome."
+    )
+    parser.add_argument("--saida", default="benchmarks/resultados.json", help="Arquivo JSON de saída.")
+    parser.add_argument("--referencia", help="Resultados anteriores (JSON) para detectar regressões.")
+    parser.add_argument(
+        "--tolerancia", type=float, default=0.25, help="Regressão tolerada (0.25 = 25%%)."
+    )
+    args = parser.parse_args()
+
+    rng = random.Random(args.semente)
+    print("Gerando os dados sintéticos...")
+    entradas = gerar_plano(args.dias, args.capitulos_por_dia)
+    plan_index = PlanIndex.from_rows(1, "Plano Sintético", entradas)
+    leituras = gerar_leituras(plan_index, args.leituras, rng)
+    progresso = PlanProgress.from_readings(plan_index, leituras)
+    dia_pendente = progresso.next_unread_date() or INICIO_PLANO
+    dashboard = gerar_dashboard(args.usuarios, args.planos, plan_index.total_slots, rng)
+    strings_capitulos = [e["capitulos"] for e in entradas]
+    print(
+        f"Plano com {len(plan_index.dates)} dias e {plan_index.total_slots} capítulos; "
+        f"{len(leituras)} leituras; dashboard com {len(dashboard)} linhas."
+    )
+
+    print("Montando o banco local...")
+    inicio = time.perf_counter()
+    client, repo = montar_banco_local(entradas, leituras)
+    carga_s = time.perf_counter() - inicio
+    usuario = Usuario(id=1, nome="Leitor")
+    hoje = dia_pendente
+    estatisticas_cache = get_cache("estatisticas_usuario")
+    dia_novo = [
+        {
+            "usuario_id": 1,
+            "plano_id": 1,
+            "id_livro": e.book_id,
+            "capitulo": c,
+            "data_leitura_plano": str(dia_pendente),
+        }
+        for e in plan_index.entries_for(dia_pendente)
+        for c in e.chapters
+        if not progresso.is_read(e.book_id, c, dia_pendente)
+    ]
+
+    def estatisticas() -> int:
+        # Sem o cache: mede a leitura da projeção mantida pelos triggers.
+        estatisticas_cache.invalidate(usuario.id)
+        return repo.get_user_stats(usuario.id).sequencia_em(hoje)
+
+    def gravar_dia() -> None:
+        # Grava e desfaz as leituras de um dia: os triggers recalculam estatísticas e sequência.
+        inseridas = client.table("tb_leituras").insert(dia_novo).execute().data
+        client.table("tb_leituras").delete().in_("id", [r["id"] for r in inseridas]).execute()
+
+    def marcar_dia() -> list[bool]:
+        return [
+            progresso.is_read(e.book_id, c, hoje)
+            for e in plan_index.entries_for(hoje)
+            for c in e.chapters
+        ]
+
+    def dashboard_pct() -> None:
+        df = dashboard.copy()
+        _dashboard_metrics(df)
+        _add_dashboard_percentages(df)
+        for plano in df["Plano"].unique():
+            df[df["Plano"] == plano].copy()
+
+    benchmarks: list[tuple[str, Callable[[], Any]]] = [
+        ("expandir_capitulos", lambda: [expandir_capitulos(s) for s in strings_capitulos]),
+        ("indice_plano", lambda: PlanIndex.from_rows(1, "Plano Sintético", entradas)),
+        ("estrutura_plano_dataframe", plan_index.to_frame),
+        ("progresso_bitset", lambda: PlanProgress.from_readings(plan_index, leituras)),
+        (
+            "proxima_data_pendente",
+            lambda: PlanProgress.from_readings(plan_index, leituras).next_unread_date(),
+        ),
+        ("proxima_data_pendente_cache", progresso.next_unread_date),
+        ("marcacao_capitulos_dia", marcar_dia),
+        ("estatisticas_sequencia", estatisticas),
+        ("gravacao_dia_leitura", gravar_dia),
+        ("dashboard_percentuais", dashboard_pct),
+    ]
+
+    print(f"Executando os benchmarks ({args.repeticoes} repetições)...")
+    resultados = [
+        medir(nome, funcao, args.repeticoes) for nome, funcao in benchmarks if args.filtro in nome
+    ]
+
+    relatorio = {
+        "gerado_em": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "commit": commit_atual(),
+        "python": platform.python_version(),
+        "plataforma": platform.platform(),
+        "parametros": {
+            "dias": args.dias,
+            "capitulos_por_dia": args.capitulos_por_dia,
+            "capitulos_plano": plan_index.total_slots,
+            "leituras": len(leituras),
+            "linhas_dashboard": len(dashboard),
+            "semente": args.semente,
+            "carga_banco_local_s": round(carga_s, 3),
+        },
+        "resultados": resultados,
+    }
+    os.makedirs(os.path.dirname(os.path.abspath(args.saida)), exist_ok=True)
+    with open(args.saida, "w", encoding="utf-8") as f:
+        json.dump(relatorio, f, ensure_ascii=False, indent=2)
+        f.write("\n")
+    print(f"Resultados gravados em '{args.saida}'.")
+
+    if args.referencia:
+        if not os.path.exists(args.referencia):
+            # Sem referência não há como detectar regressões: falha em vez de passar em silêncio.
+            print(
+                f"Referência '{args.referencia}' não encontrada. Grave uma com 'make bench-baseline' "
+                "(ou 'make bench-baseline BENCH_BASE=origin/main' para medir outro commit)."
+            )
+            sys.exit(1)
+        with open(args.referencia, encoding="utf-8") as f:
+            regressoes = comparar(resultados, json.load(f), args.tolerancia)
+        if regressoes:
+            print(f"\n{len(regressoes)} regressões acima de {args.tolerancia:.0%}:")
+            for regressao in regressoes:
+                print(f"  - {regressao}")
+            sys.exit(1)
+        print(f"Nenhuma regressão acima de {args.tolerancia:.0%} em relação a '{args.referencia}'.")
+
+
+if __name__ == "__main__":
+    run_benchmarks()
@@ -0,0 +1,99 @@
+import argparse
+import hashlib
+import io
+import json
+import math
+import os
+import sys
+
+from PIL import Image
+
+# Adiciona o diretório raiz ao path para encontrar o módulo 'src'
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.badges import MANIFEST_NAME, SPRITE_DIR
+from src.books import BUNDLED_BOOKS
+
+
+def montar_sprite(
+    imagens: list[str], tamanho: int, colunas: int
+) -> tuple[Image.Image, dict[str, list[int]]]:
+    """Reduz as imagens a `tamanho` pixels e as posiciona em uma grade única.
+
+    Returns:
+        A folha de sprites e a posição [coluna, linha] de cada imagem, pelo caminho de origem.
+    """
+    linhas = math.ceil(len(imagens) / colunas)
+    sprite = Image.new("RGBA", (colunas * tamanho, linhas * tamanho), (0, 0, 0, 0))
+    posicoes: dict[str, list[int]] = {}
+    for i, caminho in enumerate(imagens):
+        coluna, linha = i % colunas, i // colunas
+        with Image.open(caminho) as imagem:
+            miniatura = imagem.convert("RGBA")
+            miniatura.thumbnail((tamanho, tamanho), Image.Resampling.LANCZOS)
+        # Centraliza imagens não quadradas na célula.
+        x = coluna * tamanho + (tamanho - miniatura.width) // 2
+        y = linha * tamanho + (tamanho - miniatura.height) // 2
+        sprite.paste(miniatura, (x, y))
+        posicoes[caminho] = [coluna, linha]
+    return sprite, posicoes
+
+
+def build_badges():
+    """
+    Gera a folha de sprites dos selos de conclusão usada pela página de Awards.
+
+    As imagens de 'media/' referenciadas pelo catálogo de livros são reduzidas,
+    combinadas em um único arquivo WebP e gravadas em 'static/selos/', servido pelo
+    Streamlit em '/app/static/selos/'. O nome do arquivo inclui o hash do conteúdo,
+    de forma que ele pode ser cacheado indefinidamente pelo navegador e por proxies;
+    o 'manifest.json' aponta para o arquivo atual e a posição de cada selo.
+    """
+    parser = argparse.ArgumentParser(description="Gera a folha de sprites dos selos de conclusão.")
+    parser.add_argument("--tamanho", type=int, default=128, help="Lado de cada selo, em pixels.")
+    parser.add_argument("--colunas", type=int, default=11, help="Selos por linha na folha de sprites.")
+    parser.add_argument("--qualidade", type=int, default=80, help="Qualidade WebP (0-100).")
+    args = parser.parse_args()
+
+    imagens = [image_path for _, _, _, image_path in BUNDLED_BOOKS if os.path.exists(image_path)]
+    faltando = len(BUNDLED_BOOKS) - len(imagens)
+    if faltando:
+        print(f"Aviso: {faltando} imagens do catálogo não foram encontradas e serão omitidas.")
+    if not imagens:
+        print("Nenhuma imagem encontrada. Execute o script a partir da raiz do projeto.")
+        return
+
+    sprite, posicoes = montar_sprite(imagens, args.tamanho, args.colunas)
+    buffer = io.BytesIO()
+    sprite.save(buffer, format="WEBP", quality=args.qualidade, method=6)
+    conteudo = buffer.getvalue()
+    nome = f"selos-{hashlib.sha256(conteudo).hexdigest()[:12]}.webp"
+
+    os.makedirs(SPRITE_DIR, exist_ok=True)
+    # Remove as folhas antigas: apenas a referenciada pelo manifesto é servida.
+    for antigo in os.listdir(SPRITE_DIR):
+        if antigo.startswith("selos-") and antigo.endswith(".webp") and antigo != nome:
+            os.remove(os.path.join(SPRITE_DIR, antigo))
+    with open(os.path.join(SPRITE_DIR, nome), "wb") as f:
+        f.write(conteudo)
+
+    manifesto = {
+        "sprite": nome,
+        "tamanho": args.tamanho,
+        "colunas": args.colunas,
+        "linhas": math.ceil(len(imagens) / args.colunas),
+        "selos": posicoes,
+    }
+    with open(os.path.join(SPRITE_DIR, MANIFEST_NAME), "w", encoding="utf-8") as f:
+        json.dump(manifesto, f, ensure_ascii=False, sort_keys=True)
+        f.write("\n")
+
+    original = sum(os.path.getsize(caminho) for caminho in imagens)
+    print(
+        f"{len(imagens)} selos gravados em '{SPRITE_DIR}/{nome}': "
+        f"{len(conteudo) / 1024:.0f} KB (originais: {original / 1024:.0f} KB)."
+    )
+
+
+if __name__ == "__main__":
+    build_badges()
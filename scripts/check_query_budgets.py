@@ -0,0 +1,266 @@
+import argparse
+import logging
+import os
+import subprocess
+import sys
+import tempfile
+from typing import Any, Callable, Optional
+
+# Adiciona o diretório raiz ao path para encontrar o módulo 'src'
+RAIZ = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.append(RAIZ)
+
+import streamlit as st
+
+from src.cache import clear_all_caches
+from src.config import BACKEND_LOCAL, get_database_client
+from src.models import Usuario
+from src.query_budget import (
+    BUDGETS,
+    QueryBudgetExceeded,
+    QueryCount,
+    check_budget,
+    count_queries,
+)
+from src.repository import DatabaseRepository
+from src.ui import (
+    render_awards_page,
+    render_dashboard_page,
+    render_login_page,
+    render_profile_page,
+    render_qa_page,
+    render_reading_page,
+    render_sidebar,
+)
+
+# Chave do estado da sessão em que o cenário acumula a contagem entre os reruns.
+CHAVE_CONTAGEM = "orcamento_consultas"
+CHAVE_CENARIO = "orcamento_cenario"
+
+
+def repositorio() -> DatabaseRepository:
+    # Sem o catálogo embutido, como no Supabase: a consulta a 'tb_livros' entra na conta.
+    return DatabaseRepository(get_database_client())
+
+
+def _renderizar_login(repo: DatabaseRepository) -> Callable[[], Any]:
+    usuarios = repo.get_all_users()
+    return lambda: render_login_page(usuarios)
+
+
+def _renderizar_leitura(repo: DatabaseRepository) -> Callable[[], Any]:
+    usuario = st.session_state["logged_in_user"]
+    planos = repo.get_all_plan_names()
+    return lambda: render_reading_page(usuario, repo, planos)
+
+
+# Cada cenário prepara, fora da contagem, o que o app.py carrega antes de renderizar a
+# página (a lista de membros, os nomes dos planos) e devolve a renderização a medir.
+CENARIOS: dict[str, Callable[[DatabaseRepository], Callable[[], Any]]] = {
+    "render_login_page": _renderizar_login,
+    "render_sidebar": lambda repo: lambda: render_sidebar(st.session_state["logged_in_user"]),
+    "render_reading_page": _renderizar_leitura,
+    "render_profile_page": lambda repo: lambda: render_profile_page(
+        st.session_state["logged_in_user"], repo
+    ),
+    "render_dashboard_page": lambda repo: lambda: render_dashboard_page(repo),
+    "render_awards_page": lambda repo: lambda: render_awards_page(
+        st.session_state["logged_in_user"], repo
+    ),
+    "render_qa_page": lambda repo: lambda: render_qa_page(st.session_state["logged_in_user"], repo),
+}
+
+
+def executar_cenario() -> None:
+    """Renderiza a página do cenário da sessão, somando as consultas de cada rerun.
+
+    Executado pelo AppTest: os `st.rerun` da página (ex: a data pendente da página de
+    leitura) reexecutam o script, e as consultas de todas as execuções são somadas.
+    """
+    renderizar = CENARIOS[st.session_state[CHAVE_CENARIO]](repositorio())
+    contagem = st.session_state.setdefault(CHAVE_CONTAGEM, QueryCount())
+    parcial = QueryCount()
+    try:
+        with count_queries() as parcial:
+            renderizar()
+    finally:
+        contagem.add(parcial)
+
+
+def roteiro(raiz: str) -> None:
+    """Script executado pelo AppTest (o código da função vira o script, sem o módulo)."""
+    import os
+    import sys
+
+    sys.path[:0] = [raiz, os.path.join(raiz, "scripts")]
+    from check_query_budgets import executar_cenario
+
+    executar_cenario()
+
+
+def medir_pagina(cenario: str, usuario: Optional[Usuario], timeout: float) -> QueryCount:
+    """Renderiza uma página em uma nova sessão e retorna as consultas feitas."""
+    from streamlit.testing.v1 import AppTest
+
+    principal = sys.modules["__main__"]
+    try:
+        at = AppTest.from_function(roteiro, args=(RAIZ,), default_timeout=timeout)
+        at.session_state[CHAVE_CENARIO] = cenario
+        if usuario is not None:
+            at.session_state["logged_in_user"] = usuario
+        at.run()
+    finally:
+        # O AppTest registra o script como '__main__'.
+        sys.modules["__main__"] = principal
+    if at.exception:
+        raise RuntimeError(f"{cenario}: {at.exception[0].message}")
+    return at.session_state[CHAVE_CONTAGEM]
+
+
+def escolher_membro(repo: DatabaseRepository) -> tuple[Usuario, str]:
+    """O primeiro membro com um plano ativo e o nome desse plano."""
+    for usuario in repo.get_all_users():
+        plano = repo.get_last_active_plan_name(usuario)
+        if plano:
+            return usuario, plano
+    print("Nenhum membro com leituras no banco. Gere-os com scripts/generate_community_data.py.")
+    sys.exit(1)
+
+
+def medir_operacoes(repo: DatabaseRepository, usuario: Usuario, plano: str) -> dict[str, QueryCount]:
+    """Mede as gravações da página de leitura: um capítulo e, em lote, o restante do dia."""
+    plan_index = repo.get_plan_index(plano)
+    assert plan_index is not None
+    dia = repo.find_next_unread_date(usuario, plan_index)
+    progresso = repo.get_plan_progress(usuario, plan_index)
+    pendentes = [
+        (entrada.book_id, c, dia)
+        for entrada in plan_index.entries_for(dia)
+        for c in entrada.chapters
+        if not progresso.is_read(entrada.book_id, c, dia)
+    ]
+    if len(pendentes) < 2:
+        print(f"O dia {dia:%d/%m/%Y} do plano '{plano}' não tem capítulos pendentes suficientes.")
+        sys.exit(1)
+
+    contagens = {}
+    livro_id, capitulo, _ = pendentes[0]
+    with count_queries() as contagens["save_reading"]:
+        repo.save_reading(usuario, plan_index.plan_id, livro_id, capitulo, dia)
+    with count_queries() as contagens["save_readings"]:
+        repo.save_readings(usuario, plan_index.plan_id, pendentes[1:])
+    return contagens
+
+
+def gerar_banco(diretorio: str) -> str:
+    """Gera uma comunidade sintética pequena em um banco local temporário."""
+    caminho = os.path.join(diretorio, "orcamento.sqlite3")
+    ambiente = dict(os.environ, BIBLE_TRACKER_BACKEND=BACKEND_LOCAL, BIBLE_TRACKER_LOCAL_DB=caminho)
+    subprocess.run(
+        [sys.executable, os.path.join(RAIZ, "scripts", "generate_community_data.py"), "--escala", "0.2"],
+        check=True,
+        env=ambiente,
+        stdout=subprocess.DEVNULL,
+    )
+    return caminho
+
+
+def verificar(timeout: float) -> list[str]:
+    """Mede todos os cenários com os caches frios e depois quentes e confere os orçamentos.
+
+    Returns:
+        As violações encontradas (vazia se todos os orçamentos foram respeitados).
+    """
+    repo = repositorio()
+    usuario, plano = escolher_membro(repo)
+    print(f"Membro: {usuario.nome} (plano '{plano}').\n")
+
+    violacoes = []
+    print(f"{'Cenário':<24}{'frio':>6}{'quente':>8}{'orçamento':>11}")
+
+    def conferir(nome: str, frio: QueryCount, quente: Optional[QueryCount]) -> None:
+        orcamento = BUDGETS[nome]
+        limite = f"{orcamento.cold}/{'-' if orcamento.warm is None else orcamento.warm}"
+        print(f"{nome:<24}{frio.queries:>6}{'-' if quente is None else quente.queries:>8}{limite:>11}")
+        for rotulo, contagem, maximo in (
+            ("frio", frio, orcamento.cold),
+            ("quente", quente, orcamento.warm),
+        ):
+            if contagem is None:
+                continue
+            try:
+                check_budget(contagem, maximo, f"{nome} ({rotulo})")
+            except QueryBudgetExceeded as e:
+                violacoes.append(str(e))
+
+    for nome in CENARIOS:
+        membro = None if nome == "render_login_page" else usuario
+        clear_all_caches()
+        frio = medir_pagina(nome, membro, timeout)
+        conferir(nome, frio, medir_pagina(nome, membro, timeout))
+
+    clear_all_caches()
+    with count_queries() as frio:
+        repo.get_book_catalog()
+    with count_queries() as quente:
+        repo.get_book_catalog()
+    conferir("get_book_catalog", frio, quente)
+
+    for nome, contagem in medir_operacoes(repo, usuario, plano).items():
+        conferir(nome, contagem, None)
+    return violacoes
+
+
+def check_query_budgets():
+    """
+    Confere os orçamentos de consultas ao banco das páginas e operações do app.
+
+    Cada função `render_*` de src/ui.py é executada pelo AppTest do Streamlit contra o
+    backend local, primeiro com os caches vazios (frio) e depois em uma nova sessão
+    com os caches carregados (quente); as gravações da página de leitura e o catálogo
+    de livros são medidos diretamente no repositório. As consultas são contadas pelas
+    métricas do repositório (src/metrics.py): cada uma corresponde a uma requisição
+    ao PostgREST no Supabase. Sai com código 1 se algum cenário exceder o orçamento
+    declarado em src/query_budget.py, o que normalmente indica uma regressão N+1.
+
+    Sem --banco, gera uma comunidade sintética pequena em um banco temporário; com
+    --banco, use um banco dedicado, pois o script grava leituras.
+    """
+    parser = argparse.ArgumentParser(description="Confere os orçamentos de consultas das páginas.")
+    parser.add_argument("--banco", help="Arquivo SQLite do backend local. Padrão: um banco gerado.")
+    parser.add_argument(
+        "--timeout", type=float, default=60.0, help="Tempo máximo de uma renderização, em segundos."
+    )
+    args = parser.parse_args()
+
+    # As consultas são contadas fora dos reruns, o que o Streamlit avisa a cada leitura
+    # do cliente (ver scripts/load_test.py).
+    logging.getLogger("streamlit.runtime.scriptrunner_utils.script_run_context").addFilter(
+        lambda registro: "missing ScriptRunContext" not in registro.getMessage()
+    )
+
+    with tempfile.TemporaryDirectory() as diretorio:
+        if args.banco is None:
+            print("Gerando uma comunidade sintética em um banco temporário...")
+            banco = gerar_banco(diretorio)
+        elif os.path.exists(args.banco):
+            banco = args.banco
+        else:
+            print(
+                f"Banco '{args.banco}' não encontrado. Gere um com scripts/generate_community_data.py."
+            )
+            sys.exit(1)
+        os.environ["BIBLE_TRACKER_BACKEND"] = BACKEND_LOCAL
+        os.environ["BIBLE_TRACKER_LOCAL_DB"] = os.path.abspath(banco)
+        violacoes = verificar(args.timeout)
+
+    if violacoes:
+        print("\nOrçamentos excedidos:")
+        for violacao in violacoes:
+            print(f"  - {violacao}")
+        sys.exit(1)
+    print("\nTodos os orçamentos de consultas foram respeitados.")
+
+
+if __name__ == "__main__":
+    check_query_budgets()
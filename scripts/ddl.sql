@@ -137,6 +137,59 @@ END;
 $$ LANGUAGE plpgsql IMMUTABLE;
 
 
+-- =================================================================
+-- SLOTS DOS PLANOS (CAPÍTULOS PRÉ-EXPANDIDOS)
+-- =================================================================
+-- Cada capítulo programado de um plano vira uma linha, numerada em ordem
+-- cronológica (ordem). A string 'capitulos' é expandida uma única vez, quando as
+-- entradas do plano mudam, e as funções, views e o app leem esta tabela.
+
+CREATE TABLE IF NOT EXISTS public.tb_plano_slots (
+    plano_id BIGINT NOT NULL REFERENCES public.tb_planos(id) ON DELETE CASCADE,
+    ordem INTEGER NOT NULL,
+    data_leitura DATE NOT NULL,
+    id_livro BIGINT NOT NULL REFERENCES public.tb_livros(id),
+    capitulo INTEGER NOT NULL,
+    entrada_id BIGINT NOT NULL REFERENCES public.tb_plano_entradas(id) ON DELETE CASCADE,
+    PRIMARY KEY (plano_id, ordem)
+);
+
+CREATE INDEX IF NOT EXISTS idx_plano_slots_livro ON public.tb_plano_slots (plano_id, id_livro, capitulo);
+CREATE INDEX IF NOT EXISTS idx_plano_slots_data ON public.tb_plano_slots (plano_id, data_leitura);
+CREATE INDEX IF NOT EXISTS idx_plano_slots_entrada ON public.tb_plano_slots (entrada_id);
+
+COMMENT ON TABLE public.tb_plano_slots IS 'Capítulos programados de cada plano, já expandidos e numerados em ordem cronológica. Mantida por trigger em tb_plano_entradas.';
+
+ALTER TABLE public.tb_plano_slots ENABLE ROW LEVEL SECURITY;
+
+CREATE POLICY "Permitir leitura para usuários autenticados"
+ON public.tb_plano_slots FOR SELECT TO authenticated USING (true);
+
+CREATE OR REPLACE FUNCTION public.refresh_plano_slots(p_plano_id BIGINT)
+RETURNS VOID
+LANGUAGE plpgsql
+SECURITY DEFINER
+AS $$
+BEGIN
+    DELETE FROM public.tb_plano_slots WHERE plano_id = p_plano_id;
+
+    INSERT INTO public.tb_plano_slots (plano_id, ordem, data_leitura, id_livro, capitulo, entrada_id)
+    SELECT
+        pe.plano_id,
+        (ROW_NUMBER() OVER (ORDER BY pe.data_leitura, pe.id, caps.posicao) - 1)::integer,
+        pe.data_leitura,
+        pe.id_livro,
+        caps.num,
+        pe.id
+    FROM public.tb_plano_entradas pe,
+         LATERAL public.expand_capitulos(pe.capitulos) WITH ORDINALITY AS caps(num, posicao)
+    WHERE pe.plano_id = p_plano_id;
+END;
+$$;
+
+SELECT public.refresh_plano_slots(id) FROM public.tb_planos;
+
+
 
 CREATE OR REPLACE FUNCTION public.handle_book_completion_check(
     p_usuario_id BIGINT,
@@ -163,11 +216,10 @@ BEGIN
     END IF;
 
     -- 2. Calcula o total de capítulos necessários para este livro no plano.
-    SELECT count(DISTINCT caps.num)
+    SELECT count(DISTINCT ps.capitulo)
     INTO target_chapters_count
-    FROM public.tb_plano_entradas pe,
-         LATERAL expand_capitulos(pe.capitulos) AS caps(num)
-    WHERE pe.plano_id = p_plano_id AND pe.id_livro = p_livro_id;
+    FROM public.tb_plano_slots ps
+    WHERE ps.plano_id = p_plano_id AND ps.id_livro = p_livro_id;
 
     IF target_chapters_count = 0 THEN
         RETURN FALSE; -- Nenhum capítulo definido para este livro no plano.
@@ -192,20 +244,102 @@ $$;
 
 
 
+CREATE OR REPLACE FUNCTION public.handle_books_completion_check(
+    p_usuario_id BIGINT,
+    p_plano_id BIGINT,
+    p_livro_ids BIGINT[]
+)
+RETURNS BIGINT[] -- IDs dos livros recém-concluídos
+LANGUAGE plpgsql
+SECURITY DEFINER
+AS $$
+DECLARE
+    v_livro_id BIGINT;
+    newly_completed BIGINT[] := ARRAY[]::BIGINT[];
+BEGIN
+    -- Executa a verificação de conclusão uma única vez por livro afetado,
+    -- permitindo que uma leitura em lote (ex: um dia inteiro) use apenas uma RPC.
+    FOR v_livro_id IN SELECT DISTINCT unnest(p_livro_ids) LOOP
+        IF public.handle_book_completion_check(p_usuario_id, p_plano_id, v_livro_id) THEN
+            newly_completed := array_append(newly_completed, v_livro_id);
+        END IF;
+    END LOOP;
+
+    RETURN newly_completed;
+END;
+$$;
+
+COMMENT ON FUNCTION public.handle_books_completion_check(BIGINT, BIGINT, BIGINT[]) IS 'Verifica a conclusão de vários livros de um plano em uma única chamada e retorna os IDs dos livros recém-concluídos.';
+
+
+
+-- Conclusões de livros que já deveriam existir em tb_livros_concluidos, calculadas em
+-- um único comando: mesma regra de handle_book_completion_check, aplicada a todas as
+-- combinações (usuário, plano, livro) de uma vez.
+CREATE OR REPLACE VIEW public.vw_livros_concluidos_pendentes AS
+WITH
+  alvo AS (
+    SELECT ps.plano_id, ps.id_livro, count(DISTINCT ps.capitulo) AS capitulos_alvo
+    FROM public.tb_plano_slots ps
+    GROUP BY ps.plano_id, ps.id_livro
+  ),
+  lidos AS (
+    SELECT l.usuario_id, l.plano_id, l.id_livro, count(DISTINCT l.capitulo) AS capitulos_lidos
+    FROM public.tb_leituras l
+    GROUP BY l.usuario_id, l.plano_id, l.id_livro
+  )
+SELECT lidos.usuario_id, lidos.plano_id, lidos.id_livro
+FROM lidos
+JOIN alvo ON alvo.plano_id = lidos.plano_id AND alvo.id_livro = lidos.id_livro
+WHERE alvo.capitulos_alvo > 0
+  AND lidos.capitulos_lidos >= alvo.capitulos_alvo
+  AND NOT EXISTS (
+    SELECT 1
+    FROM public.tb_livros_concluidos c
+    WHERE c.usuario_id = lidos.usuario_id AND c.plano_id = lidos.plano_id AND c.id_livro = lidos.id_livro
+  );
+
+
+
+CREATE OR REPLACE FUNCTION public.backfill_livros_concluidos(p_dry_run BOOLEAN DEFAULT FALSE)
+RETURNS INTEGER -- Número de conclusões inseridas (ou que seriam inseridas, em p_dry_run)
+LANGUAGE plpgsql
+SECURITY DEFINER
+AS $$
+DECLARE
+    total INTEGER;
+BEGIN
+    IF p_dry_run THEN
+        SELECT count(*) INTO total FROM public.vw_livros_concluidos_pendentes;
+        RETURN total;
+    END IF;
+
+    INSERT INTO public.tb_livros_concluidos (usuario_id, plano_id, id_livro)
+    SELECT usuario_id, plano_id, id_livro
+    FROM public.vw_livros_concluidos_pendentes
+    ON CONFLICT ON CONSTRAINT tb_livros_concluidos_unique_entry DO NOTHING;
+
+    GET DIAGNOSTICS total = ROW_COUNT;
+    RETURN total;
+END;
+$$;
+
+COMMENT ON FUNCTION public.backfill_livros_concluidos(BOOLEAN) IS 'Preenche tb_livros_concluidos em um único comando a partir de vw_livros_concluidos_pendentes. Idempotente.';
+
+
+
 CREATE OR REPLACE FUNCTION count_unique_readings_for_user(p_usuario_id integer)
 RETURNS integer AS $$
 DECLARE
     total_count integer;
 BEGIN
-    SELECT count(*)
+    -- Lido da projeção mantida por trigger (tb_estatisticas_usuarios), sem varrer tb_leituras.
+    SELECT capitulos_unicos
     INTO total_count
-    FROM (
-        SELECT DISTINCT id_livro, capitulo
-        FROM tb_leituras
-        WHERE usuario_id = p_usuario_id
-    ) as unique_readings;
+    FROM public.tb_estatisticas_usuarios
+    WHERE usuario_id = p_usuario_id;
 
-    RETURN total_count;
+    RETURN COALESCE(total_count, 0);
 END;
 $$ LANGUAGE plpgsql;
 
@@ -241,46 +375,709 @@ FROM (VALUES
 ) AS v(nome, ordem, chapters, image_path)
 WHERE tb_livros.nome = v.nome;
 
-CREATE OR REPLACE VIEW public.vw_dashboard_progresso AS
-WITH
-  plan_totals AS (
-    SELECT
-      p.id AS plano_id,
-      p.nome AS plano_nome,
-      SUM((SELECT count(*) FROM public.expand_capitulos(pe.capitulos)))::integer AS total_do_plano
-    FROM public.tb_planos p
-    JOIN public.tb_plano_entradas pe ON p.id = pe.plano_id
-    GROUP BY p.id
-  ),
-  plan_targets_today AS (
-    SELECT
-      pe.plano_id,
-      SUM((SELECT count(*) FROM public.expand_capitulos(pe.capitulos)))::integer AS meta_hoje
-    FROM public.tb_plano_entradas pe
-    WHERE pe.data_leitura <= (NOW() AT TIME ZONE 'America/Sao_Paulo')
-    GROUP BY pe.plano_id
-  ),
-  user_readings AS (
+-- =================================================================
+-- PROGRESSO MATERIALIZADO DO DASHBOARD
+-- =================================================================
+-- Em vez de reexpandir os capítulos de todos os planos e contar todas as leituras a
+-- cada consulta, o dashboard lê duas tabelas mantidas por triggers:
+--   * tb_plano_metas_diarias: meta acumulada de capítulos por plano e por dia;
+--   * tb_progresso_usuarios: capítulos lidos por usuário em cada plano.
+-- O custo da consulta depende do número de pares (usuário, plano), não do histórico.
+
+CREATE TABLE IF NOT EXISTS public.tb_plano_metas_diarias (
+    plano_id BIGINT NOT NULL REFERENCES public.tb_planos(id) ON DELETE CASCADE,
+    data_leitura DATE NOT NULL,
+    capitulos_dia INTEGER NOT NULL,
+    meta_acumulada INTEGER NOT NULL,
+    PRIMARY KEY (plano_id, data_leitura)
+);
+
+COMMENT ON TABLE public.tb_plano_metas_diarias IS 'Capítulos programados por dia e meta acumulada até cada dia, por plano. Mantida por trigger em tb_plano_entradas.';
+
+CREATE TABLE IF NOT EXISTS public.tb_progresso_usuarios (
+    usuario_id BIGINT NOT NULL REFERENCES public.tb_usuarios(id) ON DELETE CASCADE,
+    plano_id BIGINT NOT NULL REFERENCES public.tb_planos(id) ON DELETE CASCADE,
+    lidos INTEGER NOT NULL DEFAULT 0,
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    PRIMARY KEY (usuario_id, plano_id)
+);
+
+COMMENT ON TABLE public.tb_progresso_usuarios IS 'Capítulos lidos por usuário em cada plano. Mantida por triggers em tb_leituras.';
+
+ALTER TABLE public.tb_plano_metas_diarias ENABLE ROW LEVEL SECURITY;
+ALTER TABLE public.tb_progresso_usuarios ENABLE ROW LEVEL SECURITY;
+
+CREATE POLICY "Permitir leitura para usuários autenticados"
+ON public.tb_plano_metas_diarias FOR SELECT TO authenticated USING (true);
+
+CREATE POLICY "Permitir leitura para usuários autenticados"
+ON public.tb_progresso_usuarios FOR SELECT TO authenticated USING (true);
+
+
+-- Recalcula as metas diárias de um plano a partir dos slots já expandidos.
+CREATE OR REPLACE FUNCTION public.refresh_plano_metas(p_plano_id BIGINT)
+RETURNS VOID
+LANGUAGE plpgsql
+SECURITY DEFINER
+AS $$
+BEGIN
+    DELETE FROM public.tb_plano_metas_diarias WHERE plano_id = p_plano_id;
+
+    INSERT INTO public.tb_plano_metas_diarias (plano_id, data_leitura, capitulos_dia, meta_acumulada)
     SELECT
-      l.usuario_id,
-      l.plano_id,
-      count(*)::integer AS lidos
-    FROM public.tb_leituras l
-    GROUP BY l.usuario_id, l.plano_id
-  )
+        ps.plano_id,
+        ps.data_leitura,
+        count(*)::integer,
+        -- O último slot de cada dia tem a ordem (base 0) do total acumulado menos um.
+        (max(ps.ordem) + 1)::integer
+    FROM public.tb_plano_slots ps
+    WHERE ps.plano_id = p_plano_id
+    GROUP BY ps.plano_id, ps.data_leitura;
+END;
+$$;
+
+CREATE OR REPLACE FUNCTION public.trg_plano_entradas_metas()
+RETURNS TRIGGER
+LANGUAGE plpgsql
+SECURITY DEFINER
+AS $$
+DECLARE
+    v_plano_id BIGINT;
+BEGIN
+    -- Trigger por comando: reexpande os slots e recalcula as metas uma única vez
+    -- por plano afetado.
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        FOR v_plano_id IN SELECT DISTINCT plano_id FROM antigas_entradas LOOP
+            PERFORM public.refresh_plano_slots(v_plano_id);
+            PERFORM public.refresh_plano_metas(v_plano_id);
+        END LOOP;
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        FOR v_plano_id IN SELECT DISTINCT plano_id FROM novas_entradas LOOP
+            PERFORM public.refresh_plano_slots(v_plano_id);
+            PERFORM public.refresh_plano_metas(v_plano_id);
+        END LOOP;
+    END IF;
+    RETURN NULL;
+END;
+$$;
+
+DROP TRIGGER IF EXISTS plano_entradas_metas_insert ON public.tb_plano_entradas;
+CREATE TRIGGER plano_entradas_metas_insert
+AFTER INSERT ON public.tb_plano_entradas
+REFERENCING NEW TABLE AS novas_entradas
+FOR EACH STATEMENT EXECUTE FUNCTION public.trg_plano_entradas_metas();
+
+DROP TRIGGER IF EXISTS plano_entradas_metas_update ON public.tb_plano_entradas;
+CREATE TRIGGER plano_entradas_metas_update
+AFTER UPDATE ON public.tb_plano_entradas
+REFERENCING OLD TABLE AS antigas_entradas NEW TABLE AS novas_entradas
+FOR EACH STATEMENT EXECUTE FUNCTION public.trg_plano_entradas_metas();
+
+DROP TRIGGER IF EXISTS plano_entradas_metas_delete ON public.tb_plano_entradas;
+CREATE TRIGGER plano_entradas_metas_delete
+AFTER DELETE ON public.tb_plano_entradas
+REFERENCING OLD TABLE AS antigas_entradas
+FOR EACH STATEMENT EXECUTE FUNCTION public.trg_plano_entradas_metas();
+
+
+-- Aplica a tb_progresso_usuarios a variação de leituras de um comando.
+CREATE OR REPLACE FUNCTION public.trg_leituras_progresso()
+RETURNS TRIGGER
+LANGUAGE plpgsql
+SECURITY DEFINER
+AS $$
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        UPDATE public.tb_progresso_usuarios pu
+        SET lidos = pu.lidos - removidas.total, updated_at = NOW()
+        FROM (
+            SELECT usuario_id, plano_id, count(*)::integer AS total
+            FROM antigas_leituras
+            GROUP BY usuario_id, plano_id
+        ) AS removidas
+        WHERE pu.usuario_id = removidas.usuario_id AND pu.plano_id = removidas.plano_id;
+    END IF;
+
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        INSERT INTO public.tb_progresso_usuarios (usuario_id, plano_id, lidos)
+        SELECT usuario_id, plano_id, count(*)::integer
+        FROM novas_leituras
+        GROUP BY usuario_id, plano_id
+        ON CONFLICT (usuario_id, plano_id)
+        DO UPDATE SET lidos = tb_progresso_usuarios.lidos + EXCLUDED.lidos, updated_at = NOW();
+    END IF;
+
+    RETURN NULL;
+END;
+$$;
+
+DROP TRIGGER IF EXISTS leituras_progresso_insert ON public.tb_leituras;
+CREATE TRIGGER leituras_progresso_insert
+AFTER INSERT ON public.tb_leituras
+REFERENCING NEW TABLE AS novas_leituras
+FOR EACH STATEMENT EXECUTE FUNCTION public.trg_leituras_progresso();
+
+DROP TRIGGER IF EXISTS leituras_progresso_update ON public.tb_leituras;
+CREATE TRIGGER leituras_progresso_update
+AFTER UPDATE ON public.tb_leituras
+REFERENCING OLD TABLE AS antigas_leituras NEW TABLE AS novas_leituras
+FOR EACH STATEMENT EXECUTE FUNCTION public.trg_leituras_progresso();
+
+DROP TRIGGER IF EXISTS leituras_progresso_delete ON public.tb_leituras;
+CREATE TRIGGER leituras_progresso_delete
+AFTER DELETE ON public.tb_leituras
+REFERENCING OLD TABLE AS antigas_leituras
+FOR EACH STATEMENT EXECUTE FUNCTION public.trg_leituras_progresso();
+
+
+-- Carga inicial das tabelas materializadas a partir dos dados existentes.
+SELECT public.refresh_plano_metas(id) FROM public.tb_planos;
+
+INSERT INTO public.tb_progresso_usuarios (usuario_id, plano_id, lidos)
+SELECT usuario_id, plano_id, count(*)::integer
+FROM public.tb_leituras
+GROUP BY usuario_id, plano_id
+ON CONFLICT (usuario_id, plano_id) DO UPDATE SET lidos = EXCLUDED.lidos, updated_at = NOW();
+
+
+CREATE OR REPLACE VIEW public.vw_dashboard_progresso AS
 SELECT
   u.nome AS "Usuario",
-  pt.plano_nome AS "Plano",
-  COALESCE(ur.lidos, 0) AS "Lidos",
-  COALESCE(ptt.meta_hoje, 0) AS "Meta_Hoje",
-  pt.total_do_plano AS "Total_Plano",
+  p.nome AS "Plano",
+  pu.lidos AS "Lidos",
+  COALESCE(hoje.meta_acumulada, 0) AS "Meta_Hoje",
+  total.meta_acumulada AS "Total_Plano",
   CASE
-    WHEN COALESCE(ur.lidos, 0) >= COALESCE(ptt.meta_hoje, 0) THEN 'Em dia'::text
+    WHEN pu.lidos >= COALESCE(hoje.meta_acumulada, 0) THEN 'Em dia'::text
     ELSE 'Atrasado'::text
   END AS "Status"
-FROM user_readings ur
-JOIN public.tb_usuarios u ON ur.usuario_id = u.id
-JOIN plan_totals pt ON ur.plano_id = pt.plano_id
-LEFT JOIN plan_targets_today ptt ON ur.plano_id = ptt.plano_id;
+FROM public.tb_progresso_usuarios pu
+JOIN public.tb_usuarios u ON u.id = pu.usuario_id
+JOIN public.tb_planos p ON p.id = pu.plano_id
+-- Meta total e meta até hoje: uma busca pela chave primária de tb_plano_metas_diarias cada.
+JOIN LATERAL (
+  SELECT m.meta_acumulada
+  FROM public.tb_plano_metas_diarias m
+  WHERE m.plano_id = pu.plano_id
+  ORDER BY m.data_leitura DESC
+  LIMIT 1
+) AS total ON TRUE
+LEFT JOIN LATERAL (
+  SELECT m.meta_acumulada
+  FROM public.tb_plano_metas_diarias m
+  WHERE m.plano_id = pu.plano_id
+    AND m.data_leitura <= (NOW() AT TIME ZONE 'America/Sao_Paulo')::date
+  ORDER BY m.data_leitura DESC
+  LIMIT 1
+) AS hoje ON TRUE
+WHERE pu.lidos > 0;
+
+COMMENT ON VIEW public.vw_dashboard_progresso IS 'Visão consolidada para o dashboard de progresso: capítulos lidos, metas e status para cada usuário em cada plano, lidos de tb_progresso_usuarios e tb_plano_metas_diarias.';
+
+
+-- =================================================================
+-- ESTATÍSTICAS DE LEITURA POR USUÁRIO (PROJEÇÃO MANTIDA NA ESCRITA)
+-- =================================================================
+-- As páginas de Perfil e Awards leem uma linha de tb_estatisticas_usuarios (e os
+-- poucos meses de tb_leituras_mensais_usuarios) em vez de varrer o histórico.
+-- Triggers em tb_leituras mantêm as tabelas auxiliares por dia e por capítulo, e a
+-- linha de estatísticas é recalculada a partir delas (não de tb_leituras).
+
+CREATE TABLE IF NOT EXISTS public.tb_estatisticas_usuarios (
+    usuario_id BIGINT PRIMARY KEY REFERENCES public.tb_usuarios(id) ON DELETE CASCADE,
+    capitulos_unicos INTEGER NOT NULL DEFAULT 0,
+    capitulos_canonicos INTEGER NOT NULL DEFAULT 0,
+    cobertura NUMERIC(6, 5) NOT NULL DEFAULT 0,
+    ultima_data DATE,
+    sequencia_atual INTEGER NOT NULL DEFAULT 0,
+    maior_sequencia INTEGER NOT NULL DEFAULT 0,
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
+COMMENT ON TABLE public.tb_estatisticas_usuarios IS 'Capítulos únicos, cobertura da Bíblia, última data e sequências de leitura (até a data da última escrita) por usuário.';
+
+CREATE TABLE IF NOT EXISTS public.tb_leituras_mensais_usuarios (
+    usuario_id BIGINT NOT NULL REFERENCES public.tb_estatisticas_usuarios(usuario_id) ON DELETE CASCADE,
+    mes DATE NOT NULL,
+    capitulos INTEGER NOT NULL,
+    PRIMARY KEY (usuario_id, mes)
+);
+
+CREATE TABLE IF NOT EXISTS public.tb_leituras_dias_usuarios (
+    usuario_id BIGINT NOT NULL REFERENCES public.tb_usuarios(id) ON DELETE CASCADE,
+    data_leitura DATE NOT NULL,
+    capitulos INTEGER NOT NULL,
+    PRIMARY KEY (usuario_id, data_leitura)
+);
+
+CREATE TABLE IF NOT EXISTS public.tb_capitulos_lidos_usuarios (
+    usuario_id BIGINT NOT NULL REFERENCES public.tb_usuarios(id) ON DELETE CASCADE,
+    id_livro BIGINT NOT NULL REFERENCES public.tb_livros(id),
+    capitulo INTEGER NOT NULL,
+    leituras INTEGER NOT NULL,
+    PRIMARY KEY (usuario_id, id_livro, capitulo)
+);
+
+ALTER TABLE public.tb_estatisticas_usuarios ENABLE ROW LEVEL SECURITY;
+ALTER TABLE public.tb_leituras_mensais_usuarios ENABLE ROW LEVEL SECURITY;
+ALTER TABLE public.tb_leituras_dias_usuarios ENABLE ROW LEVEL SECURITY;
+ALTER TABLE public.tb_capitulos_lidos_usuarios ENABLE ROW LEVEL SECURITY;
+
+CREATE POLICY "Permitir leitura para usuários autenticados"
+ON public.tb_estatisticas_usuarios FOR SELECT TO authenticated USING (true);
+
+CREATE POLICY "Permitir leitura para usuários autenticados"
+ON public.tb_leituras_mensais_usuarios FOR SELECT TO authenticated USING (true);
+
+
+-- Recalcula a linha de estatísticas e os meses de um usuário a partir das tabelas
+-- auxiliares (no máximo ~1.200 capítulos e um dia por data de leitura).
+CREATE OR REPLACE FUNCTION public.refresh_estatisticas_usuario(p_usuario_id BIGINT)
+RETURNS VOID
+LANGUAGE plpgsql
+SECURITY DEFINER
+AS $$
+DECLARE
+    v_hoje DATE := (NOW() AT TIME ZONE 'America/Sao_Paulo')::date;
+BEGIN
+    INSERT INTO public.tb_estatisticas_usuarios AS e (
+        usuario_id, capitulos_unicos, capitulos_canonicos, cobertura,
+        ultima_data, sequencia_atual, maior_sequencia, updated_at
+    )
+    SELECT
+        p_usuario_id,
+        capitulos.unicos,
+        capitulos.canonicos,
+        COALESCE(capitulos.canonicos::numeric / NULLIF(biblia.total, 0), 0),
+        sequencias.ultima_data,
+        COALESCE(sequencias.atual, 0),
+        COALESCE(sequencias.maior, 0),
+        NOW()
+    FROM (
+        SELECT
+            count(*)::integer AS unicos,
+            count(*) FILTER (WHERE c.capitulo BETWEEN 1 AND l.chapters)::integer AS canonicos
+        FROM public.tb_capitulos_lidos_usuarios c
+        JOIN public.tb_livros l ON l.id = c.id_livro
+        WHERE c.usuario_id = p_usuario_id
+    ) AS capitulos,
+    (SELECT sum(chapters) AS total FROM public.tb_livros) AS biblia,
+    (
+        -- Ilhas de dias consecutivos: data - posição é constante dentro de uma sequência.
+        -- Datas futuras do plano (leituras adiantadas) não entram nas sequências: o
+        -- app as soma quando chegam, a partir de tb_leituras_dias_usuarios (ver
+        -- EstatisticasLeitura.sequencia_em em src/models.py).
+        SELECT
+            max(fim) AS ultima_data,
+            (array_agg(tamanho ORDER BY fim DESC))[1]::integer AS atual,
+            max(tamanho)::integer AS maior
+        FROM (
+            SELECT max(data_leitura) AS fim, count(*) AS tamanho
+            FROM (
+                SELECT
+                    data_leitura,
+                    data_leitura - (ROW_NUMBER() OVER (ORDER BY data_leitura))::integer AS grupo
+                FROM public.tb_leituras_dias_usuarios
+                WHERE usuario_id = p_usuario_id AND data_leitura <= v_hoje
+            ) AS dias
+            GROUP BY grupo
+        ) AS ilhas
+    ) AS sequencias
+    ON CONFLICT (usuario_id) DO UPDATE SET
+        capitulos_unicos = EXCLUDED.capitulos_unicos,
+        capitulos_canonicos = EXCLUDED.capitulos_canonicos,
+        cobertura = EXCLUDED.cobertura,
+        ultima_data = EXCLUDED.ultima_data,
+        sequencia_atual = EXCLUDED.sequencia_atual,
+        maior_sequencia = EXCLUDED.maior_sequencia,
+        updated_at = EXCLUDED.updated_at;
+
+    DELETE FROM public.tb_leituras_mensais_usuarios WHERE usuario_id = p_usuario_id;
+
+    INSERT INTO public.tb_leituras_mensais_usuarios (usuario_id, mes, capitulos)
+    SELECT p_usuario_id, date_trunc('month', data_leitura)::date, sum(capitulos)::integer
+    FROM public.tb_leituras_dias_usuarios
+    WHERE usuario_id = p_usuario_id
+    GROUP BY date_trunc('month', data_leitura);
+END;
+$$;
+
+CREATE OR REPLACE FUNCTION public.trg_leituras_estatisticas()
+RETURNS TRIGGER
+LANGUAGE plpgsql
+SECURITY DEFINER
+AS $$
+DECLARE
+    v_usuario_id BIGINT;
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        UPDATE public.tb_leituras_dias_usuarios d
+        SET capitulos = d.capitulos - x.total
+        FROM (
+            SELECT usuario_id, data_leitura_plano, count(*)::integer AS total
+            FROM antigas_leituras
+            WHERE data_leitura_plano IS NOT NULL
+            GROUP BY usuario_id, data_leitura_plano
+        ) AS x
+        WHERE d.usuario_id = x.usuario_id AND d.data_leitura = x.data_leitura_plano;
+
+        UPDATE public.tb_capitulos_lidos_usuarios c
+        SET leituras = c.leituras - x.total
+        FROM (
+            SELECT usuario_id, id_livro, capitulo, count(*)::integer AS total
+            FROM antigas_leituras
+            GROUP BY usuario_id, id_livro, capitulo
+        ) AS x
+        WHERE c.usuario_id = x.usuario_id AND c.id_livro = x.id_livro AND c.capitulo = x.capitulo;
+
+        DELETE FROM public.tb_leituras_dias_usuarios WHERE capitulos <= 0;
+        DELETE FROM public.tb_capitulos_lidos_usuarios WHERE leituras <= 0;
+    END IF;
+
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        INSERT INTO public.tb_leituras_dias_usuarios AS d (usuario_id, data_leitura, capitulos)
+        SELECT usuario_id, data_leitura_plano, count(*)::integer
+        FROM novas_leituras
+        WHERE data_leitura_plano IS NOT NULL
+        GROUP BY usuario_id, data_leitura_plano
+        ON CONFLICT (usuario_id, data_leitura) DO UPDATE SET capitulos = d.capitulos + EXCLUDED.capitulos;
+
+        INSERT INTO public.tb_capitulos_lidos_usuarios AS c (usuario_id, id_livro, capitulo, leituras)
+        SELECT usuario_id, id_livro, capitulo, count(*)::integer
+        FROM novas_leituras
+        GROUP BY usuario_id, id_livro, capitulo
+        ON CONFLICT (usuario_id, id_livro, capitulo) DO UPDATE SET leituras = c.leituras + EXCLUDED.leituras;
+    END IF;
+
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        FOR v_usuario_id IN SELECT DISTINCT usuario_id FROM antigas_leituras LOOP
+            PERFORM public.refresh_estatisticas_usuario(v_usuario_id);
+        END LOOP;
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        FOR v_usuario_id IN SELECT DISTINCT usuario_id FROM novas_leituras LOOP
+            PERFORM public.refresh_estatisticas_usuario(v_usuario_id);
+        END LOOP;
+    END IF;
+
+    RETURN NULL;
+END;
+$$;
+
+DROP TRIGGER IF EXISTS leituras_estatisticas_insert ON public.tb_leituras;
+CREATE TRIGGER leituras_estatisticas_insert
+AFTER INSERT ON public.tb_leituras
+REFERENCING NEW TABLE AS novas_leituras
+FOR EACH STATEMENT EXECUTE FUNCTION public.trg_leituras_estatisticas();
+
+DROP TRIGGER IF EXISTS leituras_estatisticas_update ON public.tb_leituras;
+CREATE TRIGGER leituras_estatisticas_update
+AFTER UPDATE ON public.tb_leituras
+REFERENCING OLD TABLE AS antigas_leituras NEW TABLE AS novas_leituras
+FOR EACH STATEMENT EXECUTE FUNCTION public.trg_leituras_estatisticas();
+
+DROP TRIGGER IF EXISTS leituras_estatisticas_delete ON public.tb_leituras;
+CREATE TRIGGER leituras_estatisticas_delete
+AFTER DELETE ON public.tb_leituras
+REFERENCING OLD TABLE AS antigas_leituras
+FOR EACH STATEMENT EXECUTE FUNCTION public.trg_leituras_estatisticas();
+
+
+-- Carga inicial a partir do histórico existente.
+INSERT INTO public.tb_leituras_dias_usuarios (usuario_id, data_leitura, capitulos)
+SELECT usuario_id, data_leitura_plano, count(*)::integer
+FROM public.tb_leituras
+WHERE data_leitura_plano IS NOT NULL
+GROUP BY usuario_id, data_leitura_plano
+ON CONFLICT (usuario_id, data_leitura) DO UPDATE SET capitulos = EXCLUDED.capitulos;
+
+INSERT INTO public.tb_capitulos_lidos_usuarios (usuario_id, id_livro, capitulo, leituras)
+SELECT usuario_id, id_livro, capitulo, count(*)::integer
+FROM public.tb_leituras
+GROUP BY usuario_id, id_livro, capitulo
+ON CONFLICT (usuario_id, id_livro, capitulo) DO UPDATE SET leituras = EXCLUDED.leituras;
+
+SELECT public.refresh_estatisticas_usuario(u.id)
+FROM public.tb_usuarios u
+WHERE EXISTS (SELECT 1 FROM public.tb_leituras l WHERE l.usuario_id = u.id);
+
+
+-- =================================================================
+-- MURAL DE DÚVIDAS: CONTAGEM DE RESPOSTAS E PAGINAÇÃO
+-- =================================================================
+-- O mural carrega páginas de perguntas (sem as respostas) na ordem "sem resposta
+-- primeiro, mais recentes primeiro"; as respostas são buscadas ao abrir a pergunta.
+-- A contagem é mantida por trigger para que a ordenação use apenas o índice.
+
+ALTER TABLE public.tb_perguntas ADD COLUMN IF NOT EXISTS total_respostas INTEGER NOT NULL DEFAULT 0;
+ALTER TABLE public.tb_perguntas
+    ADD COLUMN IF NOT EXISTS respondida BOOLEAN GENERATED ALWAYS AS (total_respostas > 0) STORED;
+
+CREATE INDEX IF NOT EXISTS idx_perguntas_mural ON public.tb_perguntas (respondida, id DESC);
+CREATE INDEX IF NOT EXISTS idx_respostas_pergunta ON public.tb_respostas (pergunta_id, id);
+
+CREATE OR REPLACE FUNCTION public.trg_respostas_total()
+RETURNS TRIGGER
+LANGUAGE plpgsql
+SECURITY DEFINER
+AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        UPDATE public.tb_perguntas SET total_respostas = total_respostas + 1 WHERE id = NEW.pergunta_id;
+    ELSIF TG_OP = 'DELETE' THEN
+        UPDATE public.tb_perguntas SET total_respostas = total_respostas - 1 WHERE id = OLD.pergunta_id;
+    END IF;
+    RETURN NULL;
+END;
+$$;
+
+DROP TRIGGER IF EXISTS respostas_total ON public.tb_respostas;
+CREATE TRIGGER respostas_total
+AFTER INSERT OR DELETE ON public.tb_respostas
+FOR EACH ROW EXECUTE FUNCTION public.trg_respostas_total();
+
+-- Carga inicial a partir das respostas existentes.
+UPDATE public.tb_perguntas p
+SET total_respostas = (SELECT count(*) FROM public.tb_respostas r WHERE r.pergunta_id = p.id);
+
+
+-- =================================================================
+-- BUSCA TEXTUAL NO MURAL DE DÚVIDAS
+-- =================================================================
+-- Cada pergunta tem um documento de busca com o texto da pergunta (peso A) e das
+-- respostas (peso B), indexado por GIN. A configuração 'portugues_sem_acento' usa o
+-- stemmer do português após remover os acentos ('oração' casa com 'oracoes').
+
+CREATE EXTENSION IF NOT EXISTS unaccent;
+
+DO $$
+BEGIN
+    IF NOT EXISTS (SELECT 1 FROM pg_ts_config WHERE cfgname = 'portugues_sem_acento') THEN
+        CREATE TEXT SEARCH CONFIGURATION public.portugues_sem_acento (COPY = pg_catalog.portuguese);
+        ALTER TEXT SEARCH CONFIGURATION public.portugues_sem_acento
+            ALTER MAPPING FOR hword, hword_part, word WITH unaccent, portuguese_stem;
+    END IF;
+END;
+$$;
+
+ALTER TABLE public.tb_perguntas ADD COLUMN IF NOT EXISTS busca TSVECTOR;
+CREATE INDEX IF NOT EXISTS idx_perguntas_busca ON public.tb_perguntas USING GIN (busca);
+
+CREATE OR REPLACE FUNCTION public.documento_busca_pergunta(p_pergunta_id INTEGER, p_texto TEXT)
+RETURNS TSVECTOR
+LANGUAGE sql
+STABLE
+AS $$
+    SELECT
+        setweight(to_tsvector('public.portugues_sem_acento', COALESCE(p_texto, '')), 'A')
+        || setweight(
+            to_tsvector(
+                'public.portugues_sem_acento',
+                COALESCE((SELECT string_agg(resposta_texto, ' ') FROM public.tb_respostas WHERE pergunta_id = p_pergunta_id), '')
+            ),
+            'B'
+        );
+$$;
+
+CREATE OR REPLACE FUNCTION public.trg_perguntas_busca()
+RETURNS TRIGGER
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    NEW.busca := public.documento_busca_pergunta(NEW.id, NEW.pergunta_texto);
+    RETURN NEW;
+END;
+$$;
+
+DROP TRIGGER IF EXISTS perguntas_busca ON public.tb_perguntas;
+CREATE TRIGGER perguntas_busca
+BEFORE INSERT OR UPDATE OF pergunta_texto ON public.tb_perguntas
+FOR EACH ROW EXECUTE FUNCTION public.trg_perguntas_busca();
+
+CREATE OR REPLACE FUNCTION public.trg_respostas_busca()
+RETURNS TRIGGER
+LANGUAGE plpgsql
+SECURITY DEFINER
+AS $$
+DECLARE
+    v_pergunta_id INTEGER := CASE WHEN TG_OP = 'DELETE' THEN OLD.pergunta_id ELSE NEW.pergunta_id END;
+BEGIN
+    UPDATE public.tb_perguntas
+    SET busca = public.documento_busca_pergunta(id, pergunta_texto)
+    WHERE id = v_pergunta_id;
+    RETURN NULL;
+END;
+$$;
+
+DROP TRIGGER IF EXISTS respostas_busca ON public.tb_respostas;
+CREATE TRIGGER respostas_busca
+AFTER INSERT OR UPDATE OF resposta_texto OR DELETE ON public.tb_respostas
+FOR EACH ROW EXECUTE FUNCTION public.trg_respostas_busca();
+
+-- Busca paginada e ordenada por relevância (empate: perguntas mais recentes primeiro).
+-- 'websearch_to_tsquery' aceita o texto digitado pelo usuário como está.
+CREATE OR REPLACE FUNCTION public.buscar_duvidas(p_termo TEXT, p_limite INTEGER DEFAULT 20, p_offset INTEGER DEFAULT 0)
+RETURNS TABLE (
+    id INTEGER,
+    pergunta_texto TEXT,
+    created_at TIMESTAMPTZ,
+    total_respostas INTEGER,
+    relevancia REAL
+)
+LANGUAGE sql
+STABLE
+AS $$
+    SELECT p.id, p.pergunta_texto, p.created_at, p.total_respostas, ts_rank_cd(p.busca, q) AS relevancia
+    FROM public.tb_perguntas p,
+        websearch_to_tsquery('public.portugues_sem_acento', p_termo) AS q
+    WHERE p.busca @@ q
+    ORDER BY relevancia DESC, p.id DESC
+    LIMIT p_limite
+    OFFSET p_offset;
+$$;
+
+-- Carga inicial dos documentos de busca.
+UPDATE public.tb_perguntas SET busca = public.documento_busca_pergunta(id, pergunta_texto);
+
+
+-- =================================================================
+-- RANKING DE CONCLUSÕES (GALERIA DA COMUNIDADE)
+-- =================================================================
+-- Número de livros distintos concluídos por usuário (um livro concluído em dois planos
+-- conta uma vez), mantido em tb_estatisticas_usuarios. A página de Awards lê o ranking
+-- em páginas pelo índice e busca os selos de um membro apenas quando ele é escolhido.
+
+ALTER TABLE public.tb_estatisticas_usuarios ADD COLUMN IF NOT EXISTS livros_concluidos INTEGER NOT NULL DEFAULT 0;
+
+CREATE INDEX IF NOT EXISTS idx_estatisticas_ranking
+ON public.tb_estatisticas_usuarios (livros_concluidos DESC, usuario_id)
+WHERE livros_concluidos > 0;
+
+CREATE OR REPLACE FUNCTION public.trg_livros_concluidos_ranking()
+RETURNS TRIGGER
+LANGUAGE plpgsql
+SECURITY DEFINER
+AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        INSERT INTO public.tb_estatisticas_usuarios AS e (usuario_id, livros_concluidos)
+        SELECT u.usuario_id, (
+            SELECT count(DISTINCT c.id_livro)::integer
+            FROM public.tb_livros_concluidos c
+            WHERE c.usuario_id = u.usuario_id
+        )
+        FROM (SELECT DISTINCT usuario_id FROM novas_conclusoes) AS u
+        ON CONFLICT (usuario_id) DO UPDATE SET livros_concluidos = EXCLUDED.livros_concluidos;
+    ELSE
+        UPDATE public.tb_estatisticas_usuarios e
+        SET livros_concluidos = (
+            SELECT count(DISTINCT c.id_livro)::integer
+            FROM public.tb_livros_concluidos c
+            WHERE c.usuario_id = e.usuario_id
+        )
+        WHERE e.usuario_id IN (SELECT usuario_id FROM antigas_conclusoes);
+    END IF;
+    RETURN NULL;
+END;
+$$;
+
+DROP TRIGGER IF EXISTS livros_concluidos_ranking_insert ON public.tb_livros_concluidos;
+CREATE TRIGGER livros_concluidos_ranking_insert
+AFTER INSERT ON public.tb_livros_concluidos
+REFERENCING NEW TABLE AS novas_conclusoes
+FOR EACH STATEMENT EXECUTE FUNCTION public.trg_livros_concluidos_ranking();
+
+DROP TRIGGER IF EXISTS livros_concluidos_ranking_delete ON public.tb_livros_concluidos;
+CREATE TRIGGER livros_concluidos_ranking_delete
+AFTER DELETE ON public.tb_livros_concluidos
+REFERENCING OLD TABLE AS antigas_conclusoes
+FOR EACH STATEMENT EXECUTE FUNCTION public.trg_livros_concluidos_ranking();
+
+-- Carga inicial a partir das conclusões existentes.
+INSERT INTO public.tb_estatisticas_usuarios AS e (usuario_id, livros_concluidos)
+SELECT usuario_id, count(DISTINCT id_livro)::integer
+FROM public.tb_livros_concluidos
+GROUP BY usuario_id
+ON CONFLICT (usuario_id) DO UPDATE SET livros_concluidos = EXCLUDED.livros_concluidos;
+
+
+-- =================================================================
+-- RITMO DE LEITURA (CALENDÁRIO DO PERFIL)
+-- =================================================================
+-- O gráfico mensal do perfil lê tb_leituras_mensais_usuarios, e o calendário lê os
+-- capítulos por dia de tb_leituras_dias_usuarios (no máximo uma linha por dia do
+-- período, pela chave primária), ambas agregadas na escrita pelos triggers de
+-- estatísticas, em vez de transferir cada data de leitura.
+
+CREATE POLICY "Permitir leitura para usuários autenticados"
+ON public.tb_leituras_dias_usuarios FOR SELECT TO authenticated USING (true);
+
+
+-- =================================================================
+-- VERSÕES DOS DADOS (VALIDAÇÃO DOS CACHES DO APP)
+-- =================================================================
+-- Um contador de alterações por tabela, incrementado uma vez por comando. O app lê
+-- esta tabela (uma linha por tabela) a cada poucos segundos e só recarrega os dados
+-- em cache (planos, conclusões, dashboard e mural) quando a versão de uma das suas
+-- tabelas de origem muda. Comandos que não alteram linhas também incrementam a
+-- versão: no pior caso, o app recarrega um dado sem necessidade.
+--
+-- Cada tabela tem uma única linha de contador, e o incremento a trava até o fim da
+-- transação: todos os comandos que escrevem na tabela passam a se enfileirar nessa
+-- linha. Por isso só são versionadas tabelas com escritas raras (planos, membros,
+-- conclusões e mural). tb_leituras, escrita a cada capítulo marcado por qualquer
+-- membro, fica de fora: os caches por usuário são invalidados pelo app ao salvar
+-- (save_readings), e o dashboard, que depende das leituras de todos, é invalidado
+-- pelo processo que salva e expira por tempo nos demais (DASHBOARD_READINGS_TTL em
+-- src/repository.py). Se uma tabela muito escrita precisar de versão, use um
+-- contador particionado (várias linhas por tabela, somadas na leitura).
+
+CREATE TABLE IF NOT EXISTS public.tb_versoes_dados (
+    tabela TEXT PRIMARY KEY,
+    versao BIGINT NOT NULL DEFAULT 0,
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
+COMMENT ON TABLE public.tb_versoes_dados IS 'Contador de alterações por tabela, usado pelo app para validar os caches. Mantida por triggers.';
+
+ALTER TABLE public.tb_versoes_dados ENABLE ROW LEVEL SECURITY;
+
+CREATE POLICY "Permitir leitura para usuários autenticados"
+ON public.tb_versoes_dados FOR SELECT TO authenticated USING (true);
+
+CREATE OR REPLACE FUNCTION public.trg_versao_dados()
+RETURNS TRIGGER
+LANGUAGE plpgsql
+SECURITY DEFINER
+AS $$
+BEGIN
+    INSERT INTO public.tb_versoes_dados AS v (tabela, versao)
+    VALUES (TG_TABLE_NAME, 1)
+    ON CONFLICT (tabela) DO UPDATE SET versao = v.versao + 1, updated_at = NOW();
+    RETURN NULL;
+END;
+$$;
+
+DO $$
+DECLARE
+    t TEXT;
+BEGIN
+    FOREACH t IN ARRAY ARRAY[
+        'tb_usuarios', 'tb_planos', 'tb_plano_entradas',
+        'tb_livros_concluidos', 'tb_perguntas', 'tb_respostas'
+    ] LOOP
+        EXECUTE format('DROP TRIGGER IF EXISTS versao_dados ON public.%I', t);
+        EXECUTE format(
+            'CREATE TRIGGER versao_dados AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON public.%I '
+            'FOR EACH STATEMENT EXECUTE FUNCTION public.trg_versao_dados()',
+            t
+        );
+        INSERT INTO public.tb_versoes_dados (tabela) VALUES (t) ON CONFLICT (tabela) DO NOTHING;
+    END LOOP;
+END;
+$$;
 
-COMMENT ON VIEW public.vw_dashboard_progresso IS 'Visão consolidada para o dashboard de progresso, calculando capítulos lidos, metas e status para cada usuário em cada plano.';
+-- Bancos criados quando tb_leituras era versionada.
+DROP TRIGGER IF EXISTS versao_dados ON public.tb_leituras;
+DELETE FROM public.tb_versoes_dados WHERE tabela = 'tb_leituras';
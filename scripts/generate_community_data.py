@@ -0,0 +1,351 @@
+import argparse
+import os
+import random
+import sys
+import time
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from typing import Any, Optional
+
+# Adiciona o diretório raiz ao path para encontrar o módulo 'src'
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from backfill_completions import conectar
+
+from src.books import Book
+from src.config import FUSO_BR, DatabaseClient
+from src.repository import DatabaseRepository
+
+# Tamanhos com --escala 1; usuários e perguntas crescem com a escala.
+USUARIOS_POR_ESCALA = 50
+PERGUNTAS_POR_ESCALA = 20
+
+# Modelos de plano: nome, ordens dos livros (no catálogo) e duração em dias.
+MODELOS_PLANO: tuple[tuple[str, range, int], ...] = (
+    ("Bíblia em 1 ano", range(1, 67), 365),
+    ("Novo Testamento em 6 meses", range(40, 67), 182),
+    ("Bíblia em 2 anos", range(1, 67), 730),
+    ("Evangelhos em 90 dias", range(40, 44), 90),
+    ("Antigo Testamento em 1 ano", range(1, 40), 365),
+    ("Salmos e Provérbios", range(19, 21), 60),
+)
+
+
+@dataclass(frozen=True)
+class Perfil:
+    """Comportamento de leitura de um grupo de membros."""
+
+    nome: str
+    peso: float
+    chance_dia: float  # Chance de ler as leituras de um dia programado.
+    atraso_medio: float  # Dias, em média, entre a data programada e a leitura.
+    chance_abandono: float  # Chance de parar de ler em algum ponto do plano.
+
+
+PERFIS = (
+    Perfil("assíduo", 0.3, 0.95, 0.3, 0.05),
+    Perfil("regular", 0.5, 0.75, 2.0, 0.15),
+    Perfil("esporádico", 0.2, 0.4, 6.0, 0.4),
+)
+
+MODELOS_PERGUNTA = (
+    "Qual o contexto histórico de {livro} {capitulo}?",
+    "Alguém pode explicar {livro} {capitulo}?",
+    "Como aplicar {livro} {capitulo} no dia a dia?",
+    "Por que as traduções de {livro} {capitulo} são tão diferentes?",
+    "Quem escreveu o livro de {livro}?",
+)
+
+MODELOS_RESPOSTA = (
+    "Vale ler os capítulos anteriores de {livro} para entender o contexto.",
+    "Uma boa Bíblia de estudo tem notas sobre {livro} {capitulo}.",
+    "Conversamos sobre {livro} no último encontro; posso compartilhar as anotações.",
+    "Recomendo comparar {livro} {capitulo} em duas ou três traduções.",
+)
+
+
+class Destino:
+    """Grava as linhas no banco em lotes ou, no dry-run, apenas as conta e numera."""
+
+    def __init__(self, client: DatabaseClient, lote: int, dry_run: bool):
+        self.client = client
+        self.lote = lote
+        self.dry_run = dry_run
+        self.contagens: dict[str, int] = defaultdict(int)
+        self._pendentes: dict[str, list[dict[str, Any]]] = defaultdict(list)
+
+    def inserir(self, tabela: str, linhas: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        """Insere as linhas (em lotes) e as retorna com o 'id' gerado."""
+        inseridas = []
+        for i in range(0, len(linhas), self.lote):
+            parte = linhas[i : i + self.lote]
+            if self.dry_run:
+                inicio = self.contagens[tabela] + 1
+                inseridas += [{**linha, "id": inicio + j} for j, linha in enumerate(parte)]
+            else:
+                inseridas += self.client.table(tabela).insert(parte).execute().data or []
+            self.contagens[tabela] += len(parte)
+        return inseridas
+
+    def adicionar(self, tabela: str, linha: dict[str, Any]) -> None:
+        """Acumula uma linha e grava o lote quando ele fica completo."""
+        pendentes = self._pendentes[tabela]
+        pendentes.append(linha)
+        if len(pendentes) >= self.lote:
+            self.descarregar(tabela)
+
+    def descarregar(self, tabela: Optional[str] = None) -> None:
+        """Grava as linhas acumuladas de uma tabela (ou de todas)."""
+        for nome in [tabela] if tabela else list(self._pendentes):
+            pendentes = self._pendentes.pop(nome, [])
+            if pendentes:
+                self.inserir(nome, pendentes)
+
+
+def distribuir_capitulos(livros: list[Book], dias: int) -> list[list[tuple[int, str]]]:
+    """Distribui os capítulos dos livros, em ordem, pelos dias do plano.
+
+    Returns:
+        Para cada dia, as entradas (ID do livro, capítulos como '1-3' ou '5').
+    """
+    capitulos = [(livro.id, c) for livro in livros for c in range(1, livro.chapters + 1)]
+    por_dia = []
+    for dia in range(dias):
+        inicio, fim = len(capitulos) * dia // dias, len(capitulos) * (dia + 1) // dias
+        entradas: list[tuple[int, int, int]] = []
+        for livro_id, capitulo in capitulos[inicio:fim]:
+            if entradas and entradas[-1][0] == livro_id:
+                entradas[-1] = (livro_id, entradas[-1][1], capitulo)
+            else:
+                entradas.append((livro_id, capitulo, capitulo))
+        por_dia.append([(livro, f"{a}-{b}" if b > a else str(a)) for livro, a, b in entradas])
+    return por_dia
+
+
+def momento(rng: random.Random, dia: date) -> str:
+    """Um horário aleatório (entre 6h e 23h, horário de Brasília) no dia, em ISO 8601."""
+    hora = datetime.combine(dia, datetime.min.time()) + timedelta(
+        seconds=rng.randint(6 * 3600, 23 * 3600)
+    )
+    return FUSO_BR.localize(hora).isoformat()
+
+
+def gerar_planos(
+    destino: Destino, livros: list[Book], quantidade: int, anos: int, hoje: date, rng: random.Random
+) -> list[tuple[int, date, list[list[tuple[int, str]]]]]:
+    """Cria os planos e as suas entradas.
+
+    Os planos começam em datas espalhadas pelos últimos `anos` anos: alguns já
+    terminaram, outros estão em andamento.
+
+    Returns:
+        Para cada plano, o ID, a data de início e as entradas de cada dia.
+    """
+    por_ordem = {livro.order: livro for livro in livros}
+    definicoes = []
+    for i in range(quantidade):
+        nome, ordens, dias = MODELOS_PLANO[i % len(MODELOS_PLANO)]
+        selecionados = [por_ordem[o] for o in ordens if o in por_ordem and por_ordem[o].chapters]
+        inicio = hoje - timedelta(days=rng.randint(0, max(0, anos * 365 - 30)))
+        definicoes.append(
+            (f"{nome} · Turma {i // len(MODELOS_PLANO) + 1:02d}", inicio, dias, selecionados)
+        )
+
+    inseridos = destino.inserir("tb_planos", [{"nome": nome} for nome, _, _, _ in definicoes])
+    planos = []
+    for plano, (_, inicio, dias, selecionados) in zip(inseridos, definicoes):
+        por_dia = distribuir_capitulos(selecionados, dias)
+        destino.inserir(
+            "tb_plano_entradas",
+            [
+                {
+                    "plano_id": plano["id"],
+                    "data_leitura": str(inicio + timedelta(days=dia)),
+                    "id_livro": livro_id,
+                    "capitulos": capitulos,
+                }
+                for dia, entradas in enumerate(por_dia)
+                for livro_id, capitulos in entradas
+            ],
+        )
+        planos.append((plano["id"], inicio, por_dia))
+    return planos
+
+
+def gerar_leituras(
+    destino: Destino,
+    usuario_id: int,
+    plano: tuple[int, date, list[list[tuple[int, str]]]],
+    perfil: Perfil,
+    hoje: date,
+    rng: random.Random,
+) -> None:
+    """Gera o histórico de um membro em um plano, com atrasos, lacunas e abandono."""
+    plano_id, inicio, por_dia = plano
+    entrada = rng.randint(0, min(30, len(por_dia) - 1))
+    parada = (
+        rng.randint(entrada, len(por_dia)) if rng.random() < perfil.chance_abandono else len(por_dia)
+    )
+    for dia in range(entrada, parada):
+        programado = inicio + timedelta(days=dia)
+        if programado > hoje:
+            break
+        if rng.random() > perfil.chance_dia:
+            continue
+        lido_em = programado + timedelta(days=int(rng.expovariate(1 / perfil.atraso_medio)))
+        if lido_em > hoje:
+            continue
+        for livro_id, capitulos in por_dia[dia]:
+            inicio_cap, _, fim_cap = capitulos.partition("-")
+            for capitulo in range(int(inicio_cap), int(fim_cap or inicio_cap) + 1):
+                destino.adicionar(
+                    "tb_leituras",
+                    {
+                        "usuario_id": usuario_id,
+                        "plano_id": plano_id,
+                        "id_livro": livro_id,
+                        "capitulo": capitulo,
+                        "data_leitura_plano": str(programado),
+                        "created_at": momento(rng, lido_em),
+                    },
+                )
+
+
+def gerar_mural(
+    destino: Destino,
+    usuarios: list[int],
+    livros: list[Book],
+    quantidade: int,
+    anos: int,
+    hoje: date,
+    rng: random.Random,
+) -> None:
+    """Cria as perguntas do mural e de zero a quatro respostas para cada uma."""
+    perguntas = []
+    for _ in range(quantidade):
+        livro = rng.choice(livros)
+        perguntas.append(
+            (
+                livro,
+                rng.randint(1, max(1, livro.chapters)),
+                hoje - timedelta(days=rng.randint(0, anos * 365)),
+            )
+        )
+    perguntas.sort(key=lambda p: p[2])
+    inseridas = destino.inserir(
+        "tb_perguntas",
+        [
+            {
+                "pergunta_texto": rng.choice(MODELOS_PERGUNTA).format(
+                    livro=livro.name, capitulo=capitulo
+                ),
+                "created_at": momento(rng, dia),
+            }
+            for livro, capitulo, dia in perguntas
+        ],
+    )
+    respostas = []
+    for pergunta, (livro, capitulo, dia) in zip(inseridas, perguntas):
+        for _ in range(rng.choices(range(5), weights=(3, 4, 2, 1, 1))[0]):
+            dia = min(hoje, dia + timedelta(days=rng.randint(0, 3)))
+            respostas.append(
+                {
+                    "pergunta_id": pergunta["id"],
+                    "usuario_id": rng.choice(usuarios),
+                    "resposta_texto": rng.choice(MODELOS_RESPOSTA).format(
+                        livro=livro.name, capitulo=capitulo
+                    ),
+                    "created_at": momento(rng, dia),
+                }
+            )
+    destino.inserir("tb_respostas", respostas)
+
+
+def generate_community_data():
+    """
+    Gera uma comunidade sintética e determinística para testes de carga e de escala.
+
+    Com a mesma semente e a mesma data de referência, os dados gerados são sempre os
+    mesmos: membros com perfis de leitura diferentes (assíduos, regulares e
+    esporádicos), planos montados a partir dos capítulos de 'tb_livros', históricos de
+    leitura com atrasos, lacunas e abandonos, as conclusões de livros correspondentes
+    e um mural de dúvidas com respostas. As linhas são gravadas em lotes no banco
+    configurado (Supabase ou o backend local, como em backfill_completions.py).
+
+    Exemplo (5.000 membros, 20 planos, 3 anos de histórico, no banco local):
+        BIBLE_TRACKER_BACKEND=local BIBLE_TRACKER_LOCAL_DB=data/carga.sqlite3 \\
+            python scripts/generate_community_data.py --escala 100 --planos 20 --anos 3
+    """
+    parser = argparse.ArgumentParser(description="Gera uma comunidade sintética para testes de carga.")
+    parser.add_argument(
+        "--escala",
+        type=float,
+        default=1.0,
+        help=f"Fator de escala: {USUARIOS_POR_ESCALA} membros e {PERGUNTAS_POR_ESCALA} perguntas por unidade.",
+    )
+    parser.add_argument("--planos", type=int, default=3, help="Número de planos.")
+    parser.add_argument("--anos", type=int, default=1, help="Anos de histórico.")
+    parser.add_argument(
+        "--max-planos-por-membro", type=int, default=2, help="Planos seguidos por membro."
+    )
+    parser.add_argument("--semente", type=int, default=42, help="Semente do gerador aleatório.")
+    parser.add_argument(
+        "--hoje", type=date.fromisoformat, help="Data de referência (AAAA-MM-DD). Padrão: a data atual."
+    )
+    parser.add_argument("--lote", type=int, default=1000, help="Linhas por inserção.")
+    parser.add_argument("--dry-run", action="store_true", help="Apenas informa o que seria gravado.")
+    args = parser.parse_args()
+
+    client = conectar()
+    if client is None:
+        return
+    repo = DatabaseRepository(client)
+    rng = random.Random(args.semente)
+    hoje = args.hoje or datetime.now(FUSO_BR).date()
+    total_usuarios = max(1, round(USUARIOS_POR_ESCALA * args.escala))
+    destino = Destino(client, max(1, args.lote), args.dry_run)
+
+    livros = list(repo.get_book_catalog())
+    nomes = [f"Membro Sintético {i:05d}" for i in range(1, total_usuarios + 1)]
+    existente = client.table("tb_usuarios").select("id").eq("nome", nomes[0]).execute().data
+    if existente and not args.dry_run:
+        print(f"O banco já tem '{nomes[0]}': os dados sintéticos já foram gerados. Nada a fazer.")
+        return
+
+    inicio = time.monotonic()
+    try:
+        print(f"Gerando {args.planos} planos a partir de {len(livros)} livros...")
+        planos = gerar_planos(destino, livros, args.planos, args.anos, hoje, rng)
+
+        print(f"Gerando {total_usuarios} membros e os seus históricos de leitura...")
+        usuarios = [u["id"] for u in destino.inserir("tb_usuarios", [{"nome": nome} for nome in nomes])]
+        for n, usuario_id in enumerate(usuarios, start=1):
+            perfil = rng.choices(PERFIS, weights=[p.peso for p in PERFIS])[0]
+            quantidade = rng.randint(1, min(args.max_planos_por_membro, len(planos)))
+            for plano in rng.sample(planos, quantidade):
+                gerar_leituras(destino, usuario_id, plano, perfil, hoje, rng)
+            if n % 500 == 0:
+                print(f"  {n}/{total_usuarios} membros · {destino.contagens['tb_leituras']} leituras")
+        destino.descarregar()
+
+        perguntas = max(1, round(PERGUNTAS_POR_ESCALA * args.escala))
+        print(f"Gerando {perguntas} perguntas no mural...")
+        gerar_mural(destino, usuarios, livros, perguntas, args.anos, hoje, rng)
+
+        if not args.dry_run:
+            print("Calculando as conclusões de livros...")
+            response = client.rpc("backfill_livros_concluidos", {"p_dry_run": False}).execute()
+            destino.contagens["tb_livros_concluidos"] += response.data or 0
+    except Exception as e:
+        print(f"\nOcorreu um erro durante a geração dos dados: {e}")
+        return
+
+    prefixo = "[dry-run] " if args.dry_run else ""
+    print(f"\n{prefixo}Dados gerados em {time.monotonic() - inicio:.1f}s:")
+    for tabela, total in destino.contagens.items():
+        print(f"  {tabela}: {total}")
+
+
+if __name__ == "__main__":
+    generate_community_data()
@@ -0,0 +1,367 @@
+import argparse
+import json
+import logging
+import math
+import multiprocessing
+import os
+import random
+import statistics
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Any
+
+# Adiciona o diretório raiz ao path para encontrar o módulo 'src'
+RAIZ = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.append(RAIZ)
+
+from benchmark import commit_atual
+
+from src.config import BACKEND_LOCAL, create_database_client
+
+APP = os.path.join(RAIZ, "app.py")
+
+# Peso de cada ação de uma sessão depois do login.
+ACOES = {"capitulo": 4, "plano": 1, "pagina": 3}
+
+# Páginas visitadas pela ação 'pagina' e o seu peso (o dashboard é a mais aberta).
+PAGINAS = {"Progresso Geral": 3, "Meu Perfil": 1, "Awards": 1, "Dúvidas da Comunidade": 1}
+
+
+def permitir_sessoes_simultaneas() -> None:
+    """Adapta o AppTest para executar várias sessões ao mesmo tempo no processo.
+
+    O AppTest supõe uma execução por vez: a cada `run`, ele instala um Runtime simulado
+    (removido ao final) e ativa a opção `global.appTest` com um patch. Com as sessões
+    em threads, o fim de uma execução removeria o Runtime e desfaria o patch no meio
+    das outras. Aqui a opção fica ativa no processo inteiro, e o último Runtime
+    instalado continua valendo entre as execuções.
+    """
+    from contextlib import nullcontext
+
+    from streamlit import config
+    from streamlit.runtime import Runtime
+    from streamlit.testing.v1 import app_test
+
+    config.set_option("global.appTest", True)
+    setattr(app_test, "patch_config_options", lambda opcoes: nullcontext())
+
+    ultimo: list[Any] = [None]
+
+    def instance(cls: type[Runtime]) -> Runtime:
+        if cls._instance is not None:
+            ultimo[0] = cls._instance
+        if ultimo[0] is None:
+            raise RuntimeError("Runtime hasn't been created!")
+        return ultimo[0]
+
+    def exists(cls: type[Runtime]) -> bool:
+        return cls._instance is not None or ultimo[0] is not None
+
+    setattr(Runtime, "instance", classmethod(instance))
+    setattr(Runtime, "exists", classmethod(exists))
+
+
+def preparar_processo(sessoes_simultaneas: bool) -> None:
+    """Inicializa um processo de trabalho.
+
+    Uma primeira execução da página de login carrega os módulos e a conexão com o
+    banco fora das medições; os caches de dados continuam vazios, como em uma réplica
+    recém-iniciada.
+
+    Args:
+        sessoes_simultaneas: Se o processo executará várias sessões ao mesmo tempo.
+    """
+    from streamlit.testing.v1 import AppTest
+
+    if sessoes_simultaneas:
+        permitir_sessoes_simultaneas()
+
+    # O contador de consultas é lido fora do rerun, o que o Streamlit avisa a cada leitura
+    # (um filtro, e não o nível, porque o Streamlit reconfigura o nível dos seus loggers).
+    logging.getLogger("streamlit.runtime.scriptrunner_utils.script_run_context").addFilter(
+        lambda registro: "missing ScriptRunContext" not in registro.getMessage()
+    )
+    principal = sys.modules["__main__"]
+    try:
+        AppTest.from_file(APP, default_timeout=60).run()
+    finally:
+        sys.modules["__main__"] = principal
+
+
+def sortear(rng: random.Random, pesos: dict[str, int]) -> str:
+    return rng.choices(list(pesos), weights=list(pesos.values()))[0]
+
+
+def percentil(valores: list[float], p: float) -> float:
+    """Percentil pelo método do posto mais próximo (os valores não precisam estar ordenados)."""
+    ordenados = sorted(valores)
+    return ordenados[max(0, math.ceil(p / 100 * len(ordenados)) - 1)]
+
+
+def executar_sessao(
+    indice: int,
+    nome: str,
+    acoes: int,
+    pausa: float,
+    semente: int,
+    timeout: float,
+    contar_consultas: bool,
+):
+    """Simula a sessão de um membro: login seguido de `acoes` interações.
+
+    Cada interação é um rerun do `main()` pelo AppTest, medido do clique ao fim da
+    renderização (incluindo os reruns disparados por `st.rerun`). O número de consultas
+    é a diferença do contador do cliente local, que é do processo: só é exato (e só é
+    registrado, com `contar_consultas`) quando o processo executa uma sessão por vez.
+
+    Returns:
+        Um registro por rerun, com a ação, a página renderizada, o tempo em ms, as
+        consultas ao banco (None se não contadas) e as exceções exibidas.
+    """
+    from streamlit.testing.v1 import AppTest
+
+    from src.config import get_database_client
+
+    rng = random.Random(semente + indice)
+    at = AppTest.from_file(APP, default_timeout=timeout)
+    registros: list[dict[str, Any]] = []
+
+    def rerun(acao: str) -> None:
+        client = get_database_client()
+        consultas = client.query_count
+        inicio = time.perf_counter()
+        at.run()
+        ms = (time.perf_counter() - inicio) * 1000
+        logado = "logged_in_user" in at.session_state
+        registros.append(
+            {
+                "sessao": indice,
+                "acao": acao,
+                "pagina": at.session_state["page_selection"] if logado else "Login",
+                "ms": ms,
+                "consultas": client.query_count - consultas if contar_consultas else None,
+                "erros": len(at.exception),
+            }
+        )
+        if pausa:
+            time.sleep(pausa)
+
+    try:
+        rerun("abrir")
+        at.selectbox[0].set_value(nome)
+        rerun("selecionar_usuario")
+        at.button[0].click()
+        rerun("entrar")
+
+        for _ in range(acoes):
+            acao = sortear(rng, ACOES)
+            if acao != "pagina" and at.session_state["page_selection"] != "Minha Leitura":
+                at.sidebar.radio[0].set_value("Minha Leitura")
+                rerun("pagina")
+            if acao == "capitulo":
+                pendentes = [b for b in at.button if b.label.isdigit() and not b.disabled]
+                if pendentes:
+                    rng.choice(pendentes).click()
+                    rerun(acao)
+                    continue
+                # Dia já lido: troca de plano, o que leva à próxima data pendente.
+                acao = "plano"
+            if acao == "plano":
+                seletor = next(s for s in at.selectbox if s.label == "📅 Escolha o Plano")
+                outros = [p for p in seletor.options if p != seletor.value]
+                if outros:
+                    seletor.set_value(rng.choice(outros))
+                    rerun(acao)
+            else:
+                at.sidebar.radio[0].set_value(sortear(rng, PAGINAS))
+                rerun(acao)
+    except Exception as e:
+        # Sessão em estado desconhecido (timeout, widget ausente): registra e encerra.
+        registros.append(
+            {"sessao": indice, "acao": "falha", "pagina": "-", "ms": 0.0, "consultas": None, "erros": 1}
+        )
+        print(f"Sessão {indice} ({nome}) interrompida: {e}")
+    return registros
+
+
+def executar_lote(
+    sessoes: list[tuple[int, str]], acoes: int, pausa: float, semente: int, timeout: float
+) -> list[dict[str, Any]]:
+    """Executa um lote de sessões ao mesmo tempo, uma por thread, no processo de trabalho.
+
+    Como no servidor do Streamlit, as sessões do processo disputam o GIL, os locks dos
+    caches e a conexão com o banco: essa contenção aparece nos percentis p95/p99.
+
+    Returns:
+        Os registros de todas as sessões do lote.
+    """
+    # O AppTest registra o app.py como '__main__'; o original é restaurado ao final
+    # do lote para que o processo consiga receber os próximos lotes do pool.
+    principal = sys.modules["__main__"]
+    try:
+        with ThreadPoolExecutor(max_workers=len(sessoes)) as threads:
+            execucoes = [
+                threads.submit(
+                    executar_sessao, indice, nome, acoes, pausa, semente, timeout, len(sessoes) == 1
+                )
+                for indice, nome in sessoes
+            ]
+            return [registro for execucao in execucoes for registro in execucao.result()]
+    finally:
+        sys.modules["__main__"] = principal
+
+
+def resumir(registros: list[dict[str, Any]]) -> dict[str, dict[str, Any]]:
+    """Agrupa os reruns por página: quantidade, percentis de latência, consultas e erros."""
+    por_pagina: dict[str, list[dict[str, Any]]] = {}
+    for r in registros:
+        if r["acao"] != "falha":
+            por_pagina.setdefault(r["pagina"], []).append(r)
+    por_pagina["(todas)"] = [r for grupo in por_pagina.values() for r in grupo]
+    contadas = all(r["consultas"] is not None for r in por_pagina["(todas)"])
+
+    resumo = {}
+    for pagina, grupo in por_pagina.items():
+        if not grupo:
+            continue
+        tempos = [r["ms"] for r in grupo]
+        consultas = [r["consultas"] for r in grupo]
+        resumo[pagina] = {
+            "reruns": len(grupo),
+            "p50_ms": percentil(tempos, 50),
+            "p95_ms": percentil(tempos, 95),
+            "p99_ms": percentil(tempos, 99),
+            "max_ms": max(tempos),
+            "consultas_media": statistics.fmean(consultas) if contadas else None,
+            "consultas_p95": percentil(consultas, 95) if contadas else None,
+            "consultas_max": max(consultas) if contadas else None,
+            "erros": sum(r["erros"] for r in grupo),
+        }
+    return resumo
+
+
+def run_load_test():
+    """
+    Teste de carga da aplicação com várias sessões simultâneas, sem navegador.
+
+    Cada sessão usa o AppTest do Streamlit para executar o `app.py` contra o backend
+    local: entra com um membro, troca de plano, marca capítulos e navega pelo
+    dashboard e pelas demais páginas. As sessões rodam em paralelo em --workers
+    processos, cada um com os próprios caches, como réplicas do app; dentro de um
+    processo, as sessões seguintes encontram os caches aquecidas pelas anteriores.
+    Com --sessoes-por-processo, cada processo executa várias sessões ao mesmo tempo
+    em threads, como o servidor do Streamlit, e a concorrência total passa a ser
+    --workers x --sessoes-por-processo. Ao final, informa por página os percentis
+    p50/p95/p99 do tempo de rerun e as consultas ao banco por rerun (só com uma
+    sessão por processo, em que a contagem é exata), e grava o relatório em JSON.
+
+    O teste grava leituras: use um banco dedicado, por exemplo um gerado por
+    scripts/generate_community_data.py.
+    """
+    parser = argparse.ArgumentParser(description="Teste de carga com sessões simultâneas (AppTest).")
+    parser.add_argument("--banco", required=True, help="Arquivo SQLite do backend local.")
+    parser.add_argument("--sessoes", type=int, default=20, help="Número de sessões simuladas.")
+    parser.add_argument(
+        "--workers", type=int, default=4, help="Processos executando sessões em paralelo."
+    )
+    parser.add_argument(
+        "--sessoes-por-processo",
+        type=int,
+        default=1,
+        help="Sessões simultâneas (threads) em cada processo.",
+    )
+    parser.add_argument("--acoes", type=int, default=20, help="Interações por sessão após o login.")
+    parser.add_argument("--pausa", type=float, default=0.0, help="Pausa entre interações, em segundos.")
+    parser.add_argument("--semente", type=int, default=42, help="Semente das escolhas das sessões.")
+    parser.add_argument(
+        "--timeout", type=float, default=30.0, help="Tempo máximo de um rerun, em segundos."
+    )
+    parser.add_argument("--saida", default="benchmarks/carga.json", help="Arquivo JSON de saída.")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.banco):
+        print(f"Banco '{args.banco}' não encontrado. Gere um com scripts/generate_community_data.py.")
+        sys.exit(1)
+    client = create_database_client(BACKEND_LOCAL, local_path=args.banco)
+    nomes = [u["nome"] for u in client.table("tb_usuarios").select("nome").order("id").execute().data]
+    if not nomes:
+        print(f"O banco '{args.banco}' não tem membros. Gere-os com scripts/generate_community_data.py.")
+        sys.exit(1)
+    random.Random(args.semente).shuffle(nomes)
+
+    # Herdadas pelos processos de trabalho: o app usa o backend local com este banco.
+    os.environ["BIBLE_TRACKER_BACKEND"] = BACKEND_LOCAL
+    os.environ["BIBLE_TRACKER_LOCAL_DB"] = os.path.abspath(args.banco)
+
+    if args.sessoes_por_processo < 1:
+        print("--sessoes-por-processo deve ser pelo menos 1.")
+        sys.exit(1)
+    print(
+        f"Executando {args.sessoes} sessões ({args.acoes} interações cada) em {args.workers} "
+        f"processos ({args.sessoes_por_processo} sessões simultâneas por processo)..."
+    )
+    sessoes = [(i, nomes[i % len(nomes)]) for i in range(args.sessoes)]
+    lotes = [
+        sessoes[i : i + args.sessoes_por_processo]
+        for i in range(0, len(sessoes), args.sessoes_por_processo)
+    ]
+    inicio = time.perf_counter()
+    registros: list[dict[str, Any]] = []
+    with ProcessPoolExecutor(
+        max_workers=args.workers,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=preparar_processo,
+        initargs=(args.sessoes_por_processo > 1,),
+    ) as pool:
+        execucoes = [
+            pool.submit(executar_lote, lote, args.acoes, args.pausa, args.semente, args.timeout)
+            for lote in lotes
+        ]
+        for execucao in execucoes:
+            registros.extend(execucao.result())
+    duracao = time.perf_counter() - inicio
+
+    resumo = resumir(registros)
+    print(
+        f"\n{'Página':<24}{'reruns':>8}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'consultas':>11}{'erros':>7}"
+    )
+    for pagina, r in resumo.items():
+        consultas = (
+            f"{r['consultas_media']:>6.1f} ({r['consultas_max']})"
+            if r["consultas_media"] is not None
+            else f"{'-':>11}"
+        )
+        print(
+            f"{pagina:<24}{r['reruns']:>8}{r['p50_ms']:>10.1f}{r['p95_ms']:>10.1f}{r['p99_ms']:>10.1f}"
+            f"{consultas}{r['erros']:>7}"
+        )
+    total = resumo.get("(todas)", {}).get("reruns", 0)
+    print(f"\n{total} reruns em {duracao:.1f} s ({total / duracao:.1f} reruns/s).")
+
+    relatorio = {
+        "gerado_em": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "commit": commit_atual(),
+        "parametros": {
+            "sessoes": args.sessoes,
+            "workers": args.workers,
+            "sessoes_por_processo": args.sessoes_por_processo,
+            "acoes": args.acoes,
+            "pausa_s": args.pausa,
+            "semente": args.semente,
+            "membros": len(nomes),
+            "duracao_s": round(duracao, 3),
+        },
+        "paginas": resumo,
+        "sessoes_interrompidas": sum(1 for r in registros if r["acao"] == "falha"),
+    }
+    os.makedirs(os.path.dirname(os.path.abspath(args.saida)), exist_ok=True)
+    with open(args.saida, "w", encoding="utf-8") as f:
+        json.dump(relatorio, f, ensure_ascii=False, indent=2)
+        f.write("\n")
+    print(f"Relatório gravado em '{args.saida}'.")
+
+
+if __name__ == "__main__":
+    run_load_test()
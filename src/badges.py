@@ -0,0 +1,115 @@
+import json
+import logging
+import os
+from dataclasses import dataclass
+from functools import lru_cache
+from html import escape
+from types import MappingProxyType
+from typing import Iterable, Mapping, Optional
+
+from src.books import BookCatalog
+
+logger = logging.getLogger(__name__)
+
+# Diretório servido pelo Streamlit em '/app/static' (server.enableStaticServing) e o
+# subdiretório com a folha de sprites dos selos, gerada por scripts/build_badges.py.
+STATIC_DIR = "static"
+SPRITE_DIR = os.path.join(STATIC_DIR, "selos")
+MANIFEST_NAME = "manifest.json"
+_SPRITE_URL = "app/static/selos"
+
+
+@dataclass(frozen=True)
+class BadgeSprite:
+    """Folha de sprites com as miniaturas dos selos de conclusão.
+
+    Todos os selos vêm de um único arquivo, cujo nome inclui o hash do conteúdo: o
+    navegador o baixa uma vez e, nas visitas seguintes, cada selo custa apenas o HTML
+    da sua posição na folha.
+    """
+
+    url: str
+    columns: int
+    rows: int
+    cells: Mapping[str, tuple[int, int]]
+
+    @classmethod
+    def load(cls, directory: str = SPRITE_DIR) -> Optional["BadgeSprite"]:
+        """Lê o manifesto da folha de sprites.
+
+        Args:
+            directory: Diretório com o 'manifest.json' e a folha de sprites.
+
+        Returns:
+            A folha de sprites, ou None se ela não foi gerada ou está incompleta.
+        """
+        try:
+            with open(os.path.join(directory, MANIFEST_NAME), encoding="utf-8") as f:
+                manifest = json.load(f)
+            sprite = manifest["sprite"]
+            if not os.path.exists(os.path.join(directory, sprite)):
+                raise FileNotFoundError(sprite)
+            return cls(
+                url=f"{_SPRITE_URL}/{sprite}",
+                columns=int(manifest["colunas"]),
+                rows=int(manifest["linhas"]),
+                cells=MappingProxyType(
+                    {path: (int(col), int(row)) for path, (col, row) in manifest["selos"].items()}
+                ),
+            )
+        except FileNotFoundError:
+            logger.info("Folha de sprites dos selos não encontrada; usando as imagens originais.")
+        except (KeyError, TypeError, ValueError) as e:
+            logger.warning(f"Manifesto da folha de sprites inválido; usando as imagens originais: {e}")
+        return None
+
+    def grid_html(self, catalog: BookCatalog, book_ids: Iterable[int]) -> str:
+        """Monta a grade de selos como um único bloco HTML.
+
+        Livros sem miniatura na folha aparecem pelo nome, como na grade de imagens.
+
+        Args:
+            catalog: O catálogo de livros (nome e imagem por ID).
+            book_ids: Os IDs dos livros, na ordem de exibição.
+
+        Returns:
+            O HTML da grade (estilizado pela classe 'selos-grid' em `apply_styles`).
+        """
+        seals = []
+        for book_id in book_ids:
+            name = escape(catalog.name_of(book_id))
+            image_path = catalog.image_of(book_id)
+            if image_path is not None and image_path in self.cells:
+                col, row = self.cells[image_path]
+                x = col / (self.columns - 1) * 100 if self.columns > 1 else 0
+                y = row / (self.rows - 1) * 100 if self.rows > 1 else 0
+                seals.append(
+                    f'<div class="selo" title="{name}" role="img" aria-label="{name}" '
+                    f'style="background-position: {x:.3f}% {y:.3f}%"></div>'
+                )
+            else:
+                seals.append(f'<div class="selo selo-texto">{name}</div>')
+        return (
+            f'<div class="selos-grid" style="--selos-sprite: url({self.url}); '
+            f'--selos-tamanho: {self.columns * 100}% {self.rows * 100}%">{"".join(seals)}</div>'
+        )
+
+
+@lru_cache(maxsize=1)
+def load_badge_sprite() -> Optional[BadgeSprite]:
+    """Retorna a folha de sprites dos selos, lida uma única vez por processo."""
+    return BadgeSprite.load()
+
+
+@lru_cache(maxsize=1)
+def available_images(directory: str = "media") -> frozenset[str]:
+    """Caminhos das imagens originais existentes, listados uma única vez por processo.
+
+    Usado quando a folha de sprites não foi gerada, em vez de um `os.path.exists`
+    por selo a cada rerun.
+    """
+    try:
+        return frozenset(os.path.join(directory, name) for name in os.listdir(directory))
+    except OSError as e:
+        logger.warning(f"Não foi possível listar as imagens dos selos em '{directory}': {e}")
+        return frozenset()
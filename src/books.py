@@ -0,0 +1,181 @@
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Any, Iterable, Iterator, Mapping, Optional
+
+# Valores estáticos de 'tb_livros' (nome, ordem, capítulos, imagem), os mesmos do
+# UPDATE em scripts/ddl.sql. No catálogo embutido, o ID de cada livro é a sua ordem.
+BUNDLED_BOOKS: tuple[tuple[str, int, int, str], ...] = (
+    ("Gênesis", 1, 50, "media/28.png"),
+    ("Êxodo", 2, 40, "media/29.png"),
+    ("Levítico", 3, 27, "media/30.png"),
+    ("Números", 4, 36, "media/31.png"),
+    ("Deuteronômio", 5, 34, "media/32.png"),
+    ("Josué", 6, 24, "media/33.png"),
+    ("Juízes", 7, 21, "media/34.png"),
+    ("Rute", 8, 4, "media/35.png"),
+    ("1 Samuel", 9, 31, "media/36.png"),
+    ("2 Samuel", 10, 24, "media/37.png"),
+    ("1 Reis", 11, 22, "media/38.png"),
+    ("2 Reis", 12, 25, "media/39.png"),
+    ("1 Crônicas", 13, 29, "media/40.png"),
+    ("2 Crônicas", 14, 36, "media/41.png"),
+    ("Esdras", 15, 10, "media/42.png"),
+    ("Neemias", 16, 13, "media/43.png"),
+    ("Ester", 17, 10, "media/44.png"),
+    ("Jó", 18, 42, "media/45.png"),
+    ("Salmos", 19, 150, "media/46.png"),
+    ("Provérbios", 20, 31, "media/47.png"),
+    ("Eclesiastes", 21, 12, "media/48.png"),
+    ("Cantares", 22, 8, "media/49.png"),
+    ("Isaías", 23, 66, "media/50.png"),
+    ("Jeremias", 24, 52, "media/51.png"),
+    ("Lamentações", 25, 5, "media/52.png"),
+    ("Ezequiel", 26, 48, "media/53.png"),
+    ("Daniel", 27, 12, "media/54.png"),
+    ("Oseias", 28, 14, "media/55.png"),
+    ("Joel", 29, 3, "media/56.png"),
+    ("Amós", 30, 9, "media/57.png"),
+    ("Obadias", 31, 1, "media/58.png"),
+    ("Jonas", 32, 4, "media/59.png"),
+    ("Miqueias", 33, 7, "media/60.png"),
+    ("Naum", 34, 3, "media/61.png"),
+    ("Habacuque", 35, 3, "media/62.png"),
+    ("Sofonias", 36, 3, "media/63.png"),
+    ("Ageu", 37, 2, "media/64.png"),
+    ("Zacarias", 38, 14, "media/65.png"),
+    ("Malaquias", 39, 4, "media/66.png"),
+    ("Mateus", 40, 28, "media/1.png"),
+    ("Marcos", 41, 16, "media/2.png"),
+    ("Lucas", 42, 24, "media/3.png"),
+    ("João", 43, 21, "media/4.png"),
+    ("Atos", 44, 28, "media/5.png"),
+    ("Romanos", 45, 16, "media/6.png"),
+    ("1 Coríntios", 46, 16, "media/7.png"),
+    ("2 Coríntios", 47, 13, "media/8.png"),
+    ("Gálatas", 48, 6, "media/9.png"),
+    ("Efésios", 49, 6, "media/10.png"),
+    ("Filipenses", 50, 4, "media/11.png"),
+    ("Colossenses", 51, 4, "media/12.png"),
+    ("1 Tessalonicenses", 52, 5, "media/13.png"),
+    ("2 Tessalonicenses", 53, 3, "media/14.png"),
+    ("1 Timóteo", 54, 6, "media/15.png"),
+    ("2 Timóteo", 55, 4, "media/16.png"),
+    ("Tito", 56, 3, "media/17.png"),
+    ("Filemom", 57, 1, "media/18.png"),
+    ("Hebreus", 58, 13, "media/19.png"),
+    ("Tiago", 59, 5, "media/20.png"),
+    ("1 Pedro", 60, 5, "media/21.png"),
+    ("2 Pedro", 61, 3, "media/22.png"),
+    ("1 João", 62, 5, "media/23.png"),
+    ("2 João", 63, 1, "media/24.png"),
+    ("3 João", 64, 1, "media/25.png"),
+    ("Judas", 65, 1, "media/26.png"),
+    ("Apocalipse", 66, 22, "media/27.png"),
+)
+
+# Ordem usada para livros sem 'ordem' cadastrada (ficam no fim das listagens).
+UNKNOWN_ORDER = 999
+
+
+@dataclass(frozen=True)
+class Book:
+    """Um livro da Bíblia, como cadastrado em 'tb_livros'."""
+
+    id: int
+    name: str
+    order: int
+    chapters: int
+    image_path: Optional[str]
+
+
+@dataclass(frozen=True)
+class BookCatalog:
+    """Catálogo imutável dos livros, indexado pelo ID do livro.
+
+    Substitui as consultas separadas a 'tb_livros' (total de capítulos, mapa de ordem e
+    mapa de imagens): tudo vem de uma única leitura da tabela, ou do catálogo embutido
+    (`BookCatalog.bundled`), que não faz nenhuma consulta.
+    """
+
+    books: Mapping[int, Book]
+    ids_by_name: Mapping[str, int]
+
+    def __getstate__(self) -> dict[str, Any]:
+        # MappingProxyType não é copiável em profundidade nem serializável: o estado leva
+        # os dicionários. Ao ler um catálogo gravado em JSON (marcação "obj"), o cache
+        # compartilhado (src/shared_cache.py) entrega os campos a __setstate__, que
+        # protege os dicionários de novo.
+        return {"books": dict(self.books), "ids_by_name": dict(self.ids_by_name)}
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        for name, value in state.items():
+            object.__setattr__(self, name, MappingProxyType(value))
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[dict[str, Any]]) -> "BookCatalog":
+        """Constrói o catálogo a partir das linhas de 'tb_livros'.
+
+        Args:
+            rows: Linhas com as chaves 'id', 'nome', 'ordem', 'chapters' e 'image_path'.
+
+        Returns:
+            O catálogo de livros.
+        """
+        books = {
+            int(row["id"]): Book(
+                id=int(row["id"]),
+                name=str(row["nome"]),
+                order=int(row["ordem"]) if row.get("ordem") is not None else UNKNOWN_ORDER,
+                chapters=int(row.get("chapters") or 0),
+                image_path=row.get("image_path"),
+            )
+            for row in rows
+        }
+        return cls(
+            books=MappingProxyType(books),
+            ids_by_name=MappingProxyType({book.name: book.id for book in books.values()}),
+        )
+
+    @classmethod
+    def bundled(cls) -> "BookCatalog":
+        """Retorna o catálogo embutido no código (IDs iguais à ordem canônica)."""
+        return cls.from_rows(
+            {"id": ordem, "nome": nome, "ordem": ordem, "chapters": chapters, "image_path": image_path}
+            for nome, ordem, chapters, image_path in BUNDLED_BOOKS
+        )
+
+    def __len__(self) -> int:
+        return len(self.books)
+
+    def __iter__(self) -> Iterator[Book]:
+        """Percorre os livros na ordem canônica."""
+        return iter(sorted(self.books.values(), key=lambda book: (book.order, book.id)))
+
+    def get(self, book_id: int) -> Optional[Book]:
+        return self.books.get(book_id)
+
+    def name_of(self, book_id: int) -> str:
+        """Retorna o nome do livro, ou o próprio ID como texto se ele não estiver no catálogo."""
+        book = self.books.get(book_id)
+        return book.name if book else str(book_id)
+
+    def order_of(self, book_id: int) -> int:
+        book = self.books.get(book_id)
+        return book.order if book else UNKNOWN_ORDER
+
+    def image_of(self, book_id: int) -> Optional[str]:
+        book = self.books.get(book_id)
+        return book.image_path if book else None
+
+    def id_of(self, name: str) -> Optional[int]:
+        """Retorna o ID de um livro pelo nome (apenas para entradas externas, fora do caminho quente)."""
+        return self.ids_by_name.get(name)
+
+    def sorted_ids(self, book_ids: Iterable[int]) -> list[int]:
+        """Ordena IDs de livros pela ordem canônica."""
+        return sorted(book_ids, key=lambda book_id: (self.order_of(book_id), book_id))
+
+    @property
+    def total_chapters(self) -> int:
+        """Número total de capítulos de todos os livros do catálogo."""
+        return sum(book.chapters for book in self.books.values())
@@ -0,0 +1,231 @@
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Hashable, Optional, TypeVar
+
+from src.shared_cache import MISSING as _SHARED_MISSING
+from src.shared_cache import SharedCacheStore
+
+T = TypeVar("T")
+
+_MISSING = object()
+
+# Camada compartilhada entre os processos do host (ver `set_shared_store`), usada pelos
+# caches criados com `shared=True`.
+_shared_store: Optional[SharedCacheStore] = None
+
+# Notificado a cada leitura (nome do cache, acerto), ver `set_access_listener`.
+_access_listener: Optional[Callable[[str, bool], None]] = None
+
+
+@dataclass(frozen=True)
+class CacheStats:
+    """Contadores de uso de um cache."""
+
+    name: str
+    hits: int
+    misses: int
+    evictions: int
+    invalidations: int
+    stale: int
+    shared_hits: int
+    size: int
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+class KeyedCache:
+    """Cache em memória por chave, compartilhado entre as sessões do processo.
+
+    Diferente do `st.cache_data`, que só pode ser limpo por inteiro, permite invalidar
+    apenas as chaves afetadas por uma escrita (ex: as leituras de um usuário em um
+    plano). As entradas expiram após `ttl` segundos e, ao atingir `max_entries`, as
+    menos usadas recentemente são descartadas.
+
+    Uma entrada pode ser gravada com a versão dos dados de origem (ex: um contador de
+    alterações da tabela). Uma leitura que informa a versão atual só aproveita a
+    entrada se a versão for a mesma; do contrário, ela é descartada como obsoleta.
+
+    Com `shared=True` e uma camada compartilhada configurada, `get_or_load` consulta o
+    arquivo comum às réplicas antes de carregar o valor, e as gravações e invalidações
+    também são aplicadas a ele.
+    """
+
+    def __init__(
+        self, name: str, ttl: Optional[float] = None, max_entries: int = 1024, shared: bool = False
+    ):
+        """Inicializa o cache.
+
+        Args:
+            name: Nome usado nos contadores e métricas (e na camada compartilhada).
+            ttl: Tempo de vida das entradas em segundos (None para não expirar).
+            max_entries: Número máximo de entradas mantidas.
+            shared: Se o cache usa a camada compartilhada entre processos, quando houver.
+        """
+        self.name = name
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.shared = shared
+        self._entries: OrderedDict[Hashable, tuple[float, Hashable, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._invalidations = 0
+        self._stale = 0
+        self._shared_hits = 0
+
+    def get(self, key: Hashable, default: Any = None, version: Hashable = None) -> Any:
+        """Retorna o valor da chave (contando acerto ou falha), ou `default` se ausente.
+
+        Com `version`, uma entrada gravada com outra versão é descartada como obsoleta.
+        """
+        hit = False
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, entry_version, value = entry
+                if expires_at < time.monotonic():
+                    del self._entries[key]
+                    self._evictions += 1
+                elif version is not None and entry_version != version:
+                    del self._entries[key]
+                    self._stale += 1
+                else:
+                    self._entries.move_to_end(key)
+                    self._hits += 1
+                    hit = True
+            if not hit:
+                self._misses += 1
+        if _access_listener is not None:
+            _access_listener(self.name, hit)
+        return value if hit else default
+
+    def set(self, key: Hashable, value: Any, version: Hashable = None) -> None:
+        """Armazena um valor e a versão dos dados de origem, descartando as mais antigas."""
+        expires_at = time.monotonic() + self.ttl if self.ttl is not None else float("inf")
+        with self._lock:
+            self._entries[key] = (expires_at, version, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+
+    def get_or_load(self, key: Hashable, loader: Callable[[], T], version: Hashable = None) -> T:
+        """Retorna o valor em cache ou o carrega com `loader` e o armazena.
+
+        Args:
+            key: A chave da entrada.
+            loader: Função que carrega o valor em caso de falha.
+            version: Versão atual dos dados de origem (None para depender apenas do TTL).
+        """
+        value = self.get(key, _MISSING, version=version)
+        if value is not _MISSING:
+            return value
+        store = self._shared_store()
+        if store is not None:
+            value = store.get(self.name, key, version)
+            if value is not _SHARED_MISSING:
+                with self._lock:
+                    self._shared_hits += 1
+                self.set(key, value, version=version)
+                return value
+        value = loader()
+        self.set(key, value, version=version)
+        if store is not None:
+            store.set(self.name, key, value, version=version, ttl=self.ttl)
+        return value
+
+    def _shared_store(self) -> Optional[SharedCacheStore]:
+        return _shared_store if self.shared else None
+
+    def invalidate(self, key: Hashable) -> None:
+        """Remove uma única chave do cache."""
+        with self._lock:
+            if self._entries.pop(key, None) is not None:
+                self._invalidations += 1
+        store = self._shared_store()
+        if store is not None:
+            store.invalidate(self.name, key)
+
+    def invalidate_where(self, predicate: Callable[[Hashable], bool]) -> None:
+        """Remove todas as chaves que satisfazem o predicado."""
+        with self._lock:
+            for key in [k for k in self._entries if predicate(k)]:
+                del self._entries[key]
+                self._invalidations += 1
+        store = self._shared_store()
+        if store is not None:
+            store.invalidate_where(self.name, predicate)
+
+    def clear(self) -> None:
+        """Remove todas as entradas do cache."""
+        with self._lock:
+            self._invalidations += len(self._entries)
+            self._entries.clear()
+        store = self._shared_store()
+        if store is not None:
+            store.clear(self.name)
+
+    def stats(self) -> CacheStats:
+        """Retorna um retrato dos contadores do cache."""
+        with self._lock:
+            return CacheStats(
+                name=self.name,
+                hits=self._hits,
+                misses=self._misses,
+                evictions=self._evictions,
+                invalidations=self._invalidations,
+                stale=self._stale,
+                shared_hits=self._shared_hits,
+                size=len(self._entries),
+            )
+
+
+_registry: dict[str, KeyedCache] = {}
+_registry_lock = threading.Lock()
+
+
+def get_cache(
+    name: str, ttl: Optional[float] = None, max_entries: int = 1024, shared: bool = False
+) -> KeyedCache:
+    """Retorna o cache nomeado do processo, criando-o na primeira chamada."""
+    with _registry_lock:
+        if name not in _registry:
+            _registry[name] = KeyedCache(name, ttl=ttl, max_entries=max_entries, shared=shared)
+        return _registry[name]
+
+
+def set_shared_store(store: Optional[SharedCacheStore]) -> None:
+    """Define (ou remove, com None) a camada compartilhada dos caches com `shared=True`."""
+    global _shared_store
+    _shared_store = store
+
+
+def set_access_listener(listener: Optional[Callable[[str, bool], None]]) -> None:
+    """Define (ou remove, com None) a função notificada a cada leitura dos caches.
+
+    Usada pelas métricas do repositório (src/metrics.py) para atribuir acertos e
+    falhas à chamada em andamento.
+    """
+    global _access_listener
+    _access_listener = listener
+
+
+def clear_all_caches() -> None:
+    """Esvazia todos os caches registrados no processo (ex: para medir com os caches frios)."""
+    with _registry_lock:
+        caches = list(_registry.values())
+    for cache in caches:
+        cache.clear()
+
+
+def all_cache_stats() -> list[CacheStats]:
+    """Retorna os contadores de todos os caches registrados no processo."""
+    with _registry_lock:
+        caches = list(_registry.values())
+    return [cache.stats() for cache in caches]
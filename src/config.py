@@ -1,23 +1,216 @@
+import logging
+import os
+from typing import Any, Optional, Protocol
+
 import pytz
 import streamlit as st
-from supabase import Client, create_client
+from supabase import create_client
+
+from src.cache import set_shared_store
+from src.metrics import configure_export
+from src.profiling import DEFAULT_INTERVAL
+from src.shared_cache import DEFAULT_MAX_MB, SharedCacheStore
 
 FUSO_BR = pytz.timezone("America/Sao_Paulo")
 
+# Backends de dados suportados. 'local' usa o banco SQLite em processo (src/local_client.py).
+BACKEND_SUPABASE = "supabase"
+BACKEND_LOCAL = "local"
+
+
+class DatabaseClient(Protocol):
+    """Interface mínima do cliente de banco usada pelo repositório.
+
+    É satisfeita tanto pelo `supabase.Client` quanto pelo `LocalClient`.
+    """
+
+    def table(self, table_name: str) -> Any:
+        """Retorna o construtor de consultas de uma tabela."""
+
+    def from_(self, table_name: str) -> Any:
+        """Retorna o construtor de consultas de uma tabela ou view."""
+
+    def rpc(self, fn: str, params: Optional[dict[Any, Any]] = None) -> Any:
+        """Prepara a chamada de uma função do banco (RPC)."""
+
+
+def create_database_client(
+    backend: str,
+    url: Optional[str] = None,
+    key: Optional[str] = None,
+    local_path: Optional[str] = None,
+) -> DatabaseClient:
+    """Cria o cliente de banco para o backend escolhido.
+
+    Args:
+        backend: 'supabase' ou 'local'.
+        url: URL do projeto Supabase (backend 'supabase').
+        key: Chave do Supabase (backend 'supabase').
+        local_path: Caminho do arquivo SQLite (backend 'local'). Padrão: banco em memória.
+
+    Returns:
+        Um cliente compatível com `DatabaseClient`.
+    """
+    if backend == BACKEND_LOCAL:
+        from src.local_client import LocalClient
+
+        return LocalClient(local_path or ":memory:")
+    if backend != BACKEND_SUPABASE:
+        raise ValueError(f"Backend de dados desconhecido: '{backend}'")
+    if not url or not key:
+        raise ValueError("URL e chave do Supabase são obrigatórias para o backend 'supabase'.")
+    return create_client(url, key)
+
+
+def get_backend_settings() -> dict[str, Any]:
+    """Lê a configuração do backend de dados.
+
+    As variáveis de ambiente `BIBLE_TRACKER_BACKEND` e `BIBLE_TRACKER_LOCAL_DB` têm
+    precedência sobre a seção `[backend]` do secrets.toml (chaves `tipo` e `caminho`).
+
+    Returns:
+        Um dicionário com as chaves 'backend' e 'local_path'.
+    """
+    secrets: dict[str, Any] = {}
+    try:
+        secrets = dict(st.secrets.get("backend", {}))
+    except Exception:
+        # Sem secrets.toml: usa apenas as variáveis de ambiente.
+        pass
+    return {
+        "backend": os.getenv("BIBLE_TRACKER_BACKEND") or secrets.get("tipo", BACKEND_SUPABASE),
+        "local_path": os.getenv("BIBLE_TRACKER_LOCAL_DB") or secrets.get("caminho"),
+    }
+
+
+def get_shared_cache_settings() -> dict[str, Any]:
+    """Lê a configuração do cache compartilhado entre processos.
+
+    As variáveis de ambiente `BIBLE_TRACKER_SHARED_CACHE` (caminho do arquivo) e
+    `BIBLE_TRACKER_SHARED_CACHE_MB` têm precedência sobre a seção `[cache_compartilhado]`
+    do secrets.toml (chaves `caminho` e `tamanho_mb`). Sem caminho, o cache fica desativado.
+
+    Returns:
+        Um dicionário com as chaves 'path' e 'max_mb'.
+    """
+    secrets: dict[str, Any] = {}
+    try:
+        secrets = dict(st.secrets.get("cache_compartilhado", {}))
+    except Exception:
+        pass
+    return {
+        "path": os.getenv("BIBLE_TRACKER_SHARED_CACHE") or secrets.get("caminho"),
+        "max_mb": float(
+            os.getenv("BIBLE_TRACKER_SHARED_CACHE_MB") or secrets.get("tamanho_mb", DEFAULT_MAX_MB)
+        ),
+    }
+
 
 @st.cache_resource
-def get_supabase_client() -> Client:
+def configure_shared_cache() -> Optional[SharedCacheStore]:
     """
-    Cria e retorna um cliente Supabase.
+    Ativa o cache compartilhado entre os processos do host, se configurado.
+    Usa @st.cache_resource para abrir o arquivo apenas uma vez por processo.
+    """
+    settings = get_shared_cache_settings()
+    if not settings["path"]:
+        return None
+    try:
+        store = SharedCacheStore(settings["path"], max_bytes=int(settings["max_mb"] * 1024 * 1024))
+    except Exception as e:
+        # Sem o cache compartilhado, cada processo continua com o próprio cache em memória.
+        st.warning(f"Não foi possível abrir o cache compartilhado '{settings['path']}': {e}")
+        return None
+    set_shared_store(store)
+    return store
+
+
+def get_metrics_settings() -> dict[str, Any]:
+    """Lê a configuração da exportação das métricas do repositório.
+
+    As variáveis de ambiente `BIBLE_TRACKER_METRICS_FILE` (arquivo no formato do
+    Prometheus) e `BIBLE_TRACKER_METRICS_LOG` ('1' para resumir cada rerun no log) têm
+    precedência sobre a seção `[metricas]` do secrets.toml (chaves `arquivo` e
+    `log_reruns`). Sem configuração, as métricas são apenas mantidas em memória.
+
+    Returns:
+        Um dicionário com as chaves 'path' e 'log_reruns'.
+    """
+    secrets: dict[str, Any] = {}
+    try:
+        secrets = dict(st.secrets.get("metricas", {}))
+    except Exception:
+        pass
+    log_reruns = os.getenv("BIBLE_TRACKER_METRICS_LOG")
+    return {
+        "path": os.getenv("BIBLE_TRACKER_METRICS_FILE") or secrets.get("arquivo"),
+        "log_reruns": (
+            log_reruns.lower() in ("1", "true", "sim")
+            if log_reruns
+            else bool(secrets.get("log_reruns", False))
+        ),
+    }
+
+
+@st.cache_resource
+def configure_metrics() -> dict[str, Any]:
+    """
+    Ativa a exportação das métricas do repositório, se configurada.
+    Usa @st.cache_resource para configurar apenas uma vez por processo.
+    """
+    settings = get_metrics_settings()
+    configure_export(settings["path"], log_reruns=settings["log_reruns"])
+    if settings["log_reruns"]:
+        # O resumo é registrado em INFO; sem configuração de logging, o Python só exibe WARNING.
+        metrics_logger = logging.getLogger("src.metrics")
+        metrics_logger.setLevel(logging.INFO)
+        if not metrics_logger.handlers:
+            handler = logging.StreamHandler()
+            handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s"))
+            metrics_logger.addHandler(handler)
+    return settings
+
+
+@st.cache_resource
+def get_profiling_settings() -> dict[str, Any]:
+    """Lê a configuração do profiling sob demanda (ver src/profiling.py).
+
+    As variáveis de ambiente `BIBLE_TRACKER_PROFILING_TOKEN`, `BIBLE_TRACKER_PROFILING_DIR`
+    e `BIBLE_TRACKER_PROFILING_INTERVAL_MS` têm precedência sobre a seção `[profiling]`
+    do secrets.toml (chaves `token`, `diretorio` e `intervalo_ms`). Sem token, o
+    profiling fica desativado. Usa @st.cache_resource para ler apenas uma vez por processo.
+
+    Returns:
+        Um dicionário com as chaves 'token', 'directory' e 'interval' (em segundos).
+    """
+    secrets: dict[str, Any] = {}
+    try:
+        secrets = dict(st.secrets.get("profiling", {}))
+    except Exception:
+        pass
+    interval_ms = os.getenv("BIBLE_TRACKER_PROFILING_INTERVAL_MS") or secrets.get(
+        "intervalo_ms", DEFAULT_INTERVAL * 1000
+    )
+    return {
+        "token": os.getenv("BIBLE_TRACKER_PROFILING_TOKEN") or secrets.get("token"),
+        "directory": os.getenv("BIBLE_TRACKER_PROFILING_DIR") or secrets.get("diretorio", "profiles"),
+        "interval": float(interval_ms) / 1000,
+    }
+
+
+@st.cache_resource
+def get_database_client() -> DatabaseClient:
+    """
+    Cria e retorna o cliente de banco configurado (Supabase ou local).
     Usa @st.cache_resource para garantir que a conexão seja criada apenas uma vez.
     """
+    settings = get_backend_settings()
     try:
+        if settings["backend"] == BACKEND_LOCAL:
+            return create_database_client(BACKEND_LOCAL, local_path=settings["local_path"])
         url = st.secrets["supabase"]["url"]
         key = st.secrets["supabase"]["key"]
-        return create_client(url, key)
+        return create_database_client(BACKEND_SUPABASE, url=url, key=key)
     except Exception as e:
-        st.error(f"Erro ao configurar Supabase. Verifique o secrets.toml. {e}")
+        st.error(f"Erro ao configurar o banco de dados. Verifique o secrets.toml. {e}")
         st.stop()
-
-
-supabase_client = get_supabase_client()
@@ -0,0 +1,767 @@
+import re
+import sqlite3
+import threading
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Optional, Union
+
+import pytz
+
+from src import search
+from src.books import BUNDLED_BOOKS
+from src.utils import expandir_capitulos
+
+SCHEMA_PATH = Path(__file__).with_name("local_schema.sql")
+
+# Limite padrão de linhas por resposta, equivalente ao 'max-rows' do PostgREST no Supabase.
+DEFAULT_MAX_ROWS = 1000
+
+# Limite de parâmetros por cláusula IN, abaixo do limite do SQLite.
+_IN_CHUNK_SIZE = 500
+
+_IDENTIFIER_RE = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+
+JSON = Union[dict[str, Any], list[dict[str, Any]]]
+
+
+class LocalAPIError(Exception):
+    """Erro levantado pelo cliente local, equivalente ao APIError do PostgREST."""
+
+
+@dataclass
+class LocalResponse:
+    """Resposta de uma consulta local, com a mesma forma do APIResponse do PostgREST."""
+
+    data: Any
+    count: Optional[int] = None
+
+
+@dataclass
+class _Embed:
+    alias: str
+    table: str
+    inner: bool
+    node: "_SelectNode"
+
+
+@dataclass
+class _SelectNode:
+    """Árvore de uma cláusula select do PostgREST (colunas e recursos embutidos)."""
+
+    items: list[Union[str, tuple[str, str], _Embed]] = field(default_factory=list)
+
+    @property
+    def embeds(self) -> list[_Embed]:
+        return [item for item in self.items if isinstance(item, _Embed)]
+
+
+@dataclass
+class _Filter:
+    column: str
+    op: str
+    value: Any
+    negate: bool = False
+
+
+def _split_top_level(text: str) -> list[str]:
+    """Divide uma string por vírgulas que não estejam dentro de parênteses."""
+    parts: list[str] = []
+    current: list[str] = []
+    depth = 0
+    for char in text:
+        if char == "(":
+            depth += 1
+        elif char == ")":
+            depth -= 1
+        if char == "," and depth == 0:
+            parts.append("".join(current).strip())
+            current = []
+        else:
+            current.append(char)
+    if "".join(current).strip():
+        parts.append("".join(current).strip())
+    return parts
+
+
+def _parse_select(columns: str) -> _SelectNode:
+    """Interpreta uma cláusula select (ex: 'id, livro:tb_livros!inner(id, nome)')."""
+    node = _SelectNode()
+    for part in _split_top_level(columns):
+        if "(" in part:
+            head, body = part.split("(", 1)
+            alias, _, target = head.partition(":") if ":" in head else (head, "", head)
+            target, _, hint = target.partition("!")
+            node.items.append(
+                _Embed(
+                    # Sem alias, o recurso é nomeado pela tabela (sem o '!inner').
+                    alias=alias.partition("!")[0].strip(),
+                    table=target.strip(),
+                    inner=hint.strip() == "inner",
+                    node=_parse_select(body.rsplit(")", 1)[0]),
+                )
+            )
+        elif ":" in part:
+            alias, column = part.split(":", 1)
+            node.items.append((alias.strip(), column.strip()))
+        else:
+            node.items.append(part)
+    return node
+
+
+def _check_identifier(name: str) -> str:
+    if not _IDENTIFIER_RE.match(name):
+        raise LocalAPIError(f"Identificador inválido: {name!r}")
+    return name
+
+
+def _expand_bounds(str_caps: Optional[str]) -> tuple[Optional[int], Optional[int]]:
+    capitulos = expandir_capitulos(str(str_caps)) if str_caps is not None else []
+    if not capitulos:
+        return None, None
+    return capitulos[0], capitulos[-1]
+
+
+def _native(value: Any) -> Any:
+    """Converte escalares do numpy/pandas (ex: numpy.int64) em tipos nativos do Python.
+
+    O cliente Supabase serializa esses valores em texto na URL; o sqlite3, por outro
+    lado, os vincularia como BLOB e nenhum filtro corresponderia.
+    """
+    if isinstance(value, list):
+        return [_native(v) for v in value]
+    if hasattr(value, "item") and not isinstance(value, (str, bytes)):
+        return value.item()
+    return value
+
+
+def _matches(value: Any, op: str, target: Any) -> bool:
+    """Avalia um filtro do PostgREST em Python (usado nos recursos embutidos)."""
+    if op == "is":
+        return value is None if target in (None, "null") else value is target
+    if value is None:
+        return False
+    if op == "eq":
+        return value == target
+    if op == "neq":
+        return value != target
+    if op == "gt":
+        return value > target
+    if op == "gte":
+        return value >= target
+    if op == "lt":
+        return value < target
+    if op == "lte":
+        return value <= target
+    if op == "in":
+        return value in target
+    raise LocalAPIError(f"Operador não suportado: {op}")
+
+
+class _Negation:
+    """Proxy para o atributo 'not_' dos filtros do PostgREST."""
+
+    def __init__(self, builder: "LocalQueryBuilder"):
+        self._builder = builder
+
+    def __getattr__(self, name: str) -> Callable[..., "LocalQueryBuilder"]:
+        method = getattr(self._builder, name)
+
+        def negated(*args: Any, **kwargs: Any) -> "LocalQueryBuilder":
+            method(*args, **kwargs)
+            self._builder._filters[-1].negate = True
+            return self._builder
+
+        return negated
+
+
+class LocalQueryBuilder:
+    """Construtor de consultas compatível com o subconjunto da API do PostgREST usado pelo app.
+
+    Suporta select com recursos embutidos (inclusive '!inner' e filtros em colunas
+    embutidas), filtros simples, ordenação, limit/range, single, insert, upsert,
+    update e delete.
+    """
+
+    def __init__(self, client: "LocalClient", table: str):
+        self._client = client
+        self._table = _check_identifier(table)
+        self._operation = "select"
+        self._select = _parse_select("*")
+        self._count: Optional[str] = None
+        self._filters: list[_Filter] = []
+        self._orders: list[tuple[Optional[str], str, bool]] = []
+        self._limit: Optional[int] = None
+        self._offset = 0
+        self._single: Optional[str] = None
+        self._payload: list[dict[str, Any]] = []
+        self._on_conflict: list[str] = []
+        self._ignore_duplicates = False
+
+    # --- Operações ---
+
+    def select(
+        self, *columns: str, count: Any = None, head: Optional[bool] = None
+    ) -> "LocalQueryBuilder":
+        self._operation = "select"
+        self._select = _parse_select(",".join(columns) or "*")
+        self._count = str(getattr(count, "value", count)) if count else None
+        return self
+
+    def insert(self, json: JSON, *, count: Any = None, **_: Any) -> "LocalQueryBuilder":
+        self._operation = "insert"
+        rows = json if isinstance(json, list) else [json]
+        self._payload = [{k: _native(v) for k, v in row.items()} for row in rows]
+        self._count = str(getattr(count, "value", count)) if count else None
+        return self
+
+    def upsert(
+        self,
+        json: JSON,
+        *,
+        count: Any = None,
+        ignore_duplicates: bool = False,
+        on_conflict: str = "",
+        **_: Any,
+    ) -> "LocalQueryBuilder":
+        self.insert(json, count=count)
+        self._operation = "upsert"
+        self._ignore_duplicates = ignore_duplicates
+        self._on_conflict = [_check_identifier(c.strip()) for c in on_conflict.split(",") if c.strip()]
+        return self
+
+    def update(self, json: dict[str, Any], *, count: Any = None, **_: Any) -> "LocalQueryBuilder":
+        self._operation = "update"
+        self._payload = [{k: _native(v) for k, v in json.items()}]
+        self._count = str(getattr(count, "value", count)) if count else None
+        return self
+
+    def delete(self, *, count: Any = None, **_: Any) -> "LocalQueryBuilder":
+        self._operation = "delete"
+        self._count = str(getattr(count, "value", count)) if count else None
+        return self
+
+    # --- Filtros ---
+
+    def _add_filter(self, column: str, op: str, value: Any) -> "LocalQueryBuilder":
+        self._filters.append(_Filter(column, op, _native(value)))
+        return self
+
+    def eq(self, column: str, value: Any) -> "LocalQueryBuilder":
+        return self._add_filter(column, "eq", value)
+
+    def neq(self, column: str, value: Any) -> "LocalQueryBuilder":
+        return self._add_filter(column, "neq", value)
+
+    def gt(self, column: str, value: Any) -> "LocalQueryBuilder":
+        return self._add_filter(column, "gt", value)
+
+    def gte(self, column: str, value: Any) -> "LocalQueryBuilder":
+        return self._add_filter(column, "gte", value)
+
+    def lt(self, column: str, value: Any) -> "LocalQueryBuilder":
+        return self._add_filter(column, "lt", value)
+
+    def lte(self, column: str, value: Any) -> "LocalQueryBuilder":
+        return self._add_filter(column, "lte", value)
+
+    def is_(self, column: str, value: Any) -> "LocalQueryBuilder":
+        return self._add_filter(column, "is", value)
+
+    def in_(self, column: str, values: Any) -> "LocalQueryBuilder":
+        return self._add_filter(column, "in", list(values))
+
+    @property
+    def not_(self) -> _Negation:
+        return _Negation(self)
+
+    # --- Modificadores ---
+
+    def order(
+        self,
+        column: str,
+        *,
+        desc: bool = False,
+        nullsfirst: Optional[bool] = None,
+        foreign_table: Optional[str] = None,
+    ) -> "LocalQueryBuilder":
+        self._orders.append((foreign_table, _check_identifier(column), desc))
+        return self
+
+    def limit(self, size: int, *, foreign_table: Optional[str] = None) -> "LocalQueryBuilder":
+        self._limit = size
+        return self
+
+    def range(self, start: int, end: int, foreign_table: Optional[str] = None) -> "LocalQueryBuilder":
+        self._offset = start
+        self._limit = end - start + 1
+        return self
+
+    def single(self) -> "LocalQueryBuilder":
+        self._single = "single"
+        return self
+
+    def maybe_single(self) -> "LocalQueryBuilder":
+        self._single = "maybe_single"
+        return self
+
+    # --- Execução ---
+
+    def execute(self) -> LocalResponse:
+        with self._client._lock:
+            self._client.query_count += 1
+            if self._operation == "select":
+                response = self._execute_select()
+            elif self._operation in ("insert", "upsert"):
+                response = self._execute_insert()
+            else:
+                response = self._execute_update_or_delete()
+        if self._single:
+            rows = response.data or []
+            if len(rows) == 1:
+                response.data = rows[0]
+            elif not rows and self._single == "maybe_single":
+                response.data = None
+            else:
+                raise LocalAPIError(
+                    f"JSON object requested, multiple (or no) rows returned ({len(rows)})"
+                )
+        return response
+
+    def _where_sql(self, table: str, filters: list[_Filter]) -> tuple[str, list[Any]]:
+        clauses: list[str] = []
+        params: list[Any] = []
+        for f in filters:
+            column = _check_identifier(f.column)
+            if f.op == "is":
+                clause = f"{column} IS NULL" if f.value in (None, "null") else f"{column} IS ?"
+                if f.value not in (None, "null"):
+                    params.append(f.value)
+            elif f.op == "in":
+                if not f.value:
+                    clause = "0"
+                else:
+                    clause = f"{column} IN ({', '.join('?' for _ in f.value)})"
+                    params.extend(f.value)
+            else:
+                operators = {"eq": "=", "neq": "<>", "gt": ">", "gte": ">=", "lt": "<", "lte": "<="}
+                clause = f"{column} {operators[f.op]} ?"
+                params.append(f.value)
+            clauses.append(f"NOT ({clause})" if f.negate else clause)
+        return (" WHERE " + " AND ".join(clauses) if clauses else ""), params
+
+    def _execute_select(self) -> LocalResponse:
+        base_filters = [f for f in self._filters if "." not in f.column]
+        embed_filters = [f for f in self._filters if "." in f.column]
+
+        where, params = self._where_sql(self._table, base_filters)
+        clauses = [where[len(" WHERE ") :]] if where else []
+
+        # Filtros em recursos embutidos com '!inner' são empurrados para o SQL como subconsultas.
+        pushed: set[int] = set()
+        pushed_embeds: set[str] = set()
+        for embed in self._select.embeds:
+            relation = self._client._relation(self._table, embed.table)
+            filters = [f for f in embed_filters if f.column.split(".", 1)[0] == embed.alias]
+            if not (embed.inner and relation and relation[0] == "one" and filters):
+                continue
+            _, local_col, remote_col = relation
+            inner_filters = [
+                _Filter(f.column.split(".", 1)[1], f.op, f.value, f.negate)
+                for f in filters
+                if "." not in f.column.split(".", 1)[1]
+            ]
+            sub_where, sub_params = self._where_sql(embed.table, inner_filters)
+            clauses.append(f"{local_col} IN (SELECT {remote_col} FROM {embed.table}{sub_where})")
+            params.extend(sub_params)
+            pushed.update(id(f) for f in filters)
+            pushed_embeds.add(embed.alias)
+
+        sql_where = " WHERE " + " AND ".join(clauses) if clauses else ""
+        base_orders = [(column, desc) for table, column, desc in self._orders if table is None]
+        order_sql = (
+            " ORDER BY " + ", ".join(f"{c} {'DESC' if d else 'ASC'}" for c, d in base_orders)
+            if base_orders
+            else ""
+        )
+        needs_post_filter = any(
+            e.inner and e.alias not in pushed_embeds for e in self._select.embeds
+        ) or any(id(f) not in pushed for f in embed_filters)
+
+        sql = f"SELECT * FROM {self._table}{sql_where}{order_sql}"
+        window = self._window()
+        if not needs_post_filter and window is not None:
+            sql += f" LIMIT {window[1]} OFFSET {window[0]}"
+
+        rows = [dict(r) for r in self._client._conn.execute(sql, params).fetchall()]
+        total: Optional[int] = None
+        if self._count and not needs_post_filter:
+            total = self._client._conn.execute(
+                f"SELECT count(*) FROM {self._table}{sql_where}", params
+            ).fetchone()[0]
+
+        remaining_filters = [f for f in embed_filters if id(f) not in pushed]
+        resolved = self._client._resolve(
+            self._table, rows, self._select, remaining_filters, self._orders
+        )
+        data = [r for r in resolved if r is not None]
+
+        if needs_post_filter:
+            total = len(data)
+            if window is not None:
+                offset, limit = window
+                data = data[offset : offset + limit] if limit >= 0 else data[offset:]
+        return LocalResponse(data=data, count=total)
+
+    def _window(self) -> Optional[tuple[int, int]]:
+        """Calcula (offset, limite) aplicando o teto de linhas por resposta do servidor."""
+        max_rows = self._client.max_rows
+        limit = self._limit
+        if max_rows is not None:
+            limit = max_rows if limit is None else min(limit, max_rows)
+        if limit is None and not self._offset:
+            return None
+        return self._offset, -1 if limit is None else limit
+
+    def _execute_insert(self) -> LocalResponse:
+        if not self._payload:
+            return LocalResponse(data=[], count=0)
+        columns = list(self._payload[0].keys())
+        for column in columns:
+            _check_identifier(column)
+        sql = f"INSERT INTO {self._table} ({', '.join(columns)}) VALUES ({', '.join('?' for _ in columns)})"
+        if self._operation == "upsert":
+            conflict = f"({', '.join(self._on_conflict)})" if self._on_conflict else ""
+            if self._ignore_duplicates:
+                sql += f" ON CONFLICT{conflict} DO NOTHING"
+            else:
+                updates = ", ".join(f"{c} = excluded.{c}" for c in columns if c not in self._on_conflict)
+                sql += f" ON CONFLICT{conflict} DO UPDATE SET {updates}"
+        sql += " RETURNING *"
+
+        inserted: list[dict[str, Any]] = []
+        try:
+            for row in self._payload:
+                cursor = self._client._conn.execute(sql, [row.get(c) for c in columns])
+                inserted.extend(dict(r) for r in cursor.fetchall())
+            self._client._conn.commit()
+        except sqlite3.Error as e:
+            self._client._conn.rollback()
+            raise LocalAPIError(str(e)) from e
+        return LocalResponse(data=inserted, count=len(inserted) if self._count else None)
+
+    def _execute_update_or_delete(self) -> LocalResponse:
+        where, params = self._where_sql(self._table, self._filters)
+        if self._operation == "update":
+            values = self._payload[0]
+            assignments = ", ".join(f"{_check_identifier(c)} = ?" for c in values)
+            sql = f"UPDATE {self._table} SET {assignments}{where} RETURNING *"
+            params = list(values.values()) + params
+        else:
+            sql = f"DELETE FROM {self._table}{where} RETURNING *"
+        try:
+            rows = [dict(r) for r in self._client._conn.execute(sql, params).fetchall()]
+            self._client._conn.commit()
+        except sqlite3.Error as e:
+            self._client._conn.rollback()
+            raise LocalAPIError(str(e)) from e
+        return LocalResponse(data=rows, count=len(rows) if self._count else None)
+
+
+class LocalRpcCall:
+    """Chamada de função (RPC) pendente, executada em execute()."""
+
+    def __init__(self, client: "LocalClient", fn: str, params: dict[str, Any]):
+        self._client = client
+        self._fn = fn
+        self._params = params
+
+    def execute(self) -> LocalResponse:
+        handler = self._client._rpcs.get(self._fn)
+        if handler is None:
+            raise LocalAPIError(f"Função não encontrada: {self._fn}")
+        with self._client._lock:
+            self._client.query_count += 1
+            try:
+                data = handler(**{k: _native(v) for k, v in self._params.items()})
+                self._client._conn.commit()
+            except sqlite3.Error as e:
+                self._client._conn.rollback()
+                raise LocalAPIError(str(e)) from e
+        return LocalResponse(data=data)
+
+
+# Colunas adicionadas depois que bancos locais já podiam ter sido criados: o CREATE TABLE
+# do schema já as inclui, e bancos antigos recebem o ALTER TABLE e a carga inicial.
+_ADDED_COLUMNS: tuple[tuple[str, str, str, Optional[str]], ...] = (
+    (
+        "tb_perguntas",
+        "total_respostas",
+        "INTEGER NOT NULL DEFAULT 0",
+        "UPDATE tb_perguntas SET total_respostas = "
+        "(SELECT count(*) FROM tb_respostas WHERE tb_respostas.pergunta_id = tb_perguntas.id)",
+    ),
+    ("tb_perguntas", "respondida", "INTEGER GENERATED ALWAYS AS (total_respostas > 0) VIRTUAL", None),
+    # Preenchida pela carga inicial do ranking em local_schema.sql.
+    ("tb_estatisticas_usuarios", "livros_concluidos", "INTEGER NOT NULL DEFAULT 0", None),
+)
+
+
+class LocalClient:
+    """Backend offline em processo (SQLite) com a mesma interface do cliente Supabase.
+
+    Espelha o schema de 'scripts/ddl.sql' (tabelas, views e as funções
+    'expand_capitulos', 'handle_book_completion_check', 'count_unique_readings_for_user',
+    'backfill_livros_concluidos' e 'buscar_duvidas'), permitindo executar a aplicação, testes de
+    carga, benchmarks e profiling sem rede.
+    """
+
+    def __init__(self, path: str = ":memory:", max_rows: Optional[int] = DEFAULT_MAX_ROWS):
+        """Abre (ou cria) o banco local e aplica o schema.
+
+        Args:
+            path: Caminho do arquivo SQLite, ou ':memory:' para um banco em memória.
+            max_rows: Limite de linhas por resposta, como o 'max-rows' do PostgREST.
+                Use None para desabilitar.
+        """
+        self.max_rows = max_rows
+        self.query_count = 0
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA foreign_keys = ON")
+        if path != ":memory:":
+            self._conn.execute("PRAGMA journal_mode = WAL")
+        self._conn.create_function(
+            "expand_capitulos_inicio", 1, lambda s: _expand_bounds(s)[0], deterministic=True
+        )
+        self._conn.create_function(
+            "expand_capitulos_fim", 1, lambda s: _expand_bounds(s)[1], deterministic=True
+        )
+        self._conn.create_function("normaliza_busca", 1, search.normalize, deterministic=True)
+        self._conn.create_function(
+            "hoje_br", 0, lambda: datetime.now(pytz.timezone("America/Sao_Paulo")).date().isoformat()
+        )
+        self._add_missing_columns()
+        self._conn.executescript(SCHEMA_PATH.read_text(encoding="utf-8"))
+        self._conn.executemany(
+            "INSERT OR IGNORE INTO tb_livros (id, nome, ordem, chapters, image_path) VALUES (?, ?, ?, ?, ?)",
+            [(ordem, nome, ordem, chapters, image) for nome, ordem, chapters, image in BUNDLED_BOOKS],
+        )
+        self._conn.commit()
+        self._relations: dict[tuple[str, str], Optional[tuple[str, str, str]]] = {}
+        self._rpcs: dict[str, Callable[..., Any]] = {
+            "handle_book_completion_check": self._handle_book_completion_check,
+            "handle_books_completion_check": self._handle_books_completion_check,
+            "count_unique_readings_for_user": self._count_unique_readings_for_user,
+            "backfill_livros_concluidos": self._backfill_livros_concluidos,
+            "buscar_duvidas": self._buscar_duvidas,
+        }
+
+    def _add_missing_columns(self) -> None:
+        """Adiciona a bancos existentes as colunas criadas depois deles (ver _ADDED_COLUMNS)."""
+        for table, column, definition, backfill in _ADDED_COLUMNS:
+            # 'table_xinfo' inclui as colunas geradas; uma tabela inexistente não tem linhas.
+            columns = {row["name"] for row in self._conn.execute(f"PRAGMA table_xinfo({table})")}
+            if columns and column not in columns:
+                self._conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
+                if backfill:
+                    self._conn.execute(backfill)
+
+    # --- Interface compatível com supabase.Client ---
+
+    def table(self, table_name: str) -> LocalQueryBuilder:
+        return LocalQueryBuilder(self, table_name)
+
+    def from_(self, table_name: str) -> LocalQueryBuilder:
+        return LocalQueryBuilder(self, table_name)
+
+    def rpc(self, fn: str, params: Optional[dict[str, Any]] = None, **_: Any) -> LocalRpcCall:
+        return LocalRpcCall(self, fn, params or {})
+
+    # --- Recursos embutidos ---
+
+    def _relation(self, base: str, target: str) -> Optional[tuple[str, str, str]]:
+        """Descobre a relação entre duas tabelas a partir das chaves estrangeiras.
+
+        Returns:
+            ('one', coluna_local, coluna_remota) quando 'base' referencia 'target',
+            ('many', coluna_local, coluna_remota) quando 'target' referencia 'base',
+            ou None se não houver relação.
+        """
+        key = (base, target)
+        if key not in self._relations:
+            relation: Optional[tuple[str, str, str]] = None
+            for fk in self._conn.execute(f"PRAGMA foreign_key_list({_check_identifier(base)})"):
+                if fk["table"] == target:
+                    relation = ("one", fk["from"], fk["to"] or "id")
+                    break
+            if relation is None:
+                for fk in self._conn.execute(f"PRAGMA foreign_key_list({_check_identifier(target)})"):
+                    if fk["table"] == base:
+                        relation = ("many", fk["to"] or "id", fk["from"])
+                        break
+            self._relations[key] = relation
+        return self._relations[key]
+
+    def _fetch_in(
+        self, table: str, column: str, values: list[Any], order_sql: str = ""
+    ) -> list[dict[str, Any]]:
+        rows: list[dict[str, Any]] = []
+        for i in range(0, len(values), _IN_CHUNK_SIZE):
+            chunk = values[i : i + _IN_CHUNK_SIZE]
+            sql = f"SELECT * FROM {table} WHERE {column} IN ({', '.join('?' for _ in chunk)}){order_sql}"
+            rows.extend(dict(r) for r in self._conn.execute(sql, chunk).fetchall())
+        return rows
+
+    def _resolve(
+        self,
+        table: str,
+        rows: list[dict[str, Any]],
+        node: _SelectNode,
+        filters: list[_Filter],
+        orders: list[tuple[Optional[str], str, bool]],
+    ) -> list[Optional[dict[str, Any]]]:
+        """Resolve os recursos embutidos e projeta as colunas pedidas no select.
+
+        Returns:
+            Uma lista alinhada com 'rows', com None nas linhas descartadas por
+            recursos embutidos '!inner' sem correspondência.
+        """
+        embedded: dict[str, dict[int, Any]] = {}
+        for embed in node.embeds:
+            relation = self._relation(table, embed.table)
+            if relation is None:
+                raise LocalAPIError(f"Relação não encontrada entre '{table}' e '{embed.table}'")
+            kind, local_col, remote_col = relation
+            prefix = embed.alias + "."
+            sub_filters = [
+                _Filter(f.column[len(prefix) :], f.op, f.value, f.negate)
+                for f in filters
+                if f.column.startswith(prefix)
+            ]
+            keys = list({r[local_col] for r in rows if r.get(local_col) is not None})
+            # Como no PostgREST, a ordenação de um recurso embutido é endereçada pelo
+            # alias ('slots.order=ordem' para 'slots:tb_plano_slots(...)'), não pela tabela.
+            sub_orders = [(None, c, d) for t, c, d in orders if t == embed.alias]
+            nested_orders: list[tuple[Optional[str], str, bool]] = [
+                (t[len(prefix) :], c, d) for t, c, d in orders if t and t.startswith(prefix)
+            ]
+            order_sql = (
+                " ORDER BY " + ", ".join(f"{c} {'DESC' if d else 'ASC'}" for _, c, d in sub_orders)
+                if sub_orders
+                else ""
+            )
+            related = self._fetch_in(embed.table, remote_col, keys, order_sql) if keys else []
+            related = [
+                r
+                for r in related
+                if all(
+                    _matches(r.get(f.column), f.op, f.value) != f.negate
+                    for f in sub_filters
+                    if "." not in f.column
+                )
+            ]
+            projected = self._resolve(embed.table, related, embed.node, sub_filters, nested_orders)
+
+            values: dict[Any, Any] = {}
+            for raw, proj in zip(related, projected):
+                if proj is None:
+                    continue
+                if kind == "one":
+                    values[raw[remote_col]] = proj
+                else:
+                    values.setdefault(raw[remote_col], []).append(proj)
+            missing: Any = None if kind == "one" else []
+            embedded[embed.alias] = {id(r): values.get(r.get(local_col), missing) for r in rows}
+
+        result: list[Optional[dict[str, Any]]] = []
+        for row in rows:
+            if any(e.inner and not embedded[e.alias][id(row)] for e in node.embeds):
+                result.append(None)
+                continue
+            out: dict[str, Any] = {}
+            for item in node.items:
+                if isinstance(item, _Embed):
+                    out[item.alias] = embedded[item.alias][id(row)]
+                elif isinstance(item, tuple):
+                    out[item[0]] = row.get(item[1])
+                elif item == "*":
+                    out.update(row)
+                else:
+                    out[item] = row.get(item)
+            result.append(out)
+        return result
+
+    # --- Funções (RPC) espelhando scripts/ddl.sql ---
+
+    def _handle_book_completion_check(self, p_usuario_id: int, p_plano_id: int, p_livro_id: int) -> bool:
+        already_completed = self._conn.execute(
+            "SELECT count(*) FROM tb_livros_concluidos WHERE usuario_id = ? AND plano_id = ? AND id_livro = ?",
+            (p_usuario_id, p_plano_id, p_livro_id),
+        ).fetchone()[0]
+        if already_completed > 0:
+            return False
+
+        target_chapters_count = self._conn.execute(
+            "SELECT count(DISTINCT capitulo) FROM tb_plano_slots WHERE plano_id = ? AND id_livro = ?",
+            (p_plano_id, p_livro_id),
+        ).fetchone()[0]
+        if target_chapters_count == 0:
+            return False
+
+        read_chapters_count = self._conn.execute(
+            "SELECT count(DISTINCT capitulo) FROM tb_leituras "
+            "WHERE usuario_id = ? AND plano_id = ? AND id_livro = ?",
+            (p_usuario_id, p_plano_id, p_livro_id),
+        ).fetchone()[0]
+
+        if read_chapters_count >= target_chapters_count:
+            self._conn.execute(
+                "INSERT INTO tb_livros_concluidos (usuario_id, plano_id, id_livro) VALUES (?, ?, ?)",
+                (p_usuario_id, p_plano_id, p_livro_id),
+            )
+            return True
+        return False
+
+    def _handle_books_completion_check(
+        self, p_usuario_id: int, p_plano_id: int, p_livro_ids: list[int]
+    ) -> list[int]:
+        return [
+            livro_id
+            for livro_id in dict.fromkeys(p_livro_ids)
+            if self._handle_book_completion_check(p_usuario_id, p_plano_id, livro_id)
+        ]
+
+    def _count_unique_readings_for_user(self, p_usuario_id: int) -> int:
+        row = self._conn.execute(
+            "SELECT capitulos_unicos FROM tb_estatisticas_usuarios WHERE usuario_id = ?", (p_usuario_id,)
+        ).fetchone()
+        return row[0] if row else 0
+
+    def _backfill_livros_concluidos(self, p_dry_run: bool = False) -> int:
+        if p_dry_run:
+            return self._conn.execute("SELECT count(*) FROM vw_livros_concluidos_pendentes").fetchone()[
+                0
+            ]
+        return self._conn.execute(
+            "INSERT OR IGNORE INTO tb_livros_concluidos (usuario_id, plano_id, id_livro) "
+            "SELECT usuario_id, plano_id, id_livro FROM vw_livros_concluidos_pendentes"
+        ).rowcount
+
+    def _buscar_duvidas(
+        self, p_termo: str, p_limite: int = 20, p_offset: int = 0
+    ) -> list[dict[str, Any]]:
+        query = search.match_query(p_termo)
+        if query is None:
+            return []
+        # bm25 retorna valores menores para documentos mais relevantes; a pergunta pesa o dobro.
+        rows = self._conn.execute(
+            "SELECT p.id, p.pergunta_texto, p.created_at, p.total_respostas, "
+            "-bm25(tb_perguntas_busca, 2.0, 1.0) AS relevancia "
+            "FROM tb_perguntas_busca JOIN tb_perguntas p ON p.id = tb_perguntas_busca.rowid "
+            "WHERE tb_perguntas_busca MATCH ? "
+            "ORDER BY relevancia DESC, p.id DESC LIMIT ? OFFSET ?",
+            (query, p_limite, p_offset),
+        )
+        return [dict(row) for row in rows]
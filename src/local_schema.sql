@@ -0,0 +1,799 @@
+-- =================================================================
+-- SCHEMA LOCAL (SQLite) ESPELHANDO scripts/ddl.sql
+-- =================================================================
+-- Usado pelo backend offline (src/local_client.py) para testes de carga,
+-- benchmarks e profiling sem um projeto Supabase. As funções
+-- expand_capitulos_inicio/expand_capitulos_fim são registradas em Python e,
+-- combinadas com a tabela _numeros, expandem as entradas em tb_plano_slots.
+
+CREATE TABLE IF NOT EXISTS tb_usuarios (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    nome TEXT NOT NULL UNIQUE,
+    created_at TEXT DEFAULT (strftime('%Y-%m-%dT%H:%M:%fZ', 'now'))
+);
+
+CREATE TABLE IF NOT EXISTS tb_planos (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    nome TEXT NOT NULL UNIQUE,
+    created_at TEXT DEFAULT (strftime('%Y-%m-%dT%H:%M:%fZ', 'now'))
+);
+
+CREATE TABLE IF NOT EXISTS tb_livros (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    nome TEXT NOT NULL UNIQUE,
+    ordem INTEGER,
+    chapters INTEGER,
+    image_path TEXT,
+    created_at TEXT DEFAULT (strftime('%Y-%m-%dT%H:%M:%fZ', 'now'))
+);
+
+CREATE TABLE IF NOT EXISTS tb_plano_entradas (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    plano_id INTEGER NOT NULL REFERENCES tb_planos(id),
+    data_leitura TEXT NOT NULL,
+    id_livro INTEGER NOT NULL REFERENCES tb_livros(id),
+    capitulos TEXT NOT NULL,
+    created_at TEXT DEFAULT (strftime('%Y-%m-%dT%H:%M:%fZ', 'now'))
+);
+
+CREATE INDEX IF NOT EXISTS idx_plano_entradas_plano_data ON tb_plano_entradas (plano_id, data_leitura);
+
+CREATE TABLE IF NOT EXISTS tb_leituras (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    usuario_id INTEGER NOT NULL REFERENCES tb_usuarios(id),
+    plano_id INTEGER NOT NULL REFERENCES tb_planos(id),
+    id_livro INTEGER NOT NULL REFERENCES tb_livros(id),
+    capitulo INTEGER NOT NULL,
+    created_at TEXT DEFAULT (strftime('%Y-%m-%dT%H:%M:%fZ', 'now')),
+    data_leitura_plano TEXT,
+    CONSTRAINT tb_leituras_leitura_unica_por_dia_key
+        UNIQUE (usuario_id, plano_id, id_livro, capitulo, data_leitura_plano)
+);
+
+-- 'total_respostas' e 'respondida' também são adicionadas a bancos antigos pelo
+-- LocalClient (ver _ADDED_COLUMNS em src/local_client.py).
+CREATE TABLE IF NOT EXISTS tb_perguntas (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    pergunta_texto TEXT NOT NULL,
+    created_at TEXT DEFAULT (strftime('%Y-%m-%dT%H:%M:%fZ', 'now')),
+    total_respostas INTEGER NOT NULL DEFAULT 0,
+    respondida INTEGER GENERATED ALWAYS AS (total_respostas > 0) VIRTUAL
+);
+
+CREATE TABLE IF NOT EXISTS tb_respostas (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    pergunta_id INTEGER NOT NULL REFERENCES tb_perguntas(id) ON DELETE CASCADE,
+    usuario_id INTEGER NOT NULL REFERENCES tb_usuarios(id),
+    resposta_texto TEXT NOT NULL,
+    created_at TEXT DEFAULT (strftime('%Y-%m-%dT%H:%M:%fZ', 'now'))
+);
+
+CREATE TABLE IF NOT EXISTS tb_livros_concluidos (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    created_at TEXT DEFAULT (strftime('%Y-%m-%dT%H:%M:%fZ', 'now')) NOT NULL,
+    usuario_id INTEGER NOT NULL REFERENCES tb_usuarios(id) ON DELETE CASCADE,
+    plano_id INTEGER NOT NULL REFERENCES tb_planos(id) ON DELETE CASCADE,
+    id_livro INTEGER NOT NULL REFERENCES tb_livros(id) ON DELETE CASCADE,
+    CONSTRAINT tb_livros_concluidos_unique_entry UNIQUE (usuario_id, plano_id, id_livro)
+);
+
+-- Slots dos planos: capítulos pré-expandidos e numerados em ordem cronológica (ver
+-- scripts/ddl.sql). O SQLite não aceita CTEs dentro de triggers, então a expansão usa
+-- a tabela auxiliar _numeros. Sem chave primária em (plano_id, ordem): a renumeração
+-- de um UPDATE violaria a unicidade no meio do comando.
+CREATE TABLE IF NOT EXISTS _numeros (n INTEGER PRIMARY KEY);
+
+INSERT OR IGNORE INTO _numeros (n)
+WITH RECURSIVE seq(n) AS (SELECT 0 UNION ALL SELECT n + 1 FROM seq WHERE n < 999)
+SELECT n FROM seq;
+
+CREATE TABLE IF NOT EXISTS tb_plano_slots (
+    plano_id INTEGER NOT NULL REFERENCES tb_planos(id) ON DELETE CASCADE,
+    ordem INTEGER NOT NULL,
+    data_leitura TEXT NOT NULL,
+    id_livro INTEGER NOT NULL REFERENCES tb_livros(id),
+    capitulo INTEGER NOT NULL,
+    entrada_id INTEGER NOT NULL REFERENCES tb_plano_entradas(id) ON DELETE CASCADE
+);
+
+CREATE INDEX IF NOT EXISTS idx_plano_slots_ordem ON tb_plano_slots (plano_id, ordem);
+CREATE INDEX IF NOT EXISTS idx_plano_slots_livro ON tb_plano_slots (plano_id, id_livro, capitulo);
+CREATE INDEX IF NOT EXISTS idx_plano_slots_data ON tb_plano_slots (plano_id, data_leitura);
+CREATE INDEX IF NOT EXISTS idx_plano_slots_entrada ON tb_plano_slots (entrada_id);
+
+CREATE TRIGGER IF NOT EXISTS plano_entradas_slots_insert
+AFTER INSERT ON tb_plano_entradas
+BEGIN
+    UPDATE tb_plano_slots
+    SET ordem = ordem + COALESCE(expand_capitulos_fim(NEW.capitulos) - expand_capitulos_inicio(NEW.capitulos) + 1, 0)
+    WHERE plano_id = NEW.plano_id
+      AND (data_leitura > NEW.data_leitura OR (data_leitura = NEW.data_leitura AND entrada_id > NEW.id));
+    INSERT INTO tb_plano_slots (plano_id, ordem, data_leitura, id_livro, capitulo, entrada_id)
+    SELECT
+        NEW.plano_id,
+        (
+            SELECT count(*) FROM tb_plano_slots s
+            WHERE s.plano_id = NEW.plano_id
+              AND (s.data_leitura < NEW.data_leitura OR (s.data_leitura = NEW.data_leitura AND s.entrada_id < NEW.id))
+        ) + _numeros.n,
+        NEW.data_leitura,
+        NEW.id_livro,
+        expand_capitulos_inicio(NEW.capitulos) + _numeros.n,
+        NEW.id
+    FROM _numeros
+    WHERE _numeros.n <= expand_capitulos_fim(NEW.capitulos) - expand_capitulos_inicio(NEW.capitulos);
+END;
+
+CREATE TRIGGER IF NOT EXISTS plano_entradas_slots_delete
+AFTER DELETE ON tb_plano_entradas
+BEGIN
+    DELETE FROM tb_plano_slots WHERE entrada_id = OLD.id;
+    UPDATE tb_plano_slots
+    SET ordem = ordem - COALESCE(expand_capitulos_fim(OLD.capitulos) - expand_capitulos_inicio(OLD.capitulos) + 1, 0)
+    WHERE plano_id = OLD.plano_id
+      AND (data_leitura > OLD.data_leitura OR (data_leitura = OLD.data_leitura AND entrada_id > OLD.id));
+END;
+
+CREATE TRIGGER IF NOT EXISTS plano_entradas_slots_update
+AFTER UPDATE OF plano_id, data_leitura, id_livro, capitulos ON tb_plano_entradas
+BEGIN
+    DELETE FROM tb_plano_slots WHERE entrada_id = OLD.id;
+    UPDATE tb_plano_slots
+    SET ordem = ordem - COALESCE(expand_capitulos_fim(OLD.capitulos) - expand_capitulos_inicio(OLD.capitulos) + 1, 0)
+    WHERE plano_id = OLD.plano_id
+      AND (data_leitura > OLD.data_leitura OR (data_leitura = OLD.data_leitura AND entrada_id > OLD.id));
+    UPDATE tb_plano_slots
+    SET ordem = ordem + COALESCE(expand_capitulos_fim(NEW.capitulos) - expand_capitulos_inicio(NEW.capitulos) + 1, 0)
+    WHERE plano_id = NEW.plano_id
+      AND (data_leitura > NEW.data_leitura OR (data_leitura = NEW.data_leitura AND entrada_id > NEW.id));
+    INSERT INTO tb_plano_slots (plano_id, ordem, data_leitura, id_livro, capitulo, entrada_id)
+    SELECT
+        NEW.plano_id,
+        (
+            SELECT count(*) FROM tb_plano_slots s
+            WHERE s.plano_id = NEW.plano_id
+              AND (s.data_leitura < NEW.data_leitura OR (s.data_leitura = NEW.data_leitura AND s.entrada_id < NEW.id))
+        ) + _numeros.n,
+        NEW.data_leitura,
+        NEW.id_livro,
+        expand_capitulos_inicio(NEW.capitulos) + _numeros.n,
+        NEW.id
+    FROM _numeros
+    WHERE _numeros.n <= expand_capitulos_fim(NEW.capitulos) - expand_capitulos_inicio(NEW.capitulos);
+END;
+
+-- Carga inicial para bancos criados antes da tabela de slots.
+INSERT INTO tb_plano_slots (plano_id, ordem, data_leitura, id_livro, capitulo, entrada_id)
+SELECT
+    pe.plano_id,
+    ROW_NUMBER() OVER (PARTITION BY pe.plano_id ORDER BY pe.data_leitura, pe.id, _numeros.n) - 1,
+    pe.data_leitura,
+    pe.id_livro,
+    expand_capitulos_inicio(pe.capitulos) + _numeros.n,
+    pe.id
+FROM tb_plano_entradas pe
+JOIN _numeros ON _numeros.n <= expand_capitulos_fim(pe.capitulos) - expand_capitulos_inicio(pe.capitulos)
+WHERE NOT EXISTS (SELECT 1 FROM tb_plano_slots);
+
+-- tb_livros é populada pelo LocalClient a partir de src/books.py (BUNDLED_BOOKS).
+
+-- Progresso materializado do dashboard (ver scripts/ddl.sql). O SQLite não tem
+-- triggers por comando, então as metas são mantidas de forma incremental por linha.
+CREATE TABLE IF NOT EXISTS tb_plano_metas_diarias (
+    plano_id INTEGER NOT NULL REFERENCES tb_planos(id) ON DELETE CASCADE,
+    data_leitura TEXT NOT NULL,
+    capitulos_dia INTEGER NOT NULL,
+    meta_acumulada INTEGER NOT NULL,
+    PRIMARY KEY (plano_id, data_leitura)
+);
+
+CREATE TABLE IF NOT EXISTS tb_progresso_usuarios (
+    usuario_id INTEGER NOT NULL REFERENCES tb_usuarios(id) ON DELETE CASCADE,
+    plano_id INTEGER NOT NULL REFERENCES tb_planos(id) ON DELETE CASCADE,
+    lidos INTEGER NOT NULL DEFAULT 0,
+    updated_at TEXT DEFAULT (strftime('%Y-%m-%dT%H:%M:%fZ', 'now')),
+    PRIMARY KEY (usuario_id, plano_id)
+);
+
+CREATE TRIGGER IF NOT EXISTS plano_entradas_metas_insert
+AFTER INSERT ON tb_plano_entradas
+BEGIN
+    INSERT OR IGNORE INTO tb_plano_metas_diarias (plano_id, data_leitura, capitulos_dia, meta_acumulada)
+    VALUES (
+        NEW.plano_id,
+        NEW.data_leitura,
+        0,
+        COALESCE((
+            SELECT meta_acumulada FROM tb_plano_metas_diarias
+            WHERE plano_id = NEW.plano_id AND data_leitura < NEW.data_leitura
+            ORDER BY data_leitura DESC LIMIT 1
+        ), 0)
+    );
+    UPDATE tb_plano_metas_diarias
+    SET capitulos_dia = capitulos_dia + COALESCE(expand_capitulos_fim(NEW.capitulos) - expand_capitulos_inicio(NEW.capitulos) + 1, 0)
+    WHERE plano_id = NEW.plano_id AND data_leitura = NEW.data_leitura;
+    UPDATE tb_plano_metas_diarias
+    SET meta_acumulada = meta_acumulada + COALESCE(expand_capitulos_fim(NEW.capitulos) - expand_capitulos_inicio(NEW.capitulos) + 1, 0)
+    WHERE plano_id = NEW.plano_id AND data_leitura >= NEW.data_leitura;
+END;
+
+CREATE TRIGGER IF NOT EXISTS plano_entradas_metas_delete
+AFTER DELETE ON tb_plano_entradas
+BEGIN
+    UPDATE tb_plano_metas_diarias
+    SET capitulos_dia = capitulos_dia - COALESCE(expand_capitulos_fim(OLD.capitulos) - expand_capitulos_inicio(OLD.capitulos) + 1, 0)
+    WHERE plano_id = OLD.plano_id AND data_leitura = OLD.data_leitura;
+    UPDATE tb_plano_metas_diarias
+    SET meta_acumulada = meta_acumulada - COALESCE(expand_capitulos_fim(OLD.capitulos) - expand_capitulos_inicio(OLD.capitulos) + 1, 0)
+    WHERE plano_id = OLD.plano_id AND data_leitura >= OLD.data_leitura;
+END;
+
+CREATE TRIGGER IF NOT EXISTS plano_entradas_metas_update
+AFTER UPDATE OF plano_id, data_leitura, capitulos ON tb_plano_entradas
+BEGIN
+    UPDATE tb_plano_metas_diarias
+    SET capitulos_dia = capitulos_dia - COALESCE(expand_capitulos_fim(OLD.capitulos) - expand_capitulos_inicio(OLD.capitulos) + 1, 0)
+    WHERE plano_id = OLD.plano_id AND data_leitura = OLD.data_leitura;
+    UPDATE tb_plano_metas_diarias
+    SET meta_acumulada = meta_acumulada - COALESCE(expand_capitulos_fim(OLD.capitulos) - expand_capitulos_inicio(OLD.capitulos) + 1, 0)
+    WHERE plano_id = OLD.plano_id AND data_leitura >= OLD.data_leitura;
+    INSERT OR IGNORE INTO tb_plano_metas_diarias (plano_id, data_leitura, capitulos_dia, meta_acumulada)
+    VALUES (
+        NEW.plano_id,
+        NEW.data_leitura,
+        0,
+        COALESCE((
+            SELECT meta_acumulada FROM tb_plano_metas_diarias
+            WHERE plano_id = NEW.plano_id AND data_leitura < NEW.data_leitura
+            ORDER BY data_leitura DESC LIMIT 1
+        ), 0)
+    );
+    UPDATE tb_plano_metas_diarias
+    SET capitulos_dia = capitulos_dia + COALESCE(expand_capitulos_fim(NEW.capitulos) - expand_capitulos_inicio(NEW.capitulos) + 1, 0)
+    WHERE plano_id = NEW.plano_id AND data_leitura = NEW.data_leitura;
+    UPDATE tb_plano_metas_diarias
+    SET meta_acumulada = meta_acumulada + COALESCE(expand_capitulos_fim(NEW.capitulos) - expand_capitulos_inicio(NEW.capitulos) + 1, 0)
+    WHERE plano_id = NEW.plano_id AND data_leitura >= NEW.data_leitura;
+END;
+
+CREATE TRIGGER IF NOT EXISTS leituras_progresso_insert
+AFTER INSERT ON tb_leituras
+BEGIN
+    INSERT INTO tb_progresso_usuarios (usuario_id, plano_id, lidos)
+    VALUES (NEW.usuario_id, NEW.plano_id, 1)
+    ON CONFLICT (usuario_id, plano_id) DO UPDATE
+    SET lidos = lidos + 1, updated_at = strftime('%Y-%m-%dT%H:%M:%fZ', 'now');
+END;
+
+CREATE TRIGGER IF NOT EXISTS leituras_progresso_delete
+AFTER DELETE ON tb_leituras
+BEGIN
+    UPDATE tb_progresso_usuarios
+    SET lidos = lidos - 1, updated_at = strftime('%Y-%m-%dT%H:%M:%fZ', 'now')
+    WHERE usuario_id = OLD.usuario_id AND plano_id = OLD.plano_id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS leituras_progresso_update
+AFTER UPDATE OF usuario_id, plano_id ON tb_leituras
+BEGIN
+    UPDATE tb_progresso_usuarios
+    SET lidos = lidos - 1, updated_at = strftime('%Y-%m-%dT%H:%M:%fZ', 'now')
+    WHERE usuario_id = OLD.usuario_id AND plano_id = OLD.plano_id;
+    INSERT INTO tb_progresso_usuarios (usuario_id, plano_id, lidos)
+    VALUES (NEW.usuario_id, NEW.plano_id, 1)
+    ON CONFLICT (usuario_id, plano_id) DO UPDATE
+    SET lidos = lidos + 1, updated_at = strftime('%Y-%m-%dT%H:%M:%fZ', 'now');
+END;
+
+-- Carga inicial para bancos criados antes das tabelas materializadas.
+INSERT OR IGNORE INTO tb_plano_metas_diarias (plano_id, data_leitura, capitulos_dia, meta_acumulada)
+SELECT
+    plano_id,
+    data_leitura,
+    capitulos_dia,
+    SUM(capitulos_dia) OVER (PARTITION BY plano_id ORDER BY data_leitura)
+FROM (
+    SELECT
+        plano_id,
+        data_leitura,
+        SUM(COALESCE(expand_capitulos_fim(capitulos) - expand_capitulos_inicio(capitulos) + 1, 0)) AS capitulos_dia
+    FROM tb_plano_entradas
+    GROUP BY plano_id, data_leitura
+);
+
+INSERT OR IGNORE INTO tb_progresso_usuarios (usuario_id, plano_id, lidos)
+SELECT usuario_id, plano_id, count(*) FROM tb_leituras GROUP BY usuario_id, plano_id;
+
+DROP VIEW IF EXISTS vw_dashboard_progresso;
+CREATE VIEW vw_dashboard_progresso AS
+SELECT
+  u.nome AS "Usuario",
+  p.nome AS "Plano",
+  pu.lidos AS "Lidos",
+  COALESCE((
+    SELECT m.meta_acumulada FROM tb_plano_metas_diarias m
+    WHERE m.plano_id = pu.plano_id AND m.data_leitura <= hoje_br()
+    ORDER BY m.data_leitura DESC LIMIT 1
+  ), 0) AS "Meta_Hoje",
+  (
+    SELECT m.meta_acumulada FROM tb_plano_metas_diarias m
+    WHERE m.plano_id = pu.plano_id
+    ORDER BY m.data_leitura DESC LIMIT 1
+  ) AS "Total_Plano",
+  CASE
+    WHEN pu.lidos >= COALESCE((
+      SELECT m.meta_acumulada FROM tb_plano_metas_diarias m
+      WHERE m.plano_id = pu.plano_id AND m.data_leitura <= hoje_br()
+      ORDER BY m.data_leitura DESC LIMIT 1
+    ), 0) THEN 'Em dia'
+    ELSE 'Atrasado'
+  END AS "Status"
+FROM tb_progresso_usuarios pu
+JOIN tb_usuarios u ON u.id = pu.usuario_id
+JOIN tb_planos p ON p.id = pu.plano_id
+WHERE pu.lidos > 0
+  AND EXISTS (SELECT 1 FROM tb_plano_metas_diarias m WHERE m.plano_id = pu.plano_id);
+
+DROP VIEW IF EXISTS vw_livros_concluidos_pendentes;
+CREATE VIEW vw_livros_concluidos_pendentes AS
+WITH
+  alvo AS (
+    SELECT plano_id, id_livro, count(DISTINCT capitulo) AS capitulos_alvo
+    FROM tb_plano_slots
+    GROUP BY plano_id, id_livro
+  ),
+  lidos AS (
+    SELECT usuario_id, plano_id, id_livro, count(DISTINCT capitulo) AS capitulos_lidos
+    FROM tb_leituras
+    GROUP BY usuario_id, plano_id, id_livro
+  )
+SELECT lidos.usuario_id, lidos.plano_id, lidos.id_livro
+FROM lidos
+JOIN alvo ON alvo.plano_id = lidos.plano_id AND alvo.id_livro = lidos.id_livro
+WHERE alvo.capitulos_alvo > 0
+  AND lidos.capitulos_lidos >= alvo.capitulos_alvo
+  AND NOT EXISTS (
+    SELECT 1
+    FROM tb_livros_concluidos c
+    WHERE c.usuario_id = lidos.usuario_id AND c.plano_id = lidos.plano_id AND c.id_livro = lidos.id_livro
+  );
+
+-- Estatísticas de leitura por usuário (ver scripts/ddl.sql). Sem triggers por comando,
+-- a projeção é mantida em cascata: tb_leituras atualiza as tabelas por capítulo, dia
+-- e mês; um capítulo novo ajusta os contadores e um dia novo recalcula as sequências.
+CREATE TABLE IF NOT EXISTS tb_estatisticas_usuarios (
+    usuario_id INTEGER PRIMARY KEY REFERENCES tb_usuarios(id) ON DELETE CASCADE,
+    capitulos_unicos INTEGER NOT NULL DEFAULT 0,
+    capitulos_canonicos INTEGER NOT NULL DEFAULT 0,
+    cobertura REAL NOT NULL DEFAULT 0,
+    ultima_data TEXT,
+    sequencia_atual INTEGER NOT NULL DEFAULT 0,
+    maior_sequencia INTEGER NOT NULL DEFAULT 0,
+    updated_at TEXT DEFAULT (strftime('%Y-%m-%dT%H:%M:%fZ', 'now')),
+    livros_concluidos INTEGER NOT NULL DEFAULT 0
+);
+
+CREATE TABLE IF NOT EXISTS tb_leituras_mensais_usuarios (
+    usuario_id INTEGER NOT NULL REFERENCES tb_estatisticas_usuarios(usuario_id) ON DELETE CASCADE,
+    mes TEXT NOT NULL,
+    capitulos INTEGER NOT NULL,
+    PRIMARY KEY (usuario_id, mes)
+);
+
+CREATE TABLE IF NOT EXISTS tb_leituras_dias_usuarios (
+    usuario_id INTEGER NOT NULL REFERENCES tb_usuarios(id) ON DELETE CASCADE,
+    data_leitura TEXT NOT NULL,
+    capitulos INTEGER NOT NULL,
+    PRIMARY KEY (usuario_id, data_leitura)
+);
+
+CREATE TABLE IF NOT EXISTS tb_capitulos_lidos_usuarios (
+    usuario_id INTEGER NOT NULL REFERENCES tb_usuarios(id) ON DELETE CASCADE,
+    id_livro INTEGER NOT NULL REFERENCES tb_livros(id),
+    capitulo INTEGER NOT NULL,
+    leituras INTEGER NOT NULL,
+    PRIMARY KEY (usuario_id, id_livro, capitulo)
+);
+
+CREATE TRIGGER IF NOT EXISTS leituras_estatisticas_insert
+AFTER INSERT ON tb_leituras
+BEGIN
+    INSERT OR IGNORE INTO tb_estatisticas_usuarios (usuario_id) VALUES (NEW.usuario_id);
+    INSERT INTO tb_capitulos_lidos_usuarios (usuario_id, id_livro, capitulo, leituras)
+    VALUES (NEW.usuario_id, NEW.id_livro, NEW.capitulo, 1)
+    ON CONFLICT (usuario_id, id_livro, capitulo) DO UPDATE SET leituras = leituras + 1;
+    INSERT INTO tb_leituras_dias_usuarios (usuario_id, data_leitura, capitulos)
+    SELECT NEW.usuario_id, NEW.data_leitura_plano, 1 WHERE NEW.data_leitura_plano IS NOT NULL
+    ON CONFLICT (usuario_id, data_leitura) DO UPDATE SET capitulos = capitulos + 1;
+    INSERT INTO tb_leituras_mensais_usuarios (usuario_id, mes, capitulos)
+    SELECT NEW.usuario_id, substr(NEW.data_leitura_plano, 1, 7) || '-01', 1 WHERE NEW.data_leitura_plano IS NOT NULL
+    ON CONFLICT (usuario_id, mes) DO UPDATE SET capitulos = capitulos + 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS leituras_estatisticas_delete
+AFTER DELETE ON tb_leituras
+BEGIN
+    UPDATE tb_capitulos_lidos_usuarios SET leituras = leituras - 1
+    WHERE usuario_id = OLD.usuario_id AND id_livro = OLD.id_livro AND capitulo = OLD.capitulo;
+    UPDATE tb_leituras_dias_usuarios SET capitulos = capitulos - 1
+    WHERE usuario_id = OLD.usuario_id AND data_leitura = OLD.data_leitura_plano;
+    UPDATE tb_leituras_mensais_usuarios SET capitulos = capitulos - 1
+    WHERE usuario_id = OLD.usuario_id AND mes = substr(OLD.data_leitura_plano, 1, 7) || '-01';
+    DELETE FROM tb_capitulos_lidos_usuarios WHERE usuario_id = OLD.usuario_id AND leituras <= 0;
+    DELETE FROM tb_leituras_dias_usuarios WHERE usuario_id = OLD.usuario_id AND capitulos <= 0;
+    DELETE FROM tb_leituras_mensais_usuarios WHERE usuario_id = OLD.usuario_id AND capitulos <= 0;
+END;
+
+CREATE TRIGGER IF NOT EXISTS leituras_estatisticas_update
+AFTER UPDATE OF usuario_id, id_livro, capitulo, data_leitura_plano ON tb_leituras
+BEGIN
+    UPDATE tb_capitulos_lidos_usuarios SET leituras = leituras - 1
+    WHERE usuario_id = OLD.usuario_id AND id_livro = OLD.id_livro AND capitulo = OLD.capitulo;
+    UPDATE tb_leituras_dias_usuarios SET capitulos = capitulos - 1
+    WHERE usuario_id = OLD.usuario_id AND data_leitura = OLD.data_leitura_plano;
+    UPDATE tb_leituras_mensais_usuarios SET capitulos = capitulos - 1
+    WHERE usuario_id = OLD.usuario_id AND mes = substr(OLD.data_leitura_plano, 1, 7) || '-01';
+    DELETE FROM tb_capitulos_lidos_usuarios WHERE usuario_id = OLD.usuario_id AND leituras <= 0;
+    DELETE FROM tb_leituras_dias_usuarios WHERE usuario_id = OLD.usuario_id AND capitulos <= 0;
+    DELETE FROM tb_leituras_mensais_usuarios WHERE usuario_id = OLD.usuario_id AND capitulos <= 0;
+    INSERT OR IGNORE INTO tb_estatisticas_usuarios (usuario_id) VALUES (NEW.usuario_id);
+    INSERT INTO tb_capitulos_lidos_usuarios (usuario_id, id_livro, capitulo, leituras)
+    VALUES (NEW.usuario_id, NEW.id_livro, NEW.capitulo, 1)
+    ON CONFLICT (usuario_id, id_livro, capitulo) DO UPDATE SET leituras = leituras + 1;
+    INSERT INTO tb_leituras_dias_usuarios (usuario_id, data_leitura, capitulos)
+    SELECT NEW.usuario_id, NEW.data_leitura_plano, 1 WHERE NEW.data_leitura_plano IS NOT NULL
+    ON CONFLICT (usuario_id, data_leitura) DO UPDATE SET capitulos = capitulos + 1;
+    INSERT INTO tb_leituras_mensais_usuarios (usuario_id, mes, capitulos)
+    SELECT NEW.usuario_id, substr(NEW.data_leitura_plano, 1, 7) || '-01', 1 WHERE NEW.data_leitura_plano IS NOT NULL
+    ON CONFLICT (usuario_id, mes) DO UPDATE SET capitulos = capitulos + 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS capitulos_lidos_insert
+AFTER INSERT ON tb_capitulos_lidos_usuarios
+BEGIN
+    UPDATE tb_estatisticas_usuarios
+    SET
+        capitulos_unicos = capitulos_unicos + 1,
+        capitulos_canonicos = capitulos_canonicos + ((NEW.capitulo BETWEEN 1 AND COALESCE((SELECT chapters FROM tb_livros WHERE id = NEW.id_livro), 0)))
+    WHERE usuario_id = NEW.usuario_id;
+    UPDATE tb_estatisticas_usuarios
+    SET
+        cobertura = COALESCE(capitulos_canonicos * 1.0 / (SELECT NULLIF(sum(chapters), 0) FROM tb_livros), 0),
+        updated_at = strftime('%Y-%m-%dT%H:%M:%fZ', 'now')
+    WHERE usuario_id = NEW.usuario_id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS capitulos_lidos_delete
+AFTER DELETE ON tb_capitulos_lidos_usuarios
+BEGIN
+    UPDATE tb_estatisticas_usuarios
+    SET
+        capitulos_unicos = capitulos_unicos - 1,
+        capitulos_canonicos = capitulos_canonicos - ((OLD.capitulo BETWEEN 1 AND COALESCE((SELECT chapters FROM tb_livros WHERE id = OLD.id_livro), 0)))
+    WHERE usuario_id = OLD.usuario_id;
+    UPDATE tb_estatisticas_usuarios
+    SET
+        cobertura = COALESCE(capitulos_canonicos * 1.0 / (SELECT NULLIF(sum(chapters), 0) FROM tb_livros), 0),
+        updated_at = strftime('%Y-%m-%dT%H:%M:%fZ', 'now')
+    WHERE usuario_id = OLD.usuario_id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS leituras_dias_insert
+AFTER INSERT ON tb_leituras_dias_usuarios
+BEGIN
+    UPDATE tb_estatisticas_usuarios
+    SET
+        ultima_data = (
+            SELECT max(data_leitura) FROM tb_leituras_dias_usuarios
+            WHERE usuario_id = NEW.usuario_id AND data_leitura <= hoje_br()
+        ),
+        sequencia_atual = COALESCE((
+            SELECT count(*) FROM (
+                SELECT julianday(data_leitura) - ROW_NUMBER() OVER (ORDER BY data_leitura) AS grupo
+                FROM tb_leituras_dias_usuarios
+                WHERE usuario_id = NEW.usuario_id AND data_leitura <= hoje_br()
+            )
+            WHERE grupo = (
+                SELECT julianday(max(data_leitura)) - count(*) FROM tb_leituras_dias_usuarios
+                WHERE usuario_id = NEW.usuario_id AND data_leitura <= hoje_br()
+            )
+        ), 0),
+        maior_sequencia = COALESCE((
+            SELECT max(tamanho) FROM (
+                SELECT count(*) AS tamanho FROM (
+                    SELECT julianday(data_leitura) - ROW_NUMBER() OVER (ORDER BY data_leitura) AS grupo
+                    FROM tb_leituras_dias_usuarios
+                    WHERE usuario_id = NEW.usuario_id AND data_leitura <= hoje_br()
+                )
+                GROUP BY grupo
+            )
+        ), 0),
+        updated_at = strftime('%Y-%m-%dT%H:%M:%fZ', 'now')
+    WHERE usuario_id = NEW.usuario_id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS leituras_dias_delete
+AFTER DELETE ON tb_leituras_dias_usuarios
+BEGIN
+    UPDATE tb_estatisticas_usuarios
+    SET
+        ultima_data = (
+            SELECT max(data_leitura) FROM tb_leituras_dias_usuarios
+            WHERE usuario_id = OLD.usuario_id AND data_leitura <= hoje_br()
+        ),
+        sequencia_atual = COALESCE((
+            SELECT count(*) FROM (
+                SELECT julianday(data_leitura) - ROW_NUMBER() OVER (ORDER BY data_leitura) AS grupo
+                FROM tb_leituras_dias_usuarios
+                WHERE usuario_id = OLD.usuario_id AND data_leitura <= hoje_br()
+            )
+            WHERE grupo = (
+                SELECT julianday(max(data_leitura)) - count(*) FROM tb_leituras_dias_usuarios
+                WHERE usuario_id = OLD.usuario_id AND data_leitura <= hoje_br()
+            )
+        ), 0),
+        maior_sequencia = COALESCE((
+            SELECT max(tamanho) FROM (
+                SELECT count(*) AS tamanho FROM (
+                    SELECT julianday(data_leitura) - ROW_NUMBER() OVER (ORDER BY data_leitura) AS grupo
+                    FROM tb_leituras_dias_usuarios
+                    WHERE usuario_id = OLD.usuario_id AND data_leitura <= hoje_br()
+                )
+                GROUP BY grupo
+            )
+        ), 0),
+        updated_at = strftime('%Y-%m-%dT%H:%M:%fZ', 'now')
+    WHERE usuario_id = OLD.usuario_id;
+END;
+
+-- Carga inicial para bancos criados antes da projeção (os triggers acima calculam
+-- os contadores e as sequências à medida que as linhas auxiliares são inseridas).
+INSERT OR IGNORE INTO tb_estatisticas_usuarios (usuario_id)
+SELECT DISTINCT usuario_id FROM tb_leituras;
+
+INSERT INTO tb_capitulos_lidos_usuarios (usuario_id, id_livro, capitulo, leituras)
+SELECT usuario_id, id_livro, capitulo, count(*) FROM tb_leituras
+WHERE NOT EXISTS (SELECT 1 FROM tb_capitulos_lidos_usuarios)
+GROUP BY usuario_id, id_livro, capitulo;
+
+INSERT INTO tb_leituras_dias_usuarios (usuario_id, data_leitura, capitulos)
+SELECT usuario_id, data_leitura_plano, count(*) FROM tb_leituras
+WHERE data_leitura_plano IS NOT NULL AND NOT EXISTS (SELECT 1 FROM tb_leituras_dias_usuarios)
+GROUP BY usuario_id, data_leitura_plano;
+
+INSERT INTO tb_leituras_mensais_usuarios (usuario_id, mes, capitulos)
+SELECT usuario_id, substr(data_leitura_plano, 1, 7) || '-01', count(*) FROM tb_leituras
+WHERE data_leitura_plano IS NOT NULL AND NOT EXISTS (SELECT 1 FROM tb_leituras_mensais_usuarios)
+GROUP BY usuario_id, substr(data_leitura_plano, 1, 7);
+
+-- Mural de dúvidas: contagem de respostas mantida por trigger (ver scripts/ddl.sql).
+CREATE INDEX IF NOT EXISTS idx_perguntas_mural ON tb_perguntas (respondida, id DESC);
+CREATE INDEX IF NOT EXISTS idx_respostas_pergunta ON tb_respostas (pergunta_id, id);
+
+CREATE TRIGGER IF NOT EXISTS respostas_total_insert
+AFTER INSERT ON tb_respostas
+BEGIN
+    UPDATE tb_perguntas SET total_respostas = total_respostas + 1 WHERE id = NEW.pergunta_id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS respostas_total_delete
+AFTER DELETE ON tb_respostas
+BEGIN
+    UPDATE tb_perguntas SET total_respostas = total_respostas - 1 WHERE id = OLD.pergunta_id;
+END;
+
+-- Busca textual no mural (ver scripts/ddl.sql). O FTS5 não tem stemmer do português:
+-- o texto é gravado já normalizado por 'normaliza_busca' (src/search.py), e o rowid
+-- do índice é o ID da pergunta.
+CREATE VIRTUAL TABLE IF NOT EXISTS tb_perguntas_busca USING fts5(pergunta, respostas);
+
+CREATE TRIGGER IF NOT EXISTS perguntas_busca_insert
+AFTER INSERT ON tb_perguntas
+BEGIN
+    INSERT INTO tb_perguntas_busca (rowid, pergunta, respostas)
+    VALUES (NEW.id, normaliza_busca(NEW.pergunta_texto), '');
+END;
+
+CREATE TRIGGER IF NOT EXISTS perguntas_busca_update
+AFTER UPDATE OF pergunta_texto ON tb_perguntas
+BEGIN
+    UPDATE tb_perguntas_busca SET pergunta = normaliza_busca(NEW.pergunta_texto) WHERE rowid = NEW.id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS perguntas_busca_delete
+AFTER DELETE ON tb_perguntas
+BEGIN
+    DELETE FROM tb_perguntas_busca WHERE rowid = OLD.id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS respostas_busca_insert
+AFTER INSERT ON tb_respostas
+BEGIN
+    UPDATE tb_perguntas_busca
+    SET respostas = normaliza_busca((SELECT group_concat(resposta_texto, ' ') FROM tb_respostas WHERE pergunta_id = NEW.pergunta_id))
+    WHERE rowid = NEW.pergunta_id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS respostas_busca_delete
+AFTER DELETE ON tb_respostas
+BEGIN
+    UPDATE tb_perguntas_busca
+    SET respostas = normaliza_busca((SELECT group_concat(resposta_texto, ' ') FROM tb_respostas WHERE pergunta_id = OLD.pergunta_id))
+    WHERE rowid = OLD.pergunta_id;
+END;
+
+-- Carga inicial para bancos criados antes do índice de busca.
+INSERT INTO tb_perguntas_busca (rowid, pergunta, respostas)
+SELECT
+    p.id,
+    normaliza_busca(p.pergunta_texto),
+    normaliza_busca((SELECT group_concat(r.resposta_texto, ' ') FROM tb_respostas r WHERE r.pergunta_id = p.id))
+FROM tb_perguntas p
+WHERE NOT EXISTS (SELECT 1 FROM tb_perguntas_busca);
+
+-- Ranking de conclusões: livros distintos concluídos por usuário (ver scripts/ddl.sql).
+CREATE INDEX IF NOT EXISTS idx_estatisticas_ranking
+ON tb_estatisticas_usuarios (livros_concluidos DESC, usuario_id);
+
+CREATE TRIGGER IF NOT EXISTS livros_concluidos_ranking_insert
+AFTER INSERT ON tb_livros_concluidos
+BEGIN
+    INSERT OR IGNORE INTO tb_estatisticas_usuarios (usuario_id) VALUES (NEW.usuario_id);
+    UPDATE tb_estatisticas_usuarios
+    SET livros_concluidos = (
+        SELECT count(DISTINCT id_livro) FROM tb_livros_concluidos WHERE usuario_id = NEW.usuario_id
+    )
+    WHERE usuario_id = NEW.usuario_id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS livros_concluidos_ranking_delete
+AFTER DELETE ON tb_livros_concluidos
+BEGIN
+    UPDATE tb_estatisticas_usuarios
+    SET livros_concluidos = (
+        SELECT count(DISTINCT id_livro) FROM tb_livros_concluidos WHERE usuario_id = OLD.usuario_id
+    )
+    WHERE usuario_id = OLD.usuario_id;
+END;
+
+-- Carga inicial (idempotente) para bancos com conclusões anteriores ao ranking.
+INSERT OR IGNORE INTO tb_estatisticas_usuarios (usuario_id)
+SELECT DISTINCT usuario_id FROM tb_livros_concluidos;
+
+UPDATE tb_estatisticas_usuarios
+SET livros_concluidos = (
+    SELECT count(DISTINCT c.id_livro) FROM tb_livros_concluidos c
+    WHERE c.usuario_id = tb_estatisticas_usuarios.usuario_id
+)
+WHERE livros_concluidos = 0
+    AND EXISTS (SELECT 1 FROM tb_livros_concluidos c WHERE c.usuario_id = tb_estatisticas_usuarios.usuario_id);
+
+-- Versões dos dados para a validação dos caches (ver scripts/ddl.sql). Sem triggers
+-- por comando, o contador é incrementado a cada linha alterada.
+CREATE TABLE IF NOT EXISTS tb_versoes_dados (
+    tabela TEXT PRIMARY KEY,
+    versao INTEGER NOT NULL DEFAULT 0,
+    updated_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+
+INSERT OR IGNORE INTO tb_versoes_dados (tabela) VALUES
+    ('tb_usuarios'),
+    ('tb_planos'),
+    ('tb_plano_entradas'),
+    ('tb_livros_concluidos'),
+    ('tb_perguntas'),
+    ('tb_respostas');
+
+CREATE TRIGGER IF NOT EXISTS usuarios_versao_insert
+AFTER INSERT ON tb_usuarios
+BEGIN
+    UPDATE tb_versoes_dados SET versao = versao + 1, updated_at = CURRENT_TIMESTAMP WHERE tabela = 'tb_usuarios';
+END;
+
+CREATE TRIGGER IF NOT EXISTS usuarios_versao_update
+AFTER UPDATE ON tb_usuarios
+BEGIN
+    UPDATE tb_versoes_dados SET versao = versao + 1, updated_at = CURRENT_TIMESTAMP WHERE tabela = 'tb_usuarios';
+END;
+
+CREATE TRIGGER IF NOT EXISTS usuarios_versao_delete
+AFTER DELETE ON tb_usuarios
+BEGIN
+    UPDATE tb_versoes_dados SET versao = versao + 1, updated_at = CURRENT_TIMESTAMP WHERE tabela = 'tb_usuarios';
+END;
+
+CREATE TRIGGER IF NOT EXISTS planos_versao_insert
+AFTER INSERT ON tb_planos
+BEGIN
+    UPDATE tb_versoes_dados SET versao = versao + 1, updated_at = CURRENT_TIMESTAMP WHERE tabela = 'tb_planos';
+END;
+
+CREATE TRIGGER IF NOT EXISTS planos_versao_update
+AFTER UPDATE ON tb_planos
+BEGIN
+    UPDATE tb_versoes_dados SET versao = versao + 1, updated_at = CURRENT_TIMESTAMP WHERE tabela = 'tb_planos';
+END;
+
+CREATE TRIGGER IF NOT EXISTS planos_versao_delete
+AFTER DELETE ON tb_planos
+BEGIN
+    UPDATE tb_versoes_dados SET versao = versao + 1, updated_at = CURRENT_TIMESTAMP WHERE tabela = 'tb_planos';
+END;
+
+CREATE TRIGGER IF NOT EXISTS plano_entradas_versao_insert
+AFTER INSERT ON tb_plano_entradas
+BEGIN
+    UPDATE tb_versoes_dados SET versao = versao + 1, updated_at = CURRENT_TIMESTAMP WHERE tabela = 'tb_plano_entradas';
+END;
+
+CREATE TRIGGER IF NOT EXISTS plano_entradas_versao_update
+AFTER UPDATE ON tb_plano_entradas
+BEGIN
+    UPDATE tb_versoes_dados SET versao = versao + 1, updated_at = CURRENT_TIMESTAMP WHERE tabela = 'tb_plano_entradas';
+END;
+
+CREATE TRIGGER IF NOT EXISTS plano_entradas_versao_delete
+AFTER DELETE ON tb_plano_entradas
+BEGIN
+    UPDATE tb_versoes_dados SET versao = versao + 1, updated_at = CURRENT_TIMESTAMP WHERE tabela = 'tb_plano_entradas';
+END;
+
+-- tb_leituras não é versionada (ver scripts/ddl.sql); remove os triggers de bancos antigos.
+DROP TRIGGER IF EXISTS leituras_versao_insert;
+DROP TRIGGER IF EXISTS leituras_versao_update;
+DROP TRIGGER IF EXISTS leituras_versao_delete;
+DELETE FROM tb_versoes_dados WHERE tabela = 'tb_leituras';
+
+CREATE TRIGGER IF NOT EXISTS livros_concluidos_versao_insert
+AFTER INSERT ON tb_livros_concluidos
+BEGIN
+    UPDATE tb_versoes_dados SET versao = versao + 1, updated_at = CURRENT_TIMESTAMP WHERE tabela = 'tb_livros_concluidos';
+END;
+
+CREATE TRIGGER IF NOT EXISTS livros_concluidos_versao_update
+AFTER UPDATE ON tb_livros_concluidos
+BEGIN
+    UPDATE tb_versoes_dados SET versao = versao + 1, updated_at = CURRENT_TIMESTAMP WHERE tabela = 'tb_livros_concluidos';
+END;
+
+CREATE TRIGGER IF NOT EXISTS livros_concluidos_versao_delete
+AFTER DELETE ON tb_livros_concluidos
+BEGIN
+    UPDATE tb_versoes_dados SET versao = versao + 1, updated_at = CURRENT_TIMESTAMP WHERE tabela = 'tb_livros_concluidos';
+END;
+
+CREATE TRIGGER IF NOT EXISTS perguntas_versao_insert
+AFTER INSERT ON tb_perguntas
+BEGIN
+    UPDATE tb_versoes_dados SET versao = versao + 1, updated_at = CURRENT_TIMESTAMP WHERE tabela = 'tb_perguntas';
+END;
+
+CREATE TRIGGER IF NOT EXISTS perguntas_versao_update
+AFTER UPDATE ON tb_perguntas
+BEGIN
+    UPDATE tb_versoes_dados SET versao = versao + 1, updated_at = CURRENT_TIMESTAMP WHERE tabela = 'tb_perguntas';
+END;
+
+CREATE TRIGGER IF NOT EXISTS perguntas_versao_delete
+AFTER DELETE ON tb_perguntas
+BEGIN
+    UPDATE tb_versoes_dados SET versao = versao + 1, updated_at = CURRENT_TIMESTAMP WHERE tabela = 'tb_perguntas';
+END;
+
+CREATE TRIGGER IF NOT EXISTS respostas_versao_insert
+AFTER INSERT ON tb_respostas
+BEGIN
+    UPDATE tb_versoes_dados SET versao = versao + 1, updated_at = CURRENT_TIMESTAMP WHERE tabela = 'tb_respostas';
+END;
+
+CREATE TRIGGER IF NOT EXISTS respostas_versao_update
+AFTER UPDATE ON tb_respostas
+BEGIN
+    UPDATE tb_versoes_dados SET versao = versao + 1, updated_at = CURRENT_TIMESTAMP WHERE tabela = 'tb_respostas';
+END;
+
+CREATE TRIGGER IF NOT EXISTS respostas_versao_delete
+AFTER DELETE ON tb_respostas
+BEGIN
+    UPDATE tb_versoes_dados SET versao = versao + 1, updated_at = CURRENT_TIMESTAMP WHERE tabela = 'tb_respostas';
+END;
@@ -0,0 +1,480 @@
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field, replace
+from functools import wraps
+from typing import Any, Callable, Hashable, Iterator, Optional, TypeVar, cast
+
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+from src.cache import all_cache_stats, set_access_listener
+
+logger = logging.getLogger(__name__)
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+# Limites superiores (em segundos) dos buckets do histograma de duração das chamadas.
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Intervalo mínimo entre duas gravações do arquivo de métricas, em segundos.
+EXPORT_INTERVAL = 5.0
+
+_PREFIX = "bible_tracker"
+
+
+@dataclass(slots=True)
+class Usage:
+    """Consultas ao banco e acessos a cache observados durante uma chamada ou um rerun."""
+
+    queries: int = 0
+    errors: int = 0
+    rows: int = 0
+    payload_bytes: int = 0
+    db_seconds: float = 0.0
+    cache_hits: int = 0
+    cache_misses: int = 0
+
+    def add(self, other: "Usage") -> None:
+        self.queries += other.queries
+        self.errors += other.errors
+        self.rows += other.rows
+        self.payload_bytes += other.payload_bytes
+        self.db_seconds += other.db_seconds
+        self.cache_hits += other.cache_hits
+        self.cache_misses += other.cache_misses
+
+
+@dataclass(frozen=True)
+class MethodStats:
+    """Contadores acumulados de um método do repositório.
+
+    Os valores são inclusivos: as consultas e os acessos a cache de um método chamado
+    por outro contam para os dois, como o tempo. `errors` soma as exceções propagadas
+    e as consultas que falharam (o repositório trata a maioria delas e segue com um
+    valor padrão).
+    """
+
+    name: str
+    calls: int
+    errors: int
+    seconds: float
+    max_seconds: float
+    usage: Usage
+    buckets: tuple[int, ...]
+
+    @property
+    def mean_seconds(self) -> float:
+        return self.seconds / self.calls if self.calls else 0.0
+
+
+@dataclass(frozen=True)
+class QueryStats:
+    """Contadores acumulados das consultas a uma tabela, view ou função (RPC) do banco."""
+
+    target: str
+    queries: int
+    errors: int
+    seconds: float
+    rows: int
+    payload_bytes: int
+
+
+@dataclass
+class RerunMetrics:
+    """Uso do repositório durante um rerun de uma sessão (ver `track_rerun`)."""
+
+    page: str = ""
+    seconds: float = 0.0
+    usage: Usage = field(default_factory=Usage)
+    calls: dict[str, int] = field(default_factory=dict)
+    method_seconds: dict[str, float] = field(default_factory=dict)
+
+    def summary(self, top: int = 5) -> str:
+        """Resumo em uma linha, com os `top` métodos mais demorados."""
+        u = self.usage
+        methods = sorted(self.method_seconds.items(), key=lambda item: item[1], reverse=True)[:top]
+        detail = ", ".join(f"{name} {self.calls[name]}x {s * 1000:.1f} ms" for name, s in methods)
+        return (
+            f"Rerun '{self.page or '-'}': {self.seconds * 1000:.1f} ms; {u.queries} consultas "
+            f"({u.rows} linhas, {u.payload_bytes / 1024:.1f} KB, {u.db_seconds * 1000:.1f} ms no banco), "
+            f"cache {u.cache_hits}/{u.cache_hits + u.cache_misses} acertos, {u.errors} erros"
+            + (f"; {detail}" if detail else "")
+        )
+
+
+class _MethodCounters:
+    __slots__ = ("calls", "exceptions", "seconds", "max_seconds", "usage", "buckets")
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.exceptions = 0
+        self.seconds = 0.0
+        self.max_seconds = 0.0
+        self.usage = Usage()
+        self.buckets = [0] * (len(DURATION_BUCKETS) + 1)
+
+
+_lock = threading.Lock()
+_methods: dict[str, _MethodCounters] = {}
+_queries: dict[str, Usage] = {}
+_reruns: dict[Hashable, RerunMetrics] = {}
+# Pilha das chamadas instrumentadas em andamento na thread.
+_local = threading.local()
+
+_export_path: Optional[str] = None
+_log_reruns = False
+_last_export = 0.0
+
+
+def _stack() -> list[Usage]:
+    stack: Optional[list[Usage]] = getattr(_local, "stack", None)
+    if stack is None:
+        stack = _local.stack = []
+    return stack
+
+
+def _session_key() -> Hashable:
+    # As threads de `load_concurrently` recebem o contexto da sessão que as disparou.
+    ctx = get_script_run_ctx(suppress_warning=True)
+    return ctx.session_id if ctx is not None else None
+
+
+def _current_rerun() -> Optional[RerunMetrics]:
+    return _reruns.get(_session_key()) if _reruns else None
+
+
+def instrumented(method: F) -> F:
+    """Decora um método do repositório para medir as suas chamadas.
+
+    Registra, pelo nome do método, o número de chamadas, a duração, as exceções e o
+    uso do banco e dos caches durante a chamada.
+    """
+    name = method.__name__
+
+    @wraps(method)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        usage = Usage()
+        stack = _stack()
+        stack.append(usage)
+        start = time.perf_counter()
+        failed = False
+        try:
+            return method(*args, **kwargs)
+        except Exception:
+            failed = True
+            raise
+        finally:
+            elapsed = time.perf_counter() - start
+            stack.pop()
+            _record_call(name, elapsed, failed, usage)
+
+    return cast(F, wrapper)
+
+
+def _record_call(name: str, elapsed: float, failed: bool, usage: Usage) -> None:
+    bucket = next((i for i, limit in enumerate(DURATION_BUCKETS) if elapsed <= limit), -1)
+    rerun = _current_rerun()
+    with _lock:
+        counters = _methods.get(name)
+        if counters is None:
+            counters = _methods[name] = _MethodCounters()
+        counters.calls += 1
+        counters.exceptions += failed
+        counters.seconds += elapsed
+        counters.max_seconds = max(counters.max_seconds, elapsed)
+        counters.usage.add(usage)
+        counters.buckets[bucket] += 1
+        if rerun is not None:
+            rerun.calls[name] = rerun.calls.get(name, 0) + 1
+            rerun.method_seconds[name] = rerun.method_seconds.get(name, 0.0) + elapsed
+
+
+def _record_query(target: str, elapsed: float, rows: int, payload_bytes: int, failed: bool) -> None:
+    usage = Usage(
+        queries=1, errors=int(failed), rows=rows, payload_bytes=payload_bytes, db_seconds=elapsed
+    )
+    for active in _stack():
+        active.add(usage)
+    rerun = _current_rerun()
+    with _lock:
+        _queries.setdefault(target, Usage()).add(usage)
+        if rerun is not None:
+            rerun.usage.add(usage)
+
+
+def _record_cache_access(cache: str, hit: bool) -> None:
+    stack = _stack()
+    rerun = _current_rerun()
+    if not stack and rerun is None:
+        return
+    usage = Usage(cache_hits=int(hit), cache_misses=int(not hit))
+    for active in stack:
+        active.add(usage)
+    if rerun is not None:
+        with _lock:
+            rerun.usage.add(usage)
+
+
+set_access_listener(_record_cache_access)
+
+
+class _InstrumentedQuery:
+    """Construtor de consultas que mede o `execute()` e repassa o resto ao original."""
+
+    __slots__ = ("_query", "_target")
+
+    def __init__(self, query: Any, target: str):
+        self._query = query
+        self._target = target
+
+    def __getattr__(self, name: str) -> Any:
+        attr = getattr(self._query, name)
+        if not callable(attr):
+            # `not_` é uma propriedade que devolve o construtor (ou a negação) seguinte.
+            return _InstrumentedQuery(attr, self._target) if name == "not_" else attr
+
+        def call(*args: Any, **kwargs: Any) -> Any:
+            result = attr(*args, **kwargs)
+            return _InstrumentedQuery(result, self._target) if hasattr(result, "execute") else result
+
+        return call
+
+    def execute(self) -> Any:
+        start = time.perf_counter()
+        try:
+            response = self._query.execute()
+        except Exception:
+            _record_query(self._target, time.perf_counter() - start, 0, 0, failed=True)
+            raise
+        elapsed = time.perf_counter() - start
+        data = response.data
+        rows = len(data) if isinstance(data, list) else int(data is not None)
+        payload = _payload_size(data) if _payload_enabled() else 0
+        _record_query(self._target, elapsed, rows, payload, failed=False)
+        return response
+
+
+def _payload_enabled() -> bool:
+    # Reserializar cada resposta custa tanto quanto decodificá-la: o tamanho só é medido
+    # quando alguém o lê (o arquivo de métricas ou o resumo dos reruns no log).
+    return _export_path is not None or _log_reruns
+
+
+def _payload_size(data: Any) -> int:
+    """Tamanho aproximado da resposta, em bytes, serializada como JSON."""
+    if data is None:
+        return 0
+    try:
+        return len(json.dumps(data, default=str, separators=(",", ":")))
+    except (TypeError, ValueError):
+        return 0
+
+
+class InstrumentedClient:
+    """Envolve o cliente de banco (Supabase ou local) para medir as consultas.
+
+    Cada `execute()` registra a duração, as linhas e o tamanho da resposta, pela
+    tabela ou função consultada e pelas chamadas instrumentadas em andamento. O
+    tamanho só é medido com a exportação ou o log dos reruns ativos (ver
+    `configure_export`); sem eles, fica em zero.
+    """
+
+    def __init__(self, client: Any):
+        self._client = client
+
+    def table(self, table_name: str) -> Any:
+        return _InstrumentedQuery(self._client.table(table_name), table_name)
+
+    def from_(self, table_name: str) -> Any:
+        return _InstrumentedQuery(self._client.from_(table_name), table_name)
+
+    def rpc(self, fn: str, *args: Any, **kwargs: Any) -> Any:
+        return _InstrumentedQuery(self._client.rpc(fn, *args, **kwargs), f"rpc:{fn}")
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._client, name)
+
+
+@contextmanager
+def track_rerun() -> Iterator[RerunMetrics]:
+    """Acompanha o uso do repositório durante um rerun da sessão atual.
+
+    Ao final (inclusive quando o rerun é interrompido por `st.rerun` ou `st.stop`),
+    registra o resumo no log, se ativado, e atualiza o arquivo de métricas.
+
+    Yields:
+        O acumulador do rerun; defina `page` com o nome da página renderizada.
+    """
+    key = _session_key()
+    rerun = RerunMetrics()
+    with _lock:
+        _reruns[key] = rerun
+    start = time.perf_counter()
+    try:
+        yield rerun
+    finally:
+        rerun.seconds = time.perf_counter() - start
+        with _lock:
+            if _reruns.get(key) is rerun:
+                del _reruns[key]
+        if _log_reruns:
+            logger.info(rerun.summary())
+        _export()
+
+
+def method_stats() -> list[MethodStats]:
+    """Retorna os contadores de todos os métodos instrumentados, pelo nome."""
+    with _lock:
+        return [
+            MethodStats(
+                name=name,
+                calls=c.calls,
+                errors=c.exceptions + c.usage.errors,
+                seconds=c.seconds,
+                max_seconds=c.max_seconds,
+                usage=replace(c.usage),
+                buckets=tuple(c.buckets),
+            )
+            for name, c in sorted(_methods.items())
+        ]
+
+
+def query_stats() -> list[QueryStats]:
+    """Retorna os contadores das consultas por tabela, view ou função (RPC)."""
+    with _lock:
+        return [
+            QueryStats(
+                target=target,
+                queries=u.queries,
+                errors=u.errors,
+                seconds=u.db_seconds,
+                rows=u.rows,
+                payload_bytes=u.payload_bytes,
+            )
+            for target, u in sorted(_queries.items())
+        ]
+
+
+def render_prometheus() -> str:
+    """Exporta os contadores dos métodos, das consultas e dos caches no formato texto do Prometheus."""
+    lines: list[str] = []
+
+    def family(name: str, kind: str, help_text: str, samples: list[tuple[str, str, Any]]) -> None:
+        lines.append(f"# HELP {_PREFIX}_{name} {help_text}")
+        lines.append(f"# TYPE {_PREFIX}_{name} {kind}")
+        for suffix, labels, value in samples:
+            lines.append(f"{_PREFIX}_{name}{suffix}{{{labels}}} {value}")
+
+    methods = method_stats()
+    for name, help_text, value_of in (
+        ("repository_calls_total", "Chamadas aos métodos do repositório.", lambda m: m.calls),
+        ("repository_errors_total", "Exceções e consultas com erro por método.", lambda m: m.errors),
+        ("repository_queries_total", "Consultas ao banco por método.", lambda m: m.usage.queries),
+        ("repository_rows_total", "Linhas recebidas do banco por método.", lambda m: m.usage.rows),
+        (
+            "repository_payload_bytes_total",
+            "Tamanho aproximado (JSON) das respostas por método.",
+            lambda m: m.usage.payload_bytes,
+        ),
+        (
+            "repository_db_seconds_total",
+            "Tempo em consultas ao banco por método.",
+            lambda m: m.usage.db_seconds,
+        ),
+        ("repository_cache_hits_total", "Acertos de cache por método.", lambda m: m.usage.cache_hits),
+        ("repository_cache_misses_total", "Falhas de cache por método.", lambda m: m.usage.cache_misses),
+    ):
+        family(
+            name,
+            "counter",
+            help_text,
+            [("", f'method="{m.name}"', value_of(m)) for m in methods],
+        )
+
+    samples: list[tuple[str, str, Any]] = []
+    for m in methods:
+        cumulative = 0
+        for limit, count in zip(DURATION_BUCKETS, m.buckets):
+            cumulative += count
+            samples.append(("_bucket", f'method="{m.name}",le="{limit}"', cumulative))
+        samples.append(("_bucket", f'method="{m.name}",le="+Inf"', m.calls))
+        samples.append(("_sum", f'method="{m.name}"', m.seconds))
+        samples.append(("_count", f'method="{m.name}"', m.calls))
+    family("repository_duration_seconds", "histogram", "Duração das chamadas ao repositório.", samples)
+
+    queries = query_stats()
+    for name, help_text, value_of in (
+        ("db_queries_total", "Consultas por tabela, view ou RPC.", lambda q: q.queries),
+        ("db_errors_total", "Consultas com erro por tabela, view ou RPC.", lambda q: q.errors),
+        ("db_seconds_total", "Tempo em consultas por tabela, view ou RPC.", lambda q: q.seconds),
+        ("db_rows_total", "Linhas recebidas por tabela, view ou RPC.", lambda q: q.rows),
+        (
+            "db_payload_bytes_total",
+            "Tamanho aproximado (JSON) das respostas por tabela, view ou RPC.",
+            lambda q: q.payload_bytes,
+        ),
+    ):
+        family(name, "counter", help_text, [("", f'target="{q.target}"', value_of(q)) for q in queries])
+
+    caches = all_cache_stats()
+    for name, kind, help_text, value_of in (
+        ("cache_hits_total", "counter", "Acertos por cache.", lambda c: c.hits),
+        ("cache_misses_total", "counter", "Falhas por cache.", lambda c: c.misses),
+        (
+            "cache_shared_hits_total",
+            "counter",
+            "Falhas atendidas pelo cache compartilhado.",
+            lambda c: c.shared_hits,
+        ),
+        ("cache_stale_total", "counter", "Entradas descartadas por versão obsoleta.", lambda c: c.stale),
+        (
+            "cache_evictions_total",
+            "counter",
+            "Entradas expiradas ou descartadas.",
+            lambda c: c.evictions,
+        ),
+        ("cache_invalidations_total", "counter", "Entradas invalidadas.", lambda c: c.invalidations),
+        ("cache_entries", "gauge", "Entradas em memória por cache.", lambda c: c.size),
+    ):
+        family(name, kind, help_text, [("", f'cache="{c.name}"', value_of(c)) for c in caches])
+    return "\n".join(lines) + "\n"
+
+
+def write_prometheus(path: str) -> None:
+    """Grava as métricas no arquivo (de forma atômica, para o coletor 'textfile' do node_exporter)."""
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    with open(temp_path, "w", encoding="utf-8") as f:
+        f.write(render_prometheus())
+    os.replace(temp_path, path)
+
+
+def configure_export(path: Optional[str], log_reruns: bool = False) -> None:
+    """Define o arquivo de métricas e se cada rerun é resumido no log.
+
+    Args:
+        path: Arquivo no formato do Prometheus, regravado ao fim dos reruns (no máximo
+            a cada EXPORT_INTERVAL segundos). '{pid}' é substituído pelo PID do processo,
+            para que cada réplica grave o seu. None desativa a exportação.
+        log_reruns: Se o resumo de cada rerun é registrado no log (nível INFO).
+            Sem exportação nem log, o tamanho das respostas não é medido.
+    """
+    global _export_path, _log_reruns
+    _export_path = path.replace("{pid}", str(os.getpid())) if path else None
+    _log_reruns = log_reruns
+
+
+def _export() -> None:
+    global _last_export
+    now = time.monotonic()
+    if _export_path is None or now - _last_export < EXPORT_INTERVAL:
+        return
+    _last_export = now
+    try:
+        write_prometheus(_export_path)
+    except OSError as e:
+        logger.warning(f"Não foi possível gravar as métricas em '{_export_path}': {e}")
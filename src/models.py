@@ -1,5 +1,5 @@
-from datetime import date, datetime
-from typing import Optional
+from datetime import date, datetime, timedelta
+from typing import Iterable, Optional
 
 from pydantic import BaseModel, Field
 
@@ -28,10 +28,12 @@ class Resposta(BaseModel):
 
 
 class Pergunta(BaseModel):
+    """Resumo de uma pergunta do mural; as respostas são carregadas à parte, sob demanda."""
+
     id: int
     pergunta_texto: str
     created_at: datetime
-    respostas: list[Resposta] = Field(default_factory=list)
+    total_respostas: int = 0
 
 
 class Leitura(BaseModel):
@@ -39,3 +41,64 @@ class Leitura(BaseModel):
     created_at: datetime
     data_leitura_plano: Optional[date] = None
     livro: Livro
+
+
+class PosicaoRanking(BaseModel):
+    """Um membro no ranking de livros concluídos da página de Awards."""
+
+    posicao: int
+    usuario: Usuario
+    livros_concluidos: int
+
+
+class LeiturasMes(BaseModel):
+    mes: date
+    capitulos: int
+
+
+class LeiturasDia(BaseModel):
+    data: date
+    capitulos: int
+
+
+class EstatisticasLeitura(BaseModel):
+    """Estatísticas de leitura de um usuário, mantidas no banco a cada escrita em 'tb_leituras'."""
+
+    usuario_id: int
+    capitulos_unicos: int = 0
+    capitulos_canonicos: int = 0
+    cobertura: float = 0.0
+    ultima_data: Optional[date] = None
+    sequencia_atual: int = 0
+    maior_sequencia: int = 0
+    livros_concluidos: int = 0
+    meses: list[LeiturasMes] = Field(default_factory=list)
+
+    def sequencia_em(self, today: date, dias: Iterable[date] = ()) -> int:
+        """Retorna a sequência atual (dias consecutivos até hoje ou ontem) vista em `today`.
+
+        A sequência gravada no banco vale até a data da última escrita (`ultima_data`):
+        dias do plano lidos adiantados só passam a contar quando chegam, sem uma nova
+        escrita que recalcule a linha. Por isso a sequência é refeita a partir de
+        `today` com os dias lidos (ex: de `get_daily_reading_counts`) e, ao alcançar
+        `ultima_data`, somada à sequência gravada.
+
+        Args:
+            today: A data de referência (hoje, no fuso do app).
+            dias: As datas com leitura; datas após `today` são ignoradas.
+        """
+        lidos = {dia for dia in dias if dia <= today}
+        if self.ultima_data is not None:
+            lidos.add(self.ultima_data)
+        dia = today if today in lidos else today - timedelta(days=1)
+        sequencia = 0
+        while dia in lidos:
+            if dia == self.ultima_data:
+                return sequencia + self.sequencia_atual
+            sequencia += 1
+            dia -= timedelta(days=1)
+        return sequencia
+
+    def maior_sequencia_em(self, today: date, dias: Iterable[date] = ()) -> int:
+        """A maior sequência, incluindo a atual refeita por `sequencia_em`."""
+        return max(self.maior_sequencia, self.sequencia_em(today, dias))
@@ -0,0 +1,126 @@
+import logging
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Any, Callable, Optional
+
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+
+logger = logging.getLogger(__name__)
+
+# Tempo máximo padrão de espera por uma dependência, em segundos.
+DEFAULT_TIMEOUT = 15.0
+
+# Threads por carregamento. Cada chamada tem o próprio pool, encerrado ao final: com
+# dezenas de sessões simultâneas, as páginas não esperam na fila umas das outras, e uma
+# dependência presa no banco ocupa apenas uma thread da própria página.
+MAX_WORKERS = 8
+
+
+@dataclass(frozen=True)
+class Dependency:
+    """Um dado de que a página depende, carregado por `load` (sem argumentos).
+
+    Args:
+        name: Nome usado para acessar o valor e nos logs.
+        load: Função que carrega o valor (ex: um método do repositório).
+        default: Valor usado se o carregamento falhar ou exceder o tempo limite.
+        timeout: Tempo limite em segundos (padrão: DEFAULT_TIMEOUT).
+    """
+
+    name: str
+    load: Callable[[], Any]
+    default: Any = None
+    timeout: Optional[float] = None
+
+
+@dataclass
+class PageData:
+    """Resultado do carregamento das dependências de uma página."""
+
+    values: dict[str, Any] = field(default_factory=dict)
+    errors: dict[str, BaseException] = field(default_factory=dict)
+    durations: dict[str, float] = field(default_factory=dict)
+
+    def __getitem__(self, name: str) -> Any:
+        return self.values[name]
+
+    def failed(self) -> list[str]:
+        """Nomes das dependências que falharam ou excederam o tempo limite."""
+        return list(self.errors)
+
+
+def load_concurrently(*dependencies: Dependency) -> PageData:
+    """Carrega as dependências de uma página em paralelo.
+
+    Cada dependência roda em uma thread própria da chamada, com o contexto da sessão
+    do Streamlit (necessário para `st.cache_data` e mensagens). A latência da página
+    passa a ser a da chamada mais lenta, e não a soma de todas. Erros e tempos limite
+    são tratados por dependência: o valor padrão é usado e o erro é registrado em
+    `PageData.errors`, sem interromper as demais. O tempo limite conta a partir do
+    início da execução da dependência; uma dependência que ainda não começou quando o
+    seu prazo termina (mais de MAX_WORKERS dependências) é cancelada.
+
+    Args:
+        *dependencies: As dependências da página.
+
+    Returns:
+        Os valores carregados (ou padrões), os erros e a duração de cada dependência.
+    """
+    ctx = get_script_run_ctx()
+    data = PageData()
+    start_times: dict[str, float] = {}
+
+    def run(dependency: Dependency) -> Any:
+        add_script_run_ctx(threading.current_thread(), ctx)
+        start_times[dependency.name] = time.monotonic()
+        start = time.perf_counter()
+        try:
+            return dependency.load()
+        finally:
+            data.durations[dependency.name] = time.perf_counter() - start
+
+    def timeout_of(dependency: Dependency) -> float:
+        return dependency.timeout if dependency.timeout is not None else DEFAULT_TIMEOUT
+
+    def fail(dependency: Dependency, error: BaseException) -> None:
+        data.errors[dependency.name] = error
+        data.values[dependency.name] = dependency.default
+
+    submitted = time.monotonic()
+    executor = ThreadPoolExecutor(
+        max_workers=max(1, min(len(dependencies), MAX_WORKERS)), thread_name_prefix="page-data"
+    )
+    try:
+        pending = {executor.submit(run, dep): dep for dep in dependencies}
+        while pending:
+            now = time.monotonic()
+            deadlines = {}
+            for future, dep in list(pending.items()):
+                if future.done():
+                    del pending[future]
+                    try:
+                        data.values[dep.name] = future.result()
+                    except Exception as e:
+                        logger.error(f"Erro ao carregar '{dep.name}': {e}", exc_info=True)
+                        fail(dep, e)
+                    continue
+                # O prazo conta do início da execução; antes disso, da submissão.
+                deadline = start_times.get(dep.name, submitted) + timeout_of(dep)
+                if deadline > now:
+                    deadlines[future] = deadline
+                elif dep.name in start_times or future.cancel():
+                    # Excedeu o tempo executando, ou não começou dentro do prazo.
+                    del pending[future]
+                    logger.warning(
+                        f"Tempo limite excedido ao carregar '{dep.name}' ({timeout_of(dep):g}s)."
+                    )
+                    fail(dep, TimeoutError(dep.name))
+            if deadlines:
+                wait(deadlines, timeout=min(deadlines.values()) - now, return_when=FIRST_COMPLETED)
+    finally:
+        # Não espera as dependências que excederam o tempo limite: as threads terminam
+        # sozinhas quando a chamada ao banco retornar.
+        executor.shutdown(wait=False, cancel_futures=True)
+    return data
@@ -0,0 +1,190 @@
+from array import array
+from bisect import bisect_right
+from dataclasses import dataclass
+from datetime import date
+from types import MappingProxyType
+from typing import Any, Iterable, Mapping, Optional, Sequence
+
+import pandas as pd
+
+from src.utils import expandir_capitulos
+
+
+def _compact(slots: array) -> Sequence[int]:
+    """Os slots de um livro como `range` quando são contíguos (o caso dos planos em ordem)."""
+    if slots and slots[-1] - slots[0] + 1 == len(slots):
+        return range(slots[0], slots[-1] + 1)
+    return slots
+
+
+@dataclass(frozen=True)
+class PlanEntry:
+    """Uma entrada do plano: um livro e seus capítulos programados para uma data."""
+
+    book_id: int
+    book_name: str
+    chapters_str: str
+    chapters: tuple[int, ...]
+    first_slot: int
+
+    @property
+    def slots(self) -> range:
+        """Intervalo de slots (posições no plano) ocupados por esta entrada."""
+        return range(self.first_slot, self.first_slot + len(self.chapters))
+
+
+@dataclass(frozen=True)
+class PlanIndex:
+    """Índice imutável e compacto de um plano de leitura, construído uma vez por versão do plano.
+
+    Cada capítulo programado ocupa um "slot", numerado em ordem cronológica. Os slots
+    são guardados em arrays paralelos (livro, capítulo e data), permitindo responder
+    às consultas da página de leitura sem varrer ou reexpandir o DataFrame do plano.
+    Os slots de cada (livro, capítulo, data) e de cada livro (um `range` quando são
+    contíguos) servem de base para o progresso do usuário em `src/progress.py`.
+    """
+
+    plan_id: int
+    plan_name: str
+    dates: tuple[date, ...]
+    entries_by_date: Mapping[date, tuple[PlanEntry, ...]]
+    slot_book_ids: array
+    slot_chapters: array
+    slot_date_idx: array
+    cumulative_slots: array
+    slots_by_key: Mapping[tuple[int, int, date], tuple[int, ...]]
+    book_slots: Mapping[int, Sequence[int]]
+
+    @classmethod
+    def from_rows(cls, plan_id: int, plan_name: str, rows: Iterable[dict[str, Any]]) -> "PlanIndex":
+        """Constrói o índice a partir das entradas do plano.
+
+        Args:
+            plan_id: O ID do plano.
+            plan_name: O nome do plano.
+            rows: Entradas com as chaves 'data_leitura' (date ou ISO), 'livro_id',
+                'livro' e 'capitulos', já ordenadas por data e, dentro da data, pela
+                ordem de leitura. Se a entrada trouxer 'capitulos_expandidos' (os
+                slots de 'tb_plano_slots'), a string 'capitulos' não é reexpandida.
+
+        Returns:
+            O índice do plano.
+        """
+        entries: dict[date, list[PlanEntry]] = {}
+        slots_by_key: dict[tuple[int, int, date], tuple[int, ...]] = {}
+        book_slots: dict[int, array] = {}
+        slot_book_ids, slot_chapters, slot_date_idx = array("i"), array("i"), array("i")
+        cumulative_slots = array("i")
+        dates: list[date] = []
+
+        for row in sorted(rows, key=lambda r: str(r["data_leitura"])):
+            data = row["data_leitura"]
+            if not isinstance(data, date):
+                data = date.fromisoformat(str(data)[:10])
+            if not dates or dates[-1] != data:
+                if dates:
+                    cumulative_slots.append(len(slot_chapters))
+                dates.append(data)
+            expanded = row.get("capitulos_expandidos")
+            chapters = tuple(
+                expanded if expanded is not None else expandir_capitulos(str(row["capitulos"]))
+            )
+            entry = PlanEntry(
+                book_id=int(row["livro_id"]),
+                book_name=str(row["livro"]),
+                chapters_str=str(row["capitulos"]),
+                chapters=chapters,
+                first_slot=len(slot_chapters),
+            )
+            entries.setdefault(data, []).append(entry)
+            for slot, chapter in zip(entry.slots, chapters):
+                previous = slots_by_key.get((entry.book_id, chapter, data))
+                slots_by_key[(entry.book_id, chapter, data)] = (
+                    (slot,) if previous is None else previous + (slot,)
+                )
+            book_slots.setdefault(entry.book_id, array("i")).extend(entry.slots)
+            slot_book_ids.extend(array("i", (entry.book_id,)) * len(chapters))
+            slot_chapters.extend(chapters)
+            slot_date_idx.extend(array("i", (len(dates) - 1,)) * len(chapters))
+        if dates:
+            cumulative_slots.append(len(slot_chapters))
+
+        return cls(
+            plan_id=plan_id,
+            plan_name=plan_name,
+            dates=tuple(dates),
+            entries_by_date=MappingProxyType({d: tuple(e) for d, e in entries.items()}),
+            slot_book_ids=slot_book_ids,
+            slot_chapters=slot_chapters,
+            slot_date_idx=slot_date_idx,
+            cumulative_slots=cumulative_slots,
+            slots_by_key=MappingProxyType(slots_by_key),
+            book_slots=MappingProxyType({b: _compact(s) for b, s in book_slots.items()}),
+        )
+
+    @property
+    def total_slots(self) -> int:
+        """Número total de capítulos programados no plano."""
+        return len(self.slot_chapters)
+
+    @property
+    def first_date(self) -> Optional[date]:
+        return self.dates[0] if self.dates else None
+
+    def entries_for(self, day: date) -> tuple[PlanEntry, ...]:
+        """Retorna as entradas programadas para uma data (O(1))."""
+        return self.entries_by_date.get(day, ())
+
+    def slots_until(self, day: date) -> int:
+        """Número acumulado de slots programados até a data, inclusive (O(log n))."""
+        position = bisect_right(self.dates, day)
+        return self.cumulative_slots[position - 1] if position else 0
+
+    def date_slots(self, day: date) -> range:
+        """Intervalo de slots programados para uma data (vazio se a data não está no plano)."""
+        position = bisect_right(self.dates, day)
+        if not position or self.dates[position - 1] != day:
+            return range(0)
+        start = self.cumulative_slots[position - 2] if position > 1 else 0
+        return range(start, self.cumulative_slots[position - 1])
+
+    def date_of_slot(self, slot: int) -> date:
+        """Retorna a data em que um slot está programado (O(1))."""
+        return self.dates[self.slot_date_idx[slot]]
+
+    def slot_key(self, slot: int) -> tuple[int, int, date]:
+        """Retorna a chave (ID do livro, capítulo, data) de um slot, como nas leituras."""
+        return self.slot_book_ids[slot], self.slot_chapters[slot], self.date_of_slot(slot)
+
+    def to_rows(self) -> list[dict[str, Any]]:
+        """As entradas do plano no formato de `from_rows`, com os capítulos expandidos.
+
+        O cache compartilhado (src/shared_cache.py) grava as entradas e reconstrói o
+        índice ao ler, sem consultar o banco.
+        """
+        return [
+            {
+                "data_leitura": d,
+                "livro_id": e.book_id,
+                "livro": e.book_name,
+                "capitulos": e.chapters_str,
+                "capitulos_expandidos": list(e.chapters),
+            }
+            for d in self.dates
+            for e in self.entries_by_date[d]
+        ]
+
+    def to_frame(self) -> pd.DataFrame:
+        """Monta o DataFrame do plano (uma linha por entrada) a partir do índice."""
+        rows = [(d, e) for d in self.dates for e in self.entries_by_date[d]]
+        return pd.DataFrame(
+            {
+                "data": pd.to_datetime([d for d, _ in rows]),
+                "capitulos": [e.chapters_str for _, e in rows],
+                "livro": [e.book_name for _, e in rows],
+                "livro_id": [e.book_id for _, e in rows],
+                "nome_plano": self.plan_name,
+                "plano_id": self.plan_id,
+                "qtd_capitulos": [len(e.chapters) for _, e in rows],
+            }
+        )
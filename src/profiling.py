@@ -0,0 +1,284 @@
+import cProfile
+import hmac
+import io
+import json
+import logging
+import os
+import pstats
+import re
+import sys
+import threading
+import time
+import unicodedata
+from collections import defaultdict
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Hashable, Iterator, Optional
+
+import streamlit as st
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+# Atributo em que o Streamlit guarda o contexto da sessão de cada thread (o mesmo lido
+# por `get_script_run_ctx`); permite amostrar também as threads de `load_concurrently`.
+from streamlit.runtime.scriptrunner_utils.script_run_context import (
+    SCRIPT_RUN_CONTEXT_ATTR_NAME,
+)
+
+logger = logging.getLogger(__name__)
+
+# Modos de profiling: amostragem (pilhas de todas as threads da sessão, com flamegraph)
+# ou determinístico (cProfile na thread do script, com contagem exata de chamadas).
+MODE_SAMPLING = "amostragem"
+MODE_DETERMINISTIC = "deterministico"
+
+# Parâmetros da URL que ativam o profiling da sessão: ?profiling=<token>&reruns=5.
+QUERY_TOKEN = "profiling"
+QUERY_RERUNS = "reruns"
+QUERY_MODE = "modo"
+
+DEFAULT_RERUNS = 5
+MAX_RERUNS = 50
+DEFAULT_INTERVAL = 0.005
+
+# Funções exibidas no resumo de cada rerun.
+SUMMARY_FUNCTIONS = 40
+
+_REMAINING_KEY = "profiling_reruns_restantes"
+_MODE_KEY = "profiling_modo"
+
+_Frame = tuple[str, str, int]
+
+_PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class SamplingProfiler:
+    """Profiler por amostragem das threads de uma sessão do Streamlit.
+
+    Uma thread auxiliar copia, a cada `interval` segundos, a pilha de cada thread que
+    está executando para a sessão (a do script e as de `load_concurrently`). Cada
+    amostra pesa o tempo decorrido desde a anterior, de modo que o resultado aproxima
+    o tempo de parede gasto em cada pilha, inclusive esperando o banco.
+    """
+
+    def __init__(self, session_id: Hashable, interval: float = DEFAULT_INTERVAL):
+        self.session_id = session_id
+        self.interval = interval
+        self.samples: defaultdict[tuple[str, tuple[_Frame, ...]], float] = defaultdict(float)
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="profiling", daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self) -> None:
+        last = time.perf_counter()
+        while not self._stop.wait(self.interval):
+            now = time.perf_counter()
+            weight, last = now - last, now
+            frames = sys._current_frames()
+            for thread in threading.enumerate():
+                ctx = getattr(thread, SCRIPT_RUN_CONTEXT_ATTR_NAME, None)
+                frame = frames.get(thread.ident) if thread.ident is not None else None
+                if ctx is None or ctx.session_id != self.session_id or frame is None:
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append((code.co_name, code.co_filename, code.co_firstlineno))
+                    frame = frame.f_back
+                stack.reverse()
+                # As threads do pool mantêm o contexto da sessão depois de terminar a
+                # tarefa: sem código do projeto na pilha, a thread está ociosa.
+                if not any(_is_project_file(path) for _, path, _ in stack):
+                    continue
+                self.samples[(thread.name, tuple(stack))] += weight
+
+    def to_speedscope(self, name: str) -> dict[str, Any]:
+        """Exporta as amostras no formato do speedscope (um perfil por thread)."""
+        frame_index: dict[_Frame, int] = {}
+        by_thread: dict[str, list[tuple[list[int], float]]] = {}
+        for (thread, stack), weight in self.samples.items():
+            indices = [frame_index.setdefault(frame, len(frame_index)) for frame in stack]
+            by_thread.setdefault(thread, []).append((indices, weight))
+        profiles = []
+        for thread, samples in sorted(by_thread.items()):
+            total = sum(weight for _, weight in samples)
+            profiles.append(
+                {
+                    "type": "sampled",
+                    "name": f"{name} [{thread}]",
+                    "unit": "seconds",
+                    "startValue": 0,
+                    "endValue": total,
+                    "samples": [indices for indices, _ in samples],
+                    "weights": [weight for _, weight in samples],
+                }
+            )
+        return {
+            "$schema": "https://www.speedscope.app/file-format-schema.json",
+            "name": name,
+            "exporter": "bible-tracker",
+            "shared": {
+                "frames": [
+                    {"name": fn, "file": _short_path(path), "line": line}
+                    for (fn, path, line) in frame_index
+                ]
+            },
+            "profiles": profiles,
+        }
+
+    def summary(self, limit: int = SUMMARY_FUNCTIONS) -> str:
+        """Tempo total (na pilha) e próprio (no topo da pilha) das funções mais custosas."""
+        total_time: defaultdict[_Frame, float] = defaultdict(float)
+        self_time: defaultdict[_Frame, float] = defaultdict(float)
+        for (_, stack), weight in self.samples.items():
+            for frame in set(stack):
+                total_time[frame] += weight
+            if stack:
+                self_time[stack[-1]] += weight
+        sampled = sum(self.samples.values())
+        lines = [f"Tempo amostrado: {sampled * 1000:.1f} ms (intervalo de {self.interval * 1000:g} ms)"]
+        for title, counter in (("Tempo total", total_time), ("Tempo próprio", self_time)):
+            lines += ["", f"{title} por função:"]
+            ranking = sorted(counter.items(), key=lambda item: item[1], reverse=True)[:limit]
+            for (fn, path, line), seconds in ranking:
+                share = seconds / sampled if sampled else 0.0
+                lines.append(
+                    f"  {share:6.1%} {seconds * 1000:9.1f} ms  {fn} ({_short_path(path)}:{line})"
+                )
+        return "\n".join(lines) + "\n"
+
+
+def _is_project_file(path: str) -> bool:
+    return path.startswith(_PROJECT_DIR) and "site-packages" not in path
+
+
+def _short_path(path: str) -> str:
+    """Caminho relativo ao projeto ou ao site-packages, para encurtar os relatórios."""
+    marker = "site-packages" + os.sep
+    if marker in path:
+        return path.split(marker, 1)[1]
+    try:
+        relative = os.path.relpath(path)
+    except ValueError:
+        return path
+    return path if relative.startswith("..") else relative
+
+
+def _slug(text: str) -> str:
+    ascii_text = unicodedata.normalize("NFKD", text).encode("ascii", "ignore").decode()
+    return re.sub(r"[^a-z0-9]+", "-", ascii_text.lower()).strip("-") or "sem-nome"
+
+
+def _activate_from_query(settings: dict[str, Any]) -> None:
+    """Ativa o profiling da sessão se a URL trouxer o token correto.
+
+    O token é removido da URL em seguida, para não ficar no histórico nem em links
+    compartilhados; a contagem de reruns restantes fica no estado da sessão.
+    """
+    token = st.query_params.get(QUERY_TOKEN)
+    if token is None:
+        return
+    reruns = st.query_params.get(QUERY_RERUNS)
+    mode = st.query_params.get(QUERY_MODE, MODE_SAMPLING)
+    for param in (QUERY_TOKEN, QUERY_RERUNS, QUERY_MODE):
+        if param in st.query_params:
+            del st.query_params[param]
+    if not settings["token"] or not hmac.compare_digest(str(token), str(settings["token"])):
+        logger.warning("Tentativa de ativar o profiling com um token inválido.")
+        return
+    try:
+        count = int(reruns) if reruns else DEFAULT_RERUNS
+    except ValueError:
+        count = DEFAULT_RERUNS
+    st.session_state[_REMAINING_KEY] = max(1, min(count, MAX_RERUNS))
+    st.session_state[_MODE_KEY] = MODE_DETERMINISTIC if mode == MODE_DETERMINISTIC else MODE_SAMPLING
+    logger.info(
+        f"Profiling ativado para os próximos {st.session_state[_REMAINING_KEY]} reruns "
+        f"({st.session_state[_MODE_KEY]})."
+    )
+
+
+@contextmanager
+def profile_rerun(settings: dict[str, Any]) -> Iterator[None]:
+    """Executa o rerun sob o profiler, se o profiling estiver ativo na sessão.
+
+    O profiling é ativado por um administrador com `?profiling=<token>` na URL
+    (opcionalmente `&reruns=N` e `&modo=deterministico`) e vale para os N reruns
+    seguintes da sessão. Cada rerun gera, em `settings['directory']`, um resumo por
+    função (.txt) e um flamegraph no formato do speedscope (.speedscope.json, no modo
+    por amostragem) ou as estatísticas do cProfile (.prof, no modo determinístico),
+    com a página e o usuário no nome do arquivo.
+
+    Args:
+        settings: Configuração do profiling (ver `get_profiling_settings`). Sem token,
+            o profiling fica desativado.
+    """
+    if settings["token"]:
+        _activate_from_query(settings)
+    remaining = st.session_state.get(_REMAINING_KEY, 0) if settings["token"] else 0
+    ctx = get_script_run_ctx(suppress_warning=True)
+    if remaining <= 0 or ctx is None:
+        yield
+        return
+
+    st.sidebar.caption(f"🔬 Profiling ativo: {remaining} rerun(s) restante(s)")
+    mode = st.session_state.get(_MODE_KEY, MODE_SAMPLING)
+    sampler: Optional[SamplingProfiler] = None
+    profiler: Optional[cProfile.Profile] = None
+    if mode == MODE_DETERMINISTIC:
+        profiler = cProfile.Profile()
+        profiler.enable()
+    else:
+        sampler = SamplingProfiler(ctx.session_id, interval=settings["interval"])
+        sampler.start()
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        if profiler is not None:
+            profiler.disable()
+        if sampler is not None:
+            sampler.stop()
+        # O estado é lido ao final: o login e a troca de página acontecem durante o rerun.
+        st.session_state[_REMAINING_KEY] = remaining - 1
+        user = st.session_state.get("logged_in_user")
+        page = st.session_state.get("page_selection", "Minha Leitura") if user else "Login"
+        try:
+            _write_reports(settings["directory"], page, user, elapsed, sampler, profiler)
+        except OSError as e:
+            logger.warning(f"Não foi possível gravar o profiling em '{settings['directory']}': {e}")
+
+
+def _write_reports(
+    directory: str,
+    page: str,
+    user: Any,
+    elapsed: float,
+    sampler: Optional[SamplingProfiler],
+    profiler: Optional[cProfile.Profile],
+) -> None:
+    os.makedirs(directory, exist_ok=True)
+    user_tag = f"usuario-{user.id}" if user is not None else "anonimo"
+    base = os.path.join(directory, f"{datetime.now():%Y%m%d-%H%M%S-%f}-{_slug(page)}-{user_tag}")
+    title = f"{page} · {user_tag} · {elapsed * 1000:.1f} ms"
+    if sampler is not None:
+        with open(f"{base}.speedscope.json", "w", encoding="utf-8") as f:
+            json.dump(sampler.to_speedscope(title), f)
+        body = sampler.summary()
+    elif profiler is not None:
+        profiler.dump_stats(f"{base}.prof")
+        buffer = io.StringIO()
+        stats = pstats.Stats(profiler, stream=buffer)
+        stats.sort_stats("cumulative").print_stats(SUMMARY_FUNCTIONS)
+        body = buffer.getvalue()
+    else:
+        return
+    with open(f"{base}.txt", "w", encoding="utf-8") as f:
+        f.write(f"{title}\n\n{body}")
+    logger.info(f"Profiling do rerun gravado em '{base}.*' ({title}).")
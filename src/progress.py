@@ -0,0 +1,110 @@
+from dataclasses import dataclass
+from datetime import date
+from functools import cached_property
+from typing import Iterable, Optional, Sequence
+
+from src.models import Leitura
+from src.plan_index import PlanIndex
+
+
+@dataclass(frozen=True)
+class PlanProgress:
+    """Progresso de um usuário em um plano, guardado como um bitset sobre os slots do plano.
+
+    O bit `i` indica que o capítulo do slot `i` do PlanIndex foi lido na data programada.
+    Próximo slot pendente, percentual concluído e conclusão por livro são operações de
+    bits, sem varrer leituras ou o DataFrame do plano. A instância é imutável: `marked`
+    devolve um novo progresso, o que permite compartilhá-la entre sessões no cache.
+    """
+
+    plan_index: PlanIndex
+    bits: int = 0
+
+    @classmethod
+    def from_readings(cls, plan_index: PlanIndex, readings: Iterable[Leitura]) -> "PlanProgress":
+        """Constrói o progresso a partir das leituras do usuário no plano."""
+        return cls(plan_index).marked(
+            (leitura.livro.id, leitura.capitulo, leitura.data_leitura_plano)
+            for leitura in readings
+            if leitura.data_leitura_plano
+        )
+
+    def marked(self, readings: Iterable[tuple[int, int, date]]) -> "PlanProgress":
+        """Retorna um novo progresso com as leituras (livro, capítulo, data) marcadas."""
+        # Um caractere por slot ('1' lido), convertido em inteiro uma vez no final: OR-ar um
+        # bit por leitura criaria um inteiro do tamanho do plano a cada leitura.
+        get_slots = self.plan_index.slots_by_key.get
+        total = self.plan_index.total_slots
+        flags = bytearray(format(self.bits, "b").zfill(total)[::-1], "ascii")
+        for key in readings:
+            for slot in get_slots(key, ()):
+                flags[slot] = ord("1")
+        return PlanProgress(self.plan_index, int(flags[::-1].decode("ascii"), 2))
+
+    @cached_property
+    def _packed(self) -> bytes:
+        # Os bits em bytes (8 slots por byte), calculados uma vez por instância: testar um
+        # slot em `bits` deslocaria um inteiro do tamanho do plano a cada consulta.
+        return self.bits.to_bytes((self.plan_index.total_slots + 7) // 8, "little")
+
+    def _all_read(self, slots: Sequence[int]) -> bool:
+        """Indica se todos os slots foram lidos (False se não houver nenhum)."""
+        if not slots:
+            return False
+        if isinstance(slots, range):
+            width = (1 << len(slots)) - 1
+            return (self.bits >> slots.start) & width == width
+        packed = self._packed
+        for slot in slots:
+            if not packed[slot >> 3] >> (slot & 7) & 1:
+                return False
+        return True
+
+    @property
+    def full_mask(self) -> int:
+        return (1 << self.plan_index.total_slots) - 1
+
+    @property
+    def read_count(self) -> int:
+        """Número de slots do plano já lidos."""
+        return self.bits.bit_count()
+
+    @property
+    def percent_complete(self) -> float:
+        total = self.plan_index.total_slots
+        return self.read_count / total if total else 0.0
+
+    def is_read(self, book_id: int, chapter: int, day: date) -> bool:
+        # Chamado por capítulo na página de leitura: o teste dos slots fica em linha.
+        packed = self._packed
+        slots = self.plan_index.slots_by_key.get((book_id, chapter, day), ())
+        for slot in slots:
+            if not packed[slot >> 3] >> (slot & 7) & 1:
+                return False
+        return bool(slots)
+
+    def is_day_complete(self, day: date) -> bool:
+        slots = self.plan_index.date_slots(day)
+        return not slots or self._all_read(slots)
+
+    def next_unread_slot(self) -> Optional[int]:
+        """Retorna o primeiro slot ainda não lido, ou None se o plano estiver completo."""
+        unread = ~self.bits & self.full_mask
+        if not unread:
+            return None
+        return (unread & -unread).bit_length() - 1
+
+    def next_unread_date(self) -> Optional[date]:
+        """Retorna a data do primeiro slot ainda não lido, ou None se o plano estiver completo."""
+        slot = self.next_unread_slot()
+        return self.plan_index.date_of_slot(slot) if slot is not None else None
+
+    def is_book_complete(self, book_id: int) -> bool:
+        """Indica se todos os slots de um livro no plano foram lidos."""
+        return self._all_read(self.plan_index.book_slots.get(book_id, ()))
+
+    def completed_books(self) -> list[int]:
+        """Retorna os IDs dos livros do plano com todos os slots lidos."""
+        return [
+            book_id for book_id, slots in self.plan_index.book_slots.items() if self._all_read(slots)
+        ]
@@ -0,0 +1,131 @@
+from collections import Counter
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Iterator, Optional
+
+from src.metrics import method_stats, query_stats
+
+# Consultas que não contam para os orçamentos: a sonda de versões dos caches é
+# limitada por tempo (VERSION_PROBE_INTERVAL) e não pela página ou operação.
+IGNORED_TARGETS = frozenset({"tb_versoes_dados"})
+
+
+class QueryBudgetExceeded(AssertionError):
+    """Uma página ou operação fez mais consultas ao banco do que o seu orçamento."""
+
+
+@dataclass(frozen=True)
+class QueryBudget:
+    """Número máximo de consultas ao banco de uma página (`render_*`) ou operação.
+
+    Args:
+        name: A função de `src/ui.py` ou a operação do repositório medida.
+        cold: Máximo com os caches vazios (ex: a primeira sessão após o deploy).
+        warm: Máximo ao repetir a mesma renderização com os caches carregados.
+            None quando a operação não se repete (ex: uma gravação).
+    """
+
+    name: str
+    cold: int
+    warm: Optional[int] = None
+
+
+# Orçamentos de cada função `render_*` de src/ui.py e das operações de gravação, medidos
+# sem o catálogo embutido (como no Supabase). Uma mudança que os exceda (ex: uma
+# consulta por capítulo, por livro ou por membro) é uma regressão N+1; se o custo extra
+# for intencional, ajuste o orçamento no mesmo commit (ver scripts/check_query_budgets.py).
+BUDGETS: dict[str, QueryBudget] = {
+    budget.name: budget
+    for budget in (
+        # Recebem os membros e a página já carregados pelo app.py.
+        QueryBudget("render_login_page", cold=0, warm=0),
+        QueryBudget("render_sidebar", cold=0, warm=0),
+        # Último plano ativo, estrutura do plano, catálogo e leituras; com os caches
+        # carregados, só o último plano ativo (as leituras ficam no cache do usuário).
+        QueryBudget("render_reading_page", cold=4, warm=1),
+        # Estatísticas e ritmo diário, carregados em paralelo.
+        QueryBudget("render_profile_page", cold=2, warm=0),
+        QueryBudget("render_dashboard_page", cold=1, warm=0),
+        # Conclusões, catálogo, estatísticas e a primeira página do ranking.
+        QueryBudget("render_awards_page", cold=4, warm=0),
+        QueryBudget("render_qa_page", cold=1, warm=0),
+        QueryBudget("get_book_catalog", cold=1, warm=0),
+        # Gravação das leituras e verificação das conclusões (uma RPC por chamada).
+        QueryBudget("save_reading", cold=2),
+        QueryBudget("save_readings", cold=2),
+    )
+}
+
+
+@dataclass
+class QueryCount:
+    """Consultas ao banco e chamadas ao repositório observadas em um trecho de código."""
+
+    by_target: Counter[str] = field(default_factory=Counter)
+    calls: Counter[str] = field(default_factory=Counter)
+
+    @property
+    def queries(self) -> int:
+        """Consultas que contam para os orçamentos (sem IGNORED_TARGETS)."""
+        return sum(n for target, n in self.by_target.items() if target not in IGNORED_TARGETS)
+
+    def add(self, other: "QueryCount") -> None:
+        self.by_target.update(other.by_target)
+        self.calls.update(other.calls)
+
+    def describe(self) -> str:
+        """As consultas por tabela, view ou RPC e as chamadas ao repositório, em uma linha."""
+        targets = ", ".join(f"{t} x{n}" for t, n in self.by_target.most_common()) or "nenhuma"
+        calls = ", ".join(f"{m} x{n}" for m, n in self.calls.most_common()) or "nenhuma"
+        return f"consultas: {targets}; chamadas: {calls}"
+
+
+@contextmanager
+def count_queries() -> Iterator[QueryCount]:
+    """Conta as consultas ao banco e as chamadas ao repositório feitas dentro do bloco.
+
+    Usa os contadores de src/metrics.py (por tabela/RPC e por método), que são do
+    processo: a contagem só é exata quando nada mais consulta o banco ao mesmo tempo,
+    como em testes e em scripts. As chamadas são inclusivas (um método chamado por
+    outro conta para os dois).
+
+    Yields:
+        A contagem, preenchida ao sair do bloco (inclusive por exceção, como o
+        `st.rerun`).
+    """
+    queries_before = {q.target: q.queries for q in query_stats()}
+    calls_before = {m.name: m.calls for m in method_stats()}
+    count = QueryCount()
+    try:
+        yield count
+    finally:
+        for q in query_stats():
+            if q.queries > queries_before.get(q.target, 0):
+                count.by_target[q.target] = q.queries - queries_before.get(q.target, 0)
+        for m in method_stats():
+            if m.calls > calls_before.get(m.name, 0):
+                count.calls[m.name] = m.calls - calls_before.get(m.name, 0)
+
+
+def check_budget(count: QueryCount, limit: Optional[int], label: str) -> None:
+    """Falha com QueryBudgetExceeded se a contagem passar do limite (None: sem limite)."""
+    if limit is not None and count.queries > limit:
+        raise QueryBudgetExceeded(
+            f"{label}: {count.queries} consultas (orçamento: {limit}); {count.describe()}"
+        )
+
+
+@contextmanager
+def query_budget(limit: int, label: str = "bloco") -> Iterator[QueryCount]:
+    """Falha se o bloco fizer mais que `limit` consultas ao banco.
+
+    Exemplo:
+        with query_budget(BUDGETS["save_readings"].cold, "save_readings"):
+            repo.save_readings(user, plan_id, readings)
+
+    Raises:
+        QueryBudgetExceeded: Ao sair do bloco, se o orçamento foi excedido.
+    """
+    with count_queries() as count:
+        yield count
+    check_budget(count, limit, label)
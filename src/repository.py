@@ -1,32 +1,217 @@
 import logging
-from datetime import date, datetime
-from typing import Any, Dict, Optional
+import time
+from datetime import date, datetime, timedelta
+from typing import Any, Callable, Dict, Iterator, Optional
 
 import pandas as pd
 import streamlit as st
 from postgrest import CountMethod
-from supabase import Client
 
-from src.config import FUSO_BR
-from src.models import Leitura, Pergunta, Usuario
-from src.utils import expandir_capitulos
+from src.books import BookCatalog
+from src.cache import get_cache
+from src.config import FUSO_BR, DatabaseClient
+from src.metrics import InstrumentedClient, instrumented
+from src.models import (
+    EstatisticasLeitura,
+    Leitura,
+    LeiturasDia,
+    Livro,
+    Pergunta,
+    PosicaoRanking,
+    Resposta,
+    Usuario,
+)
+from src.plan_index import PlanIndex
+from src.progress import PlanProgress
 
 logger = logging.getLogger(__name__)
 
+# Caches por chave, compartilhados entre as sessões do processo. Uma escrita invalida
+# apenas as entradas que afeta: (usuário, plano) nas leituras e, no mural, as páginas
+# de perguntas e as respostas da pergunta respondida.
+_readings_cache = get_cache("leituras_usuario", ttl=60, max_entries=4096)
+_progress_cache = get_cache("progresso_planos", ttl=60, max_entries=4096)
+_catalog_cache = get_cache("catalogo_livros", ttl=3600, max_entries=1, shared=True)
+_stats_cache = get_cache("estatisticas_usuario", ttl=60, max_entries=4096)
+_daily_readings_cache = get_cache("leituras_diarias", ttl=60, max_entries=4096)
+
+# Caches validados pela versão das tabelas de origem (ver `data_version`): os dados
+# compartilhados entre os usuários (planos, conclusões, dashboard e mural) são
+# recarregados assim que outro processo os altera, e apenas quando isso acontece.
+# O TTL longo é só uma salvaguarda. Com o cache compartilhado configurado (ver
+# `configure_shared_cache`), esses caches e o catálogo são lidos também do arquivo
+# comum às réplicas do host, que assim já sobem com os dados carregados.
+_plans_cache = get_cache("planos", ttl=3600, max_entries=128, shared=True)
+_plan_index_cache = get_cache("indice_planos", ttl=3600, max_entries=64, shared=True)
+_completions_cache = get_cache("conclusoes", ttl=3600, max_entries=4096, shared=True)
+_dashboard_cache = get_cache("dashboard", ttl=3600, max_entries=1, shared=True)
+_questions_cache = get_cache("mural_duvidas", ttl=3600, max_entries=4096, shared=True)
+
+_CATALOG_KEY = "livros"
+_PLAN_NAMES_KEY = "nomes_planos"
+_PLAN_FRAME_KEY = "estrutura_plano"
+_DASHBOARD_KEY = "dashboard"
+_VERSIONS_KEY = "versoes"
+_QUESTIONS_PAGE_KEY = "pagina_perguntas"
+_ANSWERS_KEY = "respostas"
+_SEARCH_KEY = "busca_perguntas"
+_LEADERBOARD_KEY = "ranking"
+
+# Número de perguntas por página do mural e de membros por página do ranking.
+QUESTIONS_PAGE_SIZE = 20
+LEADERBOARD_PAGE_SIZE = 20
+
+# Período, em dias, do calendário de leitura do perfil.
+RHYTHM_DAYS = 365
+
+# Intervalo, em segundos, entre as consultas às versões das tabelas: é também o atraso
+# máximo para ver alterações feitas por outro processo nos caches versionados.
+VERSION_PROBE_INTERVAL = 5.0
+
+# Sem as versões (ex: 'tb_versoes_dados' ainda não criada), os caches versionados
+# voltam a expirar por tempo, a cada FALLBACK_VERSION_TTL segundos.
+FALLBACK_VERSION_TTL = 60
+
+# Atraso máximo, em segundos, para o dashboard mostrar as leituras salvas por outro
+# processo (as do próprio processo aparecem na hora).
+DASHBOARD_READINGS_TTL = 60
+
+# Tabelas de origem de cada conjunto de dados versionado. 'tb_leituras' não é
+# versionada: um contador único serializaria todas as gravações de leituras (ver
+# scripts/ddl.sql). O dashboard, que depende das leituras de todos os membros, é
+# invalidado pelas gravações do próprio processo e expira por tempo para as demais.
+PLAN_TABLES = ("tb_planos", "tb_plano_entradas")
+COMPLETION_TABLES = ("tb_livros_concluidos", "tb_usuarios")
+DASHBOARD_TABLES = ("tb_planos", "tb_plano_entradas", "tb_usuarios")
+QUESTION_TABLES = ("tb_perguntas", "tb_respostas", "tb_usuarios")
+
+# Compartilhado: com várias réplicas, uma única consulta de versões a cada intervalo.
+_versions_cache = get_cache("versoes_dados", ttl=VERSION_PROBE_INTERVAL, max_entries=1, shared=True)
+
+# Tamanho das páginas nas leituras paginadas. Deve ser menor ou igual ao 'max-rows'
+# do PostgREST (1000 no Supabase), que trunca silenciosamente respostas maiores.
+PAGE_SIZE = 1000
+
+
+def _is_questions_list_key(key: Any) -> bool:
+    """Chaves das páginas do mural e dos resultados de busca (afetadas por qualquer escrita)."""
+    return isinstance(key, tuple) and key[0] in (_QUESTIONS_PAGE_KEY, _SEARCH_KEY)
+
+
+def _is_leaderboard_key(key: Any) -> bool:
+    return isinstance(key, tuple) and key[0] == _LEADERBOARD_KEY
+
+
+def _invalidate_daily_readings(user_id: int) -> None:
+    """Remove as janelas de leituras diárias do usuário (uma por período consultado)."""
+    _daily_readings_cache.invalidate_where(lambda key: isinstance(key, tuple) and key[0] == user_id)
+
+
+def _invalidate_completions(user_id: int) -> None:
+    """Descarta os livros concluídos do usuário e as páginas do ranking."""
+    _completions_cache.invalidate(user_id)
+    _completions_cache.invalidate_where(_is_leaderboard_key)
+    _stats_cache.invalidate(user_id)
+
 
 class DatabaseRepository:
     """
-    Classe repositório para encapsular todas as interações com o banco de dados Supabase.
+    Classe repositório para encapsular todas as interações com o banco de dados.
+
+    O cliente pode ser o Supabase (produção) ou o `LocalClient` (backend offline),
+    ambos expondo a mesma interface de consultas do PostgREST.
     """
 
-    def __init__(self, client: Client):
-        """Inicializa o repositório com o cliente Supabase.
+    def __init__(self, client: DatabaseClient, book_catalog: Optional[BookCatalog] = None):
+        """Inicializa o repositório com o cliente de banco de dados.
+
+        Args:
+            client: O cliente (Supabase ou local) para interagir com o banco de dados.
+            book_catalog: Catálogo de livros fixo (ex: `BookCatalog.bundled()`). Se
+                informado, o catálogo nunca é consultado no banco.
+        """
+        # As consultas são medidas por método e por tabela (ver src/metrics.py).
+        self._client: DatabaseClient = InstrumentedClient(client)
+        self._book_catalog = book_catalog
+
+    def paginate(
+        self,
+        query_factory: Callable[[], Any],
+        key: Optional[str] = "id",
+        desc: bool = False,
+        page_size: int = PAGE_SIZE,
+    ) -> Iterator[dict[str, Any]]:
+        """Percorre todas as linhas de uma consulta, página por página.
+
+        Evita a truncagem silenciosa das respostas no limite 'max-rows' do PostgREST.
+        Com `key`, usa paginação por chave (keyset): cada página filtra as linhas
+        após a última chave vista, com custo constante por página. Sem `key`, usa
+        requisições por intervalo (Range) sobre a ordenação da própria consulta.
 
         Args:
-            client: O cliente Supabase para interagir com o banco de dados.
+            query_factory: Função que retorna uma nova consulta (select e filtros) a cada página.
+            key: Coluna única e ordenável da paginação por chave; precisa estar no select.
+                Use None para paginar por intervalo.
+            desc: Se a paginação por chave segue em ordem decrescente.
+            page_size: Número de linhas por página (no máximo o 'max-rows' do servidor).
+
+        Yields:
+            As linhas da consulta, como dicionários, à medida que as páginas chegam.
         """
-        self._client: Client = client
+        last_key: Any = None
+        start = 0
+        while True:
+            if key is None:
+                query = query_factory().range(start, start + page_size - 1)
+            else:
+                query = query_factory().order(key, desc=desc).limit(page_size)
+                if last_key is not None:
+                    query = query.lt(key, last_key) if desc else query.gt(key, last_key)
+            rows = query.execute().data or []
+            for row in rows:
+                if isinstance(row, dict):
+                    yield row
+            if len(rows) < page_size:
+                return
+            start += len(rows)
+            if key is not None:
+                last_key = rows[-1][key]
+
+    @instrumented
+    def data_version(self, *tables: str) -> tuple[Any, ...]:
+        """Retorna a versão atual dos dados de um conjunto de tabelas.
+
+        As versões vêm de 'tb_versoes_dados', um contador de alterações por tabela
+        mantido por triggers. Uma única consulta pequena traz todas as tabelas; ela é
+        compartilhada entre as sessões e repetida no máximo a cada
+        VERSION_PROBE_INTERVAL segundos. Os caches versionados usam o resultado para
+        recarregar os dados apenas quando alguma das suas tabelas muda.
+
+        Args:
+            *tables: As tabelas de origem dos dados.
+
+        Returns:
+            A versão de cada tabela ou, se as versões não estiverem disponíveis, o
+            período atual de FALLBACK_VERSION_TTL segundos (expiração por tempo).
+        """
+        versions: dict[str, int] = _versions_cache.get_or_load(_VERSIONS_KEY, self._fetch_data_versions)
+        if not versions:
+            return ("expiracao", int(time.time() // FALLBACK_VERSION_TTL))
+        return tuple(versions.get(table, 0) for table in tables)
+
+    def _fetch_data_versions(self) -> dict[str, int]:
+        try:
+            response = self._client.table("tb_versoes_dados").select("tabela, versao").execute()
+        except Exception as e:
+            logger.warning(
+                f"Não foi possível consultar as versões dos dados; usando expiração por tempo: {e}"
+            )
+            return {}
+        return {
+            row["tabela"]: int(row["versao"]) for row in response.data or [] if isinstance(row, dict)
+        }
 
+    @instrumented
     def get_all_users(self) -> list[Usuario]:
         """Carrega a lista de todos os usuários ordenados por nome.
 
@@ -34,14 +219,17 @@ class DatabaseRepository:
             Uma lista de objetos Usuario.
         """
         try:
-            response = self._client.table("tb_usuarios").select("id, nome").order("nome").execute()
-            if not response.data:
-                return []
-            return [Usuario(**user_data) for user_data in response.data if isinstance(user_data, dict)]
+            return [
+                Usuario(**user_data)
+                for user_data in self.paginate(
+                    lambda: self._client.table("tb_usuarios").select("id, nome"), key="nome"
+                )
+            ]
         except Exception as e:
             logger.error(f"Erro ao carregar lista de usuários: {e}", exc_info=True)
             return []
 
+    @instrumented
     def get_last_active_plan_name(self, user: Usuario) -> Optional[str]:
         """Busca o nome do último plano de leitura ativo para um usuário.
 
@@ -71,120 +259,170 @@ class DatabaseRepository:
             logger.warning(f"Não foi possível buscar o último plano ativo para {user.nome}: {e}")
         return None
 
-    @st.cache_data(ttl=300)
-    def get_all_plan_names(_self) -> list[str]:
+    @instrumented
+    def get_all_plan_names(self) -> list[str]:
         """Busca os nomes de todos os planos de leitura disponíveis, ordenados alfabeticamente.
 
+        A lista é cacheada enquanto a versão dos planos não mudar (ver `data_version`).
+
         Returns:
             Uma lista com os nomes dos planos.
         """
         try:
-            response = _self._client.table("tb_planos").select("nome").order("nome").execute()
-            if response.data:
-                return [
-                    item["nome"]
-                    for item in response.data
-                    if isinstance(item, dict) and "nome" in item and isinstance(item["nome"], str)
-                ]
+            return list(
+                _plans_cache.get_or_load(
+                    _PLAN_NAMES_KEY, self._fetch_plan_names, version=self.data_version(*PLAN_TABLES)
+                )
+            )
         except Exception as e:
             logger.error(f"Erro ao carregar nomes dos planos: {e}", exc_info=True)
             st.error("Não foi possível carregar a lista de planos.")
         return []
 
-    @st.cache_data(ttl=300)
-    def get_plan_structure_by_name(_self, plan_name: str) -> Optional[pd.DataFrame]:
-        """Carrega e estrutura um plano de leitura específico a partir do seu nome.
+    def _fetch_plan_names(self) -> tuple[str, ...]:
+        return tuple(
+            item["nome"]
+            for item in self.paginate(lambda: self._client.table("tb_planos").select("nome"), key="nome")
+            if isinstance(item.get("nome"), str)
+        )
 
-        Este método busca as entradas de um único plano, processa os dados e retorna
-        um DataFrame do pandas contendo a estrutura completa daquele plano.
+    @instrumented
+    def get_plan_index(self, plan_name: str) -> Optional[PlanIndex]:
+        """Carrega o índice imutável de um plano de leitura a partir do seu nome.
 
-        O método é cacheado pelo Streamlit para otimizar o desempenho, evitando
-        consultas repetidas ao banco de dados.
+        O índice é construído uma única vez por versão dos planos (ver `data_version`)
+        e compartilhado entre as sessões do processo. Ele responde às consultas da página de leitura
+        (entradas de uma data, total de capítulos, meta acumulada) sem varrer nem
+        reexpandir o DataFrame do plano.
 
         Args:
             plan_name: O nome do plano a ser carregado.
 
         Returns:
-            Um DataFrame com a estrutura do plano, ou None se o plano não for encontrado
-            ou em caso de erro.
+            O PlanIndex do plano, ou None se o plano não for encontrado ou em caso de erro.
         """
         try:
-            response = (
-                _self._client.table("tb_plano_entradas")
-                .select(
-                    "data_leitura, capitulos, plano:tb_planos!inner(id, nome), livro:tb_livros(id, nome)"
-                )
-                .eq("plano.nome", plan_name)
-                .execute()
-            )
-
-            df_plano = pd.DataFrame(response.data)
-            if df_plano.empty:
-                return None
+            return self._load_plan_index(plan_name)
+        except Exception as e:
+            logger.error(f"Erro ao carregar o plano '{plan_name}': {e}", exc_info=True)
+            st.error(f"Erro ao carregar o plano '{plan_name}'.")
+            return None
 
-            df_plano["nome_plano"] = df_plano["plano"].apply(lambda p: p["nome"] if p else None)
-            df_plano["plano_id"] = df_plano["plano"].apply(lambda p: p["id"] if p else None)
-            df_plano["livro_id"] = df_plano["livro"].apply(
-                lambda livro_obj: livro_obj["id"] if livro_obj else None
+    def _load_plan_index(self, plan_name: str) -> Optional[PlanIndex]:
+        return _plan_index_cache.get_or_load(
+            plan_name,
+            lambda: self._build_plan_index(plan_name),
+            version=self.data_version(*PLAN_TABLES),
+        )
+
+    def _build_plan_index(self, plan_name: str) -> Optional[PlanIndex]:
+        catalog = self.get_book_catalog()
+        plano: dict[str, Any] = {}
+        rows = []
+        for row in self.paginate(
+            lambda: self._client.table("tb_plano_entradas")
+            .select(
+                "id, data_leitura, capitulos, id_livro, plano:tb_planos!inner(id, nome), "
+                "slots:tb_plano_slots(ordem, capitulo)"
             )
-            df_plano["livro"] = df_plano["livro"].apply(
-                lambda livro_obj: livro_obj["nome"] if livro_obj else None
+            .eq("plano.nome", plan_name)
+            # Recurso embutido com alias: a ordenação usa o alias ('slots.order=ordem').
+            .order("ordem", foreign_table="slots")
+        ):
+            plano = row["plano"]
+            rows.append(
+                {
+                    "data_leitura": row["data_leitura"],
+                    "capitulos": row["capitulos"],
+                    # Capítulos já expandidos em tb_plano_slots: nada é reinterpretado aqui.
+                    "capitulos_expandidos": [slot["capitulo"] for slot in row.get("slots") or []],
+                    "livro_id": row["id_livro"],
+                    "livro": catalog.name_of(row["id_livro"]),
+                }
             )
-            df_plano = df_plano.rename(columns={"data_leitura": "data"})
-            df_plano["data"] = pd.to_datetime(df_plano["data"])
+        if not rows:
+            return None
+        return PlanIndex.from_rows(int(plano["id"]), plano["nome"], rows)
+
+    @instrumented
+    def get_plan_structure_by_name(self, plan_name: str) -> Optional[pd.DataFrame]:
+        """Carrega e estrutura um plano de leitura específico a partir do seu nome.
+
+        O DataFrame é montado a partir do PlanIndex do plano (ver `get_plan_index`),
+        com uma linha por entrada do plano, e cacheado com a mesma versão do índice.
 
-            df_plano = df_plano.sort_values(by="data")
-            df_plano["qtd_capitulos"] = df_plano["capitulos"].apply(lambda x: len(expandir_capitulos(x)))
-            return df_plano
+        Args:
+            plan_name: O nome do plano a ser carregado.
 
+        Returns:
+            Um DataFrame com a estrutura do plano, ou None se o plano não for encontrado
+            ou em caso de erro.
+        """
+        try:
+            frame: Optional[pd.DataFrame] = _plans_cache.get_or_load(
+                (_PLAN_FRAME_KEY, plan_name),
+                lambda: self._build_plan_frame(plan_name),
+                version=self.data_version(*PLAN_TABLES),
+            )
         except Exception as e:
             logger.error(f"Erro ao carregar o plano '{plan_name}': {e}", exc_info=True)
             st.error(f"Erro ao carregar o plano '{plan_name}'.")
             return None
+        # Cópia: o DataFrame em cache é compartilhado entre as sessões.
+        return frame.copy() if frame is not None else None
 
-    def find_next_unread_date(self, user: Usuario, df_plano: pd.DataFrame) -> datetime:
+    def _build_plan_frame(self, plan_name: str) -> Optional[pd.DataFrame]:
+        plan_index = self._load_plan_index(plan_name)
+        return plan_index.to_frame() if plan_index is not None else None
+
+    @instrumented
+    def find_next_unread_date(self, user: Usuario, plan_index: PlanIndex) -> date:
         """Encontra a próxima data de leitura com capítulos pendentes em um plano.
 
-        Compara os capítulos planejados com os capítulos já lidos pelo usuário
-        para determinar a primeira data no cronograma que ainda não foi completada.
+        Usa o bitset de progresso do usuário (ver `get_plan_progress`) para achar o
+        primeiro capítulo programado que ainda não foi lido.
 
         Args:
             user: O usuário para o qual a verificação será feita.
-            df_plano: DataFrame do plano de leitura específico.
+            plan_index: O índice do plano de leitura.
 
         Returns:
-            Um objeto datetime correspondente à próxima data com leitura pendente.
-            Retorna a data atual se o plano estiver completo ou vazio.
+            A próxima data com leitura pendente. Retorna a data atual se o plano
+            estiver completo ou vazio.
         """
-        if df_plano.empty:
-            return datetime.now(FUSO_BR)
-
-        plano_id = df_plano["plano_id"].iloc[0]
-        leituras_usuario = self.get_user_readings(user, int(plano_id))
+        proxima_data = self.get_plan_progress(user, plan_index).next_unread_date()
+        return proxima_data or datetime.now(FUSO_BR).date()
 
-        if not leituras_usuario:
-            return df_plano["data"].min()
+    @instrumented
+    def get_plan_progress(self, user: Usuario, plan_index: PlanIndex) -> PlanProgress:
+        """Retorna o progresso do usuário no plano como um bitset sobre os slots do plano.
 
-        lidos_set = {
-            (leitura.livro.nome, leitura.capitulo, leitura.data_leitura_plano)
-            for leitura in leituras_usuario
-            if leitura.data_leitura_plano
-        }
-        df_plano_ordenado = df_plano.sort_values(by="data")
+        O bitset é construído a partir de `get_user_readings` na primeira consulta e
+        atualizado incrementalmente a cada leitura salva.
 
-        for _, row in df_plano_ordenado.iterrows():
-            livro_plano = row["livro"]
-            data_plano = row["data"].date()
-            lista_caps = expandir_capitulos(str(row["capitulos"]))
-            if not all((livro_plano, cap, data_plano) in lidos_set for cap in lista_caps):
-                return row["data"]
+        Args:
+            user: O usuário.
+            plan_index: O índice do plano de leitura.
 
-        return datetime.now(FUSO_BR)
+        Returns:
+            O PlanProgress do usuário no plano.
+        """
+        key = (user.id, plan_index.plan_id)
+        progress: Optional[PlanProgress] = _progress_cache.get(key)
+        if progress is None or progress.plan_index is not plan_index:
+            progress = PlanProgress.from_readings(
+                plan_index, self.get_user_readings(user, plan_index.plan_id)
+            )
+            _progress_cache.set(key, progress)
+        return progress
 
-    @st.cache_data(ttl=60)
-    def get_user_readings(_self, user: Usuario, plan_id: int) -> list[Leitura]:
+    @instrumented
+    def get_user_readings(self, user: Usuario, plan_id: int) -> list[Leitura]:
         """Carrega o histórico de capítulos lidos por um usuário em um plano específico.
 
+        O resultado é cacheado por (usuário, plano); salvar uma leitura invalida apenas
+        a entrada correspondente, sem afetar as sessões de outros usuários.
+
         Args:
             user: O usuário cujas leituras serão buscadas.
             plan_id: O ID do plano de leitura a ser filtrado.
@@ -193,22 +431,31 @@ class DatabaseRepository:
             Uma lista de objetos Leitura representando os capítulos lidos.
         """
         try:
-            response = (
-                _self._client.table("tb_leituras")
-                .select("capitulo, created_at, data_leitura_plano, livro:tb_livros(id, nome)")
-                .eq("usuario_id", user.id)
-                .eq("plano_id", plan_id)
-                .execute()
+            return list(
+                _readings_cache.get_or_load(
+                    (user.id, int(plan_id)), lambda: self._fetch_user_readings(user.id, int(plan_id))
+                )
             )
-            if not response.data:
-                return []
-            return [Leitura(**data) for data in response.data if isinstance(data, dict)]
         except Exception as e:
             logger.warning(
                 f"AVISO: Não foi possível carregar leituras para {user.nome} no plano ID {plan_id}: {e}"
             )
             return []
 
+    def _fetch_user_readings(self, user_id: int, plan_id: int) -> list[Leitura]:
+        # O livro vem do catálogo (pelo ID), sem embutir 'tb_livros' em cada linha.
+        catalog = self.get_book_catalog()
+        return [
+            Leitura(**data, livro=Livro(id=data["id_livro"], nome=catalog.name_of(data["id_livro"])))
+            for data in self.paginate(
+                lambda: self._client.table("tb_leituras")
+                .select("id, capitulo, created_at, data_leitura_plano, id_livro")
+                .eq("usuario_id", user_id)
+                .eq("plano_id", plan_id)
+            )
+        ]
+
+    @instrumented
     def save_reading(
         self, user: Usuario, plan_id: int, book_id: int, chapter: int, reading_date: date
     ) -> bool:
@@ -226,14 +473,38 @@ class DatabaseRepository:
         Returns:
             True se o livro foi recém-concluído, False caso contrário.
         """
+        return bool(self.save_readings(user, plan_id, [(book_id, chapter, reading_date)]))
+
+    @instrumented
+    def save_readings(
+        self, user: Usuario, plan_id: int, readings: list[tuple[int, int, date]]
+    ) -> list[int]:
+        """Salva vários registros de leitura de um usuário em um único upsert.
+
+        Usado para marcar um dia (ou uma entrada do plano) inteiro como lido. Após
+        salvar, verifica a conclusão de todos os livros afetados em uma única RPC.
+
+        Args:
+            user: O usuário que realizou as leituras.
+            plan_id: O ID do plano de leitura associado.
+            readings: Tuplas (ID do livro, capítulo, data planejada) a serem salvas.
+
+        Returns:
+            Os IDs dos livros recém-concluídos (lista vazia se nenhum).
+        """
+        if not readings:
+            return []
         try:
-            insert_data: Dict[str, Any] = {
-                "usuario_id": user.id,
-                "plano_id": plan_id,
-                "id_livro": book_id,
-                "capitulo": chapter,
-                "data_leitura_plano": str(reading_date),
-            }
+            insert_data: list[Dict[str, Any]] = [
+                {
+                    "usuario_id": user.id,
+                    "plano_id": plan_id,
+                    "id_livro": book_id,
+                    "capitulo": chapter,
+                    "data_leitura_plano": str(reading_date),
+                }
+                for book_id, chapter, reading_date in readings
+            ]
 
             response = (
                 self._client.table("tb_leituras")
@@ -246,17 +517,28 @@ class DatabaseRepository:
                 .execute()
             )
 
-            # Se a contagem de linhas inseridas for > 0, a leitura era nova.
+            # Se a contagem de linhas inseridas for > 0, ao menos uma leitura era nova.
             if response.count is not None and response.count > 0:
-                # Invalida o cache das leituras do usuário para forçar a recarga dos dados.
-                self.get_user_readings.clear()
-                return self._check_and_save_book_completion(user.id, plan_id, book_id)
+                # Invalida apenas o cache das leituras deste usuário neste plano
+                # e marca as leituras no bitset de progresso, se já estiver carregado.
+                _readings_cache.invalidate((user.id, plan_id))
+                _stats_cache.invalidate(user.id)
+                _invalidate_daily_readings(user.id)
+                _dashboard_cache.invalidate(_DASHBOARD_KEY)
+                progress: Optional[PlanProgress] = _progress_cache.get((user.id, plan_id))
+                if progress is not None:
+                    _progress_cache.set((user.id, plan_id), progress.marked(readings))
+                # Com 'ignore_duplicates', a resposta traz apenas as linhas inseridas.
+                inserted_books = {
+                    row["id_livro"] for row in response.data or [] if isinstance(row, dict)
+                } or {book_id for book_id, _, _ in readings}
+                return self._check_and_save_books_completion(user.id, plan_id, sorted(inserted_books))
 
         except Exception as e:
-            logger.error(f"Erro ao salvar leitura: {e}", exc_info=True)
+            logger.error(f"Erro ao salvar leituras: {e}", exc_info=True)
             st.error(f"Erro ao salvar leitura: {e}")
 
-        return False
+        return []
 
     def _check_and_save_book_completion(self, usuario_id: int, plano_id: int, livro_id: int) -> bool:
         """
@@ -284,12 +566,48 @@ class DatabaseRepository:
                 {"p_usuario_id": usuario_id, "p_plano_id": plano_id, "p_livro_id": livro_id},
             ).execute()
             if isinstance(response.data, bool):
+                if response.data:
+                    _invalidate_completions(usuario_id)
                 return response.data
         except Exception as e:
             # O erro é logado, mas não interrompe o usuário
             logger.warning(f"Erro ao verificar conclusão do livro via RPC: {e}")
         return False
 
+    def _check_and_save_books_completion(
+        self, usuario_id: int, plano_id: int, livro_ids: list[int]
+    ) -> list[int]:
+        """
+        Verifica a conclusão de vários livros de um plano em uma única chamada.
+
+        Chama a função de banco de dados (RPC) 'handle_books_completion_check', que
+        executa 'handle_book_completion_check' para cada livro e devolve os IDs dos
+        livros recém-concluídos.
+
+        Args:
+            usuario_id: O ID do usuário.
+            plano_id: O ID do plano de leitura.
+            livro_ids: Os IDs dos livros a serem verificados.
+
+        Returns:
+            Os IDs dos livros recém-concluídos.
+        """
+        try:
+            response = self._client.rpc(
+                "handle_books_completion_check",
+                {"p_usuario_id": usuario_id, "p_plano_id": plano_id, "p_livro_ids": livro_ids},
+            ).execute()
+            if isinstance(response.data, list):
+                completed = [int(livro_id) for livro_id in response.data if livro_id is not None]
+                if completed:
+                    _invalidate_completions(usuario_id)
+                return completed
+        except Exception as e:
+            # O erro é logado, mas não interrompe o usuário
+            logger.warning(f"Erro ao verificar conclusão dos livros via RPC: {e}")
+        return []
+
+    @instrumented
     def save_question(self, text: str) -> None:
         """Salva uma nova pergunta anônima no mural de dúvidas.
 
@@ -298,11 +616,14 @@ class DatabaseRepository:
         """
         try:
             self._client.table("tb_perguntas").insert({"pergunta_texto": text}).execute()
+            # Uma nova pergunta desloca as páginas; as respostas continuam em cache.
+            _questions_cache.invalidate_where(_is_questions_list_key)
             st.toast("Pergunta enviada!", icon="✅")
         except Exception as e:
             logger.error(f"Erro ao salvar pergunta: {e}", exc_info=True)
             st.error(f"Erro ao salvar pergunta: {e}")
 
+    @instrumented
     def save_answer(self, question_id: int, user: Usuario, text: str) -> None:
         """Salva uma nova resposta para uma pergunta existente no mural.
 
@@ -315,41 +636,136 @@ class DatabaseRepository:
             self._client.table("tb_respostas").insert(
                 {"pergunta_id": question_id, "usuario_id": user.id, "resposta_texto": text}
             ).execute()
+            # Invalida as respostas da pergunta e as páginas (total e ordem mudam).
+            _questions_cache.invalidate((_ANSWERS_KEY, question_id))
+            _questions_cache.invalidate_where(_is_questions_list_key)
             st.toast("Resposta enviada!", icon="💬")
         except Exception as e:
             logger.error(f"Erro ao salvar resposta: {e}", exc_info=True)
             st.error(f"Erro ao salvar resposta: {e}")
 
-    @st.cache_data(ttl=60)
-    def get_all_questions_with_answers(_self) -> list[Pergunta]:
-        """Carrega todas as perguntas e suas respectivas respostas do mural.
+    @instrumented
+    def get_questions_page(
+        self, page: int, page_size: int = QUESTIONS_PAGE_SIZE
+    ) -> tuple[list[Pergunta], bool]:
+        """Carrega uma página do mural de dúvidas, sem as respostas.
 
-        As perguntas são retornadas com uma lista aninhada de suas respostas.
-        O método é cacheado pelo Streamlit.
+        As perguntas sem resposta vêm primeiro e, dentro de cada grupo, as mais recentes.
+        Cada página custa uma consulta de tamanho fixo sobre o índice do mural,
+        independente do tamanho do histórico. As páginas são cacheadas e invalidadas
+        quando uma pergunta ou resposta é enviada.
+
+        Args:
+            page: O número da página, a partir de 0.
+            page_size: O número de perguntas por página.
 
         Returns:
-            Uma lista de objetos Pergunta, cada um contendo suas respostas.
+            As perguntas da página (com o total de respostas) e se há uma próxima página.
         """
         try:
-            response = (
-                _self._client.table("tb_perguntas")
-                .select("*, respostas:tb_respostas(*, autor:tb_usuarios(id, nome))")
-                .order("created_at", desc=True)
-                .order("created_at", foreign_table="tb_respostas", desc=False)
-                .execute()
+            return _questions_cache.get_or_load(
+                (_QUESTIONS_PAGE_KEY, page, page_size),
+                lambda: self._fetch_questions_page(page, page_size),
+                version=self.data_version(*QUESTION_TABLES),
+            )
+        except Exception as e:
+            logger.error(f"Erro ao carregar o mural de dúvidas: {e}", exc_info=True)
+            st.error("Não foi possível carregar o mural de dúvidas. Tente recarregar a página.")
+            return [], False
+
+    def _fetch_questions_page(self, page: int, page_size: int) -> tuple[list[Pergunta], bool]:
+        start = page * page_size
+        # Uma linha a mais indica se existe uma próxima página, sem contar a tabela.
+        response = (
+            self._client.table("tb_perguntas")
+            .select("id, pergunta_texto, created_at, total_respostas")
+            .order("respondida")
+            .order("id", desc=True)
+            .range(start, start + page_size)
+            .execute()
+        )
+        rows = [row for row in response.data or [] if isinstance(row, dict)]
+        return [Pergunta(**row) for row in rows[:page_size]], len(rows) > page_size
+
+    @instrumented
+    def search_questions(
+        self, term: str, page: int, page_size: int = QUESTIONS_PAGE_SIZE
+    ) -> tuple[list[Pergunta], bool]:
+        """Busca perguntas pelo texto da pergunta e das respostas.
+
+        Chama a função 'buscar_duvidas', que usa o índice de texto completo (em
+        português, sem acentos) e ordena os resultados por relevância. Como no mural,
+        cada página é uma consulta de tamanho fixo e os resultados são cacheados até
+        a próxima pergunta ou resposta.
+
+        Args:
+            term: O texto digitado na busca.
+            page: O número da página, a partir de 0.
+            page_size: O número de perguntas por página.
+
+        Returns:
+            As perguntas encontradas na página e se há uma próxima página.
+        """
+        term = " ".join(term.split())
+        if not term:
+            return [], False
+        try:
+            return _questions_cache.get_or_load(
+                (_SEARCH_KEY, term.lower(), page, page_size),
+                lambda: self._fetch_search_page(term, page, page_size),
+                version=self.data_version(*QUESTION_TABLES),
             )
+        except Exception as e:
+            logger.error(f"Erro ao buscar no mural de dúvidas: {e}", exc_info=True)
+            st.error("Não foi possível realizar a busca. Tente novamente.")
+            return [], False
+
+    def _fetch_search_page(self, term: str, page: int, page_size: int) -> tuple[list[Pergunta], bool]:
+        response = self._client.rpc(
+            "buscar_duvidas",
+            {"p_termo": term, "p_limite": page_size + 1, "p_offset": page * page_size},
+        ).execute()
+        rows = [row for row in response.data or [] if isinstance(row, dict)]
+        return [Pergunta(**row) for row in rows[:page_size]], len(rows) > page_size
 
-            if not response.data:
-                return []
+    @instrumented
+    def get_question_answers(self, question_id: int) -> list[Resposta]:
+        """Carrega as respostas de uma pergunta, em ordem de envio.
 
-            perguntas = [Pergunta(**p_data) for p_data in response.data if isinstance(p_data, dict)]
-            return perguntas
+        Chamado apenas quando o usuário abre a pergunta no mural. O resultado é
+        cacheado por pergunta e invalidado quando ela recebe uma nova resposta.
 
+        Args:
+            question_id: O ID da pergunta.
+
+        Returns:
+            Uma lista de objetos Resposta com o autor de cada uma.
+        """
+        try:
+            return list(
+                _questions_cache.get_or_load(
+                    (_ANSWERS_KEY, question_id),
+                    lambda: self._fetch_question_answers(question_id),
+                    version=self.data_version(*QUESTION_TABLES),
+                )
+            )
         except Exception as e:
-            logger.error(f"Erro ao carregar o mural de dúvidas: {e}", exc_info=True)
-            st.error("Não foi possível carregar o mural de dúvidas. Tente recarregar a página.")
+            logger.error(f"Erro ao carregar as respostas da pergunta {question_id}: {e}", exc_info=True)
+            st.error("Não foi possível carregar as respostas. Tente novamente.")
             return []
 
+    def _fetch_question_answers(self, question_id: int) -> list[Resposta]:
+        # IDs crescentes equivalem à ordem de envio das respostas.
+        return [
+            Resposta(**data)
+            for data in self.paginate(
+                lambda: self._client.table("tb_respostas")
+                .select("*, autor:tb_usuarios(id, nome)")
+                .eq("pergunta_id", question_id)
+            )
+        ]
+
+    @instrumented
     def get_user_unique_readings_count(self, user_id: int) -> int:
         """
         Conta o número de capítulos únicos lidos por um usuário em todos os planos.
@@ -376,157 +792,237 @@ class DatabaseRepository:
             logger.warning(f"Não foi possível contar as leituras únicas do usuário {user_id}: {e}")
             return 0
 
-    @st.cache_data(ttl=60)
-    def get_completed_books_dashboard(_self) -> dict[str, set[str]]:
-        """Busca os livros concluídos por todos os usuários.
+    @instrumented
+    def get_user_completed_books(self, user_id: int) -> set[int]:
+        """Busca os livros concluídos por um usuário (em qualquer plano).
 
-        Os dados são carregados da tabela 'tb_livros_concluidos' e estruturados
-        em um dicionário para fácil acesso na página de 'Awards'.
-        O método é cacheado pelo Streamlit.
+        O resultado é cacheado por usuário e recarregado quando ele conclui um livro
+        ou quando a versão das conclusões muda (ver `data_version`).
+
+        Args:
+            user_id: O ID do usuário.
 
         Returns:
-            Um dicionário onde as chaves são nomes de usuários e os valores são
-            conjuntos (set) com os nomes dos livros concluídos.
+            Os IDs dos livros concluídos; nome, ordem e imagem vêm do `BookCatalog`.
         """
         try:
-            response = (
-                _self._client.table("tb_livros_concluidos")
-                .select("usuario:tb_usuarios(nome), livro:tb_livros(nome)")
-                .execute()
+            return set(
+                _completions_cache.get_or_load(
+                    user_id,
+                    lambda: self._fetch_user_completed_books(user_id),
+                    version=self.data_version(*COMPLETION_TABLES),
+                )
             )
-
-            if not response.data:
-                return {}
-
-            completed_books: dict[str, set[str]] = {}
-            for row in response.data:
-                if not isinstance(row, dict):
-                    continue
-
-                user_info = row.get("usuario")
-                book_info = row.get("livro")
-                if isinstance(user_info, dict) and isinstance(book_info, dict):
-                    user_name = user_info.get("nome")
-                    book_name = book_info.get("nome")
-                    if isinstance(user_name, str) and isinstance(book_name, str):
-                        completed_books.setdefault(user_name, set()).add(book_name)
-            return completed_books
         except Exception as e:
-            logger.warning(f"Não foi possível carregar os selos de conclusão: {e}")
+            logger.warning(f"Não foi possível carregar os selos de conclusão do usuário {user_id}: {e}")
             st.warning(f"Não foi possível carregar os selos de conclusão: {e}")
-            return {}
+            return set()
+
+    def _fetch_user_completed_books(self, user_id: int) -> frozenset[int]:
+        return frozenset(
+            int(row["id_livro"])
+            for row in self.paginate(
+                lambda: self._client.table("tb_livros_concluidos")
+                .select("id, id_livro")
+                .eq("usuario_id", user_id)
+            )
+        )
 
+    @instrumented
+    def get_completion_leaderboard(
+        self, page: int, page_size: int = LEADERBOARD_PAGE_SIZE
+    ) -> tuple[list[PosicaoRanking], bool]:
+        """Carrega uma página do ranking de livros concluídos da comunidade.
+
+        O total de livros distintos concluídos por usuário é mantido no banco
+        ('tb_estatisticas_usuarios.livros_concluidos'), então cada página é uma
+        consulta de tamanho fixo sobre o índice do ranking, independente do número de
+        membros e de conclusões. Empates são ordenados pelo ID do usuário.
+
+        Args:
+            page: O número da página, a partir de 0.
+            page_size: O número de membros por página.
+
+        Returns:
+            Os membros da página, com a posição no ranking, e se há uma próxima página.
+        """
+        try:
+            return _completions_cache.get_or_load(
+                (_LEADERBOARD_KEY, page, page_size),
+                lambda: self._fetch_leaderboard_page(page, page_size),
+                version=self.data_version(*COMPLETION_TABLES),
+            )
+        except Exception as e:
+            logger.warning(f"Não foi possível carregar o ranking de conclusões: {e}")
+            st.warning(f"Não foi possível carregar o ranking de conclusões: {e}")
+            return [], False
+
+    def _fetch_leaderboard_page(self, page: int, page_size: int) -> tuple[list[PosicaoRanking], bool]:
+        start = page * page_size
+        response = (
+            self._client.table("tb_estatisticas_usuarios")
+            .select("usuario_id, livros_concluidos, usuario:tb_usuarios(id, nome)")
+            .gt("livros_concluidos", 0)
+            .order("livros_concluidos", desc=True)
+            .order("usuario_id")
+            .range(start, start + page_size)
+            .execute()
+        )
+        rows = [row for row in response.data or [] if isinstance(row, dict)]
+        ranking = [
+            PosicaoRanking(
+                posicao=start + i + 1,
+                usuario=Usuario(**row["usuario"]),
+                livros_concluidos=row["livros_concluidos"],
+            )
+            for i, row in enumerate(rows[:page_size])
+            if isinstance(row.get("usuario"), dict)
+        ]
+        return ranking, len(rows) > page_size
+
+    @instrumented
     def get_dashboard_progress(self) -> pd.DataFrame:
         """Busca os dados de progresso consolidados da view do dashboard.
 
         A view 'vw_dashboard_progresso' já contém os cálculos de capítulos lidos,
-        metas e status para cada usuário em cada plano.
+        metas e status para cada usuário em cada plano. O resultado é cacheado
+        enquanto os planos e os usuários não mudarem; como a meta do dia depende da
+        data, a data atual também faz parte da versão. As leituras não são versionadas:
+        o cache é invalidado quando o processo salva leituras e, para as gravadas por
+        outros processos, expira a cada DASHBOARD_READINGS_TTL segundos.
 
         Returns:
             Um DataFrame do pandas com os dados prontos para serem exibidos.
         """
         try:
-            response = self._client.from_("vw_dashboard_progresso").select("*").execute()
-            return pd.DataFrame(response.data)
+            version = (
+                *self.data_version(*DASHBOARD_TABLES),
+                datetime.now(FUSO_BR).date(),
+                int(time.time() // DASHBOARD_READINGS_TTL),
+            )
+            dashboard: pd.DataFrame = _dashboard_cache.get_or_load(
+                _DASHBOARD_KEY, self._fetch_dashboard_progress, version=version
+            )
+            # Cópia: a página acrescenta colunas ao DataFrame.
+            return dashboard.copy()
         except Exception as e:
             logger.error(f"Erro ao carregar dados do dashboard da view: {e}", exc_info=True)
             st.error(f"Erro ao carregar dados do dashboard: {e}")
             return pd.DataFrame()
 
-    @st.cache_data(ttl=3600)
-    def get_total_bible_chapters(_self) -> int:
-        """Calcula o número total de capítulos na Bíblia a partir do banco de dados.
-
-        Returns:
-            O número total de capítulos em todos os livros.
-        """
-        try:
-            # Usamos a função de agregação 'sum' do PostgREST
-            response = (
-                _self._client.table("tb_livros").select("chapters", count=CountMethod.exact).execute()
+    def _fetch_dashboard_progress(self) -> pd.DataFrame:
+        # A view não tem chave única: pagina por intervalo sobre uma ordenação estável.
+        return pd.DataFrame(
+            self.paginate(
+                lambda: self._client.from_("vw_dashboard_progresso")
+                .select("*")
+                .order("Plano")
+                .order("Usuario"),
+                key=None,
             )
-            if response.data:
-                return sum(
-                    item["chapters"]
-                    for item in response.data
-                    if isinstance(item, dict) and "chapters" in item and item["chapters"] is not None
-                )
-        except Exception as e:
-            logger.warning(f"Não foi possível calcular o total de capítulos da Bíblia: {e}")
-        return 0
+        )
+
+    @instrumented
+    def get_book_catalog(self) -> BookCatalog:
+        """Retorna o catálogo de livros (nome, ordem, capítulos e imagem por ID).
 
-    @st.cache_data(ttl=3600)
-    def get_book_order_map(_self) -> dict[str, int]:
-        """Cria um mapa de nome do livro para sua ordem canônica.
+        O catálogo é lido de 'tb_livros' em uma única consulta e compartilhado entre
+        as sessões do processo. Se a consulta falhar, usa o catálogo embutido.
 
         Returns:
-            Um dicionário mapeando o nome de cada livro para seu número de ordem.
+            O catálogo de livros.
         """
+        if self._book_catalog is not None:
+            return self._book_catalog
         try:
-            response = _self._client.table("tb_livros").select("nome, ordem").execute()
-            if response.data:
-                return {
-                    item["nome"]: item["ordem"]
-                    for item in response.data
-                    if isinstance(item, dict)
-                    and "nome" in item
-                    and "ordem" in item
-                    and item["ordem"] is not None
-                }
+            return _catalog_cache.get_or_load(_CATALOG_KEY, self._fetch_book_catalog)
         except Exception as e:
-            logger.warning(f"Não foi possível carregar o mapa de ordem dos livros: {e}")
-        return {}
+            logger.warning(f"Não foi possível carregar o catálogo de livros; usando o embutido: {e}")
+            return BookCatalog.bundled()
+
+    def _fetch_book_catalog(self) -> BookCatalog:
+        catalog = BookCatalog.from_rows(
+            self.paginate(
+                lambda: self._client.table("tb_livros").select("id, nome, ordem, chapters, image_path")
+            )
+        )
+        if not catalog:
+            raise ValueError("A tabela 'tb_livros' está vazia.")
+        return catalog
 
-    @st.cache_data(ttl=3600)
-    def get_book_images_map(_self) -> dict[str, str]:
-        """Cria um mapa de nome do livro para o caminho da sua imagem a partir do banco de dados.
+    @instrumented
+    def get_user_stats(self, user_id: int) -> EstatisticasLeitura:
+        """Busca as estatísticas de leitura de um usuário para as páginas de Perfil e Awards.
+
+        Lê uma linha de 'tb_estatisticas_usuarios' com os meses de
+        'tb_leituras_mensais_usuarios' embutidos, mantidas por triggers a cada escrita em
+        'tb_leituras', em vez de varrer o histórico de leituras. O resultado é cacheado
+        por usuário e invalidado quando o próprio usuário salva leituras.
+
+        Args:
+            user_id: O ID do usuário.
 
         Returns:
-            Um dicionário mapeando o nome de cada livro para o caminho da imagem.
+            As estatísticas do usuário (zeradas se ele ainda não registrou leituras).
         """
         try:
-            response = _self._client.table("tb_livros").select("nome, image_path").execute()
-            if response.data:
-                return {
-                    item["nome"]: item["image_path"]
-                    for item in response.data
-                    if isinstance(item, dict)
-                    and "nome" in item
-                    and "image_path" in item
-                    and item["image_path"] is not None
-                }
+            return _stats_cache.get_or_load(user_id, lambda: self._fetch_user_stats(user_id))
         except Exception as e:
-            logger.warning(f"Não foi possível carregar o mapa de imagens dos livros: {e}")
-        return {}
-
-    @st.cache_data(ttl=60)
-    def get_reading_history_for_profile(_self, user_id: int) -> list[date]:
-        """Busca o histórico de datas de leitura de um usuário para a página de perfil.
-
-        Retorna uma lista de todas as datas em que o usuário registrou uma leitura.
+            logger.warning(
+                f"Não foi possível carregar as estatísticas de leitura do usuário {user_id}: {e}"
+            )
+            return EstatisticasLeitura(usuario_id=user_id)
+
+    def _fetch_user_stats(self, user_id: int) -> EstatisticasLeitura:
+        response = (
+            self._client.table("tb_estatisticas_usuarios")
+            .select("*, meses:tb_leituras_mensais_usuarios(mes, capitulos)")
+            .eq("usuario_id", user_id)
+            .order("mes", foreign_table="meses")
+            .execute()
+        )
+        if not response.data:
+            return EstatisticasLeitura(usuario_id=user_id)
+        return EstatisticasLeitura(**response.data[0])
+
+    @instrumented
+    def get_daily_reading_counts(self, user_id: int, days: int = RHYTHM_DAYS) -> list[LeiturasDia]:
+        """Busca o número de capítulos lidos por dia nos últimos `days` dias, até hoje.
+
+        Lê 'tb_leituras_dias_usuarios', agregada por dia a cada escrita em
+        'tb_leituras': são no máximo `days` linhas, independente do tamanho do
+        histórico. Datas futuras do plano (leituras adiantadas) não entram.
 
         Args:
             user_id: O ID do usuário.
+            days: O tamanho do período, em dias.
 
         Returns:
-            Uma lista de objetos `date`.
+            Os dias com leitura no período, em ordem cronológica.
         """
+        end = datetime.now(FUSO_BR).date()
+        start = end - timedelta(days=days - 1)
         try:
-            response = (
-                _self._client.table("tb_leituras")
-                .select("data_leitura_plano")
-                .eq("usuario_id", user_id)
-                .not_.is_("data_leitura_plano", "null")
-                .execute()
+            return list(
+                _daily_readings_cache.get_or_load(
+                    (user_id, start, end), lambda: self._fetch_daily_reading_counts(user_id, start, end)
+                )
             )
-            if response.data:
-                return [
-                    datetime.strptime(item["data_leitura_plano"], "%Y-%m-%d").date()
-                    for item in response.data
-                    if isinstance(item, dict) and item.get("data_leitura_plano")
-                ]
         except Exception as e:
             logger.warning(
-                f"Não foi possível carregar o histórico de leituras para o perfil do usuário {user_id}: {e}"
+                f"Não foi possível carregar o calendário de leitura do usuário {user_id}: {e}"
             )
-        return []
+            return []
+
+    def _fetch_daily_reading_counts(self, user_id: int, start: date, end: date) -> list[LeiturasDia]:
+        return [
+            LeiturasDia(data=row["data_leitura"], capitulos=row["capitulos"])
+            for row in self.paginate(
+                lambda: self._client.table("tb_leituras_dias_usuarios")
+                .select("data_leitura, capitulos")
+                .eq("usuario_id", user_id)
+                .gte("data_leitura", str(start))
+                .lte("data_leitura", str(end)),
+                key="data_leitura",
+            )
+        ]
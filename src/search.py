@@ -0,0 +1,124 @@
+import re
+import unicodedata
+from typing import Optional
+
+# Normalização de texto para a busca no mural do backend local (SQLite/FTS5), que não
+# tem o dicionário 'portuguese' nem o 'unaccent' do Postgres: o texto é indexado e
+# consultado já sem acentos, sem stopwords e reduzido a radicais por um stemmer leve.
+# Documento e consulta passam pela mesma função, então só a consistência importa.
+
+_TOKEN_RE = re.compile(r"\w+")
+
+# Stopwords mais frequentes do português (já sem acentos).
+_STOPWORDS = frozenset(
+    """
+    a ao aos aquela aquelas aquele aqueles aquilo as ate com como da das de dela delas
+    dele deles depois do dos e ela elas ele eles em entre era essa essas esse esses esta
+    estas este estes eu foi ha isso isto ja lhe lhes mais mas me mesmo meu meus minha
+    minhas muito na nas nem no nos nossa nossas nosso nossos num numa o os ou para pela
+    pelas pelo pelos por qual quando que quem se sem seu seus so sua suas tambem te
+    teu teus tu tua tuas um uma voce voces vos
+    """.split()
+)
+
+# Reduções de plural, aplicadas antes dos sufixos (ex: 'oracoes' -> 'oracao').
+_PLURAL_RULES: tuple[tuple[str, str], ...] = (
+    ("oes", "ao"),
+    ("aes", "ao"),
+    ("ais", "al"),
+    ("eis", "el"),
+    ("ois", "ol"),
+    ("ns", "m"),
+)
+
+# Sufixos removidos (o primeiro que casar), do mais longo ao mais curto.
+_SUFFIXES: tuple[str, ...] = (
+    "amento",
+    "imento",
+    "idade",
+    "mente",
+    "acao",
+    "icao",
+    "ncia",
+    "ismo",
+    "ista",
+    "avam",
+    "aram",
+    "eram",
+    "iram",
+    "ando",
+    "endo",
+    "indo",
+    "ava",
+    "ado",
+    "ada",
+    "ido",
+    "ida",
+    "ar",
+    "er",
+    "ir",
+)
+
+# Tamanho mínimo do radical que sobra após remover um sufixo.
+_MIN_STEM = 3
+
+
+def fold(text: str) -> str:
+    """Converte para minúsculas e remove os acentos."""
+    decomposed = unicodedata.normalize("NFKD", text.lower())
+    return "".join(ch for ch in decomposed if not unicodedata.combining(ch))
+
+
+def stem(word: str) -> str:
+    """Reduz uma palavra (já sem acentos) a um radical aproximado.
+
+    Args:
+        word: A palavra em minúsculas e sem acentos.
+
+    Returns:
+        O radical (ex: 'oracoes', 'oracao' -> 'oraca'; 'salvacao', 'salvo' -> 'salv').
+    """
+    for suffix, replacement in _PLURAL_RULES:
+        if word.endswith(suffix) and len(word) - len(suffix) >= _MIN_STEM:
+            word = word[: -len(suffix)] + replacement
+            break
+    else:
+        if word.endswith("s") and not word.endswith(("ss", "us", "is")) and len(word) > _MIN_STEM + 1:
+            word = word[:-1]
+
+    for suffix in _SUFFIXES:
+        if word.endswith(suffix) and len(word) - len(suffix) >= _MIN_STEM:
+            return word[: -len(suffix)]
+
+    if word[-1:] in ("a", "e", "o") and len(word) > _MIN_STEM + 1:
+        return word[:-1]
+    return word
+
+
+def terms(text: Optional[str]) -> list[str]:
+    """Extrai os radicais indexáveis de um texto (sem acentos e sem stopwords)."""
+    if not text:
+        return []
+    return [stem(token) for token in _TOKEN_RE.findall(fold(text)) if token not in _STOPWORDS]
+
+
+def normalize(text: Optional[str]) -> str:
+    """Texto gravado no índice de busca: os radicais separados por espaço."""
+    return " ".join(terms(text))
+
+
+def match_query(search: str) -> Optional[str]:
+    """Monta a expressão MATCH do FTS5 para uma busca digitada pelo usuário.
+
+    Todos os termos devem aparecer (como no 'websearch_to_tsquery' do Postgres).
+
+    Args:
+        search: O texto digitado.
+
+    Returns:
+        A expressão, ou None se a busca não tiver nenhum termo indexável.
+    """
+    unique_terms = dict.fromkeys(terms(search))
+    if not unique_terms:
+        return None
+    return " AND ".join(f'"{term}"' for term in unique_terms)
@@ -0,0 +1,364 @@
+import dataclasses
+import io
+import json
+import logging
+import os
+import sqlite3
+import stat
+import threading
+import time
+from array import array
+from datetime import date, datetime
+from types import MappingProxyType
+from typing import Any, Callable, Hashable, Optional
+
+import pandas as pd
+from pydantic import BaseModel
+
+from src import models
+from src.books import Book, BookCatalog
+from src.plan_index import PlanIndex
+
+logger = logging.getLogger(__name__)
+
+# Tamanho máximo padrão do arquivo de cache compartilhado, em MB.
+DEFAULT_MAX_MB = 256
+
+# Valor retornado por `SharedCacheStore.get` quando não há entrada válida.
+MISSING = object()
+
+# Versão do formato do arquivo: um arquivo de outra versão é recriado ao abrir.
+_SCHEMA_VERSION = 2
+
+_SCHEMA = """
+DROP TABLE IF EXISTS entradas;
+CREATE TABLE entradas (
+    cache TEXT NOT NULL,
+    chave TEXT NOT NULL,
+    versao TEXT,
+    expira_em REAL,
+    acessado_em REAL NOT NULL,
+    tamanho INTEGER NOT NULL,
+    formato TEXT NOT NULL,
+    valor BLOB NOT NULL,
+    PRIMARY KEY (cache, chave)
+);
+CREATE INDEX idx_entradas_acesso ON entradas (acessado_em);
+"""
+
+# Formatos dos valores gravados: DataFrames em parquet, o resto em JSON.
+_FORMAT_JSON = "json"
+_FORMAT_PARQUET = "parquet"
+
+# Únicas classes reconstruídas a partir do arquivo (os valores dos caches compartilhados
+# de src/repository.py). Um valor de outro tipo não é gravado no arquivo. O PlanIndex
+# é gravado pelas entradas (`to_rows`) e reconstruído ao ler.
+_TYPES: dict[str, type] = {
+    cls.__name__: cls
+    for cls in (
+        Book,
+        BookCatalog,
+        models.Usuario,
+        models.Plano,
+        models.Livro,
+        models.Resposta,
+        models.Pergunta,
+        models.Leitura,
+        models.PosicaoRanking,
+        models.LeiturasMes,
+        models.LeiturasDia,
+        models.EstatisticasLeitura,
+    )
+}
+
+# Colunas das entradas do PlanIndex gravadas no arquivo (ver `PlanIndex.to_rows`).
+_PLAN_COLUMNS = ("data_leitura", "livro_id", "livro", "capitulos", "capitulos_expandidos")
+
+# Inteiros maiores que isso são gravados em hexadecimal: a conversão decimal de inteiros
+# longos é limitada pelo Python.
+_MAX_PLAIN_INT = 2**63
+
+
+def _encode(value: Any) -> Any:
+    """Converte o valor em JSON, marcando os tipos que o JSON não representa."""
+    if value is None or isinstance(value, (bool, str, float)):
+        return value
+    if isinstance(value, int):
+        return value if abs(value) < _MAX_PLAIN_INT else {"t": "int", "v": hex(value)}
+    if isinstance(value, list):
+        return [_encode(item) for item in value]
+    if isinstance(value, tuple):
+        return {"t": "tuple", "v": [_encode(item) for item in value]}
+    if isinstance(value, (set, frozenset)):
+        tag = "frozenset" if isinstance(value, frozenset) else "set"
+        return {"t": tag, "v": [_encode(item) for item in value]}
+    if isinstance(value, (dict, MappingProxyType)):
+        return {"t": "dict", "v": [[_encode(k), _encode(v)] for k, v in value.items()]}
+    if isinstance(value, datetime):
+        return {"t": "datetime", "v": value.isoformat()}
+    if isinstance(value, date):
+        return {"t": "date", "v": value.isoformat()}
+    if isinstance(value, array):
+        return {"t": "array", "c": value.typecode, "v": value.tolist()}
+    if isinstance(value, PlanIndex):
+        # Uma lista por entrada, só com tipos do JSON: milhares de entradas por plano.
+        return {
+            "t": "plan_index",
+            "v": [
+                value.plan_id,
+                value.plan_name,
+                [
+                    [str(r[c]) if c == "data_leitura" else r[c] for c in _PLAN_COLUMNS]
+                    for r in value.to_rows()
+                ],
+            ],
+        }
+    if _TYPES.get(type(value).__name__) is type(value):
+        if isinstance(value, BaseModel):
+            fields = value.model_dump()
+        else:
+            fields = {f.name: getattr(value, f.name) for f in dataclasses.fields(value)}
+        return {"t": "obj", "c": type(value).__name__, "v": {k: _encode(v) for k, v in fields.items()}}
+    raise TypeError(f"Tipo não suportado pelo cache compartilhado: {type(value).__name__}")
+
+
+def _decode(data: Any) -> Any:
+    """Reconstrói um valor gravado por `_encode`."""
+    if isinstance(data, list):
+        return [_decode(item) for item in data]
+    if not isinstance(data, dict):
+        return data
+    tag, raw = data["t"], data["v"]
+    if tag == "int":
+        return int(raw, 16)
+    if tag == "tuple":
+        return tuple(_decode(item) for item in raw)
+    if tag == "frozenset":
+        return frozenset(_decode(item) for item in raw)
+    if tag == "set":
+        return {_decode(item) for item in raw}
+    if tag == "dict":
+        return {_decode(k): _decode(v) for k, v in raw}
+    if tag == "datetime":
+        return datetime.fromisoformat(raw)
+    if tag == "date":
+        return date.fromisoformat(raw)
+    if tag == "array":
+        return array(data["c"], raw)
+    if tag == "plan_index":
+        plan_id, plan_name, rows = raw
+        return PlanIndex.from_rows(plan_id, plan_name, [dict(zip(_PLAN_COLUMNS, row)) for row in rows])
+    if tag == "obj":
+        cls = _TYPES[data["c"]]
+        fields = {k: _decode(v) for k, v in raw.items()}
+        if issubclass(cls, BaseModel):
+            return cls.model_validate(fields)
+        # Dataclasses imutáveis: os campos lidos vão para `__setstate__` quando a classe o
+        # define (ex: BookCatalog, que protege os dicionários) ou são atribuídos direto,
+        # sem repetir a construção.
+        obj = object.__new__(cls)
+        setstate = getattr(obj, "__setstate__", None)
+        if setstate is not None:
+            setstate(fields)
+        else:
+            for name, field_value in fields.items():
+                object.__setattr__(obj, name, field_value)
+        return obj
+    raise ValueError(f"Marcação desconhecida no cache compartilhado: {tag}")
+
+
+def _text(value: Hashable) -> str:
+    """Texto estável de uma chave ou versão (o mesmo em todos os processos)."""
+    return json.dumps(_encode(value), sort_keys=True, separators=(",", ":"))
+
+
+def _serialize(value: Any) -> tuple[str, bytes]:
+    if isinstance(value, pd.DataFrame):
+        buffer = io.BytesIO()
+        value.to_parquet(buffer)
+        return _FORMAT_PARQUET, buffer.getvalue()
+    return _FORMAT_JSON, json.dumps(_encode(value), separators=(",", ":")).encode("utf-8")
+
+
+def _deserialize(fmt: str, payload: bytes) -> Any:
+    if fmt == _FORMAT_PARQUET:
+        return pd.read_parquet(io.BytesIO(payload))
+    return _decode(json.loads(payload))
+
+
+def _open_private_file(path: str) -> None:
+    """Cria o arquivo (0600) e o diretório (0700) e confere que só o usuário pode alterá-lo.
+
+    Raises:
+        PermissionError: Se o arquivo for de outro usuário ou gravável por outros.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, mode=0o700, exist_ok=True)
+    os.close(os.open(path, os.O_RDWR | os.O_CREAT, 0o600))
+    info = os.stat(path)
+    if hasattr(os, "getuid") and info.st_uid != os.getuid():
+        raise PermissionError(f"O arquivo '{path}' pertence a outro usuário.")
+    if info.st_mode & (stat.S_IWGRP | stat.S_IWOTH):
+        raise PermissionError(f"O arquivo '{path}' pode ser alterado por outros usuários.")
+
+
+class SharedCacheStore:
+    """Camada de cache compartilhada entre os processos do mesmo host, em um arquivo SQLite.
+
+    Os valores são gravados em JSON (DataFrames em parquet) com a versão dos dados de
+    origem e o prazo de expiração. Um processo que acaba de subir encontra os dados já
+    carregados pelas outras réplicas, e o banco remoto é consultado uma vez por versão,
+    não uma vez por processo. Quando o arquivo passa de `max_bytes`, as entradas
+    acessadas há mais tempo são descartadas.
+
+    O arquivo é uma fronteira de confiança: as réplicas exibem o que estiver nele. Por
+    isso ele é criado só para o usuário do app (0600, em um diretório 0700) e recusado
+    se pertencer a outro usuário ou puder ser alterado por outros. A leitura nunca
+    executa código: só as classes de `_TYPES` são reconstruídas, a partir dos campos.
+
+    Falhas no arquivo (bloqueio, disco cheio, entrada ilegível) nunca interrompem o app:
+    são registradas no log e tratadas como ausência da entrada. Os valores seguem os
+    campos das classes do código, então use um arquivo por versão implantada do app.
+    """
+
+    def __init__(self, path: str, max_bytes: int = DEFAULT_MAX_MB * 1024 * 1024):
+        """Abre (ou cria) o arquivo de cache.
+
+        Args:
+            path: Caminho do arquivo SQLite, acessível por todos os processos do host.
+            max_bytes: Tamanho máximo somado dos valores gravados.
+
+        Raises:
+            PermissionError: Se o arquivo for de outro usuário ou gravável por outros.
+        """
+        self.path = path
+        self.max_bytes = max_bytes
+        self._local = threading.local()
+        _open_private_file(path)
+        self._create_schema(self._connection())
+
+    def _create_schema(self, conn: sqlite3.Connection) -> None:
+        # Em uma transação: as réplicas que sobem juntas recriam o arquivo uma só vez.
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            if conn.execute("PRAGMA user_version").fetchone()[0] != _SCHEMA_VERSION:
+                for statement in _SCHEMA.split(";"):
+                    if statement.strip():
+                        conn.execute(statement)
+                conn.execute(f"PRAGMA user_version = {_SCHEMA_VERSION}")
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def _connection(self) -> sqlite3.Connection:
+        # Uma conexão por thread: as sessões do Streamlit rodam em threads diferentes.
+        conn: Optional[sqlite3.Connection] = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5.0, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def get(self, cache: str, key: Hashable, version: Hashable = None) -> Any:
+        """Retorna o valor da entrada, ou MISSING se ausente, expirada ou de outra versão."""
+        try:
+            conn = self._connection()
+            chave = _text(key)
+            row = conn.execute(
+                "SELECT formato, valor, versao, expira_em FROM entradas WHERE cache = ? AND chave = ?",
+                (cache, chave),
+            ).fetchone()
+            now = time.time()
+            if row is None or (row[3] is not None and row[3] < now):
+                return MISSING
+            if version is not None and row[2] != _text(version):
+                return MISSING
+            value = _deserialize(row[0], row[1])
+            conn.execute(
+                "UPDATE entradas SET acessado_em = ? WHERE cache = ? AND chave = ?",
+                (now, cache, chave),
+            )
+            return value
+        except Exception as e:
+            logger.warning(f"Erro ao ler o cache compartilhado '{cache}': {e}")
+            return MISSING
+
+    def set(
+        self,
+        cache: str,
+        key: Hashable,
+        value: Any,
+        version: Hashable = None,
+        ttl: Optional[float] = None,
+    ) -> None:
+        """Grava o valor da entrada e descarta as mais antigas se o limite for excedido."""
+        try:
+            fmt, payload = _serialize(value)
+            if len(payload) > self.max_bytes:
+                return
+            now = time.time()
+            conn = self._connection()
+            conn.execute(
+                "INSERT OR REPLACE INTO entradas "
+                "(cache, chave, versao, expira_em, acessado_em, tamanho, formato, valor) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    cache,
+                    _text(key),
+                    _text(version) if version is not None else None,
+                    now + ttl if ttl is not None else None,
+                    now,
+                    len(payload),
+                    fmt,
+                    payload,
+                ),
+            )
+            self._evict(conn, now)
+        except Exception as e:
+            logger.warning(f"Erro ao gravar no cache compartilhado '{cache}': {e}")
+
+    def _evict(self, conn: sqlite3.Connection, now: float) -> None:
+        conn.execute("DELETE FROM entradas WHERE expira_em < ?", (now,))
+        excess = conn.execute("SELECT coalesce(sum(tamanho), 0) FROM entradas").fetchone()[0]
+        excess -= self.max_bytes
+        if excess <= 0:
+            return
+        # As menos acessadas recentemente primeiro, até liberar o excesso.
+        rowids = []
+        for rowid, size in conn.execute("SELECT rowid, tamanho FROM entradas ORDER BY acessado_em"):
+            rowids.append(rowid)
+            excess -= size
+            if excess <= 0:
+                break
+        conn.executemany("DELETE FROM entradas WHERE rowid = ?", [(rowid,) for rowid in rowids])
+
+    def invalidate(self, cache: str, key: Hashable) -> None:
+        """Remove uma única entrada."""
+        try:
+            self._connection().execute(
+                "DELETE FROM entradas WHERE cache = ? AND chave = ?", (cache, _text(key))
+            )
+        except Exception as e:
+            logger.warning(f"Erro ao invalidar o cache compartilhado '{cache}': {e}")
+
+    def invalidate_where(self, cache: str, predicate: Callable[[Hashable], bool]) -> None:
+        """Remove as entradas do cache cujas chaves satisfazem o predicado."""
+        try:
+            conn = self._connection()
+            keys = [
+                (cache, chave)
+                for (chave,) in conn.execute("SELECT chave FROM entradas WHERE cache = ?", (cache,))
+                if predicate(_decode(json.loads(chave)))
+            ]
+            conn.executemany("DELETE FROM entradas WHERE cache = ? AND chave = ?", keys)
+        except Exception as e:
+            logger.warning(f"Erro ao invalidar o cache compartilhado '{cache}': {e}")
+
+    def clear(self, cache: str) -> None:
+        """Remove todas as entradas de um cache."""
+        try:
+            self._connection().execute("DELETE FROM entradas WHERE cache = ?", (cache,))
+        except Exception as e:
+            logger.warning(f"Erro ao limpar o cache compartilhado '{cache}': {e}")
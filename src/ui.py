@@ -1,4 +1,3 @@
-import os
 from datetime import date, datetime, timedelta
 from typing import Optional
 
@@ -6,10 +5,12 @@ import altair as alt
 import pandas as pd
 import streamlit as st
 
+from src.badges import available_images, load_badge_sprite
+from src.books import BookCatalog
 from src.config import FUSO_BR
-from src.models import Usuario
-from src.repository import DatabaseRepository
-from src.utils import expandir_capitulos
+from src.models import EstatisticasLeitura, LeiturasDia, Usuario
+from src.page_data import Dependency, PageData, load_concurrently
+from src.repository import RHYTHM_DAYS, DatabaseRepository
 
 
 def apply_styles():
@@ -63,8 +64,35 @@ def apply_styles():
             section[data-testid="stSidebar"] { background-color: #1e1e1e; }
         }
 
+        /* Grade de selos servidos pela folha de sprites (src/badges.py) */
+        .selos-grid {
+            display: grid;
+            grid-template-columns: repeat(6, minmax(0, 1fr));
+            gap: 1rem;
+            margin-bottom: 1rem;
+        }
+        .selos-grid .selo {
+            width: 100%;
+            max-width: 128px;
+            aspect-ratio: 1;
+            background-image: var(--selos-sprite);
+            background-size: var(--selos-tamanho);
+            background-repeat: no-repeat;
+        }
+        .selos-grid .selo-texto {
+            background-image: none;
+            display: flex;
+            align-items: center;
+            justify-content: center;
+            text-align: center;
+            font-size: 0.85rem;
+        }
+
         /* Estilos específicos para a página de Awards em telas pequenas */
         @media (max-width: 768px) {
+            .selos-grid {
+                grid-template-columns: repeat(3, minmax(0, 1fr));
+            }
             .awards-page-container div[data-testid="stHorizontalBlock"] {
                 flex-wrap: wrap; /* Garante que os itens quebrem para a próxima linha */
             }
@@ -137,77 +165,83 @@ def render_sidebar(user: Usuario) -> tuple[str, bool]:
     return pagina, logout_clicked
 
 
-def _calculate_reading_streak(reading_dates: list[date]) -> int:
-    """Calcula a sequência atual de dias consecutivos de leitura."""
-    if not reading_dates:
-        return 0
+def _warn_failed_dependencies(data: PageData):
+    """Avisa, sem interromper a página, quais dados não puderam ser carregados."""
+    if data.failed():
+        st.warning(
+            "Alguns dados não puderam ser carregados e foram omitidos: " + ", ".join(data.failed())
+        )
 
-    # Garante que as datas são únicas e ordenadas
-    unique_dates = sorted(list(set(reading_dates)))
 
+def _render_reading_calendar(dias: list[LeiturasDia]):
+    """Renderiza um mapa de calor com os capítulos lidos por dia (semanas x dias da semana)."""
     today = datetime.now(FUSO_BR).date()
+    por_dia = {d.data: d.capitulos for d in dias}
+    calendario = pd.DataFrame({"data": pd.date_range(today - timedelta(days=RHYTHM_DAYS - 1), today)})
+    calendario["capitulos"] = [por_dia.get(ts.date(), 0) for ts in calendario["data"]]
 
-    # Filtra apenas as datas até hoje
-    relevant_dates = [d for d in unique_dates if d <= today]
-    if not relevant_dates:
-        return 0
-
-    # Começa a contagem a partir da data mais recente
-    last_date = relevant_dates[-1]
-
-    # Se a última leitura não foi hoje ou ontem, a sequência é 0
-    if (today - last_date).days > 1:
-        return 0
-
-    streak = 1
-    # Itera para trás a partir da penúltima data relevante
-    for i in range(len(relevant_dates) - 2, -1, -1):
-        expected_date = last_date - timedelta(days=1)
-        if relevant_dates[i] == expected_date:
-            streak += 1
-            last_date = relevant_dates[i]
-        else:
-            # A sequência foi quebrada
-            break
-
-    return streak
+    chart = (
+        alt.Chart(calendario)
+        .mark_rect(cornerRadius=2)
+        .encode(
+            x=alt.X("yearweek(data):O", title=None, axis=alt.Axis(format="%b", labelOverlap=True)),
+            y=alt.Y("day(data):O", title=None),
+            color=alt.Color(
+                "capitulos:Q", title="Capítulos", scale=alt.Scale(scheme="greens", domainMin=0)
+            ),
+            tooltip=[
+                alt.Tooltip("data:T", title="Data", format="%d/%m/%Y"),
+                alt.Tooltip("capitulos:Q", title="Capítulos"),
+            ],
+        )
+        .properties(width="container")
+    )
+    st.altair_chart(chart)
 
 
 def render_profile_page(user: Usuario, repo: DatabaseRepository):
     """Renderiza a página 'Meu Perfil' com estatísticas de leitura do usuário."""
     st.markdown(f"### 📊 Perfil de Leitura de {user.nome}")
 
-    # --- Carregamento de Dados ---
-    total_chapters = repo.get_user_unique_readings_count(user.id)
-    completed_books_data = repo.get_completed_books_dashboard()
-    num_completed_books = len(completed_books_data.get(user.nome, set()))
-    reading_dates = repo.get_reading_history_for_profile(user.id)
-
-    # --- Cálculo da Sequência de Leitura ---
-    streak = _calculate_reading_streak(reading_dates)
+    # --- Carregamento de Dados (em paralelo) ---
+    # Estatísticas, meses e dias vêm agregados do banco, sem varrer o histórico.
+    data = load_concurrently(
+        Dependency("estatisticas", lambda: repo.get_user_stats(user.id)),
+        Dependency("dias", lambda: repo.get_daily_reading_counts(user.id), default=[]),
+    )
+    _warn_failed_dependencies(data)
+    stats = data["estatisticas"] or EstatisticasLeitura(usuario_id=user.id)
+    num_completed_books = stats.livros_concluidos
+    # Os dias do calendário completam a sequência gravada com as leituras adiantadas.
+    today = datetime.now(FUSO_BR).date()
+    reading_days = [dia.data for dia in data["dias"]]
+    streak = stats.sequencia_em(today, reading_days)
 
     # --- Exibição das Métricas Principais ---
     c1, c2, c3 = st.columns(3)
-    c1.metric("📚 Capítulos Únicos Lidos", total_chapters)
+    c1.metric("📚 Capítulos Únicos Lidos", stats.capitulos_unicos)
     c2.metric("🏆 Livros Concluídos", num_completed_books)
-    c3.metric("🔥 Sequência de Leitura", f"{streak} dias")
+    c3.metric(
+        "🔥 Sequência de Leitura",
+        f"{streak} dias",
+        help=f"Maior sequência: {stats.maior_sequencia_em(today, reading_days)} dias.",
+    )
 
     st.divider()
 
     # --- Gráfico de Ritmo de Leitura ---
     st.markdown("#### Ritmo de Leitura (Capítulos por Mês)")
 
-    if not reading_dates:
+    if not stats.meses:
         st.info("Você ainda não registrou nenhuma leitura para exibir o ritmo.")
         return
 
-    df_leituras = pd.DataFrame({"data": reading_dates})
-    df_leituras["data"] = pd.to_datetime(df_leituras["data"])
-
-    leituras_por_mes = (
-        df_leituras.groupby(pd.Grouper(key="data", freq="ME")).size().reset_index(name="capitulos_lidos")
+    leituras_por_mes = pd.DataFrame(
+        {
+            "mes": [m.mes.strftime("%b/%Y") for m in stats.meses],
+            "capitulos_lidos": [m.capitulos for m in stats.meses],
+        }
     )
-    leituras_por_mes["mes"] = leituras_por_mes["data"].dt.strftime("%b/%Y")
 
     chart = (
         alt.Chart(leituras_por_mes)
@@ -224,6 +258,10 @@ def render_profile_page(user: Usuario, repo: DatabaseRepository):
     )
     st.altair_chart(chart)
 
+    # --- Calendário de Leitura ---
+    st.markdown("#### Calendário de Leitura (Últimos 12 Meses)")
+    _render_reading_calendar(data["dias"])
+
 
 def render_reading_page(user: Usuario, repo: DatabaseRepository, plan_names: list[str]):
     """Renderiza a página principal 'Minha Leitura'.
@@ -273,18 +311,21 @@ def render_reading_page(user: Usuario, repo: DatabaseRepository, plan_names: lis
     plano_nome = st.selectbox("📅 Escolha o Plano", plan_names, index=default_index)
     st.session_state.plano_selecionado_widget = plano_nome
 
-    # Carrega a estrutura do plano selecionado. O cache otimiza chamadas repetidas.
-    df_plano = repo.get_plan_structure_by_name(plano_nome)
-    if df_plano is None or df_plano.empty:
+    # Carrega o índice do plano selecionado. O cache otimiza chamadas repetidas.
+    plan_index = repo.get_plan_index(plano_nome)
+    if plan_index is None or plan_index.total_slots == 0:
         st.error(f"Não foi possível carregar a estrutura do plano '{plano_nome}'.")
         st.stop()
 
     if plano_nome != st.session_state.get("plano_anterior"):
-        proxima_data = repo.find_next_unread_date(user, df_plano)
+        proxima_data = repo.find_next_unread_date(user, plan_index)
         st.session_state["data_selecionada"] = pd.to_datetime(proxima_data)
         st.session_state["plano_anterior"] = plano_nome
         st.rerun()  # Força o rerun para atualizar a data
 
+    plano_id = plan_index.plan_id
+    progresso = repo.get_plan_progress(user, plan_index)
+
     st.markdown("---")
     c_data, c_info = st.columns([1, 3])
 
@@ -293,35 +334,58 @@ def render_reading_page(user: Usuario, repo: DatabaseRepository, plan_names: lis
             "Data da Leitura", value=st.session_state.get("data_selecionada", datetime.now(FUSO_BR))
         )
         st.session_state["data_selecionada"] = pd.to_datetime(data_input)
+        meta_hoje = plan_index.slots_until(datetime.now(FUSO_BR).date())
+        st.caption(
+            f"📈 {progresso.read_count} de {plan_index.total_slots} capítulos lidos "
+            f"({progresso.percent_complete:.0%}) · meta até hoje: {meta_hoje}"
+        )
 
-    leitura_do_dia = df_plano[df_plano["data"].dt.date == st.session_state["data_selecionada"].date()]
-
-    plano_id = df_plano["plano_id"].iloc[0] if not df_plano.empty else None
-    leituras_usuario = repo.get_user_readings(user, plano_id) if plano_id is not None else []
-    lidos_set = {
-        (leitura.livro.nome, leitura.capitulo, leitura.data_leitura_plano)
-        for leitura in leituras_usuario
-        if leitura.data_leitura_plano
-    }
+    data_da_leitura = st.session_state["data_selecionada"].date()
+    leitura_do_dia = plan_index.entries_for(data_da_leitura)
 
     with c_info:
-        if leitura_do_dia.empty:
+        if not leitura_do_dia:
             st.info("😴 Nada programado para esta data.")
         else:
-            for _, row in leitura_do_dia.iterrows():
-                livro = row["livro"]
-                livro_id = row["livro_id"]
-                caps_str = str(row["capitulos"])
-                lista_caps = expandir_capitulos(caps_str)
+            pendentes_do_dia = [
+                (entrada.book_name, entrada.book_id, c)
+                for entrada in leitura_do_dia
+                for c in entrada.chapters
+                if not progresso.is_read(entrada.book_id, c, data_da_leitura)
+            ]
+            if len(leitura_do_dia) > 1 and pendentes_do_dia:
+                if st.button(
+                    "✅ Marcar o dia inteiro como lido",
+                    key=f"{user.id}_{plano_nome}_{data_da_leitura}_dia",
+                ):
+                    _save_readings_batch(user, repo, plano_id, pendentes_do_dia, data_da_leitura)
+
+            for entrada in leitura_do_dia:
+                livro = entrada.book_name
+                livro_id = entrada.book_id
+                caps_str = entrada.chapters_str
+                lista_caps = entrada.chapters
 
                 st.markdown(
                     f"### 📖 {livro} <span style='font-size:0.8em; color:gray'>Caps {caps_str}</span>",
                     unsafe_allow_html=True,
                 )
 
+                pendentes_entrada = [
+                    (livro, livro_id, c)
+                    for c in lista_caps
+                    if not progresso.is_read(livro_id, c, data_da_leitura)
+                ]
+                if len(lista_caps) > 1 and pendentes_entrada:
+                    if st.button(
+                        f"Marcar todos os capítulos de {livro}",
+                        key=f"{user.id}_{plano_nome}_{livro}_{caps_str}_todos",
+                    ):
+                        _save_readings_batch(user, repo, plano_id, pendentes_entrada, data_da_leitura)
+
                 cols = st.columns(10)
                 for i, c in enumerate(lista_caps):
-                    ja_leu = (livro, c, st.session_state["data_selecionada"].date()) in lidos_set
+                    ja_leu = progresso.is_read(livro_id, c, data_da_leitura)
                     label = f"{c} ✅" if ja_leu else f"{c}"
                     if cols[i % 10].button(
                         label,
@@ -329,30 +393,45 @@ def render_reading_page(user: Usuario, repo: DatabaseRepository, plan_names: lis
                         disabled=ja_leu,
                         type="primary" if ja_leu else "secondary",
                     ):
-                        if plano_id is not None and livro_id is not None:
-                            data_da_leitura = st.session_state["data_selecionada"].date()
-                            book_completed = repo.save_reading(
-                                user,
-                                int(plano_id),
-                                int(livro_id),
-                                c,
-                                data_da_leitura,
-                            )
-                        else:
-                            st.error(
-                                "Não foi possível salvar a leitura. IDs de plano ou livro não encontrados."
-                            )
-                            book_completed = False
+                        book_completed = repo.save_reading(user, plano_id, livro_id, c, data_da_leitura)
                         if book_completed:
                             st.session_state["book_just_completed"] = livro
                         st.rerun()
 
 
-def _render_user_seals(repo: DatabaseRepository, books: set[str], book_images_map: dict[str, str]):
-    """Renderiza os selos de um usuário em uma grade, ordenados canonicamente."""
+def _save_readings_batch(
+    user: Usuario,
+    repo: DatabaseRepository,
+    plano_id: int,
+    pendentes: list[tuple[str, int, int]],
+    data_da_leitura: date,
+):
+    """Salva vários capítulos (livro, ID do livro, capítulo) de uma vez e força o rerun."""
+    nomes_livros = {livro_id: livro for livro, livro_id, _ in pendentes}
+    livros_concluidos = repo.save_readings(
+        user, plano_id, [(livro_id, c, data_da_leitura) for _, livro_id, c in pendentes]
+    )
+    if livros_concluidos:
+        st.session_state["book_just_completed"] = ", ".join(
+            nomes_livros.get(livro_id, str(livro_id)) for livro_id in livros_concluidos
+        )
+    st.rerun()
+
+
+def _render_user_seals(catalog: BookCatalog, book_ids: set[int]):
+    """Renderiza os selos de um usuário em uma grade, ordenados canonicamente.
+
+    Com a folha de sprites gerada (`make assets`), a grade é um único bloco HTML que
+    referencia um arquivo cacheado pelo navegador; sem ela, usa as imagens originais.
+    """
+    sorted_books = catalog.sorted_ids(book_ids)
+    sprite = load_badge_sprite()
+    if sprite is not None:
+        st.markdown(sprite.grid_html(catalog, sorted_books), unsafe_allow_html=True)
+        return
+
     seals_per_row = 6  # Menos colunas = imagens maiores
-    book_order_map = repo.get_book_order_map()
-    sorted_books = sorted(list(books), key=lambda book_name: book_order_map.get(book_name, 999))
+    existing_images = available_images()
 
     book_chunks = [
         sorted_books[i : i + seals_per_row] for i in range(0, len(sorted_books), seals_per_row)
@@ -360,14 +439,14 @@ def _render_user_seals(repo: DatabaseRepository, books: set[str], book_images_ma
 
     for chunk in book_chunks:
         cols = st.columns(seals_per_row)
-        for i, book_name in enumerate(chunk):
+        for i, book_id in enumerate(chunk):
             with cols[i]:
-                image_path = book_images_map.get(book_name)
-                if image_path and os.path.exists(image_path):
+                image_path = catalog.image_of(book_id)
+                if image_path and image_path in existing_images:
                     st.image(image_path)
                 else:
                     # Fallback para o nome do livro se a imagem não for encontrada
-                    st.caption(book_name)
+                    st.caption(catalog.name_of(book_id))
 
 
 def render_awards_page(user: Usuario, repo: DatabaseRepository):
@@ -377,15 +456,23 @@ def render_awards_page(user: Usuario, repo: DatabaseRepository):
     try:
         st.markdown("# 🏅 Insígnias de Conclusão")
 
-        completed_books = repo.get_completed_books_dashboard()
-        book_images_map = repo.get_book_images_map()
+        data = load_concurrently(
+            Dependency("concluidos", lambda: repo.get_user_completed_books(user.id), default=set()),
+            Dependency("catalogo", repo.get_book_catalog, default=BookCatalog.bundled()),
+            Dependency("estatisticas", lambda: repo.get_user_stats(user.id)),
+            Dependency("ranking", lambda: repo.get_completion_leaderboard(0), default=([], False)),
+        )
+        _warn_failed_dependencies(data)
+        catalog = data["catalogo"]
 
         # --- Seção do Usuário Logado ---
         st.markdown("### 🌟 Minhas Insígnias")
 
         # Adiciona o cálculo e exibição do progresso geral de leitura da Bíblia
-        total_bible_chapters = repo.get_total_bible_chapters()
-        user_chapters_read = repo.get_user_unique_readings_count(user.id)
+        # Conta apenas capítulos que existem no catálogo (cobertura canônica).
+        total_bible_chapters = catalog.total_chapters
+        stats = data["estatisticas"] or EstatisticasLeitura(usuario_id=user.id)
+        user_chapters_read = min(stats.capitulos_canonicos, total_bible_chapters)
 
         if total_bible_chapters > 0:
             progress_pct = user_chapters_read / total_bible_chapters
@@ -396,10 +483,10 @@ def render_awards_page(user: Usuario, repo: DatabaseRepository):
             )
             st.progress(progress_pct)
 
-        my_books = completed_books.get(user.nome)
+        my_books = data["concluidos"]
 
         if my_books:
-            _render_user_seals(repo, my_books, book_images_map)
+            _render_user_seals(catalog, my_books)
         else:
             st.info(
                 "Você ainda não possui insígnias. Conclua a leitura de um livro para ganhar a sua primeira!"
@@ -408,24 +495,72 @@ def render_awards_page(user: Usuario, repo: DatabaseRepository):
         st.divider()
 
         # --- Seção da Comunidade ---
+        # Ranking paginado (a primeira página já veio com os demais dados); os selos de
+        # um membro só são carregados quando ele é escolhido.
         st.markdown("### 🏆 Insígnias da Comunidade")
-        other_users_completed = {
-            name: books for name, books in completed_books.items() if name != user.nome
-        }
-
-        if not other_users_completed:
+        ranking, has_more = data["ranking"]
+        num_pages = st.session_state.setdefault("ranking_paginas", 1)
+        for page in range(1, num_pages):
+            if not has_more:
+                break
+            page_items, has_more = repo.get_completion_leaderboard(page)
+            ranking = ranking + page_items
+
+        others = [p for p in ranking if p.usuario.id != user.id]
+        if not others:
             st.info("Nenhum outro membro da comunidade concluiu um livro ainda.")
             return
 
-        for other_user_name in sorted(other_users_completed.keys()):
-            books = other_users_completed[other_user_name]
-            st.markdown(f"**{other_user_name}:**")
-            _render_user_seals(repo, books, book_images_map)
-            st.markdown("<br>", unsafe_allow_html=True)
+        medals = {1: "🥇", 2: "🥈", 3: "🥉"}
+        st.dataframe(
+            pd.DataFrame(
+                {
+                    "Posição": [medals.get(p.posicao, f"{p.posicao}º") for p in ranking],
+                    "Membro": [
+                        f"{p.usuario.nome} (você)" if p.usuario.id == user.id else p.usuario.nome
+                        for p in ranking
+                    ],
+                    "Livros Concluídos": [p.livros_concluidos for p in ranking],
+                }
+            ),
+            hide_index=True,
+            width="stretch",
+        )
+        if has_more and st.button("Carregar mais membros"):
+            st.session_state["ranking_paginas"] = num_pages + 1
+            st.rerun()
+
+        labels = {p.usuario.id: f"{p.posicao}º {p.usuario.nome} ({p.livros_concluidos})" for p in others}
+        selected_id = st.selectbox(
+            "Ver as insígnias de",
+            options=list(labels),
+            format_func=labels.__getitem__,
+            index=None,
+            placeholder="Escolha um membro",
+            key="ranking_membro",
+        )
+        if selected_id is not None:
+            _render_user_seals(catalog, repo.get_user_completed_books(selected_id))
     finally:
         st.markdown("</div>", unsafe_allow_html=True)  # Fecha a div personalizada
 
 
+def _dashboard_metrics(df_dash: pd.DataFrame) -> dict[str, int]:
+    """Calcula as métricas agregadas a partir dos dados pré-processados da view."""
+    return {
+        "total_leitores": df_dash["Usuario"].nunique(),
+        "total_lidos": int(df_dash["Lidos"].sum()),
+        "em_dia": df_dash[df_dash["Status"] == "Em dia"].shape[0],
+        "atrasados": df_dash[df_dash["Status"] == "Atrasado"].shape[0],
+    }
+
+
+def _add_dashboard_percentages(df_dash: pd.DataFrame) -> None:
+    """Acrescenta as porcentagens lida e da meta de hoje, usadas nos gráficos."""
+    df_dash["Pct_Lido"] = (df_dash["Lidos"] / df_dash["Total_Plano"]).fillna(0)
+    df_dash["Pct_Meta"] = (df_dash["Meta_Hoje"] / df_dash["Total_Plano"]).fillna(0)
+
+
 def render_dashboard_page(repo: DatabaseRepository):
     """Renderiza a página 'Progresso Geral' (Dashboard da Comunidade).
 
@@ -444,13 +579,7 @@ def render_dashboard_page(repo: DatabaseRepository):
         st.info("Ainda não há registros de leitura para exibir os gráficos de progresso.")
         return
 
-    # Calcula as métricas agregadas a partir dos dados pré-processados da view
-    metricas = {
-        "total_leitores": df_dash["Usuario"].nunique(),
-        "total_lidos": int(df_dash["Lidos"].sum()),
-        "em_dia": df_dash[df_dash["Status"] == "Em dia"].shape[0],
-        "atrasados": df_dash[df_dash["Status"] == "Atrasado"].shape[0],
-    }
+    metricas = _dashboard_metrics(df_dash)
 
     c1, c2, c3, c4 = st.columns(4)
     c1.metric("👥 Leitores", metricas["total_leitores"])
@@ -459,9 +588,7 @@ def render_dashboard_page(repo: DatabaseRepository):
     c4.metric("⚠️ Atrasados", metricas["atrasados"])
     st.markdown("<br>", unsafe_allow_html=True)
 
-    # Calcula as porcentagens para os gráficos
-    df_dash["Pct_Lido"] = (df_dash["Lidos"] / df_dash["Total_Plano"]).fillna(0)
-    df_dash["Pct_Meta"] = (df_dash["Meta_Hoje"] / df_dash["Total_Plano"]).fillna(0)
+    _add_dashboard_percentages(df_dash)
 
     for plano in sorted(df_dash["Plano"].unique()):
         with st.container():
@@ -519,21 +646,42 @@ def render_qa_page(user: Usuario, repo: DatabaseRepository):
             )
             if st.form_submit_button("Enviar Pergunta") and texto_pergunta:
                 repo.save_question(texto_pergunta)
-                repo.get_all_questions_with_answers.clear()
                 st.rerun()
 
     st.markdown("---")
     st.markdown("### Mural")
 
-    perguntas = repo.get_all_questions_with_answers()
+    termo = st.text_input(
+        "🔎 Buscar no mural", placeholder="Ex: batismo, oração, Apocalipse", key="qa_busca"
+    ).strip()
+    # Uma nova busca (ou limpar a busca) volta para a primeira página.
+    if st.session_state.get("qa_busca_anterior") != termo:
+        st.session_state["qa_busca_anterior"] = termo
+        st.session_state["qa_paginas"] = 1
+
+    # Carrega apenas as páginas já pedidas (a primeira por padrão); as respostas de
+    # cada pergunta só são buscadas quando o usuário a abre.
+    num_pages = st.session_state.setdefault("qa_paginas", 1)
+    perguntas = []
+    has_more = False
+    for page in range(num_pages):
+        if termo:
+            page_items, has_more = repo.search_questions(termo, page)
+        else:
+            page_items, has_more = repo.get_questions_page(page)
+        perguntas.extend(page_items)
+        if not has_more:
+            break
+
     if not perguntas:
-        st.success("Nenhuma dúvida no mural por enquanto. Seja o primeiro a perguntar!")
+        if termo:
+            st.info("Nenhuma pergunta encontrada para essa busca.")
+        else:
+            st.success("Nenhuma dúvida no mural por enquanto. Seja o primeiro a perguntar!")
         return
 
-    perguntas.sort(key=lambda p: len(p.respostas) > 0)
-
     for p in perguntas:
-        indicator = "✅" if p.respostas else "❔"
+        indicator = "✅" if p.total_respostas else "❔"
         expander_title = f"{indicator} **Pergunta**: {p.pergunta_texto[:75]}..."
 
         with st.expander(expander_title):
@@ -542,12 +690,18 @@ def render_qa_page(user: Usuario, repo: DatabaseRepository):
             st.markdown("##### Pergunta Completa:")
             st.info(p.pergunta_texto)
             st.markdown("---")
-            st.markdown("##### Respostas:")
 
-            if not p.respostas:
+            if not st.toggle(
+                f"Ver respostas ({p.total_respostas}) e responder", key=f"qa_aberta_{p.id}"
+            ):
+                continue
+
+            st.markdown("##### Respostas:")
+            respostas = repo.get_question_answers(p.id) if p.total_respostas else []
+            if not respostas:
                 st.write("Ainda não há respostas. Seja o primeiro a ajudar!")
             else:
-                for r in p.respostas:
+                for r in respostas:
                     with st.container(border=True):
                         st.markdown(f"**`{r.autor.nome}` respondeu:**")
                         st.write(r.resposta_texto)
@@ -556,5 +710,8 @@ def render_qa_page(user: Usuario, repo: DatabaseRepository):
                 texto_resposta = st.text_area("Sua resposta:", height=120, key=f"ta_{p.id}")
                 if st.form_submit_button("Enviar Resposta") and texto_resposta:
                     repo.save_answer(p.id, user, texto_resposta)
-                    repo.get_all_questions_with_answers.clear()
                     st.rerun()
+
+    if has_more and st.button("Carregar mais perguntas"):
+        st.session_state["qa_paginas"] = num_pages + 1
+        st.rerun()
@@ -0,0 +1,98 @@
+from datetime import date
+from typing import Iterable
+
+import pytest
+
+from src.cache import clear_all_caches
+from src.local_client import LocalClient
+from src.models import Usuario
+from src.repository import DatabaseRepository
+
+
+@pytest.fixture(autouse=True)
+def caches_vazios():
+    """Os caches do repositório são do processo: cada teste começa sem dados carregados."""
+    clear_all_caches()
+    yield
+    clear_all_caches()
+
+
+@pytest.fixture
+def client() -> LocalClient:
+    """Banco local em memória com o 'max-rows' do Supabase (1000 linhas por resposta)."""
+    return LocalClient()
+
+
+@pytest.fixture
+def repo(client: LocalClient) -> DatabaseRepository:
+    return DatabaseRepository(client)
+
+
+class Fabrica:
+    """Cria membros, planos e leituras no banco local dos testes, em lote."""
+
+    def __init__(self, client: LocalClient) -> None:
+        self.client = client
+
+    def inserir(self, tabela: str, linhas: list[dict]) -> list[dict]:
+        return self.client.table(tabela).insert(linhas).execute().data
+
+    def usuarios(self, n: int = 1) -> list[Usuario]:
+        linhas = self.inserir("tb_usuarios", [{"nome": f"Membro {i:05d}"} for i in range(n)])
+        return [Usuario(id=linha["id"], nome=linha["nome"]) for linha in linhas]
+
+    def planos(self, n: int = 1, entradas: Iterable[tuple[date, int, str]] = ()) -> list[int]:
+        """`n` planos ('Plano', ou 'Plano 0', 'Plano 1', ...), cada um com as mesmas entradas.
+
+        Args:
+            n: Número de planos.
+            entradas: Tuplas (data, ID do livro, capítulos) de 'tb_plano_entradas'.
+        """
+        nomes = ["Plano"] if n == 1 else [f"Plano {i}" for i in range(n)]
+        planos = [linha["id"] for linha in self.inserir("tb_planos", [{"nome": nome} for nome in nomes])]
+        entradas = list(entradas)
+        if entradas:
+            self.inserir(
+                "tb_plano_entradas",
+                [
+                    {"plano_id": p, "data_leitura": str(d), "id_livro": livro, "capitulos": capitulos}
+                    for p in planos
+                    for d, livro, capitulos in entradas
+                ],
+            )
+        return planos
+
+    def leituras(
+        self, usuario: Usuario, plano_id: int, capitulos: Iterable[tuple[int, int, date]]
+    ) -> None:
+        """Grava as leituras (ID do livro, capítulo, data do plano) do membro no plano."""
+        self.inserir(
+            "tb_leituras",
+            [
+                {
+                    "usuario_id": usuario.id,
+                    "plano_id": plano_id,
+                    "id_livro": livro,
+                    "capitulo": capitulo,
+                    "data_leitura_plano": str(data),
+                }
+                for livro, capitulo, data in capitulos
+            ],
+        )
+
+    def membro_e_plano(
+        self,
+        leituras: Iterable[tuple[int, int, date]] = (),
+        entradas: Iterable[tuple[date, int, str]] = (),
+    ) -> tuple[Usuario, int]:
+        """Um membro e um plano com as entradas e as leituras do membro; retorna os dois."""
+        usuario, plano_id = self.usuarios()[0], self.planos(entradas=entradas)[0]
+        leituras = list(leituras)
+        if leituras:
+            self.leituras(usuario, plano_id, leituras)
+        return usuario, plano_id
+
+
+@pytest.fixture
+def fabrica(client: LocalClient) -> Fabrica:
+    return Fabrica(client)
@@ -0,0 +1,32 @@
+from datetime import date
+
+from src.local_client import LocalClient
+
+# Gênesis 1-5 no primeiro dia do plano.
+ENTRADAS = [(date(2026, 1, 1), 1, "1-5")]
+
+
+def versoes(client: LocalClient) -> dict[str, int]:
+    linhas = client.table("tb_versoes_dados").select("tabela, versao").execute().data
+    return {linha["tabela"]: linha["versao"] for linha in linhas}
+
+
+def test_leituras_nao_incrementam_as_versoes(client, fabrica, repo):
+    usuario, plano_id = fabrica.membro_e_plano(entradas=ENTRADAS)
+    antes = versoes(client)
+
+    repo.save_readings(usuario, plano_id, [(1, c, date(2026, 1, 1)) for c in (1, 2)])
+
+    assert "tb_leituras" not in antes
+    assert versoes(client) == antes
+
+
+def test_dashboard_mostra_as_leituras_salvas_pelo_processo(fabrica, repo):
+    usuario, plano_id = fabrica.membro_e_plano(entradas=ENTRADAS)
+    repo.save_reading(usuario, plano_id, 1, 1, date(2026, 1, 1))
+    assert repo.get_dashboard_progress()["Lidos"].tolist() == [1]
+
+    # Sem versão de 'tb_leituras', a gravação invalida o dashboard em cache.
+    repo.save_reading(usuario, plano_id, 1, 2, date(2026, 1, 1))
+
+    assert repo.get_dashboard_progress()["Lidos"].tolist() == [2]
@@ -0,0 +1,61 @@
+from datetime import date
+
+from src.local_client import LocalClient
+
+# Gênesis 1-5 no primeiro dia do plano.
+ENTRADAS = [(date(2026, 1, 1), 1, "1-5")]
+
+
+def capitulos_embutidos(client: LocalClient, foreign_table: str) -> list[int]:
+    linha = (
+        client.table("tb_plano_entradas")
+        .select("id, slots:tb_plano_slots(ordem, capitulo)")
+        .order("ordem", desc=True, foreign_table=foreign_table)
+        .execute()
+        .data[0]
+    )
+    return [slot["capitulo"] for slot in linha["slots"]]
+
+
+def test_ordenacao_de_recurso_embutido_usa_o_alias(client, fabrica):
+    fabrica.planos(entradas=ENTRADAS)
+
+    # Como no PostgREST: 'slots.order=ordem.desc' ordena o recurso embutido...
+    assert capitulos_embutidos(client, "slots") == [5, 4, 3, 2, 1]
+    # ...e o nome da tabela não corresponde a nenhum recurso da consulta.
+    assert capitulos_embutidos(client, "tb_plano_slots") == [1, 2, 3, 4, 5]
+
+
+def test_recurso_embutido_sem_alias_e_nomeado_pela_tabela(client, fabrica):
+    plano_id = fabrica.planos(entradas=ENTRADAS)[0]
+
+    linha = (
+        client.table("tb_plano_entradas")
+        .select("id, tb_planos!inner(nome)")
+        .eq("tb_planos.nome", "Plano")
+        .execute()
+        .data[0]
+    )
+
+    assert linha["tb_planos"] == {"nome": "Plano"}
+    assert client.table("tb_planos").select("id").execute().data == [{"id": plano_id}]
+
+
+def test_indice_do_plano_mantem_a_ordem_dos_capitulos(client, fabrica, repo):
+    plano_id = fabrica.planos(entradas=ENTRADAS)[0]
+    # Regrava os slots em ordem física inversa: só a ordenação pedida na consulta
+    # devolve os capítulos em ordem.
+    slots = client._conn.execute(
+        "SELECT * FROM tb_plano_slots WHERE plano_id = ? ORDER BY ordem DESC", (plano_id,)
+    ).fetchall()
+    client._conn.execute("DELETE FROM tb_plano_slots WHERE plano_id = ?", (plano_id,))
+    client._conn.executemany(
+        "INSERT INTO tb_plano_slots (plano_id, ordem, data_leitura, id_livro, capitulo, entrada_id) "
+        "VALUES (:plano_id, :ordem, :data_leitura, :id_livro, :capitulo, :entrada_id)",
+        [dict(slot) for slot in slots],
+    )
+
+    plan_index = repo.get_plan_index("Plano")
+
+    assert plan_index is not None
+    assert [e.chapters for e in plan_index.entries_for(date(2026, 1, 1))] == [(1, 2, 3, 4, 5)]
@@ -0,0 +1,49 @@
+import pytest
+
+from src import metrics
+from src.local_client import LocalClient
+from src.metrics import InstrumentedClient, configure_export, query_stats
+
+
+@pytest.fixture(autouse=True)
+def exportacao_desativada():
+    configure_export(None)
+    yield
+    configure_export(None)
+
+
+def bytes_da_consulta(client: InstrumentedClient) -> int:
+    antes = {q.target: q.payload_bytes for q in query_stats()}
+    client.table("tb_livros").select("id, nome").execute()
+    depois = {q.target: q.payload_bytes for q in query_stats()}
+    return depois["tb_livros"] - antes.get("tb_livros", 0)
+
+
+def test_tamanho_das_respostas_so_e_medido_quando_exportado(tmp_path, monkeypatch):
+    client = InstrumentedClient(LocalClient())
+    serializacoes = []
+    original = metrics._payload_size
+    monkeypatch.setattr(
+        metrics, "_payload_size", lambda data: serializacoes.append(data) or original(data)
+    )
+
+    assert bytes_da_consulta(client) == 0
+    assert serializacoes == []
+
+    configure_export(str(tmp_path / "metricas.prom"))
+    assert bytes_da_consulta(client) > 0
+
+    configure_export(None, log_reruns=True)
+    assert bytes_da_consulta(client) > 0
+    assert len(serializacoes) == 2
+
+
+def test_consultas_e_linhas_contadas_sem_exportacao():
+    client = InstrumentedClient(LocalClient())
+    antes = {q.target: (q.queries, q.rows) for q in query_stats()}.get("tb_livros", (0, 0))
+
+    client.table("tb_livros").select("id").execute()
+
+    depois = {q.target: (q.queries, q.rows) for q in query_stats()}["tb_livros"]
+    assert depois[0] - antes[0] == 1
+    assert depois[1] - antes[1] == 66
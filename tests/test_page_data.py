@@ -0,0 +1,91 @@
+import threading
+import time
+
+import pytest
+
+from src import page_data
+from src.page_data import Dependency, load_concurrently
+
+
+def dormir(segundos: float, valor: str):
+    def load():
+        time.sleep(segundos)
+        return valor
+
+    return load
+
+
+def test_valores_erros_e_padroes():
+    def falha():
+        raise ValueError("banco fora do ar")
+
+    data = load_concurrently(
+        Dependency("ok", lambda: 1),
+        Dependency("falha", falha, default=[]),
+    )
+
+    assert data["ok"] == 1
+    assert data["falha"] == []
+    assert data.failed() == ["falha"]
+    assert isinstance(data.errors["falha"], ValueError)
+
+
+def test_tempo_limite_usa_o_padrao_sem_esperar_a_dependencia():
+    inicio = time.monotonic()
+    data = load_concurrently(
+        Dependency("lenta", dormir(1.0, "lenta"), default="padrao", timeout=0.1),
+        Dependency("rapida", lambda: "rapida"),
+    )
+
+    assert time.monotonic() - inicio < 0.5
+    assert data.values == {"lenta": "padrao", "rapida": "rapida"}
+    assert isinstance(data.errors["lenta"], TimeoutError)
+
+
+def test_dependencias_presas_nao_afetam_outras_paginas():
+    liberar = threading.Event()
+    try:
+        # Ocupa tantas threads quanto o limite, todas presas além do tempo limite.
+        presa = load_concurrently(
+            *(Dependency(f"presa{i}", liberar.wait, timeout=0.05) for i in range(page_data.MAX_WORKERS))
+        )
+        assert len(presa.failed()) == page_data.MAX_WORKERS
+
+        outra = load_concurrently(Dependency("rapida", lambda: "ok", timeout=0.5))
+        assert outra.values == {"rapida": "ok"}
+        assert not outra.failed()
+    finally:
+        liberar.set()
+
+
+def test_tempo_limite_conta_a_partir_do_inicio_da_execucao(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(page_data, "MAX_WORKERS", 1)
+
+    # A segunda dependência espera a primeira na fila (0.3s) e leva mais 0.3s: passa do
+    # prazo contado da submissão, mas não do contado do início da execução.
+    data = load_concurrently(
+        Dependency("primeira", dormir(0.3, "a"), timeout=1.0),
+        Dependency("segunda", dormir(0.3, "b"), timeout=0.5),
+    )
+
+    assert data.values == {"primeira": "a", "segunda": "b"}
+    assert not data.failed()
+
+
+def test_dependencia_que_nao_comeca_no_prazo_e_cancelada(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(page_data, "MAX_WORKERS", 1)
+    executadas = []
+
+    def registrar():
+        executadas.append("na_fila")
+        return "na_fila"
+
+    data = load_concurrently(
+        Dependency("primeira", dormir(0.3, "a"), timeout=1.0),
+        Dependency("na_fila", registrar, default="padrao", timeout=0.1),
+    )
+
+    assert data.values == {"primeira": "a", "na_fila": "padrao"}
+    assert isinstance(data.errors["na_fila"], TimeoutError)
+    time.sleep(0.1)
+    assert executadas == []
@@ -0,0 +1,194 @@
+from datetime import date, datetime, timedelta
+
+import pytest
+from backfill_completions import carregar_candidatos
+
+from src.books import BookCatalog
+from src.config import FUSO_BR
+from src.local_client import DEFAULT_MAX_ROWS
+
+# Acima de uma e de duas páginas do 'max-rows', com uma última página incompleta.
+TAMANHOS = [DEFAULT_MAX_ROWS + 500, 2 * DEFAULT_MAX_ROWS + 500]
+
+CAPITULOS = [(book.id, c) for book in BookCatalog.bundled() for c in range(1, book.chapters + 1)]
+
+
+def leituras_da_biblia(n: int) -> list[tuple[int, int, date]]:
+    """`n` leituras distintas, percorrendo os capítulos da Bíblia a cada dia anterior a hoje.
+
+    Poucos dias distintos: cada dia novo recalcula as sequências do usuário no trigger.
+    """
+    hoje = datetime.now(FUSO_BR).date()
+    return [
+        (*CAPITULOS[i % len(CAPITULOS)], hoje - timedelta(days=i // len(CAPITULOS))) for i in range(n)
+    ]
+
+
+@pytest.mark.parametrize("n", TAMANHOS)
+@pytest.mark.parametrize("desc", [False, True])
+def test_paginacao_por_chave_percorre_todas_as_linhas(client, fabrica, repo, n, desc):
+    fabrica.membro_e_plano(leituras_da_biblia(n))
+
+    consultas = client.query_count
+    linhas = list(repo.paginate(lambda: client.table("tb_leituras").select("id"), desc=desc))
+
+    ids = [linha["id"] for linha in linhas]
+    assert len(ids) == n
+    assert ids == sorted(set(ids), reverse=desc)
+    assert client.query_count - consultas == n // DEFAULT_MAX_ROWS + 1
+
+
+@pytest.mark.parametrize("n", TAMANHOS)
+def test_paginacao_por_intervalo_com_empates_na_ordenacao(client, fabrica, repo, n):
+    fabrica.membro_e_plano(leituras_da_biblia(n))
+
+    # 'id_livro' se repete em centenas de linhas (inclusive entre as páginas): o 'id'
+    # desempata, e nenhuma linha pode se repetir ou faltar entre as páginas.
+    linhas = list(
+        repo.paginate(
+            lambda: client.table("tb_leituras").select("id, id_livro").order("id_livro").order("id"),
+            key=None,
+        )
+    )
+
+    assert len(linhas) == n
+    assert len({linha["id"] for linha in linhas}) == n
+    assert linhas == sorted(linhas, key=lambda linha: (linha["id_livro"], linha["id"]))
+
+
+def test_paginacao_para_na_pagina_exata(client, fabrica, repo):
+    fabrica.membro_e_plano(leituras_da_biblia(2 * DEFAULT_MAX_ROWS))
+
+    consultas = client.query_count
+    linhas = list(repo.paginate(lambda: client.table("tb_leituras").select("id")))
+
+    assert len(linhas) == 2 * DEFAULT_MAX_ROWS
+    # Duas páginas cheias e uma vazia, que encerra a paginação.
+    assert client.query_count - consultas == 3
+
+
+@pytest.mark.parametrize("n", TAMANHOS)
+def test_leituras_do_usuario_completas(fabrica, repo, n):
+    usuario, plano_id = fabrica.membro_e_plano(leituras_da_biblia(n))
+
+    leituras = repo.get_user_readings(usuario, plano_id)
+
+    assert len(leituras) == n
+    assert len({(r.livro.id, r.capitulo, r.data_leitura_plano) for r in leituras}) == n
+
+
+@pytest.mark.parametrize("n", TAMANHOS)
+def test_calendario_de_leitura_do_perfil_completo(fabrica, repo, n):
+    usuario = fabrica.usuarios()[0]
+    hoje = datetime.now(FUSO_BR).date()
+    # Direto na tabela agregada por dia (mantida pelos triggers de 'tb_leituras').
+    fabrica.inserir(
+        "tb_leituras_dias_usuarios",
+        [
+            {"usuario_id": usuario.id, "data_leitura": str(hoje - timedelta(days=i)), "capitulos": 1}
+            for i in range(n)
+        ],
+    )
+
+    dias = repo.get_daily_reading_counts(usuario.id, days=n)
+
+    assert len(dias) == n
+    assert [dia.data for dia in dias] == sorted({dia.data for dia in dias})
+
+
+@pytest.mark.parametrize("n", TAMANHOS)
+def test_livros_concluidos_completos(fabrica, repo, n):
+    usuario = fabrica.usuarios()[0]
+    planos = fabrica.planos(n // 65 + 1)
+    # Os livros 1 a 65 se repetem por vários planos; o livro 66 só aparece na última linha.
+    conclusoes = [
+        {"usuario_id": usuario.id, "plano_id": planos[i // 65], "id_livro": i % 65 + 1}
+        for i in range(n - 1)
+    ]
+    conclusoes.append({"usuario_id": usuario.id, "plano_id": planos[-1], "id_livro": 66})
+    fabrica.inserir("tb_livros_concluidos", conclusoes)
+
+    assert repo.get_user_completed_books(usuario.id) == set(range(1, 67))
+
+
+@pytest.mark.parametrize("n", TAMANHOS)
+def test_dashboard_completo(fabrica, repo, n):
+    usuarios = fabrica.usuarios(n)
+    hoje = datetime.now(FUSO_BR).date()
+    planos = fabrica.planos(2, entradas=[(hoje, 1, "1-3")])
+    # Um membro por linha, metade em cada plano: a ordenação por 'Plano' tem empates em
+    # todas as páginas, desfeitos por 'Usuario'.
+    fabrica.inserir(
+        "tb_leituras",
+        [
+            {
+                "usuario_id": u.id,
+                "plano_id": planos[i % 2],
+                "id_livro": 1,
+                "capitulo": 1,
+                "data_leitura_plano": str(hoje),
+            }
+            for i, u in enumerate(usuarios)
+        ],
+    )
+
+    dashboard = repo.get_dashboard_progress()
+
+    assert len(dashboard) == n
+    assert set(dashboard["Usuario"]) == {u.nome for u in usuarios}
+    assert repo.get_all_users() == sorted(usuarios, key=lambda u: u.nome)
+
+
+@pytest.mark.parametrize("n", TAMANHOS)
+def test_respostas_do_mural_completas(client, fabrica, repo, n):
+    usuario = fabrica.usuarios()[0]
+    pergunta_id = fabrica.inserir("tb_perguntas", [{"pergunta_texto": "Quem escreveu Hebreus?"}])[0][
+        "id"
+    ]
+    # O índice de busca renormaliza todas as respostas da pergunta a cada inserção, o
+    # que torna a carga quadrática; a busca não faz parte deste teste.
+    client._conn.execute("DROP TRIGGER respostas_busca_insert")
+    fabrica.inserir(
+        "tb_respostas",
+        [
+            {"pergunta_id": pergunta_id, "usuario_id": usuario.id, "resposta_texto": f"Resposta {i}"}
+            for i in range(n)
+        ],
+    )
+
+    respostas = repo.get_question_answers(pergunta_id)
+
+    assert [r.resposta_texto for r in respostas] == [f"Resposta {i}" for i in range(n)]
+
+
+@pytest.mark.parametrize("n", TAMANHOS)
+def test_backfill_carrega_todos_os_candidatos(client, fabrica, repo, n):
+    usuario = fabrica.usuarios()[0]
+    planos = fabrica.planos(n // len(CAPITULOS) + 1)
+    hoje = str(datetime.now(FUSO_BR).date())
+    # (plano, livro, capítulo) distintos em todas as linhas: uma página perdida apareceria
+    # como capítulos faltando.
+    leituras = [
+        {
+            "usuario_id": usuario.id,
+            "plano_id": planos[i // len(CAPITULOS)],
+            "id_livro": CAPITULOS[i % len(CAPITULOS)][0],
+            "capitulo": CAPITULOS[i % len(CAPITULOS)][1],
+            "data_leitura_plano": hoje,
+        }
+        for i in range(n)
+    ]
+    fabrica.inserir("tb_leituras", leituras)
+    concluidos = [
+        {"usuario_id": usuario.id, "plano_id": planos[i // 66], "id_livro": i % 66 + 1}
+        for i in range(min(n, 66 * len(planos)))
+    ]
+    fabrica.inserir("tb_livros_concluidos", concluidos)
+
+    lidos, existentes = carregar_candidatos(client, repo)
+
+    assert sum(len(capitulos) for capitulos in lidos.values()) == n
+    assert {(u, p, livro, c) for (u, p, livro), caps in lidos.items() for c in caps} == {
+        (r["usuario_id"], r["plano_id"], r["id_livro"], r["capitulo"]) for r in leituras
+    }
+    assert existentes == {(c["usuario_id"], c["plano_id"], c["id_livro"]) for c in concluidos}
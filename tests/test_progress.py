@@ -0,0 +1,68 @@
+from datetime import date
+
+from src.plan_index import PlanIndex
+from src.progress import PlanProgress
+
+DIA_1, DIA_2, DIA_3 = date(2026, 1, 1), date(2026, 1, 2), date(2026, 1, 3)
+
+
+def criar_indice() -> PlanIndex:
+    """Gênesis e Mateus intercalados em dois dias; Obadias inteiro no terceiro."""
+    return PlanIndex.from_rows(
+        7,
+        "Plano",
+        [
+            {"data_leitura": DIA_1, "livro_id": 1, "livro": "Gênesis", "capitulos": "1-2"},
+            {"data_leitura": DIA_1, "livro_id": 40, "livro": "Mateus", "capitulos": "1"},
+            {"data_leitura": DIA_2, "livro_id": 1, "livro": "Gênesis", "capitulos": "3"},
+            {"data_leitura": DIA_2, "livro_id": 40, "livro": "Mateus", "capitulos": "2"},
+            {"data_leitura": DIA_3, "livro_id": 31, "livro": "Obadias", "capitulos": "1"},
+        ],
+    )
+
+
+def test_indice_guarda_os_slots_de_cada_leitura_e_livro():
+    indice = criar_indice()
+
+    assert indice.slots_by_key[(40, 2, DIA_2)] == (4,)
+    assert list(indice.book_slots[1]) == [0, 1, 3]
+    assert indice.book_slots[31] == range(5, 6)
+    assert indice.date_slots(DIA_2) == range(3, 5)
+    assert indice.date_slots(date(2026, 2, 1)) == range(0)
+
+
+def test_marcar_devolve_um_novo_progresso():
+    vazio = PlanProgress(criar_indice())
+
+    progresso = vazio.marked([(1, 1, DIA_1), (40, 1, DIA_1), (1, 2, DIA_2), (66, 1, DIA_1)])
+
+    assert vazio.read_count == 0
+    # Gênesis 2 está programado para o dia 1: a leitura no dia 2 não marca nenhum slot.
+    assert progresso.read_count == 2
+    assert progresso.is_read(1, 1, DIA_1) and progresso.is_read(40, 1, DIA_1)
+    assert not progresso.is_read(1, 2, DIA_1) and not progresso.is_read(1, 2, DIA_2)
+    assert progresso.marked([(1, 2, DIA_1)]).is_day_complete(DIA_1)
+    assert not progresso.is_day_complete(DIA_1)
+
+
+def test_proxima_data_pendente():
+    progresso = PlanProgress(criar_indice())
+    assert progresso.next_unread_date() == DIA_1
+
+    progresso = progresso.marked([(1, 1, DIA_1), (1, 2, DIA_1), (40, 1, DIA_1), (1, 3, DIA_2)])
+    assert progresso.next_unread_date() == DIA_2
+
+    progresso = progresso.marked([(40, 2, DIA_2), (31, 1, DIA_3)])
+    assert progresso.next_unread_date() is None
+    assert progresso.percent_complete == 1.0
+
+
+def test_livros_concluidos():
+    progresso = PlanProgress(criar_indice()).marked(
+        [(40, 1, DIA_1), (40, 2, DIA_2), (31, 1, DIA_3), (1, 1, DIA_1), (1, 3, DIA_2)]
+    )
+
+    assert sorted(progresso.completed_books()) == [31, 40]
+    assert not progresso.is_book_complete(1)
+    assert not progresso.is_book_complete(66)
+    assert progresso.marked([(1, 2, DIA_1)]).is_book_complete(1)
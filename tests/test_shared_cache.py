@@ -0,0 +1,118 @@
+import os
+import sqlite3
+from datetime import date
+
+import pandas as pd
+import pytest
+
+from src.books import BookCatalog
+from src.models import Pergunta, PosicaoRanking, Usuario
+from src.plan_index import PlanIndex
+from src.shared_cache import MISSING, SharedCacheStore
+
+
+@pytest.fixture
+def store(tmp_path) -> SharedCacheStore:
+    return SharedCacheStore(str(tmp_path / "cache" / "compartilhado.sqlite3"))
+
+
+def criar_indice() -> PlanIndex:
+    return PlanIndex.from_rows(
+        7,
+        "Plano",
+        [
+            {"data_leitura": date(2026, 1, 1), "livro_id": 1, "livro": "Gênesis", "capitulos": "1-3"},
+            {"data_leitura": date(2026, 1, 1), "livro_id": 40, "livro": "Mateus", "capitulos": "1"},
+            {"data_leitura": date(2026, 1, 2), "livro_id": 1, "livro": "Gênesis", "capitulos": "4-5"},
+        ],
+    )
+
+
+def test_arquivo_criado_apenas_para_o_usuario(store):
+    assert os.stat(store.path).st_mode & 0o777 == 0o600
+    assert os.stat(os.path.dirname(store.path)).st_mode & 0o777 == 0o700
+
+
+def test_arquivo_gravavel_por_outros_e_recusado(store):
+    os.chmod(store.path, 0o666)
+
+    with pytest.raises(PermissionError):
+        SharedCacheStore(store.path)
+
+
+@pytest.mark.parametrize(
+    "valor",
+    [
+        ("Plano A", "Plano B"),
+        frozenset({1, 40, 66}),
+        {"tb_planos": 3, "tb_usuarios": 1},
+        ([PosicaoRanking(posicao=1, usuario=Usuario(id=2, nome="Ana"), livros_concluidos=3)], True),
+        [
+            Pergunta(
+                id=1, pergunta_texto="Quem escreveu Hebreus?", created_at="2026-01-01T10:00:00+00:00"
+            )
+        ],
+        None,
+    ],
+)
+def test_valores_dos_caches_sobrevivem_ao_arquivo(store, valor):
+    store.set("cache", ("chave", 1), valor, version=(3, 1, date(2026, 1, 1)))
+
+    assert store.get("cache", ("chave", 1), version=(3, 1, date(2026, 1, 1))) == valor
+    assert store.get("cache", ("chave", 1), version=(4, 1, date(2026, 1, 1))) is MISSING
+
+
+def test_catalogo_indice_e_dataframes_sobrevivem_ao_arquivo(store):
+    catalogo, indice = BookCatalog.bundled(), criar_indice()
+    store.set("cache", "livros", catalogo)
+    store.set("cache", "Plano", indice)
+    store.set("cache", ("estrutura", "Plano"), indice.to_frame())
+
+    lido = store.get("cache", "livros")
+    assert (lido.books, lido.ids_by_name) == (catalogo.books, catalogo.ids_by_name)
+    assert {n: getattr(store.get("cache", "Plano"), n) for n in vars(indice)} == vars(indice)
+    pd.testing.assert_frame_equal(store.get("cache", ("estrutura", "Plano")), indice.to_frame())
+
+
+def test_arquivo_nao_guarda_pickle(store):
+    store.set("cache", ("ranking", 0, 20), ([], False))
+    store.set("cache", 5, frozenset({1}))
+
+    with sqlite3.connect(store.path) as conn:
+        linhas = conn.execute("SELECT chave, formato, valor FROM entradas ORDER BY chave").fetchall()
+
+    assert linhas == [
+        ("5", "json", b'{"t":"frozenset","v":[1]}'),
+        ('{"t":"tuple","v":["ranking",0,20]}', "json", b'{"t":"tuple","v":[[],false]}'),
+    ]
+
+
+def test_tipo_desconhecido_nao_e_gravado(store):
+    store.set("cache", "chave", object())
+
+    assert store.get("cache", "chave") is MISSING
+
+
+def test_invalidacao_por_predicado_le_as_chaves(store):
+    for pagina in range(3):
+        store.set("cache", ("ranking", pagina, 20), ([], False))
+    store.set("cache", 1, frozenset())
+
+    store.invalidate_where("cache", lambda chave: isinstance(chave, tuple) and chave[0] == "ranking")
+
+    assert [store.get("cache", ("ranking", p, 20)) for p in range(3)] == [MISSING] * 3
+    assert store.get("cache", 1) == frozenset()
+
+
+def test_arquivo_no_formato_antigo_e_recriado(tmp_path):
+    caminho = str(tmp_path / "antigo.sqlite3")
+    with sqlite3.connect(caminho) as conn:
+        conn.execute("CREATE TABLE entradas (cache TEXT, chave TEXT, chave_pickle BLOB, valor BLOB)")
+        conn.execute("INSERT INTO entradas VALUES ('cache', '1', x'80', x'80')")
+    os.chmod(caminho, 0o600)
+
+    store = SharedCacheStore(caminho)
+
+    assert store.get("cache", 1) is MISSING
+    store.set("cache", 1, "valor")
+    assert store.get("cache", 1) == "valor"
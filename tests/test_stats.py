@@ -0,0 +1,68 @@
+from datetime import date, datetime, timedelta
+
+from src.config import FUSO_BR
+from src.models import EstatisticasLeitura
+
+
+def leituras_de_genesis(datas: list[date]) -> list[tuple[int, int, date]]:
+    """Uma leitura de Gênesis por data (capítulos 1, 2, ...)."""
+    return [(1, capitulo, data) for capitulo, data in enumerate(datas, start=1)]
+
+
+def test_sequencia_conta_os_dias_lidos_adiantados_quando_chegam(fabrica, repo):
+    hoje = datetime.now(FUSO_BR).date()
+    amanha = hoje + timedelta(days=1)
+    usuario, _ = fabrica.membro_e_plano(leituras_de_genesis([hoje - timedelta(days=1), hoje, amanha]))
+
+    stats = repo.get_user_stats(usuario.id)
+    # Gravado hoje: o dia de amanhã ainda não conta.
+    assert (stats.ultima_data, stats.sequencia_atual, stats.maior_sequencia) == (hoje, 2, 2)
+    dias = [hoje - timedelta(days=1), hoje, amanha]
+
+    assert stats.sequencia_em(hoje, dias) == 2
+    # Sem nenhuma nova escrita, o dia adiantado entra na sequência quando chega...
+    assert stats.sequencia_em(amanha, dias) == 3
+    assert stats.sequencia_em(amanha + timedelta(days=1), dias) == 3
+    assert stats.maior_sequencia_em(amanha, dias) == 3
+    # ...e ela se quebra depois de um dia inteiro sem leitura.
+    assert stats.sequencia_em(amanha + timedelta(days=2), dias) == 0
+    assert stats.maior_sequencia_em(amanha + timedelta(days=2), dias) == 2
+
+
+def test_sequencia_sem_os_dias_usa_a_gravada():
+    stats = EstatisticasLeitura(
+        usuario_id=1, ultima_data=date(2026, 3, 10), sequencia_atual=4, maior_sequencia=7
+    )
+
+    assert stats.sequencia_em(date(2026, 3, 10)) == 4
+    assert stats.sequencia_em(date(2026, 3, 11)) == 4
+    assert stats.sequencia_em(date(2026, 3, 12)) == 0
+    assert EstatisticasLeitura(usuario_id=1).sequencia_em(date(2026, 3, 12)) == 0
+
+
+def test_serie_mensal_em_ordem_cronologica(client, fabrica, repo):
+    hoje = datetime.now(FUSO_BR).date()
+    usuario, _ = fabrica.membro_e_plano(
+        leituras_de_genesis([hoje - timedelta(days=d) for d in (0, 40, 80)])
+    )
+    # Recria a série sem a chave primária (índice por mês) e em ordem física inversa: só a ordenação
+    # pedida no recurso embutido ('meses.order=mes') devolve os meses em ordem.
+    client._conn.executescript(
+        """
+        PRAGMA legacy_alter_table = ON;
+        CREATE TABLE meses_invertidos (
+            usuario_id INTEGER NOT NULL REFERENCES tb_estatisticas_usuarios(usuario_id),
+            mes TEXT NOT NULL,
+            capitulos INTEGER NOT NULL
+        );
+        INSERT INTO meses_invertidos
+            SELECT usuario_id, mes, capitulos FROM tb_leituras_mensais_usuarios ORDER BY mes DESC;
+        DROP TABLE tb_leituras_mensais_usuarios;
+        ALTER TABLE meses_invertidos RENAME TO tb_leituras_mensais_usuarios;
+        """
+    )
+
+    serie = [mes.mes for mes in repo.get_user_stats(usuario.id).meses]
+
+    assert len(serie) == 3
+    assert serie == sorted(serie)